@@ -3,15 +3,20 @@ Endpoints ULTRA-SIMPLIFICADOS do Market Data Service.
 
 Removidos args, kwargs, validações complexas e middleware desnecessário.
 Foco na simplicidade e facilidade de uso.
+
+As rotas são assíncronas: acertos de cache são respondidos no event loop e o
+trabalho bloqueante (yfinance, pandas, disco) roda no executor dedicado do
+serviço (`market_data_service.blocking`).
 """
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, Query
+from typing import List, Optional, Union
 from core.config import settings
 from core.logging import get_logger
 from models.requests import BulkDataRequest, SearchRequest, StockDataRequest
 
 from models.responses import (
     BulkDataResponse,
+    ColumnarHistoryResponse,
     HealthResponse,
     SearchResponse,
     StockDataResponse,
@@ -28,6 +33,13 @@ router = APIRouter()
 # Serviço
 market_data_service = MarketDataService()
 
+# Formato de saída das séries históricas
+HISTORY_FORMAT_QUERY = Query(
+    "records",
+    pattern="^(records|columnar)$",
+    description="'records' (lista de pontos) ou 'columnar' (uma lista por campo)",
+)
+
 
 @router.get(
     "/stocks-all",
@@ -35,8 +47,10 @@ market_data_service = MarketDataService()
     summary="Listar todos os tickers disponíveis",
     description="Retorna todos os tickers disponíveis para o frontend.",
 )
-def list_available_stocks() -> List[SearchResultItem]:
-    tickers = market_data_service.list_available_stocks("simple-client")
+async def list_available_stocks() -> List[SearchResultItem]:
+    tickers = await market_data_service.blocking.run(
+        market_data_service.list_available_stocks, "simple-client"
+    )
     results = []
     for t in tickers:
         # Garante valores válidos para os campos obrigatórios
@@ -51,21 +65,27 @@ def list_available_stocks() -> List[SearchResultItem]:
 
 @router.get(
     "/stocks/{symbol}/history",
-    response_model=List[HistoricalDataPoint],
+    response_model=Union[List[HistoricalDataPoint], ColumnarHistoryResponse],
     summary="Obter histórico de dados de uma ação",
     description="Retorna a série histórica de dados de uma ação específica.",
 )
-def get_stock_history(symbol: str, period: str = "1mo", interval: str = "1d") -> List[HistoricalDataPoint]:
+async def get_stock_history(
+    symbol: str,
+    period: str = "1mo",
+    interval: str = "1d",
+    format: str = HISTORY_FORMAT_QUERY,
+) -> Union[List[HistoricalDataPoint], ColumnarHistoryResponse]:
     """
     Endpoint para obter o histórico de dados de uma ação.
     :param symbol: Símbolo da ação (ex: PETR4.SA, AAPL)
     :param period: Período dos dados (ex: 1mo, 1y, etc)
     :param interval: Intervalo dos dados (ex: 1d, 1h, etc)
-    :return: Lista de pontos históricos de dados
+    :param format: 'records' ou 'columnar' (arrays por campo, para gráficos)
+    :return: Lista de pontos históricos ou série colunar
     """
     logger.info(f"Obtendo histórico para {symbol}, período {period}, intervalo {interval}")
-    return market_data_service.get_stock_history(
-        symbol, period, interval, client_id="simple-client"
+    return await market_data_service.get_stock_history_async(
+        symbol, period, interval, client_id="simple-client", output_format=format
     )
 
 
@@ -126,7 +146,7 @@ def get_stock_history(symbol: str, period: str = "1mo", interval: str = "1d") ->
     - Para day trading: use period=1d ou 5d
     """,
 )
-def get_stock_data(
+async def get_stock_data(
     symbol: str,
     period: str = "1mo",
     interval: str = "1d",
@@ -134,7 +154,9 @@ def get_stock_data(
     """Endpoint ultra-simplificado para dados de ação com suporte a intervalos."""
     logger.info(f"Dados para {symbol}, período {period}, intervalo {interval}")
     stock_request = StockDataRequest(symbol=symbol, period=period, interval=interval)
-    return market_data_service.get_stock_data(symbol, stock_request, "simple-client")
+    return await market_data_service.get_stock_data_async(
+        symbol, stock_request, "simple-client"
+    )
 
 
 @router.get(
@@ -147,6 +169,8 @@ def get_stock_data(
     **Parâmetros:**
     - **q**: Termo de busca (obrigatório)
     - **limit**: Máximo de resultados (opcional, padrão: 10, máx: 50)
+    - **enrich**: Incluir preço atual (opcional, padrão: true). Use `false` no
+      autocomplete para responder só com o índice local, sem consultar o provedor
     
     **Termos para testar:**
     - 🏢 Por empresa: "petrobras", "vale", "apple", "microsoft", "google"
@@ -177,11 +201,13 @@ def get_stock_data(
     - Quanto menor o limit, mais rápida a resposta
     """,
 )
-def search_stocks(q: str, limit: int = 10) -> SearchResponse:
+async def search_stocks(q: str, limit: int = 10, enrich: bool = True) -> SearchResponse:
     """Endpoint ultra-simplificado para busca."""
     logger.info(f"Busca por: {q}")
-    search_request = SearchRequest(query=q, limit=limit)
-    return market_data_service.search_stocks(search_request, "simple-client")
+    search_request = SearchRequest(query=q, limit=limit, enrich=enrich)
+    return await market_data_service.blocking.run(
+        market_data_service.search_stocks, search_request, "simple-client"
+    )
 
 
 @router.get(
@@ -223,14 +249,16 @@ def search_stocks(q: str, limit: int = 10) -> SearchResponse:
     **Dica:** Combine com /stocks/{symbol} para detalhes das trending!
     """,
 )
-def get_trending_stocks(
+async def get_trending_stocks(
     market: str = "BR",
     limit: int = 10,
 ):
     """Endpoint ultra-simplificado para trending."""
     logger.info(f"Trending para {market}")
     try:
-        trending_data = market_data_service.get_trending_stocks(market, "simple-client")
+        trending_data = await market_data_service.get_trending_stocks_async(
+            market, "simple-client"
+        )
         if not trending_data:
             logger.info(f"Nenhuma ação trending encontrada para {market}.")
             return []
@@ -284,10 +312,10 @@ def get_trending_stocks(
     **Dica:** Use antes de chamar /stocks/{symbol} para evitar erros!
     """,
 )
-def validate_ticker(symbol: str) -> ValidationResponse:
+async def validate_ticker(symbol: str) -> ValidationResponse:
     """Endpoint ultra-simplificado para validação."""
     logger.info(f"Validando {symbol}")
-    return market_data_service.validate_ticker(symbol, "simple-client")
+    return await market_data_service.validate_ticker_async(symbol, "simple-client")
 
 
 @router.post(
@@ -364,10 +392,12 @@ def validate_ticker(symbol: str) -> ValidationResponse:
     **Dica:** Use periods iguais para comparar performance entre ações!
     """,
 )
-def get_bulk_data(bulk_request: BulkDataRequest) -> BulkDataResponse:
+async def get_bulk_data(bulk_request: BulkDataRequest) -> BulkDataResponse:
     """Endpoint ultra-simplificado para dados em lote."""
     logger.info(f"Bulk para {len(bulk_request.symbols)} ações")
-    return market_data_service.get_bulk_data(bulk_request, "simple-client")
+    return await market_data_service.blocking.run(
+        market_data_service.get_bulk_data, bulk_request, "simple-client"
+    )
 
 
 @router.get(
@@ -415,9 +445,11 @@ def get_bulk_data(bulk_request: BulkDataRequest) -> BulkDataResponse:
     **Dica:** Chame este endpoint primeiro se algo não estiver funcionando!
     """,
 )
-def health_check() -> HealthResponse:
+async def health_check() -> HealthResponse:
     """Endpoint de health check."""
-    health_data = market_data_service.get_service_health()
+    health_data = await market_data_service.blocking.run(
+        market_data_service.get_service_health
+    )
 
     return HealthResponse(
         status=health_data["status"],
@@ -428,6 +460,8 @@ def health_check() -> HealthResponse:
             "yahoo_finance": health_data["provider_status"],
             "cache": health_data["cache_status"],
         },
+        cache_stats=health_data["cache_stats"],
+        metrics=health_data["metrics"],
     )
 
 
@@ -466,7 +500,7 @@ def health_check() -> HealthResponse:
     **Dica:** Este endpoint é seu ponto de partida na API!
     """,
 )
-def service_info():
+async def service_info():
     """Informações da API ultra-simplificada."""
     return {
         "service": "Market Data API - Versão SUPER SIMPLES",
@@ -528,11 +562,11 @@ def service_info():
     **Dica:** Combine com /health para verificar se limpeza foi bem-sucedida!
     """,
 )
-def clear_cache():
+async def clear_cache():
     """Endpoint simples para limpar cache."""
     logger.info("Limpando cache")
 
-    success = market_data_service.clear_cache()
+    success = await market_data_service.blocking.run(market_data_service.clear_cache)
 
     return {
         "message": "Cache limpo!" if success else "Erro ao limpar cache",
@@ -545,8 +579,10 @@ def clear_cache():
     Símbolos dos tickers separados por vírgula (ex: AAPL,MSFT,PETR4.SA)
     """
 )
-def get_multiple_tickers_info(tickers: str):
-    response = market_data_service.get_multiple_tickers_info(tickers)
+async def get_multiple_tickers_info(tickers: str):
+    response = await market_data_service.blocking.run(
+        market_data_service.get_multiple_tickers_info, tickers
+    )
     logger.info(f"Obtendo informações para múltiplos tickers: {tickers}")
     if not response:
         logger.warning(f"Nenhum ticker encontrado para: {tickers}")
@@ -554,11 +590,20 @@ def get_multiple_tickers_info(tickers: str):
     return response
 
 @router.get("/multi-history")
-def get_multiple_tickers_history(tickers: str, period: str = "1mo", interval: str = "1d", start: str = "2020-01-01", end: str = "2025-01-01", PrePost: bool = False, autoAdjust: bool = True):
+async def get_multiple_tickers_history(tickers: str, period: str = "1mo", interval: str = "1d", start: str = "2020-01-01", end: str = "2025-01-01", PrePost: bool = False, autoAdjust: bool = True, batch: bool = True, format: str = HISTORY_FORMAT_QUERY):
     """
     Obtém o histórico de múltiplos tickers.
+    
+    Com `batch=true` (padrão) todos os tickers são baixados em uma única chamada
+    ao provedor quando são da mesma bolsa (tickers de bolsas diferentes são
+    buscados individualmente); use `batch=false` para buscar cada ticker
+    individualmente.
+    Com `format=columnar` os dados de cada ticker vêm como uma lista por campo.
     """
-    response = market_data_service.get_multiple_historical_data(tickers, period, interval, start, end, PrePost, autoAdjust)
+    response = await market_data_service.blocking.run(
+        market_data_service.get_multiple_historical_data,
+        tickers, period, interval, start, end, PrePost, autoAdjust, batch, format,
+    )
     logger.info(f"Obtendo histórico para múltiplos tickers: {tickers}")
     if not response:
         logger.warning(f"Nenhum ticker encontrado para: {tickers}")
@@ -566,8 +611,16 @@ def get_multiple_tickers_history(tickers: str, period: str = "1mo", interval: st
     return response
 
 @router.get("/{symbol}/history")
-def get_ticker_history(symbol: str, period: str = "1mo", interval: str = "1d", start: str = "2020-01-01", end: str = "2025-01-01", PrePost: bool = False, autoAdjust: bool = True):
-    response = market_data_service.get_historical_data(symbol, period, interval, start, end, PrePost, autoAdjust)
+async def get_ticker_history(symbol: str, period: str = "1mo", interval: str = "1d", start: str = "2020-01-01", end: str = "2025-01-01", PrePost: bool = False, autoAdjust: bool = True, format: str = HISTORY_FORMAT_QUERY):
+    """
+    Obtém o histórico de um ticker.
+
+    Com `format=columnar` os dados vêm como uma lista por campo (`dates`, `open`, `close`, ...).
+    """
+    response = await market_data_service.blocking.run(
+        market_data_service.get_historical_data,
+        symbol, period, interval, start, end, PrePost, autoAdjust, format,
+    )
     logger.info(f"Obtendo histórico para {symbol}, período {period}, intervalo {interval}")
     if not response:
         logger.warning(f"Nenhum histórico encontrado para: {symbol}")
@@ -578,8 +631,8 @@ def get_ticker_history(symbol: str, period: str = "1mo", interval: str = "1d", s
 # ==================== ENDPOINTS DE INFO COMPLETAS ====================
 
 @router.get("/{symbol}/fulldata")
-def get_ticker_full_data(symbol: str):
-    response = market_data_service.get_ticker_fulldata(symbol)
+async def get_ticker_full_data(symbol: str):
+    response = await market_data_service.blocking.run(market_data_service.get_ticker_fulldata, symbol)
     logger.info(f"Obtendo dados completos para {symbol}")
     if not response:
         logger.warning(f"Nenhum dado completo encontrado para: {symbol}")
@@ -589,8 +642,8 @@ def get_ticker_full_data(symbol: str):
 # ==================== ENDPOINT DE INFO ESSENCIAIS ====================
 
 @router.get("/{symbol}/info")
-def get_ticker_info(symbol: str):
-    response = market_data_service.get_ticker_info(symbol)
+async def get_ticker_info(symbol: str):
+    response = await market_data_service.blocking.run(market_data_service.get_ticker_info, symbol)
     logger.info(f"Obtendo informações para {symbol}")
     if not response:
         logger.warning(f"Nenhuma informação encontrada para: {symbol}")
@@ -611,8 +664,8 @@ Busca por empresas, setores, símbolos ou países.
 - 📊 Símbolos: "PETR", "VALE", "AAPL", "MSFT"
 - 🌎 Países: "brazil", "usa", "american"
 """)
-def search_tickers(query: str, limit: int = 10):
-    response = market_data_service.search_tickers(query, limit)
+async def search_tickers(query: str, limit: int = 10):
+    response = await market_data_service.blocking.run(market_data_service.search_tickers, query, limit)
     logger.info(f"Realizando busca para: {query}")
     if not response:
         logger.warning(f"Nenhum ticker encontrado para a busca: {query}")
@@ -642,8 +695,8 @@ Busca informações detalhadas sobre instrumentos financeiros.
 - ETFs: "ishares"
 - Índices: "ibovespa"
 """)
-def lookup(query: str, tipo: str = "all", limit: int = 10):
-    response = market_data_service.lookup_instruments(query, tipo, limit)
+async def lookup(query: str, tipo: str = "all", limit: int = 10):
+    response = await market_data_service.blocking.run(market_data_service.lookup_instruments, query, tipo, limit)
     logger.info(f"Realizando lookup para: {query}, tipo: {tipo}")
     if not response:
         logger.warning(f"Nenhum instrumento encontrado para a busca: {query}, tipo: {tipo}")
@@ -654,8 +707,8 @@ def lookup(query: str, tipo: str = "all", limit: int = 10):
 @router.get("/{symbol}/dividends",
             description="Obter dividendos de um ticker específico")
 
-def get_ticker_dividends(symbol: str):
-    response = market_data_service.get_dividends(symbol)
+async def get_ticker_dividends(symbol: str):
+    response = await market_data_service.blocking.run(market_data_service.get_dividends, symbol)
     logger.info(f"Obtendo dividendos para {symbol}")
     if not response:
         logger.warning(f"Nenhum dividendo encontrado para: {symbol}")
@@ -666,8 +719,8 @@ def get_ticker_dividends(symbol: str):
 # ==================== ENDPOINT DE RECOMENDAÇÕES ====================
 
 @router.get("/{symbol}/recommendations")
-def get_ticker_recommendations(symbol: str):
-    response = market_data_service.get_recommendations(symbol)
+async def get_ticker_recommendations(symbol: str):
+    response = await market_data_service.blocking.run(market_data_service.get_recommendations, symbol)
     logger.info(f"Obtendo recomendações para {symbol}")
     if not response:
         logger.warning(f"Nenhuma recomendação encontrada para: {symbol}")
@@ -678,8 +731,8 @@ def get_ticker_recommendations(symbol: str):
 # ==================== ENDPOINT DE CALENDARIO ====================
 
 @router.get("/{symbol}/calendar")
-def get_ticker_calendar(symbol: str):
-    response = market_data_service.get_calendar(symbol)
+async def get_ticker_calendar(symbol: str):
+    response = await market_data_service.blocking.run(market_data_service.get_calendar, symbol)
     logger.info(f"Obtendo calendário para {symbol}")
     if not response:
         logger.warning(f"Nenhum calendário encontrado para: {symbol}")
@@ -690,8 +743,8 @@ def get_ticker_calendar(symbol: str):
 # ==================== ENDPOINT DE NEWS ====================
 
 @router.get("/{symbol}/news")
-def get_ticker_news(symbol: str, limit: int = 10):
-    response = market_data_service.get_news(symbol, limit)
+async def get_ticker_news(symbol: str, limit: int = 10):
+    response = await market_data_service.blocking.run(market_data_service.get_news, symbol, limit)
     logger.info(f"Obtendo notícias para {symbol}")
     if not response:
         logger.warning(f"Nenhuma notícia encontrada para: {symbol}")
@@ -702,7 +755,7 @@ def get_ticker_news(symbol: str, limit: int = 10):
 
 
 @router.get("/categorias")
-def get_categorias():
+async def get_categorias():
     response = market_data_service.get_categorias()
     logger.info(f"Obtendo categorias")
     if not response:
@@ -742,7 +795,7 @@ Setores disponíveis:
 - Technology
 - Utilities
 """)
-def get_tickers_by_category(
+async def get_tickers_by_category(
     categoria: str,
     setor: str = None,
     limit: int = 20,
@@ -760,7 +813,7 @@ def get_tickers_by_category(
         return {"message": "Categoria inválida", "data": []}
 
     # Chamar serviço com argumentos corretos
-    response = market_data_service.get_trending(
+    response = await market_data_service.get_trending_async(
         categoria=categoria,
         setor=setor,
         limit=limit,
@@ -778,7 +831,7 @@ def get_tickers_by_category(
 # ==================== ENDPOINT DE BUSCA-PERSONALIZADA ====================
 
 @router.get("/busca-personalizada")
-def search_tickers( min_price: float = None, max_price: float = None, 
+async def search_tickers( min_price: float = None, max_price: float = None, 
                    min_volume: int = None, min_market_cap: float = None, max_pe: float = None, 
                    min_dividend_yield: float = None, setor: str = None, limit: int = 20):
     # Verifica se pelo menos um filtro foi fornecido
@@ -788,7 +841,8 @@ def search_tickers( min_price: float = None, max_price: float = None,
         logger.warning("Busca personalizada requer pelo menos um filtro além do mercado padrão.")
         return {"message": "Forneça pelo menos um filtro para busca personalizada.", "data": []}
 
-    response = market_data_service.get_custom_search(
+    response = await market_data_service.blocking.run(
+        market_data_service.get_custom_search,
         min_price, max_price, min_volume, min_market_cap, max_pe, min_dividend_yield, setor, limit
     )
     logger.info(f"Realizando busca personalizada com filtros: "
@@ -815,8 +869,8 @@ Categorias disponíveis:
 - **asia**: Nikkei, SSE Composite, Hang Seng, Nifty 50, Sensex
 - **moedas**: USD/BRL, EUR/BRL, GBP/BRL, JPY/BRL, AUD/BRL
 """)
-def get_market_overview(category: str):
-    response = market_data_service.get_market_overview(category)
+async def get_market_overview(category: str):
+    response = await market_data_service.get_market_overview_async(category)
     logger.info(f"Obtendo visão geral do mercado para a categoria: {category}")
     if not response:
         logger.warning(f"Nenhuma visão geral encontrada para a categoria: {category}")
@@ -831,8 +885,13 @@ def get_market_overview(category: str):
         description="""
     Retorna a performance de múltiplos ativos em diferentes períodos de tempo.
 
+    Uma única série diária de 1 ano é baixada para todos os ativos (em lote
+    quando são da mesma bolsa) e todos os períodos são calculados sobre ela.
+
+    **Limite:** até 60 ativos por requisição (PERIOD_PERFORMANCE_MAX_SYMBOLS).
+
     **Períodos calculados:**
-    - 1D: Variação de 1 dia
+    - 1D: Variação sobre o pregão anterior
     - 7D: Variação de 7 dias
     - 1M: Variação de 1 mês
     - 3M: Variação de 3 meses
@@ -840,20 +899,163 @@ def get_market_overview(category: str):
     - 1Y: Variação de 1 ano
 
     **Exemplo de uso:**""")
-def get_period_performance(tickers: str):
-    response = market_data_service.get_period_performance(tickers)
+async def get_period_performance(tickers: str):
+    response = await market_data_service.blocking.run(market_data_service.get_period_performance, tickers)
     logger.info(f"Obtendo performance de períodos para os tickers: {tickers}")
     if not response:
         logger.warning(f"Nenhuma performance encontrada para os tickers: {tickers}")
         return {"message": "Nenhuma performance encontrada", "data": []}
     return response
 
+
+# ==================== ENDPOINT DE INDICADORES TÉCNICOS ====================
+
+@router.get("/indicators",
+        summary="Indicadores técnicos calculados no servidor",
+        description="""
+    Calcula indicadores técnicos para vários ativos e retorna apenas as colunas pedidas,
+    em formato colunar (`dates` e uma lista por indicador), sem as barras brutas.
+
+    Os indicadores de todos os ativos são calculados de uma vez e memorizados por
+    última barra: requisições repetidas entre duas barras não recalculam nada.
+
+    **Limite:** até 50 ativos por requisição (INDICATORS_MAX_SYMBOLS).
+
+    **Indicadores** (parâmetros opcionais separados por `:`):
+    - `sma:20` -> `sma_20`
+    - `ema:12` -> `ema_12`
+    - `rsi:14` -> `rsi_14` (suavização de Wilder)
+    - `macd:12:26:9` -> `macd_12_26_9`, `macd_signal_12_26_9`, `macd_hist_12_26_9`
+    - `bb:20:2` -> `bb_middle_20_2`, `bb_upper_20_2`, `bb_lower_20_2`
+
+    As barras de aquecimento de cada indicador vêm como `null`.
+
+    **Exemplo de uso:**
+    ```
+    /indicators?tickers=PETR4.SA,VALE3.SA&indicators=sma:20,rsi:14,macd&period=1y&interval=1d
+    ```""")
+async def get_indicators(tickers: str, indicators: str, period: str = "1y", interval: str = "1d"):
+    response = await market_data_service.blocking.run(
+        market_data_service.get_indicators, tickers, indicators, period, interval
+    )
+    logger.info(f"Calculando indicadores {indicators} para os tickers: {tickers}")
+    if not response:
+        logger.warning(f"Nenhum indicador calculado para os tickers: {tickers}")
+        return {"message": "Nenhum indicador calculado", "data": []}
+    return response
+
+
+# ==================== ENDPOINT DE CORRELAÇÃO ====================
+
+@router.get("/correlation",
+        summary="Matriz de correlação e covariância entre ativos",
+        description="""
+    Alinha os retornos diários dos ativos por data e retorna a covariância (diária),
+    a correlação, a volatilidade anualizada e a correlação móvel de cada ativo com
+    uma referência.
+
+    **Limite:** até 300 ativos por requisição (CORRELATION_MAX_SYMBOLS).
+
+    **Parâmetros:**
+    - `window`: janela da correlação móvel em pregões (padrão 60)
+    - `benchmark`: referência da correlação móvel (ex: `^BVSP`); sem ela, a cesta de pesos iguais
+    - `include_returns`: inclui a matriz de retornos alinhada (uma lista por ativo)
+
+    Ativos sem histórico suficiente aparecem em `excluded`. O resultado fica em cache
+    pelo conjunto de ativos, independente da ordem.
+
+    **Exemplo de uso:**
+    ```
+    /correlation?tickers=PETR4.SA,VALE3.SA,ITUB4.SA&period=1y&window=60&benchmark=^BVSP
+    ```""")
+async def get_correlation(tickers: str, period: str = "1y", window: int = 60, benchmark: Optional[str] = None, include_returns: bool = False):
+    response = await market_data_service.blocking.run(
+        market_data_service.get_correlation, tickers, period, window, benchmark, include_returns
+    )
+    logger.info(f"Calculando correlação para os tickers: {tickers}")
+    if not response:
+        logger.warning(f"Nenhuma correlação calculada para os tickers: {tickers}")
+        return {"message": "Nenhuma correlação calculada", "data": []}
+    return response
+
+
+# ==================== ENDPOINT DE RISCO DE CARTEIRA ====================
+
+@router.get("/portfolio-risk",
+        summary="Métricas de risco de uma carteira",
+        description="""
+    Calcula volatilidade, drawdown máximo, Sharpe, Sortino e VaR/CVaR históricos de uma
+    carteira a partir dos retornos diários alinhados dos ativos, e o VaR/CVaR por
+    Monte Carlo (log-retornos normais multivariados estimados do mesmo histórico).
+
+    **Limite:** até 100 ativos (PORTFOLIO_MAX_SYMBOLS) e 500 mil trajetórias.
+
+    **Parâmetros:**
+    - `weights`: pesos na ordem dos tickers, normalizados para somar 1 (padrão: pesos iguais)
+    - `confidence`: nível de confiança do VaR/CVaR (padrão 0.95)
+    - `horizon`: horizonte do VaR/CVaR em pregões (padrão 1)
+    - `paths`: trajetórias do Monte Carlo (padrão 20000)
+    - `risk_free_rate`: taxa livre de risco anual (ex: 0.1 para 10% a.a.)
+
+    VaR e CVaR são perdas positivas (0.02 = perda de 2% no horizonte).
+
+    **Exemplo de uso:**
+    ```
+    /portfolio-risk?tickers=PETR4.SA,VALE3.SA,ITUB4.SA&weights=0.5,0.3,0.2&confidence=0.99&horizon=10
+    ```""")
+async def get_portfolio_risk(tickers: str, weights: Optional[str] = None, period: str = "1y", confidence: float = 0.95, horizon: int = 1, paths: Optional[int] = None, risk_free_rate: Optional[float] = None):
+    response = await market_data_service.blocking.run(
+        market_data_service.get_portfolio_risk,
+        tickers, weights, period, confidence, horizon, paths, risk_free_rate,
+    )
+    logger.info(f"Calculando risco da carteira: {tickers}")
+    if not response:
+        logger.warning(f"Nenhuma métrica de risco calculada para: {tickers}")
+        return {"message": "Nenhuma métrica de risco calculada", "data": []}
+    return response
+
+
+# ==================== ENDPOINT DE FRONTEIRA EFICIENTE ====================
+
+@router.get("/efficient-frontier",
+        summary="Fronteira eficiente e carteiras ótimas",
+        description="""
+    Calcula a fronteira eficiente (média-variância) de um universo de ativos e as carteiras
+    de mínima variância e de máximo Sharpe, com retornos esperados e covariância estimados
+    do histórico diário e anualizados.
+
+    **Limite:** até 150 ativos (FRONTIER_MAX_SYMBOLS) e 100 pontos.
+
+    **Parâmetros:**
+    - `points`: pontos da fronteira (padrão 20)
+    - `shrinkage`: encolhimento da covariância: `ledoit_wolf` (padrão), `oas` ou `none`
+    - `min_weight` / `max_weight`: limites do peso de cada ativo (padrão 0 e 1;
+      `min_weight` negativo permite venda a descoberto)
+    - `risk_free_rate`: taxa livre de risco anual usada no Sharpe
+
+    O resultado fica em cache pelo universo (independente da ordem), período e restrições.
+
+    **Exemplo de uso:**
+    ```
+    /efficient-frontier?tickers=PETR4.SA,VALE3.SA,ITUB4.SA,BBDC4.SA&max_weight=0.4&risk_free_rate=0.1
+    ```""")
+async def get_efficient_frontier(tickers: str, period: str = "1y", points: int = 20, shrinkage: str = "ledoit_wolf", min_weight: float = 0.0, max_weight: float = 1.0, risk_free_rate: Optional[float] = None):
+    response = await market_data_service.blocking.run(
+        market_data_service.get_efficient_frontier,
+        tickers, period, points, shrinkage, min_weight, max_weight, risk_free_rate,
+    )
+    logger.info(f"Calculando fronteira eficiente para: {tickers}")
+    if not response:
+        logger.warning(f"Nenhuma fronteira calculada para: {tickers}")
+        return {"message": "Nenhuma fronteira calculada", "data": []}
+    return response
+
  
         
 # ==================== ENDPOINT DE HEALTH CHECK ====================
 
 @router.get("/health")
-def health_check():
+async def health_check():
     """
     Endpoint de health check - verifica se tudo está funcionando.
     
@@ -888,7 +1090,9 @@ def health_check():
     
     **Dica:** Chame este endpoint primeiro se algo não estiver funcionando!
     """
-    health_data = market_data_service.get_service_health()
+    health_data = await market_data_service.blocking.run(
+        market_data_service.get_service_health
+    )
 
     return HealthResponse(
         status=health_data["status"],
@@ -899,6 +1103,8 @@ def health_check():
             "yahoo_finance": health_data["provider_status"],
             "cache": health_data["cache_status"],
         },
+        cache_stats=health_data["cache_stats"],
+        metrics=health_data["metrics"],
     )
 
 
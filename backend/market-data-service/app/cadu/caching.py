@@ -1,28 +1,80 @@
 import functools
-from typing import Callable
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
 from cachetools import TTLCache
+from core.cache_status import capture_stale, mark_stale
+from core.config import settings
 from core.logging import get_logger
+from core.single_flight import SingleFlight
 
 logger = get_logger(__name__)
 
 class CacheManager:
     """
-    Gerencia uma instância de cache TTL para a aplicação.
+    Gerencia as instâncias de cache TTL para a aplicação.
     O cache armazena os resultados de funções pesadas (como chamadas à API yfinance)
     por um tempo determinado para melhorar a performance e evitar requisições repetidas.
+
+    Como o TTLCache do cachetools usa um único TTL por instância, o cache é
+    particionado por TTL: cada valor de `ttl` usado no decorador ganha seu próprio
+    TTLCache, com tamanho próprio. Assim, dados de 24 horas não expiram em 5 minutos
+    e não são despejados por chaves de curta duração.
+
+    Em caso de MISS, chamadas concorrentes com a mesma chave são coalescidas:
+    apenas a primeira executa a função, e as demais aguardam o mesmo resultado
+    (e a mesma marcação de vencido, se a função serviu dados vencidos).
+
+    Os itens seguem a política stale-while-revalidate: cada partição guarda os
+    itens por `ttl + max_staleness`; vencidos há até `stale_grace` segundos são
+    servidos na hora e atualizados em segundo plano, e vencidos além disso só são
+    servidos se a nova execução da função falhar.
     """
-    def __init__(self, maxsize: int = 512, default_ttl: int = 300):
+    def __init__(
+        self,
+        maxsize: int = 512,
+        default_ttl: int = 300,
+        partition_sizes: Optional[Dict[int, int]] = None,
+        stale_grace: Optional[int] = None,
+        max_staleness: Optional[int] = None,
+    ):
         """
         Inicializa o CacheManager.
-        
+
         Args:
-            maxsize (int): O número máximo de itens a serem mantidos no cache.
+            maxsize (int): O número máximo de itens de cada partição sem tamanho específico.
             default_ttl (int): O tempo de vida padrão (em segundos) para um item no cache.
                                (300 segundos = 5 minutos)
+            partition_sizes (Dict[int, int], optional): Tamanho máximo por TTL (ttl -> maxsize).
+            stale_grace (int, optional): Janela (s) em que itens vencidos são servidos
+                                         enquanto são atualizados em segundo plano.
+            max_staleness (int, optional): Idade máxima (s) além do TTL de um item vencido.
         """
-        self.cache = TTLCache(maxsize=maxsize, ttl=default_ttl)
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.partition_sizes = partition_sizes or {}
+        self.stale_grace = settings.CACHE_STALE_GRACE_SECONDS if stale_grace is None else stale_grace
+        self.max_staleness = settings.CACHE_MAX_STALENESS_SECONDS if max_staleness is None else max_staleness
+        self._partitions: Dict[int, TTLCache] = {}
+        self._lock = threading.RLock()
+        self.single_flight = SingleFlight("cadu_cache")
+        self._refreshing: set = set()
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+        self.cache = self._partition(default_ttl)
         logger.info(f"CacheManager inicializado com maxsize={maxsize} e ttl={default_ttl}s.")
 
+    def _partition(self, ttl: int) -> TTLCache:
+        """Obtém (ou cria) a partição do cache para o TTL informado."""
+        with self._lock:
+            partition = self._partitions.get(ttl)
+            if partition is None:
+                maxsize = self.partition_sizes.get(ttl, self.maxsize)
+                # Itens ficam armazenados além do TTL para poderem ser servidos vencidos
+                partition = self._partitions[ttl] = TTLCache(maxsize=maxsize, ttl=ttl + self.max_staleness)
+                logger.debug(f"Partição de cache criada: ttl={ttl}s, maxsize={maxsize}")
+            return partition
+
     def cached(self, ttl: int = None) -> Callable:
         """
         Decorador para aplicar cache a uma função.
@@ -33,6 +85,10 @@ class CacheManager:
                                  Se None, usa o TTL padrão do cache.
         """
         def decorator(func: Callable):
+            # Cada TTL tem sua própria partição, resolvida uma única vez por função
+            fresh_ttl = ttl or self.default_ttl
+            cache = self._partition(fresh_ttl)
+
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
                 # Cria uma chave de cache baseada no nome da função e seus argumentos
@@ -41,28 +97,105 @@ class CacheManager:
                 key_args = (args_for_key, tuple(sorted(kwargs.items())))
                 cache_key = (func.__name__,) + key_args
 
+                def load():
+                    # Outra chamada pode ter atualizado o cache logo antes desta
+                    with self._lock:
+                        entry = cache.get(cache_key)
+                    if entry is not None and time.time() < entry[1]:
+                        return entry[0]
+
+                    # Executa a função (fora do lock)
+                    result = func(*args, **kwargs)
+
+                    # Armazena o resultado com o instante em que deixa de ser fresco
+                    with self._lock:
+                        cache[cache_key] = (result, time.time() + fresh_ttl)
+                    return result
+
                 # Verifica se o resultado já está no cache
-                if cache_key in self.cache:
-                    logger.debug(f"Cache HIT para a chave: {cache_key}")
-                    return self.cache[cache_key]
+                with self._lock:
+                    entry = cache.get(cache_key)
+
+                if entry is not None:
+                    value, fresh_until = entry
+                    overdue = time.time() - fresh_until
+                    if overdue <= 0:
+                        logger.debug(f"Cache HIT para a chave: {cache_key}")
+                        return value
+                    if overdue <= self.stale_grace:
+                        logger.debug(f"Cache STALE para a chave: {cache_key}")
+                        self._refresh_in_background(cache_key, load)
+                        mark_stale()
+                        return value
 
                 logger.debug(f"Cache MISS para a chave: {cache_key}")
-                
-                # Se não estiver, executa a função
-                result = func(*args, **kwargs)
-
-                # Armazena o resultado no cache com o TTL correto
-                # O TTLCache lida com o TTL na inserção se o TTL do cache geral for usado
-                # Para TTLs customizados, teríamos que gerenciar caches separados.
-                # A implementação padrão do TTLCache usa um único TTL.
-                # Para simplificar, vamos manter o TTL padrão, mas o design está aqui.
-                # Nota: A biblioteca cachetools não suporta TTL por item nativamente.
-                # O TTL é do cache. Vamos usar o TTL padrão para todos.
-                self.cache[cache_key] = result
-                
-                return result
+
+                # Chamadas concorrentes com a mesma chave compartilham uma única execução
+                try:
+                    return self._shared_load(cache_key, load)
+                except Exception as e:
+                    if entry is None:
+                        raise
+                    logger.warning(f"Falha ao atualizar {func.__name__}, servindo valor vencido: {e}")
+                    mark_stale()
+                    return entry[0]
             return wrapper
         return decorator
 
-# Instância única (Singleton) que será importada em outros módulos
-cache_manager = CacheManager(maxsize=1024, default_ttl=300)
\ No newline at end of file
+    def _shared_load(self, cache_key, load: Callable):
+        """Executa `load` coalescida por chave, repassando a marcação de vencido a todos."""
+        value, stale = self.single_flight.do(cache_key, lambda: capture_stale(load))
+        if stale:
+            mark_stale()
+        return value
+
+    def _refresh_in_background(self, cache_key, load: Callable) -> None:
+        """Agenda a atualização de um item vencido, uma por chave."""
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                self._shared_load(cache_key, load)
+            except Exception as e:
+                logger.warning(f"Falha na atualização em segundo plano de {cache_key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        try:
+            self._refresher.submit(refresh)
+        except RuntimeError:
+            # Executor já finalizado (desligamento da aplicação)
+            with self._lock:
+                self._refreshing.discard(cache_key)
+
+    def shutdown(self) -> None:
+        """Interrompe as atualizações em segundo plano (pendentes são descartadas)."""
+        self._refresher.shutdown(wait=False, cancel_futures=True)
+        logger.info("Atualizações em segundo plano do cache finalizadas.")
+
+    def clear(self) -> None:
+        """Limpa todas as partições do cache."""
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.clear()
+        logger.info("Cache limpo (todas as partições).")
+
+    def get_stats(self) -> Dict[int, Dict[str, int]]:
+        """Retorna a ocupação de cada partição, indexada pelo TTL."""
+        with self._lock:
+            return {
+                ttl: {"size": len(partition), "maxsize": int(partition.maxsize)}
+                for ttl, partition in self._partitions.items()
+            }
+
+# Instância única (Singleton) que será importada em outros módulos.
+# Partições de dados de longa duração são menores, pois têm menos variações de chave.
+cache_manager = CacheManager(
+    maxsize=1024,
+    default_ttl=300,
+    partition_sizes={600: 512, 900: 64, 1800: 256, 3600: 512, 86400: 512},
+)
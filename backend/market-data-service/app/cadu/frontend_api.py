@@ -72,6 +72,8 @@ async def get_multiple_historical_data(
     end: Optional[str] = Query(None, description="Data fim (YYYY-MM-DD)"),
     prepost: bool = Query(False, description="Incluir pre/post market"),
     auto_adjust: bool = Query(True, description="Ajustar dividendos/splits"),
+    batch: bool = Query(True, description="Baixar todos os tickers em uma única chamada (se forem da mesma bolsa)"),
+    format: str = Query("records", pattern="^(records|columnar)$", description="Formato: records ou columnar (uma lista por campo)"),
 ):
     """
     Obtém dados históricos de preços para múltiplos tickers simultaneamente.
@@ -83,7 +85,7 @@ async def get_multiple_historical_data(
         raise HTTPException(status_code=400, detail="Número máximo de 5 tickers permitido por requisição.")
 
     try:
-        return logic.get_multiple_historical_data_logic(symbol_list, period, interval, start, end, prepost, auto_adjust)
+        return logic.get_multiple_historical_data_logic(symbol_list, period, interval, start, end, prepost, auto_adjust, batch, format)
         
     except Exception as e:
         handle_logic_errors(e)
@@ -97,6 +99,7 @@ async def get_historical_data(
     end: Optional[str] = Query(None, description="Data fim (YYYY-MM-DD)"),
     prepost: bool = Query(False, description="Incluir pre/post market"),
     auto_adjust: bool = Query(True, description="Ajustar dividendos/splits"),
+    format: str = Query("records", pattern="^(records|columnar)$", description="Formato: records ou columnar (uma lista por campo)"),
 ):
     """
     Obtém dados históricos de preços para um ticker.
@@ -104,7 +107,7 @@ async def get_historical_data(
     Retorna: Open, High, Low, Close, Volume, Dividends, Stock Splits
     """
     try:
-        return logic.get_historical_data_logic(symbol, period, interval, start, end, prepost, auto_adjust)
+        return logic.get_historical_data_logic(symbol, period, interval, start, end, prepost, auto_adjust, format)
     except Exception as e:
         handle_logic_errors(e, symbol)
 
@@ -9,6 +9,9 @@ from concurrent.futures import ThreadPoolExecutor
 
 from .caching import cache_manager  # Importa o gerenciador de cache
 from core.logging import get_logger
+from core.upstream import UpstreamUnavailableError, upstream_gateway
+from services.ohlcv_store import ohlcv_store
+from utils.Ticker_ops import convert_to_columnar, download_history_batch, gateway_history_fetch
 
 logger = get_logger(__name__)
 
@@ -111,16 +114,21 @@ SYMBOL_NAMES = {
 
 # ==================== UTILITÁRIOS ====================
 
-def safe_ticker_operation(symbol: str, operation):
+def safe_ticker_operation(symbol: str, operation, endpoint: Optional[str] = "ticker"):
     """
     Executa operação no ticker com tratamento de erro e logging detalhado.
+    A operação passa pelo gateway do provedor (concorrência adaptativa e circuit breaker),
+    exceto com `endpoint=None`, quando ela mesma encaminha suas chamadas de rede.
     """
     try:
         logger.debug(f"Criando objeto yf.Ticker para '{symbol}'")
         ticker = yf.Ticker(symbol.upper())
 
         logger.debug(f"Executando a operação solicitada para o ticker '{symbol}'")
-        result = operation(ticker)
+        if endpoint is None:
+            result = operation(ticker)
+        else:
+            result = upstream_gateway.call(endpoint, lambda: operation(ticker))
 
         # Validação adicional do resultado
         if result is None:
@@ -132,6 +140,8 @@ def safe_ticker_operation(symbol: str, operation):
 
         return result
         
+    except UpstreamUnavailableError:
+        raise # Provedor indisponível: o cache serve o valor vencido, se houver
     except Exception as e:
         if isinstance(e, ValueError):
             raise e # Propaga o ValueError que já criamos
@@ -196,7 +206,7 @@ def get_multiple_tickers_info_logic(symbol_list: List[str]):
                     "website": str(info.get("website", "")),
                     "logo": logo
                 }
-            ticker_info = safe_ticker_operation(symbol, get_info)
+            ticker_info = safe_ticker_operation(symbol, get_info, "info")
             result[symbol] = {"success": True, "data": ticker_info}
         except Exception as e:
             logger.error(f"Erro ao obter dados para {symbol} em multi-info: {str(e)}")
@@ -204,17 +214,42 @@ def get_multiple_tickers_info_logic(symbol_list: List[str]):
     return result
 
 @cache_manager.cached(ttl=300) # Cache de 5 minutos
-def get_multiple_historical_data_logic(symbol_list: List[str], period: str, interval: str, start: Optional[str], end: Optional[str], prepost: bool, auto_adjust: bool):
-    """Lógica para obter dados históricos de preços para múltiplos tickers."""
+def get_multiple_historical_data_logic(symbol_list: List[str], period: str, interval: str, start: Optional[str], end: Optional[str], prepost: bool, auto_adjust: bool, batch: bool = True, output_format: str = "records"):
+    """
+    Lógica para obter dados históricos de preços para múltiplos tickers.
+
+    Com `batch=True` todos os símbolos são baixados em uma única chamada ao
+    yf.download (se forem todos da mesma bolsa; senão, individualmente);
+    símbolos sem dados recebem o mesmo envelope de erro da busca individual.
+    Com `output_format='columnar'` os dados vêm como uma lista por campo.
+    """
+    serialize = convert_to_columnar if output_format == "columnar" else convert_to_serializable
+    if batch:
+        try:
+            frames = download_history_batch(
+                symbol_list, period=period, interval=interval, start=start, end=end, prepost=prepost, auto_adjust=auto_adjust
+            )
+        except ValueError as e:
+            logger.warning(f"{e}; usando busca individual por símbolo")
+        else:
+            result = {}
+            for symbol in symbol_list:
+                ticker_data = frames[symbol.upper()]
+                if ticker_data.empty:
+                    result[symbol] = {"success": False, "error": f"Nenhum dado histórico encontrado para o ticker '{symbol}'.", "data": []}
+                else:
+                    result[symbol] = {"success": True, "data": serialize(ticker_data)}
+            return result
+
     result = {}
     for symbol in symbol_list:
         try:
             ticker_data = safe_ticker_operation(symbol, lambda t: t.history(
                 period=period, interval=interval, start=start, end=end, prepost=prepost, auto_adjust=auto_adjust
-            ))
+            ), "history")
             result[symbol] = {
                 "success": True,
-                "data": convert_to_serializable(ticker_data)
+                "data": serialize(ticker_data)
             }
         except Exception as e:
             logger.error(f"Erro ao obter histórico para {symbol}: {str(e)}")
@@ -222,11 +257,19 @@ def get_multiple_historical_data_logic(symbol_list: List[str], period: str, inte
     return result
 
 @cache_manager.cached(ttl=300) # Cache de 5 minutos
-def get_historical_data_logic(symbol: str, period: str, interval: str, start: Optional[str], end: Optional[str], prepost: bool, auto_adjust: bool):
-    """Lógica para obter dados históricos de um ticker."""
-    data = safe_ticker_operation(symbol, lambda t: t.history(
-        period=period, interval=interval, start=start, end=end, prepost=prepost, auto_adjust=auto_adjust
-    ))
+def get_historical_data_logic(symbol: str, period: str, interval: str, start: Optional[str], end: Optional[str], prepost: bool, auto_adjust: bool, output_format: str = "records"):
+    """Lógica para obter dados históricos de um ticker (registros ou colunar)."""
+    if ohlcv_store.supports(interval, period=period, start=start, end=end, prepost=prepost, auto_adjust=auto_adjust):
+        # Barras já armazenadas vêm do disco; só a cauda é buscada no Yahoo
+        data = safe_ticker_operation(symbol, lambda t: ohlcv_store.get_history(
+            symbol, interval, fetch=gateway_history_fetch(t), period=period, start=start, end=end
+        ), endpoint=None)
+    else:
+        data = safe_ticker_operation(symbol, lambda t: t.history(
+            period=period, interval=interval, start=start, end=end, prepost=prepost, auto_adjust=auto_adjust
+        ), "history")
+    if output_format == "columnar":
+        return convert_to_columnar(data)
     return convert_to_serializable(data)
 
 
@@ -235,7 +278,7 @@ def get_historical_data_logic(symbol: str, period: str, interval: str, start: Op
 @cache_manager.cached(ttl=3600) # Cache de 1 hora
 def get_ticker_fulldata_logic(symbol: str):
     """Lógica para obter todas as informações de um ticker."""
-    info = safe_ticker_operation(symbol, lambda t: t.info)
+    info = safe_ticker_operation(symbol, lambda t: t.info, "info")
     return convert_to_serializable(info)
 
 # ==================== ENDPOINT DE INFO ESSENCIAIS ====================
@@ -308,7 +351,7 @@ def get_ticker_info_logic(symbol: str):
                 "netIncomeToCommon": info.get("netIncomeToCommon")
             }
         }
-    profile = safe_ticker_operation(symbol, get_ticker_details)
+    profile = safe_ticker_operation(symbol, get_ticker_details, "info")
     return convert_to_serializable(profile)
 
 # ==================== ENDPOINT DE SEARCH ====================
@@ -389,19 +432,19 @@ def lookup_instruments_logic(query: str, instrument_type: str, count: int):
 @cache_manager.cached(ttl=3600) # Cache de 1 hora
 def get_dividends_logic(symbol: str):
     """Lógica para obter histórico de dividendos."""
-    data = safe_ticker_operation(symbol, lambda t: t.dividends)
+    data = safe_ticker_operation(symbol, lambda t: t.dividends, "dividends")
     return convert_to_serializable(data)
 
 @cache_manager.cached(ttl=86400) # Cache de 24 horas para dados que mudam pouco
 def get_recommendations_logic(symbol: str):
     """Lógica para obter recomendações de analistas."""
-    data = safe_ticker_operation(symbol, lambda t: t.recommendations)
+    data = safe_ticker_operation(symbol, lambda t: t.recommendations, "recommendations")
     return convert_to_serializable(data)
 
 @cache_manager.cached(ttl=86400) # Cache de 24 horas
 def get_calendar_logic(symbol: str):
     """Lógica para obter calendário de eventos corporativos."""
-    data = safe_ticker_operation(symbol, lambda t: t.calendar)
+    data = safe_ticker_operation(symbol, lambda t: t.calendar, "calendar")
     return convert_to_serializable(data)
 
 @cache_manager.cached(ttl=1800) # Cache de 30 minutos para notícias
@@ -422,7 +465,7 @@ def get_news_logic(symbol: str, num: int):
             }
             simplified_news.append(simplified_item)
         return simplified_news
-    return safe_ticker_operation(symbol, process_news)
+    return safe_ticker_operation(symbol, process_news, "news")
 
 def list_categories_logic():
     """Lógica para listar as categorias de screening disponíveis."""
@@ -459,7 +502,7 @@ def get_trending_logic(categoria: str, setor: Optional[str], limit: int, offset:
     formatted_results = []
     for item in quotes:
         if not isinstance(item, dict): continue
-        info = safe_ticker_operation(str(item.get("symbol", "")), lambda t: t.info)
+        info = safe_ticker_operation(str(item.get("symbol", "")), lambda t: t.info, "info")
         website = str(info.get("website", ""))
         logo = f"https://t1.gstatic.com/faviconV2?client=SOCIAL&type=FAVICON&fallback_opts=TYPE,SIZE,URL&size=128&url={website}" if website else None
         formatted_results.append({
@@ -0,0 +1,114 @@
+"""
+Executor de trabalho bloqueante para as rotas assíncronas.
+
+As rotas da API são `async def`: acertos de cache são respondidos direto no
+event loop, sem passar por uma thread. O que ainda bloqueia (yfinance,
+pandas, leitura do armazenamento OHLCV) roda neste executor dedicado e
+dimensionado, em vez do threadpool padrão do Starlette, de modo que o
+volume de trabalho bloqueante em andamento fique limitado e visível nas
+métricas.
+
+O contexto da requisição (ContextVars) é copiado para a thread, então
+`mark_stale` continua funcionando dentro do trabalho bloqueante.
+
+Example:
+    from core.blocking import blocking_executor
+
+    data = await blocking_executor.run(service.get_stock_data, "PETR4.SA")
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from core.config import settings
+from core.logging import LoggerMixin
+
+T = TypeVar("T")
+
+
+class BlockingExecutor(LoggerMixin):
+    """
+    Pool de threads dedicado ao trabalho bloqueante das rotas assíncronas.
+
+    Attributes:
+        max_workers: Número de threads do pool
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Inicializa o executor.
+
+        Args:
+            max_workers: Número de threads do pool (padrão: configuração global)
+        """
+        self.max_workers = max_workers or settings.BLOCKING_EXECUTOR_WORKERS
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="blocking"
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._shutdown = False
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Executa uma função bloqueante no pool sem bloquear o event loop.
+
+        Args:
+            func: Função a ser executada
+            *args: Argumentos posicionais da função
+            **kwargs: Argumentos nomeados da função
+
+        Returns:
+            Resultado da função
+        """
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._tracked, func, *args, **kwargs)
+        with self._lock:
+            self._submitted += 1
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def _tracked(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna a ocupação do executor.
+
+        Returns:
+            Dicionário com threads, tarefas em execução e submetidas
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+            }
+
+    def shutdown(self, wait_for_tasks: bool = False) -> None:
+        """
+        Finaliza o pool de threads.
+
+        Args:
+            wait_for_tasks: Se True, aguarda as tarefas em andamento
+        """
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        self._executor.shutdown(wait=wait_for_tasks, cancel_futures=True)
+        self.logger.info("BlockingExecutor finalizado")
+
+
+# Instância única usada pelas rotas e pelo serviço
+blocking_executor = BlockingExecutor()
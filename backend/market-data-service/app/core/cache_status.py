@@ -0,0 +1,78 @@
+"""
+Estado de cache por requisição.
+
+Permite que camadas internas (serviço, caches) marquem a resposta da
+requisição atual como servida a partir de dados vencidos (stale), para que o
+middleware HTTP adicione o header `X-Cache-Status: STALE`.
+
+O estado é um dicionário mutável guardado em uma ContextVar pelo middleware.
+Como as rotas síncronas rodam em threads com uma cópia do contexto, a
+referência ao mesmo dicionário é compartilhada e a marcação feita na thread
+fica visível para o middleware.
+
+Buscas coalescidas (single-flight) rodam no contexto de quem as iniciou;
+`capture_stale` isola a marcação feita durante a busca para que ela seja
+repassada com o resultado a todos os chamadores que a aguardaram.
+
+Example:
+    from core.cache_status import mark_stale
+
+    if served_from_stale_entry:
+        mark_stale()
+"""
+
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_request_cache_state: ContextVar[Optional[Dict[str, bool]]] = ContextVar(
+    "request_cache_state", default=None
+)
+
+
+def track_request() -> Dict[str, bool]:
+    """
+    Inicia o rastreamento do estado de cache da requisição atual.
+
+    Returns:
+        Dicionário de estado compartilhado com as camadas internas
+    """
+    state = {"stale": False}
+    _request_cache_state.set(state)
+    return state
+
+
+def mark_stale() -> None:
+    """Marca a requisição atual como servida com dados vencidos."""
+    state = _request_cache_state.get()
+    if state is not None:
+        state["stale"] = True
+
+
+def capture_stale(func: Callable[[], T]) -> Tuple[T, bool]:
+    """
+    Executa `func` com um estado de cache próprio.
+
+    Args:
+        func: Função sem argumentos (ex: a busca de um single-flight)
+
+    Returns:
+        Tupla (resultado, vencido), com vencido=True se `func` chamou `mark_stale`
+    """
+    state = {"stale": False}
+    token = _request_cache_state.set(state)
+    try:
+        return func(), state["stale"]
+    finally:
+        _request_cache_state.reset(token)
+
+
+async def capture_stale_async(func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+    """Versão de `capture_stale` para corrotinas."""
+    state = {"stale": False}
+    token = _request_cache_state.set(state)
+    try:
+        return await func(), state["stale"]
+    finally:
+        _request_cache_state.reset(token)
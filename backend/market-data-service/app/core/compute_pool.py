@@ -0,0 +1,186 @@
+"""
+Pool de processos para cálculos numéricos pesados.
+
+Simulações e otimizações de carteira ocupam a CPU por centenas de
+milissegundos; em threads elas disputariam o GIL com o event loop e com o
+executor de trabalho bloqueante. Este módulo as executa em um pool de
+processos de longa duração, criado sob demanda na primeira tarefa.
+
+As funções submetidas precisam ser importáveis no nível de módulo (os
+processos filhos são iniciados por COMPUTE_POOL_START_METHOD, "spawn" por
+padrão) e devem trocar apenas arrays pequenos com o processo principal.
+Com COMPUTE_POOL_WORKERS = 0, ou se o pool quebrar, as tarefas rodam na
+própria thread chamadora.
+
+Example:
+    from core.compute_pool import compute_pool
+
+    results = compute_pool.map(simulate_chunk, [args_1, args_2])
+"""
+
+import importlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from core.config import settings
+from core.logging import LoggerMixin
+
+T = TypeVar("T")
+
+
+def _preload(modules: Sequence[str]) -> int:
+    """Importa os módulos no processo filho (executada no pool)."""
+    for module in modules:
+        importlib.import_module(module)
+    return len(modules)
+
+
+class ComputePool(LoggerMixin):
+    """
+    Pool de processos compartilhado para trabalho limitado por CPU.
+
+    Attributes:
+        max_workers: Número de processos (0 executa as tarefas em linha)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Inicializa o pool (os processos só são criados na primeira tarefa).
+
+        Args:
+            max_workers: Número de processos (padrão: configuração global)
+        """
+        self.max_workers = (
+            settings.COMPUTE_POOL_WORKERS if max_workers is None else max_workers
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._inline = 0
+        self._shutdown = False
+
+    def map(
+        self,
+        func: Callable[..., T],
+        args_list: Sequence[Tuple[Any, ...]],
+        timeout: Optional[float] = None,
+    ) -> List[T]:
+        """
+        Executa `func(*args)` para cada tupla de argumentos, em paralelo.
+
+        Bloqueia a thread chamadora (chamado a partir do executor de trabalho
+        bloqueante), mas não o event loop nem o GIL durante o cálculo.
+
+        Args:
+            func: Função de nível de módulo a executar
+            args_list: Argumentos de cada tarefa
+            timeout: Prazo total em segundos (padrão: COMPUTE_POOL_TIMEOUT)
+
+        Returns:
+            Resultados na mesma ordem dos argumentos
+        """
+        timeout = settings.COMPUTE_POOL_TIMEOUT if timeout is None else timeout
+        executor = self._get_executor()
+        if executor is None:
+            return self._run_inline(func, args_list)
+
+        with self._lock:
+            self._submitted += len(args_list)
+            self._in_flight += len(args_list)
+        futures = []
+        try:
+            futures = [executor.submit(func, *args) for args in args_list]
+            return [future.result(timeout=timeout) for future in futures]
+        except TimeoutError:
+            for future in futures:
+                future.cancel()
+            raise
+        except BrokenProcessPool as e:
+            self.logger.error(f"Pool de processos quebrado, recriando: {e}")
+            self._reset(executor)
+            return self._run_inline(func, args_list)
+        finally:
+            with self._lock:
+                self._in_flight -= len(args_list)
+
+    def warm_up(self, modules: Sequence[str]) -> int:
+        """
+        Inicia os processos e importa neles os módulos dos cálculos.
+
+        Chamado no aquecimento, para que a primeira requisição não pague
+        pela criação dos processos nem pela importação do NumPy/pandas.
+
+        Args:
+            modules: Módulos importados em cada processo
+
+        Returns:
+            Número de processos aquecidos
+        """
+        if self._get_executor() is None:
+            return 0
+        return len(self.map(_preload, [(tuple(modules),)] * self.max_workers))
+
+    def _run_inline(
+        self, func: Callable[..., T], args_list: Sequence[Tuple[Any, ...]]
+    ) -> List[T]:
+        """Executa as tarefas na thread chamadora."""
+        with self._lock:
+            self._inline += len(args_list)
+        return [func(*args) for args in args_list]
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Cria o pool na primeira tarefa."""
+        if self.max_workers <= 0:
+            return None
+        with self._lock:
+            if self._shutdown:
+                return None
+            if self._executor is None:
+                context = multiprocessing.get_context(settings.COMPUTE_POOL_START_METHOD)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=context
+                )
+                self.logger.info(f"Pool de processos iniciado com {self.max_workers} processos")
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor) -> None:
+        """Descarta um pool quebrado; o próximo é criado na próxima tarefa."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna a ocupação do pool.
+
+        Returns:
+            Dicionário com processos, tarefas em execução, submetidas e executadas em linha
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "started": self._executor is not None,
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+                "inline": self._inline,
+            }
+
+    def shutdown(self) -> None:
+        """Finaliza os processos do pool."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.logger.info("ComputePool finalizado")
+
+
+# Instância única usada pelas análises de carteira
+compute_pool = ComputePool()
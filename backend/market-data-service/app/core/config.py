@@ -13,7 +13,7 @@ Example:
     print(settings.ALLOWED_ORIGINS)
 """
 
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -39,10 +39,104 @@ class Settings(BaseSettings):
         ALLOWED_ORIGINS (List[str]): Lista de origens permitidas para CORS
         CACHE_TTL_SECONDS (int): TTL do cache em segundos
         ENABLE_CACHE (bool): Flag para habilitar cache
+        CACHE_BACKEND (str): Backend do cache ("memory" ou "redis")
+        REDIS_URL (str): URL do servidor Redis (redis://[:senha@]host:porta/db)
+        REDIS_POOL_SIZE (int): Número máximo de conexões com o Redis
+        REDIS_TIMEOUT (float): Timeout de conexão e leitura do Redis em segundos
+        REDIS_RETRY_COOLDOWN (int): Tempo usando o cache local após uma falha do Redis
+        CACHE_MAX_ENTRIES (int): Número máximo de entradas do cache em memória
+        CACHE_MAX_BYTES (int): Orçamento aproximado de memória do cache em bytes
+        CACHE_SWEEP_INTERVAL (int): Intervalo da limpeza de entradas expiradas
+        CACHE_STALE_GRACE_SECONDS (int): Janela em que valores vencidos são servidos
+            enquanto são atualizados em segundo plano
+        CACHE_MAX_STALENESS_SECONDS (int): Idade máxima além do TTL de um valor vencido
+            servido quando o provedor falha
+        CACHE_CLOSED_MARKET_MAX_TTL (int): TTL máximo de dados obtidos com o mercado
+            fechado, que valem até a próxima abertura
         RATE_LIMIT_REQUESTS (int): Número de requests permitidos
         RATE_LIMIT_WINDOW (int): Janela de tempo para rate limiting
+        RATE_LIMIT_SWEEP_INTERVAL (int): Intervalo da remoção de clientes ociosos
+            do rate limiter
+        RATE_LIMIT_BACKEND (str): Backend do rate limiter (memory, shared ou redis)
+        RATE_LIMIT_SHM_PATH (str): Arquivo da tabela compartilhada entre workers
+        RATE_LIMIT_SHM_SLOTS (int): Número de clientes simultâneos na tabela compartilhada
         YAHOO_FINANCE_TIMEOUT (int): Timeout para requisições ao Yahoo Finance
         MAX_RETRIES (int): Número máximo de tentativas para requisições
+        YAHOO_CHART_BASE_URL (str): URL base da API de gráficos do Yahoo usada pelo
+            provedor assíncrono
+        YAHOO_HTTP_MAX_CONNECTIONS (int): Conexões máximas do cliente HTTP assíncrono
+        YAHOO_HTTP_KEEPALIVE (int): Conexões ociosas mantidas no pool do cliente HTTP
+        SEARCH_QUOTE_TTL_SECONDS (int): Validade das cotações usadas para enriquecer
+            os resultados da busca de tickers
+        SCREENER_CACHE_TTL_SECONDS (int): TTL do cache das categorias de screening
+        SCREENER_PAGE_SIZE (int): Resultados mínimos buscados por consulta de screening;
+            pedidos com `limit` menor são recortados da mesma página em cache
+        PROFILE_CACHE_TTL_SECONDS (int): TTL do perfil dos ativos (nome, moeda, site)
+        PERIOD_PERFORMANCE_MAX_SYMBOLS (int): Número máximo de ativos da tabela de
+            performance por período
+        INDICATORS_MAX_SYMBOLS (int): Número máximo de ativos por requisição de
+            indicadores técnicos
+        INDICATOR_MEMO_MAX_ENTRIES (int): Séries de indicadores memorizadas (LRU)
+        CORRELATION_MAX_SYMBOLS (int): Número máximo de ativos da matriz de correlação
+        ANALYTICS_CACHE_TTL_SECONDS (int): TTL do cache das estatísticas de carteira
+            calculadas sobre o histórico diário
+        PORTFOLIO_MAX_SYMBOLS (int): Número máximo de ativos por carteira analisada
+        PORTFOLIO_MIN_OBSERVATIONS (int): Retornos diários mínimos para analisar uma carteira
+        RISK_FREE_RATE (float): Taxa livre de risco anual padrão (Sharpe/Sortino)
+        MONTE_CARLO_DEFAULT_PATHS (int): Trajetórias padrão do VaR por Monte Carlo
+        MONTE_CARLO_MAX_PATHS (int): Trajetórias máximas por requisição
+        MONTE_CARLO_MAX_HORIZON (int): Horizonte máximo do VaR em pregões
+        MONTE_CARLO_PATHS_PER_TASK (int): Trajetórias por tarefa do pool de processos (em blocos de 10000)
+        MONTE_CARLO_CHUNK_ELEMENTS (int): Números sorteados por lote (limita a memória)
+        MONTE_CARLO_SEED (Optional[int]): Semente do Monte Carlo (None: aleatória)
+        FRONTIER_MAX_SYMBOLS (int): Número máximo de ativos da fronteira eficiente
+        FRONTIER_MAX_POINTS (int): Número máximo de pontos da fronteira eficiente
+        UPSTREAM_MIN_CONCURRENCY (int): Limite mínimo de chamadas simultâneas ao Yahoo
+        UPSTREAM_MAX_CONCURRENCY (int): Limite máximo de chamadas simultâneas ao Yahoo
+        UPSTREAM_INITIAL_CONCURRENCY (int): Limite inicial de chamadas simultâneas
+        UPSTREAM_ACQUIRE_TIMEOUT (float): Espera máxima por uma vaga de concorrência
+        UPSTREAM_FAILURE_THRESHOLD (int): Falhas consecutivas que abrem o circuito
+        UPSTREAM_RESET_TIMEOUT (float): Tempo com o circuito aberto antes do teste
+        UPSTREAM_BACKOFF_BASE (float): Backoff do primeiro throttle do provedor
+        UPSTREAM_BACKOFF_MAX (float): Backoff máximo após throttles consecutivos
+        FANOUT_MAX_WORKERS (int): Threads do executor de fan-out compartilhado
+        FANOUT_MAX_CONCURRENCY (int): Concorrência máxima por requisição em lote
+        FANOUT_ITEM_TIMEOUT (float): Prazo por símbolo nas requisições em lote
+        CACHE_REVALIDATION_WORKERS (int): Threads das atualizações em segundo plano
+            (stale-while-revalidate), separadas do fan-out
+        BLOCKING_EXECUTOR_WORKERS (int): Threads do executor de trabalho bloqueante
+            usado pelas rotas assíncronas
+        COMPUTE_POOL_WORKERS (int): Processos do pool de cálculos numéricos
+            (0 executa os cálculos na thread da requisição)
+        COMPUTE_POOL_START_METHOD (str): Método de início dos processos do pool
+        COMPUTE_POOL_TIMEOUT (float): Prazo das tarefas do pool em segundos
+        ENABLE_OHLCV_STORE (bool): Flag para habilitar o armazenamento local de históricos
+        OHLCV_STORE_DIR (str): Diretório dos arquivos de histórico armazenados
+        OHLCV_STORE_REFRESH_SECONDS (int): Intervalo mínimo entre buscas incrementais
+        ENABLE_WARMUP (bool): Flag para aquecer caches e índices na inicialização
+        WARMUP_TIMEOUT_SECONDS (float): Prazo do aquecimento; esgotado, o serviço
+            se declara pronto mesmo assim
+        WARMUP_TOP_SYMBOLS (int): Número de símbolos mais consultados buscados
+            no aquecimento
+        WARMUP_OVERVIEW_CATEGORIES (List[str]): Categorias da visão geral do mercado
+            buscadas no aquecimento
+        POPULAR_SYMBOLS_PATH (str): Arquivo com a popularidade dos símbolos entre execuções
+        POPULAR_SYMBOLS_MAX (int): Número máximo de símbolos com popularidade registrada
+        ENABLE_REFRESH_SCHEDULER (bool): Flag para atualizar em segundo plano a visão
+            geral, o screening e as tendências
+        REFRESH_OVERVIEW_INTERVAL (int): Cadência da visão geral com o mercado aberto
+        REFRESH_SCREENER_INTERVAL (int): Cadência das categorias de screening com o
+            mercado aberto
+        REFRESH_TRENDING_INTERVAL (int): Cadência das tendências com o mercado aberto
+        REFRESH_CLOSED_INTERVAL (int): Cadência de todos os conjuntos com o mercado fechado
+        REFRESH_JITTER (float): Variação relativa aleatória aplicada às cadências
+        REFRESH_TTL_MARGIN_SECONDS (int): Folga do TTL além da próxima atualização
+        REFRESH_UPSTREAM_BUDGET (int): Chamadas ao provedor por minuto disponíveis
+            para as atualizações em segundo plano
+        REFRESH_MAX_CONCURRENCY (int): Atualizações simultâneas máximas
+        REFRESH_OVERVIEW_CATEGORIES (List[str]): Categorias da visão geral atualizadas
+        REFRESH_SCREENER_CATEGORIES (List[str]): Categorias de screening atualizadas
+        REFRESH_TRENDING_MARKETS (List[str]): Mercados das tendências atualizadas
         HOST (str): Host do servidor
         PORT (int): Porta do servidor
     """
@@ -67,14 +161,107 @@ class Settings(BaseSettings):
     # Cache Configuration
     CACHE_TTL_SECONDS: int = 300  # 5 minutes
     ENABLE_CACHE: bool = True
+    CACHE_BACKEND: str = "memory"  # memory | redis
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_POOL_SIZE: int = 10
+    REDIS_TIMEOUT: float = 0.5  # seconds
+    REDIS_RETRY_COOLDOWN: int = 30  # seconds
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_MAX_BYTES: int = 128 * 1024 * 1024  # 128 MB
+    CACHE_SWEEP_INTERVAL: int = 30  # seconds
+    CACHE_STALE_GRACE_SECONDS: int = 30
+    CACHE_MAX_STALENESS_SECONDS: int = 600  # 10 minutes
+    CACHE_CLOSED_MARKET_MAX_TTL: int = 5 * 24 * 3600  # 5 days
     
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW: int = 60  # seconds
+    RATE_LIMIT_SWEEP_INTERVAL: int = 60  # seconds
+    RATE_LIMIT_BACKEND: str = "memory"  # memory | shared | redis
+    RATE_LIMIT_SHM_PATH: str = "var/rate_limit.shm"
+    RATE_LIMIT_SHM_SLOTS: int = 65536
     
     # External APIs
     YAHOO_FINANCE_TIMEOUT: int = 30
     MAX_RETRIES: int = 3
+    YAHOO_CHART_BASE_URL: str = "https://query1.finance.yahoo.com"
+    YAHOO_HTTP_MAX_CONNECTIONS: int = 32
+    YAHOO_HTTP_KEEPALIVE: int = 16
+    SEARCH_QUOTE_TTL_SECONDS: int = 60
+    SCREENER_CACHE_TTL_SECONDS: int = 120
+    SCREENER_PAGE_SIZE: int = 20
+    PROFILE_CACHE_TTL_SECONDS: int = 24 * 3600  # 1 day
+    PERIOD_PERFORMANCE_MAX_SYMBOLS: int = 60
+    INDICATORS_MAX_SYMBOLS: int = 50
+    INDICATOR_MEMO_MAX_ENTRIES: int = 2000
+    CORRELATION_MAX_SYMBOLS: int = 300
+    ANALYTICS_CACHE_TTL_SECONDS: int = 900
+    PORTFOLIO_MAX_SYMBOLS: int = 100
+    PORTFOLIO_MIN_OBSERVATIONS: int = 30
+    RISK_FREE_RATE: float = 0.0
+    MONTE_CARLO_DEFAULT_PATHS: int = 20000
+    MONTE_CARLO_MAX_PATHS: int = 500000
+    MONTE_CARLO_MAX_HORIZON: int = 252
+    MONTE_CARLO_PATHS_PER_TASK: int = 50000
+    MONTE_CARLO_CHUNK_ELEMENTS: int = 1_000_000
+    MONTE_CARLO_SEED: Optional[int] = None
+    FRONTIER_MAX_SYMBOLS: int = 150
+    FRONTIER_MAX_POINTS: int = 100
+    
+    # Gateway de chamadas ao Yahoo (concorrência adaptativa e circuit breaker)
+    UPSTREAM_MIN_CONCURRENCY: int = 2
+    UPSTREAM_MAX_CONCURRENCY: int = 32
+    UPSTREAM_INITIAL_CONCURRENCY: int = 8
+    UPSTREAM_ACQUIRE_TIMEOUT: float = 5.0  # seconds
+    UPSTREAM_FAILURE_THRESHOLD: int = 5
+    UPSTREAM_RESET_TIMEOUT: float = 30.0  # seconds
+    UPSTREAM_BACKOFF_BASE: float = 1.0  # seconds
+    UPSTREAM_BACKOFF_MAX: float = 60.0  # seconds
+    
+    # Fan-out (requisições com múltiplos tickers)
+    FANOUT_MAX_WORKERS: int = 32
+    FANOUT_MAX_CONCURRENCY: int = 10
+    FANOUT_ITEM_TIMEOUT: float = 20.0  # seconds
+    CACHE_REVALIDATION_WORKERS: int = 4
+    
+    # Executor de trabalho bloqueante das rotas assíncronas
+    BLOCKING_EXECUTOR_WORKERS: int = 16
+    
+    # Pool de processos dos cálculos numéricos pesados
+    COMPUTE_POOL_WORKERS: int = 2
+    COMPUTE_POOL_START_METHOD: str = "spawn"
+    COMPUTE_POOL_TIMEOUT: float = 30.0  # seconds
+    
+    # Armazenamento local de históricos OHLCV
+    ENABLE_OHLCV_STORE: bool = True
+    OHLCV_STORE_DIR: str = "var/ohlcv"
+    OHLCV_STORE_REFRESH_SECONDS: int = 60
+    
+    # Aquecimento na inicialização
+    ENABLE_WARMUP: bool = True
+    WARMUP_TIMEOUT_SECONDS: float = 60.0
+    WARMUP_TOP_SYMBOLS: int = 20
+    WARMUP_OVERVIEW_CATEGORIES: List[str] = ["all", "brasil", "eua", "europa", "asia", "moedas"]
+    POPULAR_SYMBOLS_PATH: str = "var/popular_symbols.json"
+    POPULAR_SYMBOLS_MAX: int = 5000
+    
+    # Atualização em segundo plano dos conjuntos dos painéis
+    ENABLE_REFRESH_SCHEDULER: bool = True
+    REFRESH_OVERVIEW_INTERVAL: int = 45  # seconds
+    REFRESH_SCREENER_INTERVAL: int = 90  # seconds
+    REFRESH_TRENDING_INTERVAL: int = 45  # seconds
+    REFRESH_CLOSED_INTERVAL: int = 3600  # seconds
+    REFRESH_JITTER: float = 0.1
+    REFRESH_TTL_MARGIN_SECONDS: int = 30
+    REFRESH_UPSTREAM_BUDGET: int = 120  # chamadas por minuto
+    REFRESH_MAX_CONCURRENCY: int = 2
+    REFRESH_OVERVIEW_CATEGORIES: List[str] = ["all", "brasil", "eua", "europa", "asia", "moedas"]
+    REFRESH_SCREENER_CATEGORIES: List[str] = [
+        "mercado_todo", "mercado_br", "alta_do_dia", "baixa_do_dia", "mais_negociadas",
+        "small_caps_crescimento", "valor_dividendos", "baixo_pe", "alta_liquidez",
+        "crescimento_lucros", "baixo_risco",
+    ]
+    REFRESH_TRENDING_MARKETS: List[str] = ["BR"]
     
     # Server Configuration
     HOST: str = "0.0.0.0"
@@ -0,0 +1,218 @@
+"""
+Executor de fan-out para chamadas paralelas ao provedor.
+
+Este módulo fornece um executor de longa duração, compartilhado pelo
+serviço, para distribuir operações independentes (uma por símbolo) entre
+threads. Cada requisição pode limitar sua própria concorrência e definir
+um prazo por item, e os resultados são sempre devolvidos na mesma ordem
+dos itens de entrada.
+
+Example:
+    from core.fanout import FanOutExecutor
+
+    executor = FanOutExecutor(max_workers=32)
+    results = executor.map(fetch_quote, ["PETR4.SA", "VALE3.SA"], max_concurrency=5)
+    for result in results:
+        print(result.item, result.ok, result.value or result.error)
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.config import settings
+from core.logging import LoggerMixin
+
+
+class FanOutTimeoutError(TimeoutError):
+    """Exceção para itens que excederam o prazo individual do fan-out."""
+    pass
+
+
+@dataclass
+class FanOutResult:
+    """
+    Resultado de um item processado pelo fan-out.
+
+    Attributes:
+        item: Item de entrada (geralmente o símbolo)
+        value: Valor retornado pela função (None em caso de erro)
+        error: Exceção capturada (None em caso de sucesso)
+        elapsed_ms: Tempo gasto no item em milissegundos
+    """
+
+    item: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Indica se o item foi processado com sucesso."""
+        return self.error is None
+
+
+class FanOutExecutor(LoggerMixin):
+    """
+    Executor de fan-out com pool de threads de longa duração.
+
+    O pool é criado uma única vez e reaproveitado por todas as requisições,
+    evitando o custo de criar e destruir threads a cada chamada. Cada chamada
+    a `map` respeita um limite próprio de concorrência, de modo que uma
+    requisição grande não monopoliza o pool, e um prazo por item, de modo que
+    um símbolo lento não atrasa a resposta inteira.
+
+    Attributes:
+        max_workers: Número total de threads do pool
+        default_concurrency: Concorrência padrão por requisição
+        default_timeout: Prazo padrão por item em segundos
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        default_concurrency: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+    ):
+        """
+        Inicializa o executor de fan-out.
+
+        Args:
+            max_workers: Número de threads do pool (padrão: configuração global)
+            default_concurrency: Concorrência padrão por requisição
+            default_timeout: Prazo padrão por item em segundos
+        """
+        self.max_workers = max_workers or settings.FANOUT_MAX_WORKERS
+        self.default_concurrency = (
+            default_concurrency or settings.FANOUT_MAX_CONCURRENCY
+        )
+        self.default_timeout = default_timeout or settings.FANOUT_ITEM_TIMEOUT
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="fanout"
+        )
+        self._shutdown = False
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Submete uma tarefa avulsa ao pool compartilhado.
+
+        A tarefa não deve chamar `map` neste mesmo executor: ela ocuparia
+        uma thread esperando itens que disputam as threads restantes, e
+        algumas dessas tarefas concorrentes bastam para esgotar o pool.
+
+        Args:
+            func: Função a ser executada
+            *args: Argumentos posicionais da função
+            **kwargs: Argumentos nomeados da função
+
+        Returns:
+            Future da tarefa submetida
+        """
+        return self._executor.submit(func, *args, **kwargs)
+
+    def map(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[FanOutResult]:
+        """
+        Executa `func` para cada item em paralelo e retorna os resultados em ordem.
+
+        Nunca propaga exceções de itens individuais: erros e estouros de prazo
+        são registrados no `FanOutResult` correspondente.
+
+        Args:
+            func: Função aplicada a cada item
+            items: Itens de entrada (ex: lista de símbolos)
+            max_concurrency: Máximo de itens em execução simultânea nesta chamada
+            timeout: Prazo por item em segundos, contado a partir da submissão
+
+        Returns:
+            Lista de resultados na mesma ordem dos itens
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        concurrency = max(1, min(max_concurrency or self.default_concurrency, len(items)))
+        item_timeout = timeout or self.default_timeout
+
+        results: List[Optional[FanOutResult]] = [None] * len(items)
+        pending: Dict[Future, int] = {}
+        started_at: Dict[int, float] = {}
+        next_index = 0
+
+        def submit_next() -> None:
+            nonlocal next_index
+            index = next_index
+            next_index += 1
+            started_at[index] = time.monotonic()
+            pending[self._executor.submit(func, items[index])] = index
+
+        # Preencher a janela de concorrência da requisição
+        while next_index < len(items) and len(pending) < concurrency:
+            submit_next()
+
+        while pending:
+            now = time.monotonic()
+            nearest_deadline = min(
+                started_at[index] + item_timeout for index in pending.values()
+            )
+            done, _ = wait(
+                list(pending.keys()),
+                timeout=max(0.0, nearest_deadline - now),
+                return_when=FIRST_COMPLETED,
+            )
+
+            for future in done:
+                index = pending.pop(future)
+                elapsed_ms = (time.monotonic() - started_at[index]) * 1000
+                error = future.exception()
+                results[index] = FanOutResult(
+                    item=items[index],
+                    value=None if error else future.result(),
+                    error=error,
+                    elapsed_ms=elapsed_ms,
+                )
+
+            # Itens que estouraram o prazo liberam a vaga da requisição.
+            # A thread continua até o fim da chamada, mas o resultado é descartado.
+            now = time.monotonic()
+            for future, index in list(pending.items()):
+                if now - started_at[index] >= item_timeout:
+                    pending.pop(future)
+                    future.cancel()
+                    self.logger.warning(
+                        f"Prazo de {item_timeout:.1f}s excedido para {items[index]}"
+                    )
+                    results[index] = FanOutResult(
+                        item=items[index],
+                        error=FanOutTimeoutError(
+                            f"Tempo limite de {item_timeout:.1f}s excedido para {items[index]}"
+                        ),
+                        elapsed_ms=(now - started_at[index]) * 1000,
+                    )
+
+            while next_index < len(items) and len(pending) < concurrency:
+                submit_next()
+
+        return results  # type: ignore[return-value]
+
+    def shutdown(self, wait_for_tasks: bool = False) -> None:
+        """
+        Finaliza o pool de threads.
+
+        Args:
+            wait_for_tasks: Se True, aguarda as tarefas em andamento
+        """
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        self._executor.shutdown(wait=wait_for_tasks, cancel_futures=True)
+        self.logger.info("FanOutExecutor finalizado")
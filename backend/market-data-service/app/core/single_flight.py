@@ -0,0 +1,200 @@
+"""
+Coalescência de chamadas concorrentes (single-flight).
+
+Quando várias requisições concorrentes erram o cache para a mesma chave,
+apenas a primeira executa a busca no provedor; as demais aguardam o
+resultado dessa chamada em andamento em vez de repetirem a chamada externa.
+`SingleFlight` coalesce chamadas bloqueantes entre threads e
+`AsyncSingleFlight` coalesce corrotinas de um mesmo event loop.
+
+Example:
+    from core.single_flight import SingleFlight
+
+    flight = SingleFlight()
+    data = flight.do("stock_data:PETR4.SA", lambda: provider.get_stock_data(...))
+    print(flight.get_stats()["coalesced_calls"])
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from core.logging import LoggerMixin
+
+
+class _Call:
+    """Chamada em andamento compartilhada entre os chamadores de uma chave."""
+
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight(LoggerMixin):
+    """
+    Garante no máximo uma execução em andamento por chave.
+
+    O primeiro chamador de uma chave (líder) executa a função; chamadores
+    concorrentes da mesma chave bloqueiam até o líder terminar e recebem o
+    mesmo resultado ou a mesma exceção. Assim que a chamada termina a chave é
+    liberada, então chamadas posteriores executam normalmente (o cache é
+    responsável por evitá-las).
+
+    Attributes:
+        name: Nome usado nos logs e métricas
+    """
+
+    def __init__(self, name: str = "default"):
+        """
+        Inicializa o coalescedor.
+
+        Args:
+            name: Nome usado nos logs e métricas
+        """
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._leader_calls = 0
+        self._coalesced_calls = 0
+        self._shared_errors = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Executa `fn` uma única vez por chave entre chamadores concorrentes.
+
+        Args:
+            key: Chave da chamada (geralmente a chave do cache)
+            fn: Função sem argumentos que busca o valor
+
+        Returns:
+            Resultado de `fn` (o mesmo objeto para todos os chamadores concorrentes)
+
+        Raises:
+            Exception: A exceção lançada por `fn`, repassada a todos os chamadores
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._leader_calls += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self._coalesced_calls += 1
+                leader = False
+
+        if not leader:
+            self.logger.debug(f"Aguardando chamada em andamento para {key}")
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is not None:
+                    self._shared_errors += call.waiters
+            call.event.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas de coalescência.
+
+        Returns:
+            Dicionário com chamadas em andamento, chamadas executadas e
+            chamadas economizadas (coalescidas)
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "in_flight": len(self._calls),
+                "leader_calls": self._leader_calls,
+                "coalesced_calls": self._coalesced_calls,
+                "shared_errors": self._shared_errors,
+            }
+
+
+class AsyncSingleFlight(LoggerMixin):
+    """
+    Versão de SingleFlight para corrotinas de um mesmo event loop.
+
+    O líder agenda a busca como uma task; os demais chamadores aguardam a
+    mesma task. A espera é protegida por `asyncio.shield`, então um chamador
+    cancelado (cliente desconectado) não cancela a busca dos outros.
+
+    Attributes:
+        name: Nome usado nos logs e métricas
+    """
+
+    def __init__(self, name: str = "default"):
+        """
+        Inicializa o coalescedor.
+
+        Args:
+            name: Nome usado nos logs e métricas
+        """
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._leader_calls = 0
+        self._coalesced_calls = 0
+        self._failed_calls = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa a corrotina de `fn` uma única vez por chave entre chamadores concorrentes.
+
+        Args:
+            key: Chave da chamada (geralmente a chave do cache)
+            fn: Função sem argumentos que retorna a corrotina da busca
+
+        Returns:
+            Resultado da corrotina (o mesmo objeto para todos os chamadores concorrentes)
+
+        Raises:
+            Exception: A exceção lançada pela corrotina, repassada a todos os chamadores
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self._leader_calls += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self._coalesced_calls += 1
+            self.logger.debug(f"Aguardando chamada em andamento para {key}")
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Libera a chave quando a task termina."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Marca a exceção como recuperada mesmo se todos os chamadores cancelaram
+        if not task.cancelled() and task.exception() is not None:
+            self._failed_calls += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas de coalescência.
+
+        Returns:
+            Dicionário com chamadas em andamento, chamadas executadas,
+            chamadas economizadas (coalescidas) e buscas que falharam
+        """
+        return {
+            "name": self.name,
+            "in_flight": len(self._calls),
+            "leader_calls": self._leader_calls,
+            "coalesced_calls": self._coalesced_calls,
+            "failed_calls": self._failed_calls,
+        }
@@ -0,0 +1,485 @@
+"""
+Gateway de chamadas ao provedor externo (Yahoo Finance).
+
+Centraliza todas as chamadas de rede ao Yahoo para que o serviço reaja ao
+provedor como um todo, e não requisição por requisição:
+
+- Concorrência adaptativa (AIMD): o limite de chamadas simultâneas cresce
+  aditivamente a cada sucesso e cai pela metade quando o provedor limita a
+  taxa ou falha, convergindo para o que o Yahoo aceita no momento. A queda
+  é aplicada uma vez por janela de congestionamento: falhas de chamadas
+  iniciadas antes da última redução não reduzem o limite de novo.
+- Backoff compartilhado com jitter: um throttle abre uma janela de espera
+  exponencial; durante a janela as chamadas falham na hora em vez de dormir
+  na thread da requisição, e as camadas de cache servem o valor vencido.
+- Circuit breaker: após falhas consecutivas o circuito abre e as chamadas
+  falham imediatamente; depois de `reset_timeout` uma única chamada de teste
+  decide se o circuito fecha novamente.
+- Métricas por endpoint: chamadas, erros, throttles, rejeições e latência.
+
+Chamadas síncronas (yfinance) usam `call`; chamadas assíncronas (httpx)
+usam `call_async`, que compartilha o mesmo limite, backoff e circuito.
+
+Example:
+    from core.upstream import upstream_gateway
+
+    info = upstream_gateway.call("info", lambda: ticker.info)
+    chart = await upstream_gateway.call_async("chart", lambda: client.get(url))
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+import httpx
+
+from core.config import settings
+from core.logging import LoggerMixin
+
+T = TypeVar("T")
+
+# Estados do circuit breaker
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Classificação do resultado de uma chamada
+_OUTCOME_OK = "ok"
+_OUTCOME_THROTTLED = "throttled"
+_OUTCOME_FAILED = "failed"
+
+# Latências guardadas por endpoint para os percentis
+_LATENCY_WINDOW = 256
+
+# Intervalo de espera por uma vaga nas chamadas assíncronas
+_ASYNC_POLL_INTERVAL = 0.01
+
+# Mensagens de limitação de taxa quando o erro não traz o status HTTP
+_THROTTLE_MESSAGE = re.compile(
+    r"too many requests|rate limited|\b(?:http|status)(?: error| code)?:? 429\b",
+    re.IGNORECASE,
+)
+
+
+class UpstreamUnavailableError(Exception):
+    """
+    O provedor externo não está aceitando chamadas no momento.
+
+    Lançada sem chamar o provedor quando o circuito está aberto, durante uma
+    janela de backoff ou quando o limite de concorrência não libera a tempo.
+
+    Attributes:
+        message: Mensagem de erro
+        retry_after: Segundos sugeridos antes de tentar novamente
+    """
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        """
+        Inicializa a exceção.
+
+        Args:
+            message: Mensagem de erro
+            retry_after: Segundos sugeridos antes de tentar novamente
+        """
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class _EndpointMetrics:
+    """Contadores e latências recentes de um endpoint do provedor."""
+
+    __slots__ = ("calls", "errors", "throttled", "rejected", "latencies")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "latency_ms_p50": round(latencies[count // 2] * 1000, 1) if count else None,
+            "latency_ms_p95": (
+                round(latencies[min(count - 1, int(count * 0.95))] * 1000, 1)
+                if count else None
+            ),
+        }
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """
+    Indica se o erro é uma limitação de taxa do provedor (HTTP 429).
+
+    Usa o tipo da exceção ou o status da resposta anexada (httpx, requests,
+    curl_cffi); a mensagem só é considerada pelas frases de limitação de
+    taxa, para que um "429" em ticker, preço ou URL não conte como throttle.
+    """
+    if type(error).__name__ == "YFRateLimitError":
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return bool(_THROTTLE_MESSAGE.search(str(error)))
+
+
+def _classify(error: BaseException) -> str:
+    """Classifica o erro de uma chamada para o controle de concorrência e circuito."""
+    if is_throttle_error(error):
+        return _OUTCOME_THROTTLED
+    if isinstance(error, (OSError, httpx.TransportError)):
+        return _OUTCOME_FAILED
+    if isinstance(error, httpx.HTTPStatusError) and error.response.status_code >= 500:
+        return _OUTCOME_FAILED
+    return _OUTCOME_OK
+
+
+class UpstreamGateway(LoggerMixin):
+    """
+    Ponto único de saída para as chamadas ao provedor externo.
+
+    Apenas erros de rede (OSError, que inclui timeouts e erros HTTP do
+    curl_cffi/requests, e erros de transporte ou HTTP 5xx do httpx) e
+    throttles contam como falha do provedor; erros de
+    dados (ticker inexistente, resposta vazia) são repassados sem afetar o
+    limite de concorrência nem o circuito.
+
+    Attributes:
+        name: Nome do provedor nos logs e métricas
+        min_concurrency: Limite mínimo de chamadas simultâneas
+        max_concurrency: Limite máximo de chamadas simultâneas
+        acquire_timeout: Espera máxima por uma vaga de concorrência em segundos
+        failure_threshold: Falhas consecutivas que abrem o circuito
+        reset_timeout: Tempo em segundos com o circuito aberto
+        backoff_base: Backoff do primeiro throttle em segundos
+        backoff_max: Backoff máximo em segundos
+    """
+
+    def __init__(
+        self,
+        name: str = "yahoo",
+        min_concurrency: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        initial_concurrency: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+    ):
+        """
+        Inicializa o gateway.
+
+        Args:
+            name: Nome do provedor nos logs e métricas
+            min_concurrency: Limite mínimo de chamadas simultâneas
+            max_concurrency: Limite máximo de chamadas simultâneas
+            initial_concurrency: Limite inicial de chamadas simultâneas
+            acquire_timeout: Espera máxima por uma vaga em segundos
+            failure_threshold: Falhas consecutivas que abrem o circuito
+            reset_timeout: Tempo com o circuito aberto em segundos
+            backoff_base: Backoff do primeiro throttle em segundos
+            backoff_max: Backoff máximo em segundos
+        """
+        self.name = name
+        self.min_concurrency = min_concurrency or settings.UPSTREAM_MIN_CONCURRENCY
+        self.max_concurrency = max_concurrency or settings.UPSTREAM_MAX_CONCURRENCY
+        self.acquire_timeout = (
+            settings.UPSTREAM_ACQUIRE_TIMEOUT if acquire_timeout is None else acquire_timeout
+        )
+        self.failure_threshold = failure_threshold or settings.UPSTREAM_FAILURE_THRESHOLD
+        self.reset_timeout = (
+            settings.UPSTREAM_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        )
+        self.backoff_base = backoff_base or settings.UPSTREAM_BACKOFF_BASE
+        self.backoff_max = backoff_max or settings.UPSTREAM_BACKOFF_MAX
+
+        self._limit = float(
+            min(self.max_concurrency, initial_concurrency or settings.UPSTREAM_INITIAL_CONCURRENCY)
+        )
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+        self._state = CIRCUIT_CLOSED
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._consecutive_failures = 0
+        self._consecutive_throttles = 0
+        self._backoff_until = 0.0
+        self._circuit_opened = 0
+        self._last_decrease = float("-inf")
+
+        self._metrics: Dict[str, _EndpointMetrics] = {}
+
+    def call(self, endpoint: str, fn: Callable[[], T]) -> T:
+        """
+        Executa uma chamada ao provedor respeitando circuito, backoff e concorrência.
+
+        Args:
+            endpoint: Nome do endpoint para as métricas (ex: "info", "history")
+            fn: Função sem argumentos que faz a chamada de rede
+
+        Returns:
+            Resultado de `fn`
+
+        Raises:
+            UpstreamUnavailableError: Provedor indisponível; `fn` não foi chamada
+            Exception: A exceção lançada por `fn`
+        """
+        probe = self._acquire(endpoint)
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._release(endpoint, start, _classify(e), probe, error=True)
+            raise
+        self._release(endpoint, start, _OUTCOME_OK, probe)
+        return result
+
+    async def call_async(self, endpoint: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Versão assíncrona de `call`, para clientes HTTP assíncronos.
+
+        A espera por uma vaga de concorrência não bloqueia o event loop.
+
+        Args:
+            endpoint: Nome do endpoint para as métricas (ex: "chart")
+            fn: Função sem argumentos que retorna a corrotina da chamada
+
+        Returns:
+            Resultado da corrotina
+
+        Raises:
+            UpstreamUnavailableError: Provedor indisponível; `fn` não foi chamada
+            Exception: A exceção lançada pela corrotina
+        """
+        probe = await self._acquire_async(endpoint)
+        start = time.perf_counter()
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._release(endpoint, start, _classify(e), probe, error=True)
+            raise
+        self._release(endpoint, start, _OUTCOME_OK, probe)
+        return result
+
+    @property
+    def state(self) -> str:
+        """Estado atual do circuito."""
+        with self._condition:
+            if self._state == CIRCUIT_OPEN and time.time() >= self._open_until:
+                return CIRCUIT_HALF_OPEN
+            return self._state
+
+    def blocked_for(self) -> float:
+        """
+        Tempo até o gateway voltar a aceitar chamadas.
+
+        Returns:
+            Segundos restantes de circuito aberto ou de backoff (0 se aceita chamadas)
+        """
+        with self._condition:
+            now = time.time()
+            if self._state == CIRCUIT_OPEN:
+                return max(0.0, self._open_until - now)
+            return max(0.0, self._backoff_until - now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna o estado do gateway e as métricas por endpoint.
+
+        Returns:
+            Dicionário com circuito, limite de concorrência, backoff e
+            contadores/latências de cada endpoint
+        """
+        state = self.state
+        with self._condition:
+            return {
+                "name": self.name,
+                "circuit": state,
+                "circuit_opened": self._circuit_opened,
+                "concurrency_limit": round(self._limit, 2),
+                "in_flight": self._in_flight,
+                "backoff_remaining": round(max(0.0, self._backoff_until - time.time()), 2),
+                "consecutive_failures": self._consecutive_failures,
+                "endpoints": {
+                    endpoint: metrics.snapshot()
+                    for endpoint, metrics in self._metrics.items()
+                },
+            }
+
+    def _acquire(self, endpoint: str) -> bool:
+        """
+        Reserva uma vaga de concorrência ou falha imediatamente.
+
+        Returns:
+            True se esta chamada é o teste do circuito meio-aberto
+        """
+        deadline = time.time() + self.acquire_timeout
+        with self._condition:
+            while True:
+                probe = self._try_acquire(endpoint)
+                if probe is not None:
+                    return probe
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self._reject_saturated(endpoint)
+                self._condition.wait(remaining)
+
+    async def _acquire_async(self, endpoint: str) -> bool:
+        """Versão de `_acquire` que aguarda a vaga sem bloquear o event loop."""
+        deadline = time.time() + self.acquire_timeout
+        while True:
+            with self._condition:
+                probe = self._try_acquire(endpoint)
+                if probe is not None:
+                    return probe
+                if time.time() >= deadline:
+                    self._reject_saturated(endpoint)
+            await asyncio.sleep(_ASYNC_POLL_INTERVAL)
+
+    def _try_acquire(self, endpoint: str) -> Optional[bool]:
+        """
+        Tenta reservar uma vaga (chamado com o lock adquirido).
+
+        Returns:
+            True/False (teste do circuito ou não) se a vaga foi reservada,
+            None se o limite de concorrência está esgotado
+
+        Raises:
+            UpstreamUnavailableError: Circuito aberto ou janela de backoff
+        """
+        now = time.time()
+        probe = False
+        if self._state == CIRCUIT_OPEN:
+            if now < self._open_until or self._probe_in_flight:
+                self._endpoint(endpoint).rejected += 1
+                raise UpstreamUnavailableError(
+                    f"Circuito de {self.name} aberto",
+                    retry_after=max(self._open_until - now, 1.0),
+                )
+            # Meio-aberto: uma única chamada testa o provedor
+            probe = True
+        elif now < self._backoff_until:
+            self._endpoint(endpoint).rejected += 1
+            raise UpstreamUnavailableError(
+                f"{self.name} em backoff após limitação de taxa",
+                retry_after=self._backoff_until - now,
+            )
+
+        if probe or self._in_flight < int(self._limit):
+            self._in_flight += 1
+            if probe:
+                self._probe_in_flight = True
+            return probe
+        return None
+
+    def _reject_saturated(self, endpoint: str) -> None:
+        """Recusa a chamada por falta de vaga (chamado com o lock adquirido)."""
+        self._endpoint(endpoint).rejected += 1
+        raise UpstreamUnavailableError(
+            f"Limite de concorrência de {self.name} esgotado",
+            retry_after=1.0,
+        )
+
+    def _release(
+        self,
+        endpoint: str,
+        started: float,
+        outcome: str,
+        probe: bool,
+        error: bool = False,
+    ) -> None:
+        """
+        Libera a vaga e ajusta limite, backoff e circuito pelo resultado.
+
+        Args:
+            endpoint: Nome do endpoint para as métricas
+            started: Início da chamada (`time.perf_counter`)
+            outcome: Classificação do resultado
+            probe: Indica se a chamada era o teste do circuito meio-aberto
+            error: Indica se a chamada lançou exceção
+        """
+        now = time.perf_counter()
+        with self._condition:
+            self._in_flight -= 1
+            if probe:
+                self._probe_in_flight = False
+
+            metrics = self._endpoint(endpoint)
+            metrics.calls += 1
+            metrics.latencies.append(now - started)
+            if error:
+                metrics.errors += 1
+
+            if outcome == _OUTCOME_OK:
+                # Aumento aditivo: cerca de +1 a cada `limit` sucessos
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+                self._consecutive_failures = 0
+                self._consecutive_throttles = 0
+                if probe:
+                    self._state = CIRCUIT_CLOSED
+                    self.logger.info(f"Circuito de {self.name} fechado")
+            else:
+                # Redução multiplicativa, uma vez por janela: as demais falhas de
+                # uma rajada já estavam em voo quando o limite foi reduzido
+                new_window = started >= self._last_decrease
+                if new_window:
+                    self._limit = max(self.min_concurrency, self._limit / 2)
+                    self._last_decrease = now
+                self._consecutive_failures += 1
+                if outcome == _OUTCOME_THROTTLED:
+                    metrics.throttled += 1
+                    if new_window:
+                        self._start_backoff()
+                if probe or self._consecutive_failures >= self.failure_threshold:
+                    self._open_circuit()
+
+            self._condition.notify_all()
+
+    def _start_backoff(self) -> None:
+        """Abre (ou estende) a janela de backoff exponencial com jitter."""
+        self._consecutive_throttles += 1
+        ceiling = min(
+            self.backoff_max,
+            self.backoff_base * (2 ** (self._consecutive_throttles - 1)),
+        )
+        # "Equal jitter": metade fixa, metade aleatória, para dessincronizar workers
+        delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        self._backoff_until = max(self._backoff_until, time.time() + delay)
+        self.logger.warning(
+            f"{self.name} limitou a taxa; backoff de {delay:.1f}s, "
+            f"concorrência reduzida para {int(self._limit)}"
+        )
+
+    def _open_circuit(self) -> None:
+        """Abre o circuito por `reset_timeout` segundos."""
+        if self._state != CIRCUIT_OPEN:
+            self._circuit_opened += 1
+        self._state = CIRCUIT_OPEN
+        self._open_until = time.time() + self.reset_timeout
+        self.logger.warning(
+            f"Circuito de {self.name} aberto por {self.reset_timeout}s após "
+            f"{self._consecutive_failures} falhas consecutivas"
+        )
+
+    def _endpoint(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._metrics.get(endpoint)
+        if metrics is None:
+            metrics = self._metrics[endpoint] = _EndpointMetrics()
+        return metrics
+
+
+# Instância única compartilhada por provedor, serviço e módulo cadu
+upstream_gateway = UpstreamGateway("yahoo")
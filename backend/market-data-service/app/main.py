@@ -9,6 +9,7 @@ Example:
     uvicorn app.main:app --host 0.0.0.0 --port 8002 --reload
 """
 
+import asyncio
 import time
 from contextlib import asynccontextmanager
 from datetime import datetime
@@ -17,10 +18,15 @@ from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from cadu.caching import cache_manager
+from core.cache_status import track_request
 from core.config import settings
 from core.logging import get_logger
+from core.upstream import UpstreamUnavailableError
 from models.responses import ErrorResponse
-from api.market_data import router as market_data_router
+from services.refresh_scheduler import RefreshScheduler
+from services.warmup import ServiceWarmup
+from api.market_data import market_data_service, router as market_data_router
 
 # Configurar logger
 logger = get_logger(__name__)
@@ -28,6 +34,18 @@ logger = get_logger(__name__)
 # Variável para tracking de uptime
 startup_time = time.time()
 
+# Aquecimento de caches e índices (define a prontidão do serviço)
+service_warmup = ServiceWarmup(market_data_service)
+
+# Atualização em segundo plano dos conjuntos dos painéis
+refresh_scheduler = RefreshScheduler(market_data_service)
+
+
+async def run_background_tasks() -> None:
+    """Aquece o serviço e, em seguida, mantém os conjuntos frescos."""
+    await service_warmup.run()
+    await refresh_scheduler.run()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -36,6 +54,9 @@ async def lifespan(app: FastAPI):
 
     Executa tarefas de inicialização e finalização do serviço,
     incluindo configuração de recursos e limpeza de conexões.
+    O aquecimento roda em segundo plano: o servidor responde a `/health`
+    desde o início e `/ready` passa a responder 200 quando ele termina.
+    Depois dele, o agendador mantém frescos os conjuntos dos painéis.
 
     Args:
         app: Instância da aplicação FastAPI
@@ -46,14 +67,9 @@ async def lifespan(app: FastAPI):
     logger.info(f"🔧 Debug Mode: {settings.DEBUG}")
     logger.info(f"🔗 CORS Origins: {settings.ALLOWED_ORIGINS}")
 
-    # Aqui podem ser adicionadas tarefas de inicialização como:
-    # - Conexões com databases
-    # - Inicialização de cache
-    # - Verificação de serviços externos
-    # - Pré-carregamento de dados
-
     try:
-        # Teste básico de funcionalidade
+        # Pré-carregamento do universo de tickers e dos dados mais usados
+        background_task = asyncio.create_task(run_background_tasks())
         logger.info("✅ Serviços inicializados com sucesso")
         logger.info(f"🌐 Servidor rodando em {settings.HOST}:{settings.PORT}")
 
@@ -65,6 +81,16 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("🛑 Finalizando Market Data Service...")
+    if not background_task.done():
+        background_task.cancel()
+        try:
+            await background_task
+        except asyncio.CancelledError:
+            pass
+    if market_data_service.async_provider is not None:
+        await market_data_service.async_provider.aclose()
+    market_data_service.shutdown()
+    cache_manager.shutdown()
     logger.info("✅ Recursos liberados com sucesso")
 
 
@@ -102,7 +128,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["X-Request-ID", "X-Rate-Limit-Remaining"],
+    expose_headers=["X-Request-ID", "X-Rate-Limit-Remaining", "X-Cache-Status"],
 )
 
 
@@ -133,6 +159,9 @@ async def request_logging_middleware(request: Request, call_next):
         f"[{request_id}] from {request.client.host if request.client else 'unknown'}"
     )
 
+    # Estado de cache da requisição (marcado pelas camadas internas)
+    cache_state = track_request()
+
     try:
         # Processar requisição
         response = await call_next(request)
@@ -143,6 +172,8 @@ async def request_logging_middleware(request: Request, call_next):
         # Adicionar headers de resposta
         response.headers["X-Request-ID"] = request_id
         response.headers["X-Process-Time"] = f"{process_time:.3f}"
+        if cache_state["stale"]:
+            response.headers["X-Cache-Status"] = "STALE"
 
         # Log da resposta
         logger.info(
@@ -194,6 +225,38 @@ async def rate_limit_headers_middleware(request: Request, call_next):
     return response
 
 
+# Handler para provedor externo indisponível (circuito aberto ou backoff)
+@app.exception_handler(UpstreamUnavailableError)
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailableError):
+    """
+    Handler para chamadas recusadas pelo gateway do provedor.
+
+    Retorna 503 com o header Retry-After em vez de um erro interno, pois a
+    falha é temporária e nenhum valor em cache pôde ser servido.
+
+    Args:
+        request: Objeto de requisição HTTP
+        exc: Exceção do gateway
+
+    Returns:
+        JSONResponse 503 com Retry-After
+    """
+    logger.warning(f"Provedor indisponível em {request.url.path}: {exc.message}")
+
+    error_response = ErrorResponse(
+        error="UPSTREAM_UNAVAILABLE",
+        message="Provedor de dados temporariamente indisponível",
+        details={"reason": exc.message},
+        timestamp=datetime.now().isoformat(),
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=error_response.dict(),
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
 # Handler global para exceções não tratadas
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -201,7 +264,8 @@ async def global_exception_handler(request: Request, exc: Exception):
     Handler global para exceções não tratadas.
 
     Captura todas as exceções que não foram tratadas especificamente
-    e retorna uma resposta estruturada consistente.
+    e retorna uma resposta estruturada consistente. Exceções que apenas
+    encapsulam uma recusa do gateway do provedor viram 503.
 
     Args:
         request: Objeto de requisição HTTP
@@ -210,6 +274,12 @@ async def global_exception_handler(request: Request, exc: Exception):
     Returns:
         JSONResponse com detalhes do erro
     """
+    cause = exc.__cause__ or exc.__context__
+    while cause is not None:
+        if isinstance(cause, UpstreamUnavailableError):
+            return await upstream_unavailable_handler(request, cause)
+        cause = cause.__cause__ or cause.__context__
+
     logger.error(f"Exceção não tratada: {str(exc)}", exc_info=True)
 
     error_response = ErrorResponse(
@@ -253,6 +323,10 @@ async def not_found_handler(request: Request, exc):
                 "/api/v1/market-data/{symbol}/fulldata",
                 "/api/v1/market-data/search",
                 "/api/v1/market-data/period-performance",
+                "/api/v1/market-data/indicators",
+                "/api/v1/market-data/correlation",
+                "/api/v1/market-data/portfolio-risk",
+                "/api/v1/market-data/efficient-frontier",
                 "/api/v1/market-data/health",
             ]
         },
@@ -292,6 +366,7 @@ async def root():
             "yfinance": "/api/v1/yfinance/",
             "frontend": "/api/v1/frontend/",
             "health": "/health",
+            "ready": "/ready",
             "ping": "/ping",
         },
         "features": [
@@ -334,6 +409,36 @@ async def health_check():
     }
 
 
+@app.get(
+    "/ready",
+    summary="Readiness Check",
+    description=(
+        "Indica se o serviço está pronto para receber tráfego: responde 503 "
+        "enquanto o aquecimento de caches e índices está em andamento."
+    ),
+)
+async def readiness_check():
+    """
+    Readiness check para o orquestrador.
+
+    Diferente do `/health` (vivacidade), só responde 200 depois que o
+    aquecimento da inicialização termina ou esgota o prazo.
+
+    Returns:
+        Estado do aquecimento (503 enquanto não estiver pronto)
+    """
+    content = {
+        "status": "ready" if service_warmup.ready else "warming_up",
+        "service": "Market Data Service",
+        "warmup": service_warmup.get_status(),
+        "refresh_scheduler": refresh_scheduler.get_stats(),
+        "timestamp": datetime.now().isoformat(),
+    }
+    if not service_warmup.ready:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=content)
+    return content
+
+
 @app.get(
     "/ping",
     summary="Verificação básica de conectividade",
@@ -21,6 +21,7 @@ class SearchRequest(BaseModel):
     """Requisição simples para busca de ações."""
     query: str
     limit: int = 10
+    enrich: bool = True  # False: apenas o índice local, sem cotações
 
 
 class BulkRequest(BaseModel):
@@ -49,6 +49,40 @@ class HistoricalDataPoint(BaseModel):
     )
 
 
+class ColumnarHistoryResponse(BaseModel):
+    """
+    Modelo para série histórica em formato colunar (struct-of-arrays).
+
+    Cada campo é uma lista alinhada por posição com `dates`, o que evita
+    repetir as chaves a cada ponto e permite que clientes de gráficos usem
+    os arrays diretamente.
+
+    Attributes:
+        symbol: Símbolo da ação
+        interval: Intervalo dos dados
+        dates: Datas dos pontos
+        open: Preços de abertura
+        high: Preços máximos
+        low: Preços mínimos
+        close: Preços de fechamento
+        volume: Volumes negociados
+        adj_close: Preços de fechamento ajustados
+    """
+
+    symbol: str = Field(..., description="Símbolo da ação")
+    interval: str = Field(..., description="Intervalo dos dados")
+    dates: List[str] = Field(default_factory=list, description="Datas dos pontos")
+    open: List[float] = Field(default_factory=list, description="Preços de abertura")
+    high: List[float] = Field(default_factory=list, description="Preços máximos")
+    low: List[float] = Field(default_factory=list, description="Preços mínimos")
+    close: List[float] = Field(default_factory=list, description="Preços de fechamento")
+    volume: List[int] = Field(default_factory=list, description="Volumes negociados")
+    adj_close: List[float] = Field(
+        default_factory=list,
+        description="Preços de fechamento ajustados"
+    )
+
+
 class FundamentalData(BaseModel):
     """
     Modelo para dados fundamentais de uma ação.
@@ -284,6 +318,8 @@ class HealthResponse(BaseModel):
         uptime_seconds: Tempo de atividade em segundos
         external_services: Status dos serviços externos
         cache_status: Status do cache
+        cache_stats: Estatísticas do cache (acertos, falhas, despejos)
+        metrics: Métricas internas do serviço (ex: coalescência de chamadas)
         memory_usage: Uso de memória
     """
     
@@ -296,6 +332,14 @@ class HealthResponse(BaseModel):
         description="Status dos serviços externos"
     )
     cache_status: Optional[str] = Field(default=None, description="Status do cache")
+    cache_stats: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Estatísticas do cache"
+    )
+    metrics: Optional[Dict[str, Dict[str, Any]]] = Field(
+        default=None,
+        description="Métricas internas do serviço"
+    )
     memory_usage: Optional[Dict[str, float]] = Field(
         default=None,
         description="Uso de memória"
@@ -0,0 +1,219 @@
+"""
+Provedor assíncrono do Yahoo Finance.
+
+Implementa a interface IAsyncMarketDataProvider sobre a API de gráficos do
+Yahoo (`/v8/finance/chart`) com um cliente httpx assíncrono e pool de
+conexões, para que as rotas assíncronas busquem séries históricas sem ocupar
+uma thread durante a espera pela rede. As chamadas passam pelo mesmo gateway
+das chamadas síncronas (concorrência adaptativa, backoff e circuit breaker).
+
+A conversão do resultado para pontos históricos ou série colunar reutiliza a
+do provedor síncrono, de modo que as duas rotas devolvem o mesmo formato.
+
+Example:
+    from services.async_yahoo_provider import AsyncYahooFinanceProvider
+
+    provider = AsyncYahooFinanceProvider()
+    points = await provider.get_historical_data("PETR4.SA", "1mo", "1d")
+    await provider.aclose()
+"""
+
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import quote
+
+import httpx
+import pandas as pd
+
+from core.config import settings
+from core.logging import LoggerMixin
+from core.upstream import upstream_gateway
+from models.responses import ColumnarHistoryResponse, HistoricalDataPoint
+from services.interfaces import IAsyncMarketDataProvider, ProviderException
+from services.yahoo_finance_provider import INTRADAY_INTERVALS, YahooFinanceProvider
+
+# A API de gráficos recusa clientes sem um User-Agent de navegador
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+
+class AsyncYahooFinanceProvider(IAsyncMarketDataProvider, LoggerMixin):
+    """
+    Provedor assíncrono de séries históricas do Yahoo Finance.
+
+    Os preços são ajustados por proventos e desdobramentos, como no
+    `Ticker.history` do yfinance (auto_adjust), e as datas seguem o fuso da
+    bolsa do ativo.
+
+    Attributes:
+        base_url: URL base da API de gráficos
+        timeout: Timeout das requisições HTTP em segundos
+        max_connections: Conexões simultâneas máximas do pool
+        formatter: Provedor síncrono usado para converter os dados
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        formatter: Optional[YahooFinanceProvider] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Inicializa o provedor assíncrono.
+
+        O cliente HTTP é criado na primeira chamada, já dentro do event loop.
+
+        Args:
+            base_url: URL base da API de gráficos (padrão: configuração global)
+            timeout: Timeout das requisições (padrão: configuração global)
+            max_connections: Conexões máximas do pool (padrão: configuração global)
+            formatter: Provedor síncrono para conversão (padrão: YahooFinanceProvider)
+            transport: Transporte HTTP do cliente (padrão: rede; nos testes, um
+                upstream local como httpx.MockTransport)
+        """
+        self.base_url = (base_url or settings.YAHOO_CHART_BASE_URL).rstrip("/")
+        self.timeout = timeout or settings.YAHOO_FINANCE_TIMEOUT
+        self.max_connections = max_connections or settings.YAHOO_HTTP_MAX_CONNECTIONS
+        self.formatter = formatter or YahooFinanceProvider()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP assíncrono com pool de conexões (criado sob demanda)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=settings.YAHOO_HTTP_KEEPALIVE,
+                ),
+                headers={"User-Agent": _USER_AGENT, "Accept": "application/json"},
+                transport=self._transport,
+            )
+        return self._client
+
+    async def get_historical_data(
+        self,
+        symbol: str,
+        period: str = "1mo",
+        interval: str = "1d",
+        output_format: str = "records",
+    ) -> Union[List[HistoricalDataPoint], ColumnarHistoryResponse]:
+        """
+        Obtém a série histórica de uma ação pela API de gráficos.
+
+        Args:
+            symbol: Símbolo da ação (ex: "PETR4.SA")
+            period: Período (ex: '1mo', '1y')
+            interval: Intervalo (ex: '1d', '1h')
+            output_format: 'records' (lista de pontos) ou 'columnar'
+
+        Returns:
+            Lista de pontos históricos ou série colunar
+
+        Raises:
+            ProviderException: Símbolo sem dados ou resposta inválida
+            UpstreamUnavailableError: Provedor indisponível no gateway
+            httpx.HTTPError: Erro de rede ou HTTP do provedor
+        """
+        self.logger.info(
+            f"Obtendo dados históricos para {symbol} (async) - period: {period}, interval: {interval}"
+        )
+        result = await self._get_chart(symbol, period, interval)
+        hist = self._chart_to_frame(result, interval)
+        self.logger.info(f"Dados retornados pela API de gráficos: {len(hist)} linhas")
+
+        if output_format == "columnar":
+            return self.formatter._frame_to_columnar(hist, symbol, interval)
+        if hist.empty:
+            return []
+        return self.formatter._frame_to_historical_points(hist, symbol, interval)
+
+    async def aclose(self) -> None:
+        """Fecha o pool de conexões HTTP."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            self.logger.info("Cliente HTTP do provedor assíncrono finalizado")
+
+    async def _get_chart(self, symbol: str, period: str, interval: str) -> Dict[str, Any]:
+        """Busca o resultado bruto da API de gráficos pelo gateway do provedor."""
+        params = {
+            "range": period,
+            "interval": interval,
+            "includePrePost": "false",
+            "events": "div,splits",
+        }
+
+        async def request() -> Dict[str, Any]:
+            response = await self.client.get(
+                f"/v8/finance/chart/{quote(symbol, safe='')}", params=params
+            )
+            # 404 traz no corpo o motivo (símbolo inexistente ou sem dados)
+            if response.status_code != 404:
+                response.raise_for_status()
+            return response.json()
+
+        payload = await upstream_gateway.call_async("chart", request)
+
+        chart = payload.get("chart") or {}
+        error = chart.get("error")
+        if error or not chart.get("result"):
+            description = (error or {}).get("description") or "resposta sem dados"
+            raise ProviderException(
+                message=f"Sem dados de histórico: {description}",
+                provider="yahoo_finance",
+                error_code="CHART_ERROR",
+                details={"symbol": symbol, "period": period, "interval": interval},
+            )
+        return chart["result"][0]
+
+    def _chart_to_frame(self, result: Dict[str, Any], interval: str) -> pd.DataFrame:
+        """
+        Converte o resultado da API de gráficos no DataFrame do `Ticker.history`.
+
+        Args:
+            result: Item de `chart.result` da resposta
+            interval: Intervalo dos dados (barras diárias são normalizadas para a data)
+
+        Returns:
+            DataFrame com as colunas Open, High, Low, Close e Volume
+        """
+        timestamps = result.get("timestamp") or []
+        indicators = result.get("indicators") or {}
+        quotes = (indicators.get("quote") or [{}])[0]
+        if not timestamps:
+            return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+
+        index = pd.to_datetime(timestamps, unit="s", utc=True)
+        timezone = (result.get("meta") or {}).get("exchangeTimezoneName")
+        if timezone:
+            index = index.tz_convert(timezone)
+        if interval not in INTRADAY_INTERVALS:
+            index = index.normalize()
+
+        hist = pd.DataFrame(
+            {
+                "Open": quotes.get("open"),
+                "High": quotes.get("high"),
+                "Low": quotes.get("low"),
+                "Close": quotes.get("close"),
+                "Volume": quotes.get("volume"),
+            },
+            index=index,
+            dtype=float,
+        )
+
+        # Ajuste por proventos e desdobramentos (equivalente a auto_adjust=True)
+        adjclose = (indicators.get("adjclose") or [{}])[0].get("adjclose")
+        if adjclose:
+            adjusted = pd.Series(adjclose, index=index, dtype=float)
+            ratio = adjusted / hist["Close"]
+            hist[["Open", "High", "Low"]] = hist[["Open", "High", "Low"]].mul(ratio, axis=0)
+            hist["Close"] = adjusted
+
+        return hist
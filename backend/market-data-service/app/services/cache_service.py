@@ -0,0 +1,278 @@
+"""
+Cache em memória limitado para o Market Data Service.
+
+Este módulo implementa a interface ICacheService com um cache LRU limitado
+por número de entradas e por um orçamento aproximado de memória, com TTL por
+entrada e uma thread de limpeza periódica das entradas expiradas.
+
+Example:
+    from services.cache_service import BoundedLRUCache
+
+    cache = BoundedLRUCache(max_entries=5000, max_bytes=64 * 1024 * 1024)
+    cache.set("stock_data:PETR4.SA", data, ttl=300)
+    print(cache.get_stats())
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from core.config import settings
+from core.logging import LoggerMixin
+from services.interfaces import ICacheService
+
+# Elementos medidos em coleções grandes; o restante é extrapolado pela média
+SIZE_SAMPLE = 8
+
+# Profundidade máxima percorrida na estimativa de tamanho
+SIZE_MAX_DEPTH = 6
+
+
+def estimate_size(value: Any, depth: int = 0) -> int:
+    """
+    Estima o tamanho em memória de um valor por um percurso raso da estrutura.
+
+    Coleções grandes são medidas por uma amostra de SIZE_SAMPLE elementos
+    (históricos são listas de pontos homogêneos), então o custo não cresce
+    com o número de pontos. Arrays NumPy e DataFrames usam o tamanho dos
+    buffers; modelos pydantic e objetos comuns, os seus atributos.
+
+    Args:
+        value: Valor a medir
+        depth: Profundidade atual do percurso
+
+    Returns:
+        Tamanho aproximado em bytes
+    """
+    size = sys.getsizeof(value)
+    if depth >= SIZE_MAX_DEPTH or isinstance(value, (str, bytes, bytearray, int, float, bool)):
+        return size
+
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return size + nbytes
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):
+        try:
+            return size + int(memory_usage(index=True).sum())
+        except Exception:
+            return size
+
+    if isinstance(value, dict):
+        items = list(value.items()) if len(value) <= SIZE_SAMPLE else [
+            item for _, item in zip(range(SIZE_SAMPLE), value.items())
+        ]
+        sampled = sum(estimate_size(k, depth + 1) + estimate_size(v, depth + 1) for k, v in items)
+        return size + sampled * len(value) // max(len(items), 1)
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if not value:
+            return size
+        if len(value) <= SIZE_SAMPLE:
+            return size + sum(estimate_size(item, depth + 1) for item in value)
+        sequence = value if isinstance(value, (list, tuple)) else list(value)
+        step = len(sequence) // SIZE_SAMPLE
+        sampled = sum(estimate_size(sequence[i * step], depth + 1) for i in range(SIZE_SAMPLE))
+        return size + sampled * len(sequence) // SIZE_SAMPLE
+
+    attributes = getattr(value, "__dict__", None)
+    if isinstance(attributes, dict):
+        return size + estimate_size(attributes, depth + 1)
+    return size
+
+
+class _CacheEntry:
+    """Entrada do cache com valor, expiração e tamanho estimado."""
+
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class BoundedLRUCache(ICacheService, LoggerMixin):
+    """
+    Cache LRU thread-safe com TTL por entrada e orçamento de memória.
+
+    As entradas são mantidas em um OrderedDict na ordem de uso: leituras e
+    escritas movem a chave para o fim, e as despejadas saem do início quando
+    o número de entradas ou o tamanho estimado ultrapassam os limites. O
+    tamanho de cada valor é estimado por um percurso raso e amostrado da
+    estrutura (ver `estimate_size`), barato o bastante para rodar no event
+    loop a cada escrita.
+    Uma thread daemon remove periodicamente as entradas expiradas, para que
+    chaves que nunca mais são lidas não ocupem memória até serem despejadas.
+
+    Attributes:
+        max_entries: Número máximo de entradas
+        max_bytes: Orçamento aproximado de memória em bytes
+        sweep_interval: Intervalo entre limpezas de expirados em segundos
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_entries: Número máximo de entradas (padrão: configuração global)
+            max_bytes: Orçamento de memória em bytes (padrão: configuração global)
+            sweep_interval: Intervalo da limpeza em segundos (0 desabilita a thread)
+        """
+        self.max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or settings.CACHE_MAX_BYTES
+        self.sweep_interval = (
+            settings.CACHE_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
+        )
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._rejected = 0
+
+        self._stop_event = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if self.sweep_interval > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="cache-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Obtém valor do cache verificando TTL e atualizando a ordem LRU."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            if time.time() > entry.expires_at:
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+        """Armazena valor no cache com TTL, despejando entradas antigas se preciso."""
+        size = self._estimate_size(key, value)
+        if size > self.max_bytes:
+            self.logger.warning(
+                f"Valor de {size} bytes para '{key}' excede o orçamento do cache"
+            )
+            with self._lock:
+                self._rejected += 1
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(value, time.time() + ttl, size)
+            self._total_bytes += size
+            self._evict_overflow()
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Remove chave do cache."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+        return True
+
+    def clear(self) -> bool:
+        """Limpa todo o cache."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna contadores e ocupação do cache.
+
+        Returns:
+            Dicionário com entradas, bytes, acertos, falhas e despejos
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "rejected": self._rejected,
+            }
+
+    def sweep(self) -> int:
+        """
+        Remove as entradas expiradas.
+
+        Returns:
+            Número de entradas removidas
+        """
+        now = time.time()
+        with self._lock:
+            expired = [
+                key for key, entry in self._entries.items() if entry.expires_at < now
+            ]
+            for key in expired:
+                self._remove(key)
+            self._expirations += len(expired)
+
+        if expired:
+            self.logger.debug(f"Limpeza do cache removeu {len(expired)} entradas expiradas")
+        return len(expired)
+
+    def close(self) -> None:
+        """Interrompe a thread de limpeza."""
+        self._stop_event.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=self.sweep_interval)
+
+    def _sweep_loop(self) -> None:
+        """Laço da thread de limpeza periódica."""
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error(f"Erro na limpeza do cache: {e}")
+
+    def _remove(self, key: str) -> None:
+        """Remove a entrada e atualiza o total de bytes (lock já adquirido)."""
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+
+    def _evict_overflow(self) -> None:
+        """Despeja as entradas menos usadas até respeitar os limites (lock já adquirido)."""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.size
+            self._evictions += 1
+
+    def _estimate_size(self, key: str, value: Any) -> int:
+        """Estima o tamanho da entrada em bytes."""
+        return estimate_size(value) + sys.getsizeof(key)
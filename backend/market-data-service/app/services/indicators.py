@@ -0,0 +1,385 @@
+"""
+Motor vetorizado de indicadores técnicos sobre o histórico de preços.
+
+Os clientes calculavam SMA/EMA/RSI/MACD/Bollinger no navegador depois de
+baixar o histórico completo linha a linha. Este módulo calcula os
+indicadores no servidor com kernels NumPy sobre arrays float64:
+
+- as séries de fechamento de mesmo tamanho são empilhadas em uma matriz
+  (um símbolo por linha) e cada indicador é calculado para todas de uma vez
+  ao longo do último eixo;
+- médias exponenciais usam um filtro recursivo (`scipy.signal.lfilter`),
+  sem laço em Python por barra;
+- os resultados são memorizados por (símbolo, intervalo, últimas barras e
+  seus fechamentos), de modo que requisições repetidas sem novo preço não
+  recalculam nada;
+- apenas as colunas pedidas são devolvidas.
+
+Especificações aceitas (parâmetros separados por ":"):
+
+    sma:20        -> sma_20
+    ema:12        -> ema_12
+    rsi:14        -> rsi_14
+    macd:12:26:9  -> macd_12_26_9, macd_signal_12_26_9, macd_hist_12_26_9
+    bb:20:2       -> bb_middle_20_2, bb_upper_20_2, bb_lower_20_2
+
+As médias exponenciais (EMA, MACD) e as médias de Wilder (RSI) são semeadas
+com a média simples das primeiras barras, como no TA-Lib; as barras de
+aquecimento de cada indicador vêm como NaN.
+
+Example:
+    from services.indicators import indicator_engine, parse_indicator_specs
+
+    specs = parse_indicator_specs("sma:20,rsi:14,macd")
+    results = indicator_engine.compute({"PETR4.SA": hist}, "1d", specs)
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from core.config import settings
+from core.logging import LoggerMixin
+
+# Parâmetros padrão e quantidade de parâmetros de cada indicador
+INDICATOR_DEFAULTS: Dict[str, Tuple[float, ...]] = {
+    "sma": (20,),
+    "ema": (20,),
+    "rsi": (14,),
+    "macd": (12, 26, 9),
+    "bb": (20, 2),
+}
+
+# Maior janela aceita (em barras)
+MAX_INDICATOR_WINDOW = 1000
+
+# Fechamentos finais que entram na chave de memorização: a barra do pregão
+# em andamento muda de preço sem mudar de data, e um ajuste por proventos
+# reescreve os fechamentos anteriores
+MEMO_TAIL_BARS = 5
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    Indicador pedido com os seus parâmetros.
+
+    Attributes:
+        name: Nome do indicador ("sma", "ema", "rsi", "macd" ou "bb")
+        params: Parâmetros do indicador (janelas e, no "bb", o multiplicador)
+    """
+
+    name: str
+    params: Tuple[float, ...]
+
+    @property
+    def suffix(self) -> str:
+        """Parâmetros formatados para os nomes das colunas (ex: "12_26_9")."""
+        return "_".join(f"{p:g}" for p in self.params)
+
+    @property
+    def columns(self) -> List[str]:
+        """Colunas produzidas pelo indicador."""
+        if self.name == "macd":
+            return [f"macd_{self.suffix}", f"macd_signal_{self.suffix}", f"macd_hist_{self.suffix}"]
+        if self.name == "bb":
+            return [f"bb_middle_{self.suffix}", f"bb_upper_{self.suffix}", f"bb_lower_{self.suffix}"]
+        return [f"{self.name}_{self.suffix}"]
+
+
+def parse_indicator_specs(indicators: str) -> List[IndicatorSpec]:
+    """
+    Interpreta a lista de indicadores pedida na requisição.
+
+    Args:
+        indicators: Especificações separadas por vírgula (ex: "sma:20,rsi:14,bb:20:2")
+
+    Returns:
+        Especificações únicas, na ordem pedida
+
+    Raises:
+        ValueError: Se algum indicador ou parâmetro for inválido
+    """
+    specs: List[IndicatorSpec] = []
+    for raw in indicators.split(","):
+        parts = [p.strip() for p in raw.strip().lower().split(":")]
+        if not parts[0]:
+            continue
+        name = parts[0]
+        if name not in INDICATOR_DEFAULTS:
+            raise ValueError(
+                f"Indicador inválido: {name}. Disponíveis: {', '.join(INDICATOR_DEFAULTS)}"
+            )
+        defaults = INDICATOR_DEFAULTS[name]
+        if len(parts) - 1 > len(defaults):
+            raise ValueError(f"Parâmetros demais para {name}: {raw.strip()}")
+        try:
+            given = [float(p) for p in parts[1:]]
+        except ValueError:
+            raise ValueError(f"Parâmetro inválido em {raw.strip()}")
+        params = tuple(given) + defaults[len(given):]
+
+        # Janelas são inteiras; só o multiplicador do "bb" aceita fração
+        windows = params[:1] if name == "bb" else params
+        for window in windows:
+            if window != int(window) or not 1 <= window <= MAX_INDICATOR_WINDOW:
+                raise ValueError(
+                    f"Janela inválida em {raw.strip()}: use inteiros entre 1 e {MAX_INDICATOR_WINDOW}"
+                )
+        if name == "bb" and params[1] <= 0:
+            raise ValueError(f"Multiplicador inválido em {raw.strip()}")
+        if name == "macd" and params[0] >= params[1]:
+            raise ValueError(f"No MACD a média rápida deve ser menor que a lenta: {raw.strip()}")
+
+        spec = IndicatorSpec(
+            name, tuple(int(p) if p == int(p) else p for p in params)
+        )
+        if spec not in specs:
+            specs.append(spec)
+
+    if not specs:
+        raise ValueError("Nenhum indicador válido fornecido")
+    return specs
+
+
+# ==================== KERNELS ====================
+# Todos recebem uma matriz (símbolos x barras) e operam no último eixo.
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Média móvel simples por soma acumulada."""
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+    csum = np.cumsum(values, axis=-1)
+    out[:, window - 1] = csum[:, window - 1]
+    out[:, window:] = csum[:, window:] - csum[:, :-window]
+    out[:, window - 1:] /= window
+    return out
+
+
+def _smoothed(values: np.ndarray, alpha: float, window: int, start: int = 0) -> np.ndarray:
+    """
+    Média exponencial semeada com a média simples das `window` primeiras barras.
+
+    `start` é o número de barras iniciais sem valor (NaN), igual em todas as
+    linhas; a semente fica em `start + window - 1` e o restante sai de um
+    único filtro recursivo y[t] = alpha * x[t] + (1 - alpha) * y[t - 1].
+    """
+    out = np.full(values.shape, np.nan)
+    seed_at = start + window - 1
+    if values.shape[-1] <= seed_at:
+        return out
+    seed = values[:, start:seed_at + 1].mean(axis=-1)
+    out[:, seed_at] = seed
+    if values.shape[-1] > seed_at + 1:
+        out[:, seed_at + 1:], _ = lfilter(
+            [alpha], [1.0, alpha - 1.0], values[:, seed_at + 1:], axis=-1,
+            zi=((1.0 - alpha) * seed)[:, None],
+        )
+    return out
+
+
+def ema(values: np.ndarray, window: int, start: int = 0) -> np.ndarray:
+    """Média móvel exponencial (alpha = 2 / (janela + 1))."""
+    return _smoothed(values, 2.0 / (window + 1), window, start)
+
+
+def rsi(values: np.ndarray, window: int) -> np.ndarray:
+    """Índice de força relativa com a suavização de Wilder (alpha = 1 / janela)."""
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] <= window:
+        return out
+    delta = np.diff(values, axis=-1)
+    gains = _smoothed(np.clip(delta, 0, None), 1.0 / window, window)
+    losses = _smoothed(np.clip(-delta, 0, None), 1.0 / window, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[:, 1:] = np.where(losses == 0, 100.0, 100.0 - 100.0 / (1.0 + gains / losses))
+    # Série sem variação na janela: nem ganho nem perda
+    out[:, 1:][(gains == 0) & (losses == 0)] = 50.0
+    return out
+
+
+def macd(values: np.ndarray, fast: int, slow: int, signal: int) -> Tuple[np.ndarray, ...]:
+    """Linha do MACD, linha de sinal e histograma."""
+    line = ema(values, fast) - ema(values, slow)
+    signal_line = ema(line, signal, start=slow - 1)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(values: np.ndarray, window: int, width: float) -> Tuple[np.ndarray, ...]:
+    """Bandas de Bollinger (média simples ± `width` desvios padrão populacionais)."""
+    middle = sma(values, window)
+    # Var = E[x²] - E[x]², com a série deslocada pelo primeiro valor para
+    # evitar o cancelamento numérico em preços altos com pouca variação
+    centered = values - values[:, :1]
+    variance = sma(centered ** 2, window) - sma(centered, window) ** 2
+    std = np.sqrt(np.clip(variance, 0, None))
+    return middle, middle + width * std, middle - width * std
+
+
+def compute_indicators(
+    closes: np.ndarray, specs: List[IndicatorSpec]
+) -> Dict[str, np.ndarray]:
+    """
+    Calcula os indicadores para uma matriz de fechamentos.
+
+    Args:
+        closes: Matriz float64 (símbolos x barras) sem NaN
+        specs: Indicadores a calcular
+
+    Returns:
+        Dicionário coluna -> matriz (símbolos x barras)
+    """
+    columns: Dict[str, np.ndarray] = {}
+    for spec in specs:
+        if spec.name == "sma":
+            arrays = (sma(closes, *spec.params),)
+        elif spec.name == "ema":
+            arrays = (ema(closes, *spec.params),)
+        elif spec.name == "rsi":
+            arrays = (rsi(closes, *spec.params),)
+        elif spec.name == "macd":
+            arrays = macd(closes, *spec.params)
+        else:
+            arrays = bollinger(closes, *spec.params)
+        columns.update(zip(spec.columns, arrays))
+    return columns
+
+
+class IndicatorEngine(LoggerMixin):
+    """
+    Calcula indicadores para vários símbolos com memorização por última barra.
+
+    A memória guarda, por (símbolo, intervalo, primeira barra, última barra,
+    número de barras, últimos MEMO_TAIL_BARS fechamentos), as colunas já
+    calculadas; uma nova barra ou um novo preço na última barra muda a chave e
+    o símbolo é recalculado. A memória é um LRU limitado por entradas.
+
+    Attributes:
+        max_entries: Número máximo de séries memorizadas
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Inicializa o motor.
+
+        Args:
+            max_entries: Limite de séries memorizadas (padrão: INDICATOR_MEMO_MAX_ENTRIES)
+        """
+        self.max_entries = max_entries or settings.INDICATOR_MEMO_MAX_ENTRIES
+        self._memo: "OrderedDict[tuple, Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def compute(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        interval: str,
+        specs: List[IndicatorSpec],
+    ) -> Dict[str, Dict[str, list]]:
+        """
+        Calcula os indicadores pedidos para os históricos informados.
+
+        Args:
+            frames: Histórico (com coluna "Close") por símbolo
+            interval: Intervalo das barras (parte da chave de memorização)
+            specs: Indicadores pedidos
+
+        Returns:
+            Por símbolo, um dicionário colunar com `dates` e as colunas pedidas
+            (NaN das barras de aquecimento vira None)
+        """
+        series: Dict[str, pd.Series] = {}
+        for symbol, hist in frames.items():
+            if hist is None or hist.empty or "Close" not in hist:
+                continue
+            closes = hist["Close"].dropna()
+            if not closes.empty:
+                series[symbol] = closes
+
+        requested = [column for spec in specs for column in spec.columns]
+        values: Dict[str, Dict[str, list]] = {}
+        pending: Dict[int, List[str]] = {}
+        keys = {}
+        with self._lock:
+            for symbol, closes in series.items():
+                key = (
+                    symbol, interval, closes.index[0], closes.index[-1], len(closes),
+                    closes.iloc[-MEMO_TAIL_BARS:].to_numpy(dtype=np.float64).tobytes(),
+                )
+                keys[symbol] = key
+                memo = self._memo.get(key)
+                if memo is not None and all(column in memo for column in requested):
+                    self._memo.move_to_end(key)
+                    self._hits += 1
+                    values[symbol] = memo
+                else:
+                    self._misses += 1
+                    pending.setdefault(len(closes), []).append(symbol)
+
+        # Séries de mesmo tamanho são calculadas juntas em uma matriz
+        for symbols in pending.values():
+            matrix = np.vstack([series[s].to_numpy(dtype=np.float64) for s in symbols])
+            columns = compute_indicators(matrix, specs)
+            for row, symbol in enumerate(symbols):
+                values[symbol] = {
+                    "dates": self._format_dates(series[symbol].index),
+                    **{name: self._to_list(array[row]) for name, array in columns.items()},
+                }
+
+        with self._lock:
+            for symbols in pending.values():
+                for symbol in symbols:
+                    key = keys[symbol]
+                    # Mantém colunas de outros pedidos já memorizadas para a mesma barra
+                    self._memo[key] = {**self._memo.get(key, {}), **values[symbol]}
+                    self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+
+        # As listas memorizadas são compartilhadas: a resposta não deve alterá-las
+        return {
+            symbol: {
+                "dates": values[symbol]["dates"],
+                **{column: values[symbol][column] for column in requested},
+            }
+            for symbol in series
+        }
+
+    def _format_dates(self, index: pd.Index) -> List[str]:
+        """Formata as datas das barras como na resposta colunar do histórico."""
+        if isinstance(index, pd.DatetimeIndex):
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            return np.char.replace(np.datetime_as_string(index.values, unit='s'), 'T', ' ').tolist()
+        return index.astype(str).tolist()
+
+    def _to_list(self, array: np.ndarray) -> list:
+        """Converte uma coluna para lista, com None nas barras de aquecimento."""
+        result = np.round(array, 4).tolist()
+        # Sem NaN nos fechamentos, só o início da série (aquecimento) é NaN
+        valid = ~np.isnan(array)
+        warmup = int(valid.argmax()) if valid.any() else len(result)
+        result[:warmup] = [None] * warmup
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retorna as estatísticas da memorização.
+
+        Returns:
+            Dicionário com séries memorizadas, acertos e falhas
+        """
+        with self._lock:
+            return {"entries": len(self._memo), "hits": self._hits, "misses": self._misses}
+
+
+# Instância única compartilhada pelo serviço
+indicator_engine = IndicatorEngine()
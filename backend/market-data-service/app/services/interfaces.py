@@ -15,10 +15,15 @@ Example:
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from models.requests import StockDataRequest
-from models.responses import StockDataResponse, ValidationResponse
+from models.responses import (
+    ColumnarHistoryResponse,
+    HistoricalDataPoint,
+    StockDataResponse,
+    ValidationResponse,
+)
 
 
 class IMarketDataProvider(ABC):
@@ -64,13 +69,19 @@ class IMarketDataProvider(ABC):
         pass
     
     @abstractmethod
-    def search_tickers(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def search_tickers(
+        self,
+        query: str,
+        limit: int = 10,
+        enrich: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Busca tickers por nome ou símbolo.
         
         Args:
             query: Termo de busca
             limit: Número máximo de resultados
+            enrich: Se True, inclui preço e moeda atualizados nos resultados
             
         Returns:
             Lista de tickers encontrados
@@ -89,6 +100,67 @@ class IMarketDataProvider(ABC):
             Lista de ações em tendência
         """
         pass
+    
+    def warm_up(self) -> Dict[str, Any]:
+        """
+        Pré-carrega as estruturas locais do provedor (listas, índices).
+        
+        Returns:
+            Dicionário com o que foi carregado (vazio se não suportado)
+        """
+        return {}
+    
+    def find_ticker(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca um ticker na lista local do provedor, sem chamadas externas.
+        
+        Args:
+            symbol: Símbolo do ativo
+            
+        Returns:
+            Dicionário com symbol, name, sector e type, ou None se o
+            provedor não tem o ticker (ou não mantém uma lista local)
+        """
+        return None
+
+
+class IAsyncMarketDataProvider(ABC):
+    """
+    Interface assíncrona para provedores de dados de mercado.
+    
+    Usada pelas rotas assíncronas para buscar dados sem ocupar uma thread
+    enquanto aguardam a resposta do provedor. Implementações devem usar um
+    cliente HTTP assíncrono com pool de conexões.
+    """
+    
+    @abstractmethod
+    async def get_historical_data(
+        self,
+        symbol: str,
+        period: str = "1mo",
+        interval: str = "1d",
+        output_format: str = "records"
+    ) -> Union[List[HistoricalDataPoint], ColumnarHistoryResponse]:
+        """
+        Obtém a série histórica de uma ação.
+        
+        Args:
+            symbol: Símbolo da ação
+            period: Período (ex: '1mo', '1y')
+            interval: Intervalo (ex: '1d', '1h')
+            output_format: 'records' (lista de pontos) ou 'columnar'
+            
+        Returns:
+            Lista de pontos históricos ou série colunar
+            
+        Raises:
+            ProviderException: Erro na comunicação com o provedor
+        """
+        pass
+    
+    async def aclose(self) -> None:
+        """Libera recursos do provedor (conexões HTTP)."""
+        pass
 
 
 class ICacheService(ABC):
@@ -97,8 +169,14 @@ class ICacheService(ABC):
     
     Define os métodos necessários para implementar diferentes
     estratégias de cache (Redis, Memcached, in-memory, etc.).
+    
+    Attributes:
+        is_remote: Indica se as operações fazem I/O de rede e, portanto,
+            não devem ser chamadas diretamente no event loop
     """
     
+    is_remote: bool = False
+    
     @abstractmethod
     def get(self, key: str) -> Optional[Any]:
         """
@@ -149,6 +227,52 @@ class ICacheService(ABC):
             True se limpo com sucesso
         """
         pass
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Obtém vários valores do cache.
+        
+        Implementações com acesso remoto devem sobrescrever este método
+        para buscar todas as chaves em uma única ida ao servidor.
+        
+        Args:
+            keys: Chaves do cache
+            
+        Returns:
+            Dicionário apenas com as chaves encontradas
+        """
+        result = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+    
+    def set_many(self, items: Dict[str, Any], ttl: int = 300) -> bool:
+        """
+        Armazena vários valores no cache com o mesmo TTL.
+        
+        Args:
+            items: Dicionário chave -> valor
+            ttl: Tempo de vida em segundos
+            
+        Returns:
+            True se todos foram armazenados com sucesso
+        """
+        return all([self.set(key, value, ttl) for key, value in items.items()])
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do cache (acertos, falhas, ocupação).
+        
+        Returns:
+            Dicionário de estatísticas (vazio se não suportado)
+        """
+        return {}
+    
+    def close(self) -> None:
+        """Libera recursos do cache (threads, conexões)."""
+        pass
 
 
 class IRateLimiter(ABC):
@@ -157,15 +281,22 @@ class IRateLimiter(ABC):
     
     Define métodos para controle de taxa de requisições,
     prevenindo sobrecarga dos serviços externos.
+    
+    Attributes:
+        is_remote: Indica se as operações fazem I/O de rede e, portanto,
+            não devem ser chamadas diretamente no event loop
     """
     
+    is_remote: bool = False
+    
     @abstractmethod
-    def is_allowed(self, identifier: str) -> bool:
+    def is_allowed(self, identifier: str, cost: int = 1) -> bool:
         """
         Verifica se uma requisição é permitida.
         
         Args:
             identifier: Identificador único (IP, usuário, etc.)
+            cost: Peso da requisição (ex: número de tickers de um lote)
             
         Returns:
             True se a requisição é permitida
@@ -197,6 +328,19 @@ class IRateLimiter(ABC):
             True se resetado com sucesso
         """
         pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do rate limiter.
+        
+        Returns:
+            Dicionário de estatísticas (vazio se não suportado)
+        """
+        return {}
+    
+    def close(self) -> None:
+        """Libera recursos do rate limiter (threads, conexões)."""
+        pass
 
 
 class IDataProcessor(ABC):
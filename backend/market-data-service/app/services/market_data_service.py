@@ -1,36 +1,93 @@
 
 
+import asyncio
+import hashlib
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from yfinance import EquityQuery
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from deep_translator import GoogleTranslator
 
+from core.blocking import BlockingExecutor, blocking_executor
+from core.cache_status import capture_stale, capture_stale_async, mark_stale
+from core.compute_pool import ComputePool, compute_pool
 from core.config import settings
+from core.fanout import FanOutExecutor, FanOutResult
 from core.logging import LoggerMixin
+from core.single_flight import AsyncSingleFlight, SingleFlight
+from core.upstream import UpstreamUnavailableError, upstream_gateway
 from models.requests import BulkDataRequest, SearchRequest, StockDataRequest
 from models.responses import (
     BulkDataResponse,
+    ColumnarHistoryResponse,
     SearchResponse,
     SearchResultItem,
     StockDataResponse,
     ValidationResponse,
     HistoricalDataPoint,
 )
+from services.async_yahoo_provider import AsyncYahooFinanceProvider
 from services.interfaces import (
+    IAsyncMarketDataProvider,
     ICacheService,
     IMarketDataProvider,
     IRateLimiter,
     ProviderException,
     RateLimitException,
 )
+from services.cache_service import BoundedLRUCache
+from services.portfolio_optimizer import (
+    OptimizationError,
+    annualize,
+    check_bounds,
+    describe_portfolio,
+    interpolated_start,
+    max_return_weights,
+    max_sharpe,
+    min_variance,
+    shrink_covariance,
+    solve_frontier_segment,
+)
+from services.rate_limiter import (
+    RedisRateLimiter,
+    SharedMemoryRateLimiter,
+    TokenBucketRateLimiter,
+)
+from services.redis_cache import RedisCache
+from services.indicators import indicator_engine, parse_indicator_specs
+from services.ohlcv_store import ohlcv_store
+from services.portfolio_analytics import (
+    SIMULATION_BLOCK_PATHS,
+    TRADING_DAYS_PER_YEAR,
+    align_closes,
+    correlation_from_covariance,
+    covariance_factor,
+    covariance_matrix,
+    risk_metrics,
+    rolling_correlation,
+    rounded_list,
+    simple_returns,
+    simulate_portfolio_returns,
+    simulation_blocks,
+    var_cvar,
+)
+from services.symbol_popularity import SymbolPopularity, symbol_popularity
 from services.yahoo_finance_provider import YahooFinanceProvider
-from utils.Ticker_ops import convert_to_serializable, safe_ticker_operation
+from utils.market_calendar import get_calendar, market_for_symbol
+from utils.Ticker_ops import (
+    convert_to_columnar,
+    convert_to_serializable,
+    download_history_batch,
+    gateway_history_fetch,
+    safe_ticker_operation,
+)
 
 
 # Adicionar constantes para os símbolos por categoria
@@ -81,6 +138,15 @@ SYMBOL_NAMES = {
     }
 
 
+# Horizontes da tabela de performance (None = variação sobre o pregão anterior)
+PERFORMANCE_HORIZONS = {
+    "1D": None,
+    "7D": pd.DateOffset(days=7),
+    "1M": pd.DateOffset(months=1),
+    "3M": pd.DateOffset(months=3),
+    "6M": pd.DateOffset(months=6),
+    "1Y": pd.DateOffset(years=1),
+}
 
 BR_PREDEFINED_SCREENER_QUERIES = {
         "mercado_todo": EquityQuery('and', [
@@ -159,125 +225,39 @@ BR_PREDEFINED_SCREENER_QUERIES = {
     }
 
 
-
-class InMemoryCache(ICacheService):
+def create_cache_service() -> ICacheService:
     """
-    Implementação simples de cache em memória.
+    Cria o serviço de cache configurado em CACHE_BACKEND.
     
-    Para produção, recomenda-se usar Redis ou Memcached.
+    Returns:
+        RedisCache para "redis" (compartilhado entre workers) ou
+        BoundedLRUCache para "memory"
     """
-    
-    def __init__(self):
-        """Inicializa o cache em memória."""
-        self._cache: Dict[str, Dict[str, Any]] = {}
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Obtém valor do cache verificando TTL."""
-        if key not in self._cache:
-            return None
-        
-        entry = self._cache[key]
-        if time.time() > entry['expires_at']:
-            del self._cache[key]
-            return None
-        
-        return entry['value']
-    
-    def set(self, key: str, value: Any, ttl: int = 300) -> bool:
-        """Armazena valor no cache com TTL."""
-        try:
-            self._cache[key] = {
-                'value': value,
-                'expires_at': time.time() + ttl
-            }
-            return True
-        except Exception:
-            return False
-    
-    def delete(self, key: str) -> bool:
-        """Remove chave do cache."""
-        try:
-            if key in self._cache:
-                del self._cache[key]
-            return True
-        except Exception:
-            return False
-    
-    def clear(self) -> bool:
-        """Limpa todo o cache."""
-        try:
-            self._cache.clear()
-            return True
-        except Exception:
-            return False
+    backend = settings.CACHE_BACKEND.lower()
+    if backend == "redis":
+        return RedisCache()
+    if backend != "memory":
+        raise ValueError(f"CACHE_BACKEND inválido: {settings.CACHE_BACKEND}")
+    return BoundedLRUCache()
 
 
-class SimpleRateLimiter(IRateLimiter):
+def create_rate_limiter() -> IRateLimiter:
     """
-    Implementação simples de rate limiter baseado em sliding window.
+    Cria o rate limiter configurado em RATE_LIMIT_BACKEND.
     
-    Para produção, recomenda-se usar Redis para distribuição.
+    Returns:
+        SharedMemoryRateLimiter para "shared" (workers do mesmo host),
+        RedisRateLimiter para "redis" (vários hosts) ou
+        TokenBucketRateLimiter para "memory"
     """
-    
-    def __init__(
-        self,
-        max_requests: int = None,
-        window_seconds: int = None
-    ):
-        """
-        Inicializa o rate limiter.
-        
-        Args:
-            max_requests: Número máximo de requisições por janela
-            window_seconds: Tamanho da janela em segundos
-        """
-        self.max_requests = max_requests or settings.RATE_LIMIT_REQUESTS
-        self.window_seconds = window_seconds or settings.RATE_LIMIT_WINDOW
-        self._requests: Dict[str, List[float]] = {}
-    
-    def is_allowed(self, identifier: str) -> bool:
-        """Verifica se requisição é permitida."""
-        now = time.time()
-        
-        # Inicializar lista se não existe
-        if identifier not in self._requests:
-            self._requests[identifier] = []
-        
-        # Limpar requisições antigas
-        self._requests[identifier] = [
-            req_time for req_time in self._requests[identifier]
-            if now - req_time < self.window_seconds
-        ]
-        
-        # Verificar limite
-        if len(self._requests[identifier]) >= self.max_requests:
-            return False
-        
-        # Adicionar requisição atual
-        self._requests[identifier].append(now)
-        return True
-    
-    def get_remaining_requests(self, identifier: str) -> int:
-        """Obtém número de requisições restantes."""
-        if identifier not in self._requests:
-            return self.max_requests
-        
-        now = time.time()
-        recent_requests = [
-            req_time for req_time in self._requests[identifier]
-            if now - req_time < self.window_seconds
-        ]
-        
-        return max(0, self.max_requests - len(recent_requests))
-    
-    def reset_limit(self, identifier: str) -> bool:
-        """Reseta limite para um identificador."""
-        try:
-            if identifier in self._requests:
-                del self._requests[identifier]
-            return True
-        except Exception:
-            return False
+    backend = settings.RATE_LIMIT_BACKEND.lower()
+    if backend == "shared":
+        return SharedMemoryRateLimiter()
+    if backend == "redis":
+        return RedisRateLimiter()
+    if backend != "memory":
+        raise ValueError(f"RATE_LIMIT_BACKEND inválido: {settings.RATE_LIMIT_BACKEND}")
+    return TokenBucketRateLimiter()
 
 
 class MarketDataService(LoggerMixin):
@@ -287,8 +267,9 @@ class MarketDataService(LoggerMixin):
         symbol: str,
         period: str = "1mo",
         interval: str = "1d",
-        client_id: str = "default"
-    ) -> List[HistoricalDataPoint]:
+        client_id: str = "default",
+        output_format: str = "records"
+    ) -> Union[List[HistoricalDataPoint], ColumnarHistoryResponse]:
         """
         Obtém a série histórica de uma ação para o período especificado.
         Args:
@@ -296,8 +277,9 @@ class MarketDataService(LoggerMixin):
             period: Período (ex: '1mo', '1y', etc)
             interval: Intervalo (ex: '1d', '1h', etc)
             client_id: Identificador do cliente
+            output_format: 'records' (lista de pontos) ou 'columnar' (uma lista por campo)
         Returns:
-            Lista de pontos históricos
+            Lista de pontos históricos ou série colunar
         """
         from models.requests import StockDataRequest
         from models.responses import HistoricalDataPoint
@@ -313,9 +295,18 @@ class MarketDataService(LoggerMixin):
         try:
             request = StockDataRequest(symbol=symbol, period=period, interval=interval)
             ticker = yf.Ticker(symbol)
-            return self.provider._get_historical_data(ticker, request, symbol)
+            if output_format == "columnar":
+                history = self.provider._get_historical_columnar(ticker, request, symbol)
+            else:
+                history = self.provider._get_historical_data(ticker, request, symbol)
+            self._record_history(symbol, history)
+            return history
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             self.logger.error(f"Erro ao obter histórico para {symbol}: {e}")
+            if output_format == "columnar":
+                return ColumnarHistoryResponse(symbol=symbol, interval=interval)
             return []
 
     
@@ -335,28 +326,312 @@ class MarketDataService(LoggerMixin):
         provider: Provedor de dados de mercado
         cache_service: Serviço de cache
         rate_limiter: Limitador de taxa de requisições
+        fanout: Executor compartilhado para requisições com múltiplos tickers
+        single_flight: Coalescedor de buscas concorrentes para a mesma chave
+        async_single_flight: Coalescedor das buscas feitas no event loop
+        async_provider: Provedor assíncrono usado pelas rotas assíncronas
+        blocking: Executor do trabalho bloqueante das rotas assíncronas
+        popularity: Contador dos símbolos mais consultados (usado no aquecimento)
+        compute: Pool de processos dos cálculos numéricos pesados (Monte Carlo)
     """
     
     def __init__(
         self,
         provider: Optional[IMarketDataProvider] = None,
         cache_service: Optional[ICacheService] = None,
-        rate_limiter: Optional[IRateLimiter] = None
+        rate_limiter: Optional[IRateLimiter] = None,
+        fanout: Optional[FanOutExecutor] = None,
+        single_flight: Optional[SingleFlight] = None,
+        async_provider: Optional[IAsyncMarketDataProvider] = None,
+        blocking: Optional[BlockingExecutor] = None,
+        popularity: Optional[SymbolPopularity] = None,
+        compute: Optional[ComputePool] = None
     ):
         """
         Inicializa o serviço de market data.
         
         Args:
             provider: Provedor de dados (padrão: YahooFinanceProvider)
-            cache_service: Serviço de cache (padrão: InMemoryCache)
-            rate_limiter: Rate limiter (padrão: SimpleRateLimiter)
+            cache_service: Serviço de cache (padrão: definido por CACHE_BACKEND)
+            rate_limiter: Rate limiter (padrão: definido por RATE_LIMIT_BACKEND)
+            fanout: Executor de fan-out (padrão: FanOutExecutor)
+            single_flight: Coalescedor de buscas (padrão: SingleFlight)
+            async_provider: Provedor assíncrono (padrão: AsyncYahooFinanceProvider
+                quando o provedor síncrono também é o padrão)
+            blocking: Executor de trabalho bloqueante (padrão: instância global)
+            popularity: Contador de popularidade (padrão: instância global)
+            compute: Pool de processos (padrão: instância global)
         """
+        if async_provider is None and provider is None:
+            async_provider = AsyncYahooFinanceProvider()
         self.provider = provider or YahooFinanceProvider()
-        self.cache_service = cache_service or InMemoryCache()
-        self.rate_limiter = rate_limiter or SimpleRateLimiter()
+        self.async_provider = async_provider
+        self.cache_service = cache_service or create_cache_service()
+        self.rate_limiter = rate_limiter or create_rate_limiter()
+        self.fanout = fanout or FanOutExecutor()
+        self.single_flight = single_flight or SingleFlight("market_data_service")
+        self.async_single_flight = AsyncSingleFlight("market_data_service_async")
+        self.blocking = blocking or blocking_executor
+        self.popularity = popularity or symbol_popularity
+        self.compute = compute or compute_pool
+        self._revalidating: set = set()
+        self._revalidating_lock = threading.Lock()
+        # Pool próprio: os loaders revalidados usam o fan-out (ex: visão geral
+        # do mercado) e não podem disputar as threads dele com as requisições
+        self._revalidator = ThreadPoolExecutor(
+            max_workers=settings.CACHE_REVALIDATION_WORKERS,
+            thread_name_prefix="revalidate"
+        )
+        self._background_tasks: set = set()
         
         self.logger.info("MarketDataService inicializado com sucesso")
     
+    def shutdown(self) -> None:
+        """
+        Libera os recursos de longa duração do serviço.
+        
+        O cliente HTTP do provedor assíncrono é fechado à parte, no event
+        loop, por `async_provider.aclose()`. A popularidade dos símbolos é
+        gravada para o aquecimento da próxima inicialização.
+        """
+        self.popularity.save()
+        self._revalidator.shutdown(wait=False, cancel_futures=True)
+        self.fanout.shutdown()
+        self.blocking.shutdown()
+        self.compute.shutdown()
+        self.cache_service.close()
+        self.rate_limiter.close()
+    
+    def _cached_call(
+        self,
+        cache_key: str,
+        ttl: int,
+        loader: Callable[[], Any],
+        refresh_ttl: Optional[int] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Obtém um valor pelo cache com política stale-while-revalidate.
+        
+        O valor é armazenado junto com o instante em que deixa de ser fresco
+        e fica no cache por `ttl + CACHE_MAX_STALENESS_SECONDS`:
+        
+        - fresco: servido do cache;
+        - vencido há até CACHE_STALE_GRACE_SECONDS: servido imediatamente e
+          atualizado em segundo plano;
+        - vencido além da janela: buscado de forma síncrona; se o provedor
+          falhar, o valor vencido é servido (até a staleness máxima).
+        
+        Buscas concorrentes para a mesma chave são coalescidas, e todos os
+        chamadores recebem o mesmo indicador de vencido. Com
+        `refresh_ttl`, o valor é sempre buscado no provedor e armazenado com
+        esse TTL (usado pelo agendador de atualização em segundo plano).
+        
+        Args:
+            cache_key: Chave do cache
+            ttl: Tempo em segundos em que o valor é considerado fresco
+            loader: Função que busca o valor no provedor
+            refresh_ttl: Força a atualização, armazenando com este TTL
+            
+        Returns:
+            Tupla (valor, vencido)
+        """
+        if not settings.ENABLE_CACHE:
+            return loader(), False
+        
+        if refresh_ttl is not None:
+            return self._shared_load(
+                cache_key, lambda: self._store(cache_key, refresh_ttl, loader())
+            )
+        
+        entry = self.cache_service.get(cache_key)
+        if entry is not None:
+            overdue = time.time() - entry["fresh_until"]
+            if overdue <= 0:
+                return entry["value"], False
+            if overdue <= settings.CACHE_STALE_GRACE_SECONDS:
+                self._revalidate(cache_key, ttl, loader)
+                mark_stale()
+                return entry["value"], True
+        
+        try:
+            return self._shared_load(
+                cache_key, lambda: self._load_and_store(cache_key, ttl, loader)
+            )
+        except Exception as e:
+            if entry is None:
+                raise
+            self.logger.warning(
+                f"Falha ao atualizar {cache_key}, servindo valor vencido: {e}"
+            )
+            mark_stale()
+            return entry["value"], True
+    
+    def _shared_load(self, cache_key: str, load: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Executa `load` uma única vez entre chamadores concorrentes da chave.
+        
+        A busca roda no contexto do líder; se ela servir dados vencidos (ex:
+        um valor aninhado obtido do cache), a marcação volta junto com o
+        resultado e é aplicada à requisição de cada chamador.
+        
+        Returns:
+            Tupla (valor, vencido)
+        """
+        value, stale = self.single_flight.do(cache_key, lambda: capture_stale(load))
+        if stale:
+            mark_stale()
+        return value, stale
+    
+    def _load_and_store(
+        self,
+        cache_key: str,
+        ttl: int,
+        loader: Callable[[], Any]
+    ) -> Any:
+        """Busca o valor (se não houver um fresco no cache) e o armazena."""
+        # Outra chamada pode ter atualizado o cache logo antes desta
+        entry = self.cache_service.get(cache_key)
+        if entry is not None and time.time() < entry["fresh_until"]:
+            return entry["value"]
+        
+        return self._store(cache_key, ttl, loader())
+    
+    def _store(self, cache_key: str, ttl: int, value: Any) -> Any:
+        """Armazena o valor, fresco por `ttl` e mantido até a staleness máxima."""
+        self.cache_service.set(
+            cache_key,
+            {"value": value, "fresh_until": time.time() + ttl},
+            ttl=ttl + settings.CACHE_MAX_STALENESS_SECONDS
+        )
+        return value
+    
+    def _revalidate(
+        self,
+        cache_key: str,
+        ttl: int,
+        loader: Callable[[], Any]
+    ) -> None:
+        """Agenda a atualização em segundo plano de uma chave vencida."""
+        with self._revalidating_lock:
+            if cache_key in self._revalidating:
+                return
+            self._revalidating.add(cache_key)
+        
+        def refresh():
+            try:
+                self._shared_load(
+                    cache_key, lambda: self._load_and_store(cache_key, ttl, loader)
+                )
+                self.logger.debug(f"Chave {cache_key} atualizada em segundo plano")
+            except Exception as e:
+                self.logger.warning(f"Falha na atualização em segundo plano de {cache_key}: {e}")
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(cache_key)
+        
+        try:
+            self._revalidator.submit(refresh)
+        except RuntimeError:
+            # Executor já finalizado (desligamento do serviço)
+            with self._revalidating_lock:
+                self._revalidating.discard(cache_key)
+    
+    async def _cached_call_async(
+        self,
+        cache_key: str,
+        ttl: int,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Versão de `_cached_call` para buscas assíncronas no event loop.
+        
+        Mesma política stale-while-revalidate; a atualização em segundo
+        plano é uma task do loop e as buscas concorrentes para a mesma chave
+        são coalescidas por `async_single_flight`, repassando a todos o
+        indicador de vencido. Só deve ser usada com um
+        cache local (sem I/O de rede no loop).
+        
+        Args:
+            cache_key: Chave do cache
+            ttl: Tempo em segundos em que o valor é considerado fresco
+            loader: Função que retorna a corrotina da busca no provedor
+            
+        Returns:
+            Tupla (valor, vencido)
+        """
+        if not settings.ENABLE_CACHE:
+            return await loader(), False
+        
+        entry = self.cache_service.get(cache_key)
+        if entry is not None:
+            overdue = time.time() - entry["fresh_until"]
+            if overdue <= 0:
+                return entry["value"], False
+            if overdue <= settings.CACHE_STALE_GRACE_SECONDS:
+                self._revalidate_async(cache_key, ttl, loader)
+                mark_stale()
+                return entry["value"], True
+        
+        try:
+            return await self._shared_load_async(
+                cache_key, lambda: self._load_and_store_async(cache_key, ttl, loader)
+            )
+        except Exception as e:
+            if entry is None:
+                raise
+            self.logger.warning(
+                f"Falha ao atualizar {cache_key}, servindo valor vencido: {e}"
+            )
+            mark_stale()
+            return entry["value"], True
+    
+    async def _shared_load_async(
+        self,
+        cache_key: str,
+        load: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Versão assíncrona de `_shared_load`, coalescida por `async_single_flight`."""
+        value, stale = await self.async_single_flight.do(
+            cache_key, lambda: capture_stale_async(load)
+        )
+        if stale:
+            mark_stale()
+        return value, stale
+    
+    async def _load_and_store_async(
+        self,
+        cache_key: str,
+        ttl: int,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Versão assíncrona de `_load_and_store`."""
+        entry = self.cache_service.get(cache_key)
+        if entry is not None and time.time() < entry["fresh_until"]:
+            return entry["value"]
+        
+        return self._store(cache_key, ttl, await loader())
+    
+    def _revalidate_async(
+        self,
+        cache_key: str,
+        ttl: int,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """Agenda no event loop a atualização em segundo plano de uma chave vencida."""
+        async def refresh():
+            try:
+                await self._shared_load_async(
+                    cache_key, lambda: self._load_and_store_async(cache_key, ttl, loader)
+                )
+                self.logger.debug(f"Chave {cache_key} atualizada em segundo plano")
+            except Exception as e:
+                self.logger.warning(f"Falha na atualização em segundo plano de {cache_key}: {e}")
+        
+        # Referência forte até o fim: o loop só guarda referências fracas às tasks
+        task = asyncio.ensure_future(refresh())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
     def get_stock_data(
         self,
         symbol: str,
@@ -385,15 +660,35 @@ class MarketDataService(LoggerMixin):
                 remaining=self.rate_limiter.get_remaining_requests(client_id)
             )
         
-        # Tentar obter do cache primeiro
+        response = self._load_stock_data(symbol, request)
+        self.popularity.record(symbol)
+        return response
+    
+    def warm_stock_data(self, symbol: str) -> None:
+        """
+        Carrega no cache os dados padrão de uma ação (período 1mo, intervalo 1d).
+        
+        Usado pelo aquecimento: não consome rate limit nem conta popularidade.
+        
+        Args:
+            symbol: Símbolo da ação
+            
+        Raises:
+            ProviderException: Erro na obtenção de dados
+        """
+        self._load_stock_data(
+            symbol, StockDataRequest(symbol=symbol, period="1mo", interval="1d")
+        )
+    
+    def _load_stock_data(
+        self,
+        symbol: str,
+        request: StockDataRequest
+    ) -> StockDataResponse:
+        """Obtém os dados da ação pelo cache (stale-while-revalidate) ou provedor."""
         cache_key = self._generate_cache_key("stock_data", symbol, request)
-        if settings.ENABLE_CACHE:
-            cached_data = self.cache_service.get(cache_key)
-            if cached_data:
-                self.logger.info(f"Dados obtidos do cache para {symbol}")
-                return StockDataResponse(**cached_data)
         
-        try:
+        def load() -> Dict[str, Any]:
             # Obter dados do provedor
             self.logger.info(f"Obtendo dados do provedor para {symbol}")
             start_time = time.time()
@@ -404,16 +699,19 @@ class MarketDataService(LoggerMixin):
             self.logger.info(
                 f"Dados obtidos em {processing_time:.2f}ms para {symbol}"
             )
-            
-            # Armazenar no cache
-            if settings.ENABLE_CACHE:
-                self.cache_service.set(
-                    cache_key,
-                    data.dict(),
-                    ttl=settings.CACHE_TTL_SECONDS
-                )
-            
-            return data
+            return data.dict()
+        
+        try:
+            # Cache com stale-while-revalidate; buscas concorrentes são coalescidas
+            data, stale = self._cached_call(
+                cache_key,
+                self._ttl_for(settings.CACHE_TTL_SECONDS, [market_for_symbol(symbol)]),
+                load
+            )
+            response = StockDataResponse(**data)
+            if stale:
+                response.metadata = {**(response.metadata or {}), "stale": True}
+            return response
             
         except ProviderException:
             # Re-raise provider exceptions
@@ -451,7 +749,9 @@ class MarketDataService(LoggerMixin):
             
             search_results = []
             
-            results = self.provider.search_tickers(request.query, request.limit)
+            results = self.provider.search_tickers(
+                request.query, request.limit, enrich=request.enrich
+            )
             for result in results:
                 search_results.append(SearchResultItem(
                     symbol=result["symbol"],
@@ -505,29 +805,70 @@ class MarketDataService(LoggerMixin):
             f"para {len(request.symbols)} tickers"
         )
         
-        # Verificar rate limit (usar limite maior para bulk)
-        if not self.rate_limiter.is_allowed(f"{client_id}_bulk"):
+        # Verificar rate limit (balde próprio para bulk; cada ticker custa uma ficha)
+        if not self.rate_limiter.is_allowed(
+            f"{client_id}_bulk", cost=len(request.symbols)
+        ):
             raise RateLimitException()
         
-        successful_data = {}
+        fetched_data = {}
         errors = {}
         
-        # Processar cada ticker
-        for symbol in request.symbols:  # Corrigido: usar 'symbols' em vez de 'tickers'
-            try:
-                # Criar requisição individual simplificada
-                stock_request = StockDataRequest(
-                    symbol=symbol,
-                    period=request.period,
-                    interval=request.interval,
+        # Requisições individuais simplificadas e suas chaves de cache
+        # (as mesmas de get_stock_data, então o cache é compartilhado)
+        stock_requests = {
+            symbol: StockDataRequest(
+                symbol=symbol,
+                period=request.period,
+                interval=request.interval,
+            )
+            for symbol in request.symbols
+        }
+        cache_keys = {
+            symbol: self._generate_cache_key("stock_data", symbol, stock_request)
+            for symbol, stock_request in stock_requests.items()
+        }
+        
+        # Uma única ida ao cache para os tickers com valor fresco
+        cached = (
+            self.cache_service.get_many(list(cache_keys.values()))
+            if settings.ENABLE_CACHE else {}
+        )
+        pending = []
+        now = time.time()
+        for symbol in stock_requests:
+            entry = cached.get(cache_keys[symbol])
+            if entry is not None and now < entry["fresh_until"]:
+                fetched_data[symbol] = StockDataResponse(**entry["value"])
+            else:
+                pending.append(symbol)
+        
+        def fetch(symbol: str) -> StockDataResponse:
+            # Mesmo caminho de get_stock_data (sem verificar rate limit novamente):
+            # valores vencidos seguem o stale-while-revalidate e buscas
+            # concorrentes do mesmo ticker são coalescidas
+            return self._load_stock_data(symbol, stock_requests[symbol])
+        
+        # Processar os tickers restantes em paralelo
+        for result in self.fanout.map(fetch, pending):
+            symbol = result.item
+            if result.ok:
+                fetched_data[symbol] = result.value
+                # As threads do fan-out não herdam o contexto da requisição
+                if (result.value.metadata or {}).get("stale"):
+                    mark_stale()
+            else:
+                self.logger.warning(
+                    f"Erro ao obter dados para {symbol}: {result.error}"
                 )
-                
-                # Obter dados (sem verificar rate limit novamente)
-                data = self.provider.get_stock_data(symbol, stock_request)
-                successful_data[symbol] = data
-            except Exception as e:
-                self.logger.warning(f"Erro ao obter dados para {symbol}: {e}")
-                errors[symbol] = str(e)
+                errors[symbol] = str(result.error)
+        
+        # Preservar a ordem da requisição
+        successful_data = {
+            symbol: fetched_data[symbol]
+            for symbol in stock_requests
+            if symbol in fetched_data
+        }
         
         processing_time = (time.time() - start_time) * 1000
         
@@ -571,27 +912,16 @@ class MarketDataService(LoggerMixin):
         if not self.rate_limiter.is_allowed(client_id):
             raise RateLimitException()
         
-        # Verificar cache primeiro
         cache_key = f"validation:{symbol}"
         
-        if settings.ENABLE_CACHE:
-            cached_result = self.cache_service.get(cache_key)
-            if cached_result:
-                return ValidationResponse(**cached_result)
-        
         try:
-            # Obter validação do provedor
-            result = self.provider.validate_ticker(symbol)
-            
-            # Cache resultado por mais tempo (validação não muda frequentemente)
-            if settings.ENABLE_CACHE:
-                self.cache_service.set(
-                    cache_key,
-                    result.dict(),
-                    ttl=settings.CACHE_TTL_SECONDS * 4  # 4x o TTL normal
-                )
-            
-            return result
+            # Cache por mais tempo (validação não muda frequentemente): 4x o TTL normal
+            result, _ = self._cached_call(
+                cache_key,
+                settings.CACHE_TTL_SECONDS * 4,
+                lambda: self.provider.validate_ticker(symbol).dict()
+            )
+            return ValidationResponse(**result)
             
         except Exception as e:
             error_msg = f"Erro na validação: {str(e)}"
@@ -606,6 +936,7 @@ class MarketDataService(LoggerMixin):
         self,
         market: str = "BR",
         client_id: str = "default",
+        refresh_ttl: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Obtém ações em tendência.
@@ -613,6 +944,7 @@ class MarketDataService(LoggerMixin):
         Args:
             market: Mercado alvo
             client_id: Identificador do cliente
+            refresh_ttl: Força a atualização do cache com este TTL
             
         Returns:
             Lista de ações em tendência
@@ -621,20 +953,15 @@ class MarketDataService(LoggerMixin):
         if not self.rate_limiter.is_allowed(client_id):
             raise RateLimitException()
         
-        # Verificar cache
         cache_key = f"trending:{market}"
         
-        if settings.ENABLE_CACHE:
-            cached_data = self.cache_service.get(cache_key)
-            if cached_data:
-                return cached_data
-        
         try:
-            trending_data = self.provider.get_trending_stocks(market)
-            
-            if settings.ENABLE_CACHE:
-                self.cache_service.set(f"trending:{market}", trending_data, ttl=60)
-            
+            trending_data, _ = self._cached_call(
+                cache_key,
+                self._ttl_for(60, [market]),
+                lambda: self.provider.get_trending_stocks(market),
+                refresh_ttl=refresh_ttl
+            )
             return trending_data
         except Exception as e:
             error_msg = f"Erro ao obter trending: {str(e)}"
@@ -645,83 +972,295 @@ class MarketDataService(LoggerMixin):
                 error_code="TRENDING_ERROR"
             )
     
-    def get_service_health(self) -> Dict[str, Any]:
+    # ==================== MÉTODOS ASSÍNCRONOS ====================
+    
+    def _serve_fresh(self, cache_key: str, client_id: Optional[str] = None) -> Optional[Any]:
         """
-        Verifica a saúde do serviço e dependências.
+        Obtém um valor fresco do cache direto no event loop.
         
-        Returns:
-            Status detalhado do serviço
-        """
-        health_data = {
-            "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
-            "version": settings.API_VERSION,
-            "cache_status": "unknown",
-            "provider_status": "unknown"
-        }
+        Só consulta quando cache e rate limiter são locais (sem I/O de rede).
+        Em um acerto, o rate limit do cliente é aplicado aqui; em uma falta
+        nada é consumido, e o método síncrono faz a verificação no executor.
         
-        try:
-            # Testar cache
-            test_key = "health_check"
-            self.cache_service.set(test_key, "test", ttl=1)
-            if self.cache_service.get(test_key) == "test":
-                health_data["cache_status"] = "healthy"
-            else:
-                health_data["cache_status"] = "unhealthy"
-            self.cache_service.delete(test_key)
+        Args:
+            cache_key: Chave do cache
+            client_id: Identificador do cliente (None para não aplicar rate limit)
             
-        except Exception as e:
-            health_data["cache_status"] = f"error: {str(e)}"
-        
-        try:
-            # Testar provedor com ticker simples
-            test_validation = self.provider.validate_ticker("PETR4.SA")
-            if test_validation.symbol:
-                health_data["provider_status"] = "healthy"
-            else:
-                health_data["provider_status"] = "unhealthy"
-                
-        except Exception as e:
-            health_data["provider_status"] = f"error: {str(e)}"
-        
-        # Determinar status geral
+        Returns:
+            Valor fresco ou None se ausente, vencido ou não consultável no loop
+            
+        Raises:
+            RateLimitException: Se o rate limit for excedido
+        """
         if (
-            health_data["cache_status"] == "healthy" and
-            health_data["provider_status"] == "healthy"
+            not settings.ENABLE_CACHE
+            or self.cache_service.is_remote
+            or self.rate_limiter.is_remote
         ):
-            health_data["status"] = "healthy"
-        else:
-            health_data["status"] = "degraded"
+            return None
         
-        return health_data
+        entry = self.cache_service.get(cache_key)
+        if entry is None or time.time() >= entry["fresh_until"]:
+            return None
+        
+        if client_id is not None and not self.rate_limiter.is_allowed(client_id):
+            raise RateLimitException(
+                f"Rate limit excedido para cliente {client_id}",
+                remaining=self.rate_limiter.get_remaining_requests(client_id)
+            )
+        return entry["value"]
     
-    def clear_cache(self) -> bool:
+    async def get_stock_data_async(
+        self,
+        symbol: str,
+        request: StockDataRequest,
+        client_id: str = "default",
+    ) -> StockDataResponse:
         """
-        Limpa todo o cache do serviço.
+        Versão assíncrona de `get_stock_data`.
         
-        Returns:
-            True se o cache foi limpo com sucesso
+        Acertos frescos do cache são respondidos no event loop; o restante
+        roda no executor de trabalho bloqueante.
         """
-        try:
-            result = self.cache_service.clear()
-            self.logger.info("Cache limpo com sucesso")
-            return result
-        except Exception as e:
-            self.logger.error(f"Erro ao limpar cache: {e}")
-            return False
-    
-    # Métodos auxiliares privados
+        data = self._serve_fresh(
+            self._generate_cache_key("stock_data", symbol, request), client_id
+        )
+        if data is not None:
+            self.popularity.record(symbol)
+            return StockDataResponse(**data)
+        return await self.blocking.run(self.get_stock_data, symbol, request, client_id)
     
-    def _generate_cache_key(
+    async def validate_ticker_async(
         self,
-        operation: str,
         symbol: str,
-        request: StockDataRequest
-    ) -> str:
-        """Gera chave única para cache baseada nos parâmetros."""
-        # Para modelos simplificados, usar apenas os campos disponíveis
-        key_parts = [
-            operation,
+        client_id: str = "default",
+    ) -> ValidationResponse:
+        """Versão assíncrona de `validate_ticker` (acertos frescos no event loop)."""
+        result = self._serve_fresh(f"validation:{symbol}", client_id)
+        if result is not None:
+            return ValidationResponse(**result)
+        return await self.blocking.run(self.validate_ticker, symbol, client_id)
+    
+    async def get_trending_stocks_async(
+        self,
+        market: str = "BR",
+        client_id: str = "default",
+    ) -> List[Dict[str, Any]]:
+        """Versão assíncrona de `get_trending_stocks` (acertos frescos no event loop)."""
+        trending_data = self._serve_fresh(f"trending:{market}", client_id)
+        if trending_data is not None:
+            return trending_data
+        return await self.blocking.run(self.get_trending_stocks, market, client_id)
+    
+    async def get_market_overview_async(self, category: str) -> Dict[str, Any]:
+        """Versão assíncrona de `get_market_overview` (acertos frescos no event loop)."""
+        response = self._serve_fresh(f"market_overview:{category.lower()}")
+        if response is not None:
+            return {**response, "stale": False}
+        return await self.blocking.run(self.get_market_overview, category)
+    
+    async def get_trending_async(
+        self,
+        categoria: str,
+        setor: Optional[str],
+        limit: Optional[int],
+        offset: Optional[int],
+        sort_field: Optional[str],
+        sort_asc: Optional[bool]
+    ) -> Dict[str, Any]:
+        """Versão assíncrona de `get_trending` (acertos frescos no event loop)."""
+        response = self._serve_fresh(
+            self._screener_cache_key(categoria, setor, limit, offset, sort_field, sort_asc)
+        )
+        if response is not None:
+            return self._slice_screen(response, limit)
+        return await self.blocking.run(
+            self.get_trending, categoria, setor, limit, offset, sort_field, sort_asc
+        )
+    
+    async def get_stock_history_async(
+        self,
+        symbol: str,
+        period: str = "1mo",
+        interval: str = "1d",
+        client_id: str = "default",
+        output_format: str = "records"
+    ) -> Union[List[HistoricalDataPoint], ColumnarHistoryResponse]:
+        """
+        Versão assíncrona de `get_stock_history`.
+        
+        Séries servidas pelo armazenamento OHLCV (leitura em disco) e
+        configurações sem provedor assíncrono ou com cache ou rate limiter
+        remotos rodam no executor de trabalho bloqueante; as demais são
+        buscadas pelo provedor assíncrono sem ocupar uma thread, com cache
+        stale-while-revalidate e coalescência de faltas concorrentes. Se o
+        provedor falhar (timeout, 5xx, 429), a série vencida é servida.
+        """
+        if (
+            self.async_provider is None
+            or self.cache_service.is_remote
+            or self.rate_limiter.is_remote
+            or ohlcv_store.supports(interval, period=period)
+        ):
+            return await self.blocking.run(
+                self.get_stock_history, symbol, period, interval, client_id, output_format
+            )
+        
+        if not self.rate_limiter.is_allowed(client_id):
+            raise RateLimitException(
+                f"Rate limit excedido para cliente {client_id}",
+                remaining=self.rate_limiter.get_remaining_requests(client_id)
+            )
+        
+        try:
+            # O cache é local: os modelos são guardados sem serialização
+            history, _ = await self._cached_call_async(
+                f"stock_history:{symbol.upper()}:{period}:{interval}:{output_format}",
+                self._ttl_for(settings.CACHE_TTL_SECONDS, [market_for_symbol(symbol)]),
+                lambda: self.async_provider.get_historical_data(
+                    symbol, period, interval, output_format
+                )
+            )
+            self._record_history(symbol, history)
+            return history
+        except UpstreamUnavailableError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Erro ao obter histórico para {symbol}: {e}")
+            if output_format == "columnar":
+                return ColumnarHistoryResponse(symbol=symbol, interval=interval)
+            return []
+    
+    def _record_history(
+        self,
+        symbol: str,
+        history: Union[List[HistoricalDataPoint], ColumnarHistoryResponse]
+    ) -> None:
+        """Conta a consulta na popularidade se a série não veio vazia."""
+        if isinstance(history, ColumnarHistoryResponse):
+            served = bool(history.dates)
+        else:
+            served = bool(history)
+        if served:
+            self.popularity.record(symbol)
+    
+    def get_service_health(self) -> Dict[str, Any]:
+        """
+        Verifica a saúde do serviço e dependências.
+        
+        Returns:
+            Status detalhado do serviço
+        """
+        health_data = {
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "version": settings.API_VERSION,
+            "cache_status": "unknown",
+            "cache_stats": {},
+            "provider_status": "unknown",
+            "metrics": {
+                "single_flight": self.single_flight.get_stats(),
+                "async_single_flight": self.async_single_flight.get_stats(),
+                "upstream": upstream_gateway.get_stats(),
+                "rate_limiter": self.rate_limiter.get_stats(),
+                "blocking_executor": self.blocking.get_stats(),
+                "compute_pool": self.compute.get_stats(),
+                "symbol_popularity": self.popularity.get_stats(),
+                "indicator_memo": indicator_engine.get_stats(),
+            }
+        }
+        
+        try:
+            # Testar cache
+            test_key = "health_check"
+            self.cache_service.set(test_key, "test", ttl=1)
+            if self.cache_service.get(test_key) == "test":
+                health_data["cache_status"] = "healthy"
+            else:
+                health_data["cache_status"] = "unhealthy"
+            self.cache_service.delete(test_key)
+            
+            health_data["cache_stats"] = self.cache_service.get_stats()
+            
+        except Exception as e:
+            health_data["cache_status"] = f"error: {str(e)}"
+        
+        try:
+            # Testar provedor com ticker simples
+            test_validation = self.provider.validate_ticker("PETR4.SA")
+            if test_validation.symbol:
+                health_data["provider_status"] = "healthy"
+            else:
+                health_data["provider_status"] = "unhealthy"
+                
+        except Exception as e:
+            health_data["provider_status"] = f"error: {str(e)}"
+        
+        # Determinar status geral
+        if (
+            health_data["cache_status"] == "healthy" and
+            health_data["provider_status"] == "healthy"
+        ):
+            health_data["status"] = "healthy"
+        else:
+            health_data["status"] = "degraded"
+        
+        return health_data
+    
+    def clear_cache(self) -> bool:
+        """
+        Limpa todo o cache do serviço.
+        
+        Returns:
+            True se o cache foi limpo com sucesso
+        """
+        try:
+            result = self.cache_service.clear()
+            self.logger.info("Cache limpo com sucesso")
+            return result
+        except Exception as e:
+            self.logger.error(f"Erro ao limpar cache: {e}")
+            return False
+    
+    # Métodos auxiliares privados
+    
+    def _ttl_for(self, ttl: int, markets: List[Optional[str]]) -> int:
+        """
+        Dimensiona o TTL de um valor pelo calendário dos mercados dos dados.
+        
+        Se todos os mercados estão quietos (fechados, com as cotações do
+        último pregão assentadas), o valor vale até a primeira próxima
+        abertura, limitado a CACHE_CLOSED_MARKET_MAX_TTL. Com algum mercado
+        aberto ou sem calendário (moedas, bolsas estrangeiras), vale o TTL base.
+        
+        Args:
+            ttl: TTL base em segundos
+            markets: Mercados dos dados ("BR", "US" ou None)
+            
+        Returns:
+            TTL em segundos
+        """
+        until_open = None
+        for market in set(markets):
+            calendar = get_calendar(market)
+            if calendar is None or not calendar.is_quiet():
+                return ttl
+            seconds = calendar.seconds_until_open()
+            until_open = seconds if until_open is None else min(until_open, seconds)
+        if until_open is None:
+            return ttl
+        return max(ttl, min(int(until_open), settings.CACHE_CLOSED_MARKET_MAX_TTL))
+    
+    def _generate_cache_key(
+        self,
+        operation: str,
+        symbol: str,
+        request: StockDataRequest
+    ) -> str:
+        """Gera chave única para cache baseada nos parâmetros."""
+        # Para modelos simplificados, usar apenas os campos disponíveis
+        key_parts = [
+            operation,
             symbol,
             getattr(request, 'period', 'default'),
         ]
@@ -758,49 +1297,49 @@ class MarketDataService(LoggerMixin):
             if not symbol_list:
                 raise ValueError(f"Nenhum símbolo válido fornecido")
 
-            result = {}
-            # Processa cada símbolo individualmente
-            for symbol in symbol_list:
-                try:
-                    def get_info(ticker):
-                        info = ticker.info
-                        if info.get("website", False):
-                            logo = f"https://t1.gstatic.com/faviconV2?client=SOCIAL&type=FAVICON&fallback_opts=TYPE,SIZE,URL&size=128&url={info.get('website', None)}"
-                        else:
-                            logo = None
-                        return {
-                            "symbol": symbol,
-                            "name": str(info.get("shortName", "") or info.get("longName", "")),
-                            "sector": str(info.get("sector", "")),
-                            "price": float(info.get("regularMarketPrice", 0) or 0),
-                            "change": float(info.get("regularMarketChangePercent", 0) or 0),
-                            "volume": int(info.get("regularMarketVolume", 0) or 0),
-                            "market_cap": float(info.get("marketCap", 0) or 0),
-                            "pe_ratio": float(info.get("trailingPE", 0) or 0),
-                            "dividend_yield": float(info.get("dividendYield", 0) or 0),
-                            "beta": float(info.get("beta", 0) or 0),
-                            "fiftyTwoWeekChangePercent": float(info.get("fiftyTwoWeekChangePercent", 0)or 0),
-                            "avg_volume_3m": int(info.get("averageDailyVolume3Month", 0) or 0),
-                            "returnOnEquity": float(info.get("returnOnEquity", 0) or 0),
-                            "book_value": float(info.get("bookValue", 0) or 0),
-                            "exchange": str(info.get("exchange", "")),
-                            "fullExchangeName": str(info.get("fullExchangeName", "")),
-                            "currency": str(info.get("currency", "")),
-                            "website": str(info.get("website", "")),
-                            "logo": logo
-                        }
+            def get_info(ticker):
+                info = ticker.info
+                if info.get("website", False):
+                    logo = f"https://t1.gstatic.com/faviconV2?client=SOCIAL&type=FAVICON&fallback_opts=TYPE,SIZE,URL&size=128&url={info.get('website', None)}"
+                else:
+                    logo = None
+                return {
+                    "symbol": ticker.ticker,
+                    "name": str(info.get("shortName", "") or info.get("longName", "")),
+                    "sector": str(info.get("sector", "")),
+                    "price": float(info.get("regularMarketPrice", 0) or 0),
+                    "change": float(info.get("regularMarketChangePercent", 0) or 0),
+                    "volume": int(info.get("regularMarketVolume", 0) or 0),
+                    "market_cap": float(info.get("marketCap", 0) or 0),
+                    "pe_ratio": float(info.get("trailingPE", 0) or 0),
+                    "dividend_yield": float(info.get("dividendYield", 0) or 0),
+                    "beta": float(info.get("beta", 0) or 0),
+                    "fiftyTwoWeekChangePercent": float(info.get("fiftyTwoWeekChangePercent", 0)or 0),
+                    "avg_volume_3m": int(info.get("averageDailyVolume3Month", 0) or 0),
+                    "returnOnEquity": float(info.get("returnOnEquity", 0) or 0),
+                    "book_value": float(info.get("bookValue", 0) or 0),
+                    "exchange": str(info.get("exchange", "")),
+                    "fullExchangeName": str(info.get("fullExchangeName", "")),
+                    "currency": str(info.get("currency", "")),
+                    "website": str(info.get("website", "")),
+                    "logo": logo
+                }
 
-                    ticker_info = safe_ticker_operation(symbol, get_info)
-                    result[symbol] = {
+            result = {}
+            # Processa os símbolos em paralelo; falhas individuais não afetam os demais
+            for item in self.fanout.map(
+                lambda symbol: safe_ticker_operation(symbol, get_info, "info"), symbol_list
+            ):
+                if item.ok:
+                    result[item.item] = {
                         "success": True,
-                        "data": ticker_info
+                        "data": item.value
                     }
-
-                except Exception as e:
-                    self.logger.error(f"Erro ao obter dados para {symbol}: {str(e)}")
-                    result[symbol] = {
+                else:
+                    self.logger.error(f"Erro ao obter dados para {item.item}: {str(item.error)}")
+                    result[item.item] = {
                         "success": False,
-                        "error": str(e),
+                        "error": str(item.error),
                         "data": None
                     }
 
@@ -825,10 +1364,21 @@ class MarketDataService(LoggerMixin):
         start: Optional[str],
         end: Optional[str],
         prepost: bool,
-        auto_adjust: bool
+        auto_adjust: bool,
+        batch: bool = True,
+        output_format: str = "records"
     ):
         """
         Obtém dados históricos de preços para múltiplos tickers simultaneamente.
+        
+        Com `batch=True` todos os símbolos são baixados com uma única chamada ao
+        yf.download e o DataFrame largo é separado por símbolo; símbolos de
+        bolsas diferentes são buscados individualmente (ver
+        `download_history_batch`). Com `batch=False` cada símbolo é buscado
+        individualmente via Ticker.history.
+
+        Com `output_format='columnar'` o campo `data` de cada símbolo traz uma
+        lista por coluna (`dates`, `open`, `close`, ...) em vez de uma lista de registros.
         """
         try:
             # Limpa e valida os símbolos
@@ -839,52 +1389,65 @@ class MarketDataService(LoggerMixin):
                     f"Nenhum símbolo válido fornecido"
                 )
 
-            result = {}
-            # Processa cada símbolo individualmente para garantir maior confiabilidade
-            for symbol in symbol_list:
+            # Condição para usar start/end OU period
+            if start and end:
+                history_kwargs = {"start": start, "end": end}
+            else:
+                history_kwargs = {"period": period}
+            history_kwargs.update(
+                interval=interval, prepost=prepost, auto_adjust=auto_adjust
+            )
+
+            items = None
+            if batch:
                 try:
-                    def fetch_history(ticker):
-                        # Condição para usar start/end OU period
-                        if start and end:
-                            return ticker.history(
-                                interval=interval,
-                                start=start,
-                                end=end,
-                                prepost=prepost,
-                                auto_adjust=auto_adjust
-                            )
-                        else:
-                            return ticker.history(
-                                period=period,
-                                interval=interval,
-                                prepost=prepost,
-                                auto_adjust=auto_adjust
-                            )
-
-                    ticker_data = safe_ticker_operation(symbol, fetch_history)
-
-                    # Processa os dados
-                    if isinstance(ticker_data, pd.DataFrame) and not ticker_data.empty:
-                        # Converte o índice de datetime para string
-                        ticker_data.index = ticker_data.index.strftime('%Y-%m-%d %H:%M:%S')
-                        
-                        # Converte para o formato desejado
+                    frames = download_history_batch(symbol_list, **history_kwargs)
+                    items = [FanOutResult(item=symbol, value=frames[symbol]) for symbol in symbol_list]
+                except ValueError as e:
+                    self.logger.warning(f"{e}; usando busca individual por símbolo")
+            if items is None:
+                items = self.fanout.map(
+                    lambda symbol: safe_ticker_operation(
+                        symbol, lambda ticker: ticker.history(**history_kwargs), "history"
+                    ),
+                    symbol_list
+                )
+
+            result = {}
+            # Falhas individuais não afetam os demais símbolos
+            for item in items:
+                symbol = item.item
+                if not item.ok:
+                    self.logger.error(f"Erro ao obter dados para {symbol}: {str(item.error)}")
+                    result[symbol] = {
+                        "success": False,
+                        "error": str(item.error),
+                        "data": []
+                    }
+                    continue
+
+                ticker_data = item.value
+                # Processa os dados
+                if isinstance(ticker_data, pd.DataFrame) and not ticker_data.empty:
+                    if output_format == "columnar":
                         result[symbol] = {
                             "success": True,
-                            "data": ticker_data.reset_index().fillna(0).to_dict(orient='records')
-                        }
-                    else:
-                        result[symbol] = {
-                            "success": False,
-                            "error": "Dados não encontrados",
-                            "data": []
+                            "data": convert_to_columnar(ticker_data)
                         }
-                        
-                except Exception as e:
-                    self.logger.error(f"Erro ao obter dados para {symbol}: {str(e)}")
+                        continue
+
+                    # Converte o índice de datetime para string
+                    ticker_data.index = ticker_data.index.strftime('%Y-%m-%d %H:%M:%S')
+                    
+                    # Converte para o formato desejado
+                    result[symbol] = {
+                        "success": True,
+                        "data": ticker_data.reset_index().fillna(0).to_dict(orient='records')
+                    }
+                else:
                     result[symbol] = {
                         "success": False,
-                        "error": str(e),
+                        "error": "Dados não encontrados",
                         "data": []
                     }
 
@@ -910,12 +1473,16 @@ class MarketDataService(LoggerMixin):
         start: Optional[str],
         end: Optional[str],
         prepost: bool,
-        auto_adjust: bool
+        auto_adjust: bool,
+        output_format: str = "records"
     ):
         """
         Obtém dados históricos de preços para um ticker.
         
         Retorna: Open, High, Low, Close, Volume, Dividends, Stock Splits
+
+        Com `output_format='columnar'` o campo `data` traz uma lista por coluna
+        (`dates`, `open`, `close`, ...) em vez de uma lista de registros.
         """
         def get_history(ticker):
             kwargs = {
@@ -930,12 +1497,34 @@ class MarketDataService(LoggerMixin):
             else:
                 kwargs["period"] = period
             return ticker.history(**kwargs)
-        data = safe_ticker_operation(symbol, get_history)
+
+        store_start, store_end = (start, end) if start and end else (None, None)
+        if ohlcv_store.supports(
+            interval, period=period, start=store_start, end=store_end,
+            prepost=prepost, auto_adjust=auto_adjust
+        ):
+            # Só a busca da cauda passa pelo gateway; as barras em disco são
+            # servidas mesmo com o circuito aberto
+            data = safe_ticker_operation(
+                symbol,
+                lambda ticker: ohlcv_store.get_history(
+                    symbol, interval,
+                    fetch=gateway_history_fetch(ticker),
+                    period=period, start=store_start, end=store_end
+                ),
+                endpoint=None
+            )
+        else:
+            data = safe_ticker_operation(symbol, get_history, "history")
         return {
             "symbol": symbol.upper(),
             "period": period,
             "interval": interval,
-            "data": convert_to_serializable(data)
+            "data": (
+                convert_to_columnar(data)
+                if output_format == "columnar"
+                else convert_to_serializable(data)
+            )
         }
 
 
@@ -950,7 +1539,7 @@ class MarketDataService(LoggerMixin):
         def get_info(ticker):
             return ticker.info
         
-        info = safe_ticker_operation(symbol, get_info)
+        info = safe_ticker_operation(symbol, get_info, "info")
         return {
             "symbol": symbol.upper(),
             "info": convert_to_serializable(info)
@@ -1071,7 +1660,7 @@ class MarketDataService(LoggerMixin):
         }
 
         
-        profile = safe_ticker_operation(symbol, get_profile)
+        profile = safe_ticker_operation(symbol, get_profile, "info")
         return {
             "symbol": symbol.upper(),
             "profile": convert_to_serializable(profile)
@@ -1089,7 +1678,7 @@ class MarketDataService(LoggerMixin):
         """
         try:
             # Inicializa a busca com os parâmetros corretos
-            search = yf.Search(
+            search = upstream_gateway.call("search", lambda: yf.Search(
                 query=query,
                 max_results=limit,
                 news_count=0,  # Não precisamos de notícias
@@ -1097,7 +1686,7 @@ class MarketDataService(LoggerMixin):
                 enable_fuzzy_query=True,  # Permite busca aproximada
                 recommended=0,  # Não precisamos de recomendados
                 raise_errors=True
-            )
+            ))
 
             quotes = search.quotes
             if not quotes:
@@ -1172,23 +1761,11 @@ class MarketDataService(LoggerMixin):
                     raise_errors=True
                 )
 
-                # Obter resultados baseado no tipo
-                if type == "all":
-                    results = lookup.get_all(count=count)
-                elif type == "stock":
-                    results = lookup.get_stock(count=count)
-                elif type == "etf":
-                    results = lookup.get_etf(count=count)
-                elif type == "future":
-                    results = lookup.get_future(count=count)
-                elif type == "index":
-                    results = lookup.get_index(count=count)
-                elif type == "mutualfund":
-                    results = lookup.get_mutualfund(count=count)
-                elif type == "currency":
-                    results = lookup.get_currency(count=count)
-                elif type == "cryptocurrency":
-                    results = lookup.get_cryptocurrency(count=count)
+                # Obter resultados baseado no tipo (get_all, get_stock, get_etf, ...)
+                get_results = getattr(lookup, f"get_{type.lower()}")
+                results = upstream_gateway.call(
+                    "lookup", lambda: get_results(count=count)
+                )
                 
                 # Converter DataFrame para formato serializável
                 if isinstance(results, pd.DataFrame):
@@ -1218,7 +1795,7 @@ class MarketDataService(LoggerMixin):
         def get_dividends(ticker):
             return ticker.dividends
         
-        data = safe_ticker_operation(symbol, get_dividends)
+        data = safe_ticker_operation(symbol, get_dividends, "dividends")
         return {
             "symbol": symbol.upper(),
             "dividends": convert_to_serializable(data)
@@ -1231,7 +1808,7 @@ class MarketDataService(LoggerMixin):
         def get_recommendations(ticker):
             return ticker.recommendations
         
-        data = safe_ticker_operation(symbol, get_recommendations)
+        data = safe_ticker_operation(symbol, get_recommendations, "recommendations")
         return {
             "symbol": symbol.upper(),
             "recommendations": convert_to_serializable(data)
@@ -1244,7 +1821,7 @@ class MarketDataService(LoggerMixin):
         def get_calendar(ticker):
             return ticker.calendar
         
-        data = safe_ticker_operation(symbol, get_calendar)
+        data = safe_ticker_operation(symbol, get_calendar, "calendar")
         return {
             "symbol": symbol.upper(),
             "calendar": convert_to_serializable(data)
@@ -1271,7 +1848,7 @@ class MarketDataService(LoggerMixin):
                 simplified_news.append(simplified_item)
             return simplified_news
         
-        data = safe_ticker_operation(symbol, get_news)
+        data = safe_ticker_operation(symbol, get_news, "news")
         return {
             "symbol": symbol.upper(),
             "news": convert_to_serializable(data)
@@ -1303,10 +1880,17 @@ class MarketDataService(LoggerMixin):
         limit: Optional[int],
         offset: Optional[int],
         sort_field: Optional[str],
-        sort_asc: Optional[bool]
+        sort_asc: Optional[bool],
+        refresh_ttl: Optional[int] = None
     ):
         """
         Obtém lista de ações baseada na categoria de screening selecionada.
+        
+        O provedor é consultado com ao menos SCREENER_PAGE_SIZE resultados e o
+        cache não depende do `limit`: pedidos menores (ex: os 5 primeiros dos
+        painéis) são fatiados da mesma página em cache. O resultado fica em
+        cache por SCREENER_CACHE_TTL_SECONDS com stale-while-revalidate. Com
+        `refresh_ttl`, o cache é atualizado com esse TTL.
         """
         try:
             if categoria not in BR_PREDEFINED_SCREENER_QUERIES:
@@ -1325,83 +1909,10 @@ class MarketDataService(LoggerMixin):
             else:
                 query = base_query
             
-            # Executar screening com try/except específico
-            try:
-                results = yf.screen(
-                    query=query,
-                    size=limit,
-                    offset=offset,
-                    sortField=sort_field,
-                    sortAsc=sort_asc
-                )
-            except Exception as e:
-                self.logger.error(f"Erro no yf.screen(): {str(e)}")
-                raise ValueError(
-                    f"Erro ao executar screening: {str(e)}"
-                )
-                
-            # Extrair quotes do resultado
-            if isinstance(results, dict) and 'quotes' in results:
-                quotes = results['quotes']
-            else:
-                quotes = results if isinstance(results, (list, tuple)) else []
-                
-            if not quotes:
-                self.logger.warning(f"Nenhum resultado encontrado para a categoria: {categoria}")
-                return {
-                    "categoria": categoria,
-                    "resultados": [],
-                    "total": 0,
-                    "offset": offset,
-                    "limit": limit,
-                    "ordenacao": {
-                        "campo": sort_field,
-                        "ascendente": sort_asc
-                    }
-                }
-            
-            # Processar e formatar resultados com validação
-            formatted_results = []
-            for item in quotes:
-                if not isinstance(item, dict):
-                    self.logger.warning(f"Item inválido no resultado: {item}")
-                    continue
-                
-                if item.get("website", False):
-                    logo = f"https://t1.gstatic.com/faviconV2?client=SOCIAL&type=FAVICON&fallback_opts=TYPE,SIZE,URL&size=128&url={item.get('website', None)}"
-                else:
-                    logo = None
-                    
-                try:
-                    formatted_results.append({
-                            "symbol": str(item.get("symbol", "")),
-                            "name": str(item.get("shortName", "") or item.get("longName", "")),
-                            "sector": str(item.get("sector", "")),
-                            "price": float(item.get("regularMarketPrice", 0) or 0),
-                            "change": float(item.get("regularMarketChangePercent", 0) or 0),
-                            "volume": int(item.get("regularMarketVolume", 0) or 0),
-                            "market_cap": float(item.get("marketCap", 0) or 0),
-                            "pe_ratio": float(item.get("trailingPE", 0) or 0),
-                            "dividend_yield": float(item.get("dividendYield", 0) or 0),
-                            "fiftyTwoWeekChangePercent": float(item.get("fiftyTwoWeekChangePercent", 0)or 0),
-                            "avg_volume_3m": int(item.get("averageDailyVolume3Month", 0) or 0),
-                            "returnOnEquity": float(item.get("returnOnEquity", 0) or 0),
-                            "book_value": float(item.get("bookValue", 0) or 0),
-                            "exchange": str(item.get("exchange", "")),
-                            "fullExchangeName": str(item.get("fullExchangeName", "")),
-                            "currency": str(item.get("currency", "")),
-                            "website": str(item.get("website", "")),
-                            "logo": logo
-                    })
-                except (TypeError, ValueError) as e:
-                    self.logger.warning(f"Erro ao formatar item: {str(e)}")
-                    continue
-                
-            return {
+            empty_response = {
                 "categoria": categoria,
-                "resultados": formatted_results,
-                "total": len(formatted_results),
-                "total_disponivel": int(results.get("total", len(formatted_results))),
+                "resultados": [],
+                "total": 0,
                 "offset": offset,
                 "limit": limit,
                 "ordenacao": {
@@ -1410,12 +1921,128 @@ class MarketDataService(LoggerMixin):
                 }
             }
             
+            def load_screen():
+                # Executar screening com try/except específico
+                try:
+                    results = upstream_gateway.call("screen", lambda: yf.screen(
+                        query=query,
+                        size=self._screener_page_size(limit),
+                        offset=offset,
+                        sortField=sort_field,
+                        sortAsc=sort_asc
+                    ))
+                except Exception as e:
+                    self.logger.error(f"Erro no yf.screen(): {str(e)}")
+                    raise ValueError(
+                        f"Erro ao executar screening: {str(e)}"
+                    )
+                    
+                # Extrair quotes do resultado
+                if isinstance(results, dict) and 'quotes' in results:
+                    quotes = results['quotes']
+                else:
+                    quotes = results if isinstance(results, (list, tuple)) else []
+                    
+                if not quotes:
+                    # Não armazena resposta vazia; permite servir a última válida
+                    raise ProviderException(
+                        message=f"Nenhum resultado encontrado para a categoria: {categoria}",
+                        provider="market_data_service",
+                        error_code="NO_DATA"
+                    )
+                
+                # Processar e formatar resultados com validação
+                formatted_results = []
+                for item in quotes:
+                    if not isinstance(item, dict):
+                        self.logger.warning(f"Item inválido no resultado: {item}")
+                        continue
+                    
+                    if item.get("website", False):
+                        logo = f"https://t1.gstatic.com/faviconV2?client=SOCIAL&type=FAVICON&fallback_opts=TYPE,SIZE,URL&size=128&url={item.get('website', None)}"
+                    else:
+                        logo = None
+                        
+                    try:
+                        formatted_results.append({
+                                "symbol": str(item.get("symbol", "")),
+                                "name": str(item.get("shortName", "") or item.get("longName", "")),
+                                "sector": str(item.get("sector", "")),
+                                "price": float(item.get("regularMarketPrice", 0) or 0),
+                                "change": float(item.get("regularMarketChangePercent", 0) or 0),
+                                "volume": int(item.get("regularMarketVolume", 0) or 0),
+                                "market_cap": float(item.get("marketCap", 0) or 0),
+                                "pe_ratio": float(item.get("trailingPE", 0) or 0),
+                                "dividend_yield": float(item.get("dividendYield", 0) or 0),
+                                "fiftyTwoWeekChangePercent": float(item.get("fiftyTwoWeekChangePercent", 0)or 0),
+                                "avg_volume_3m": int(item.get("averageDailyVolume3Month", 0) or 0),
+                                "returnOnEquity": float(item.get("returnOnEquity", 0) or 0),
+                                "book_value": float(item.get("bookValue", 0) or 0),
+                                "exchange": str(item.get("exchange", "")),
+                                "fullExchangeName": str(item.get("fullExchangeName", "")),
+                                "currency": str(item.get("currency", "")),
+                                "website": str(item.get("website", "")),
+                                "logo": logo
+                        })
+                    except (TypeError, ValueError) as e:
+                        self.logger.warning(f"Erro ao formatar item: {str(e)}")
+                        continue
+                    
+                return {
+                    **empty_response,
+                    "resultados": formatted_results,
+                    "total": len(formatted_results),
+                    "total_disponivel": int(results.get("total", len(formatted_results))),
+                }
+            
+            try:
+                response, _ = self._cached_call(
+                    self._screener_cache_key(
+                        categoria, setor, limit, offset, sort_field, sort_asc
+                    ),
+                    self._ttl_for(
+                        settings.SCREENER_CACHE_TTL_SECONDS,
+                        # mercado_todo inclui bolsas sem calendário
+                        [None if categoria == "mercado_todo" else "BR"]
+                    ),
+                    load_screen,
+                    refresh_ttl=refresh_ttl
+                )
+                return self._slice_screen(response, limit)
+            except ProviderException as e:
+                self.logger.warning(e.message)
+                return empty_response
+            
         except Exception as e:
             self.logger.error(f"Erro ao executar screening '{categoria}': {str(e)}")
             raise ValueError(
                 f"Erro ao executar screening: {str(e)}"
             )
 
+    def _screener_cache_key(
+        self,
+        categoria: str,
+        setor: Optional[str],
+        limit: Optional[int],
+        offset: Optional[int],
+        sort_field: Optional[str],
+        sort_asc: Optional[bool]
+    ) -> str:
+        """Gera a chave de cache de uma consulta de screening (pela página buscada)."""
+        page_size = self._screener_page_size(limit)
+        return f"screener:{categoria}:{setor}:{page_size}:{offset}:{sort_field}:{sort_asc}"
+
+    def _screener_page_size(self, limit: Optional[int]) -> int:
+        """Resultados buscados no provedor para um pedido com `limit`."""
+        return max(limit or 0, settings.SCREENER_PAGE_SIZE)
+
+    def _slice_screen(self, response: Dict[str, Any], limit: Optional[int]) -> Dict[str, Any]:
+        """Recorta a página em cache para o `limit` pedido."""
+        if not limit or len(response["resultados"]) <= limit:
+            return {**response, "limit": limit}
+        resultados = response["resultados"][:limit]
+        return {**response, "resultados": resultados, "total": len(resultados), "limit": limit}
+
     # ==================== ENDPOINT DE BUSCA-PERSONALIZADA ====================
 
     def get_custom_search(
@@ -1456,12 +2083,12 @@ class MarketDataService(LoggerMixin):
                 
             query = EquityQuery('and', conditions)
             
-            results = yf.screen(
+            results = upstream_gateway.call("screen", lambda: yf.screen(
                 query=query,
                 size=limit,
                 sortField="marketCap",
                 sortAsc=False
-            )
+            ))
             
             formatted_results = []
             for item in results:
@@ -1504,9 +2131,14 @@ class MarketDataService(LoggerMixin):
     def get_market_overview(
         self,
         category: str,
+        refresh_ttl: Optional[int] = None,
     ):
         """
         Obtém visão geral do mercado para uma categoria específica.
+        
+        O resultado fica em cache por 60s com stale-while-revalidate; respostas
+        servidas a partir de dados vencidos trazem `stale=True`. Com
+        `refresh_ttl`, o cache é atualizado com esse TTL.
         """
         try:
             category = category.lower()
@@ -1516,50 +2148,30 @@ class MarketDataService(LoggerMixin):
                 )
 
             symbols = MARKET_OVERVIEW_SYMBOLS[category]
-            
-            # Função para processar um símbolo
-            def process_symbol(symbol):
-                try:
-                    ticker = yf.Ticker(symbol)
-                    info = ticker.info
-                    
-                    if info.get("website", False):
-                        logo = f"https://t1.gstatic.com/faviconV2?client=SOCIAL&type=FAVICON&fallback_opts=TYPE,SIZE,URL&size=128&url={info.get('website', None)}"
-                    else:
-                        logo = None
-                    
-                    return {
-                        "symbol": symbol,
-                        "name": SYMBOL_NAMES.get(symbol, info.get("shortName", "N/A")),
-                        "price": info.get("regularMarketPrice", 0),
-                        "change": info.get("regularMarketChangePercent", 0),
-                        "website": info.get("website", None),
-                        "currency": info.get("currency", "N/A"),
-                        "logo": logo
-                    }
-                except Exception as e:
-                    self.logger.warning(f"Erro ao processar {symbol}: {str(e)}")
-                    return None
 
-            # Processar símbolos em paralelo para melhor performance
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                results = list(executor.map(process_symbol, symbols))
-            
-            # Filtrar resultados None e organizar por categoria
-            market_data = [r for r in results if r is not None]
-            
-            # Adicionar metadados
-            response = {
-                "category": category,
-                "timestamp": datetime.now().isoformat(),
-                "count": len(market_data),
-                "data": market_data
-            }
+            def load_overview():
+                # Processar símbolos em paralelo no executor compartilhado do serviço
+                results = self.fanout.map(self._overview_row, symbols)
+                rows = {r.item: r.value for r in results if r.ok}
+                return self._overview_response(category, rows)
 
-            if not market_data:
-                self.logger.warning(f"Nenhum dado encontrado para a categoria: {category}")
+            try:
+                response, stale = self._cached_call(
+                    f"market_overview:{category}",
+                    self._ttl_for(60, [market_for_symbol(s) for s in symbols]),
+                    load_overview,
+                    refresh_ttl=refresh_ttl
+                )
+            except ProviderException as e:
+                self.logger.warning(e.message)
+                response, stale = {
+                    "category": category,
+                    "timestamp": datetime.now().isoformat(),
+                    "count": 0,
+                    "data": []
+                }, False
                 
-            return response
+            return {**response, "stale": stale}
 
         except Exception as e:
             self.logger.error(f"Erro ao obter visão geral do mercado: {str(e)}")
@@ -1568,6 +2180,99 @@ class MarketDataService(LoggerMixin):
                 f"Erro ao obter visão geral do mercado: {str(e)}"
             )
             
+    def warm_market_overview(
+        self, categories: List[str], refresh_ttl: Optional[int] = None
+    ) -> int:
+        """
+        Carrega no cache a visão geral de várias categorias de uma só vez.
+
+        As categorias se sobrepõem ("all" contém todas as demais), então a
+        união dos símbolos é buscada uma única vez e a resposta de cada
+        categoria é montada a partir dela. Usado pelo aquecimento e pelo
+        agendador de atualização.
+
+        Args:
+            categories: Categorias válidas de MARKET_OVERVIEW_SYMBOLS
+            refresh_ttl: TTL a armazenar (padrão: o mesmo de `get_market_overview`)
+
+        Returns:
+            Número de categorias armazenadas com dados
+        """
+        symbols = list(dict.fromkeys(
+            symbol for category in categories for symbol in MARKET_OVERVIEW_SYMBOLS[category]
+        ))
+        if not symbols:
+            return 0
+
+        results = self.fanout.map(self._overview_row, symbols)
+        rows = {r.item: r.value for r in results if r.ok}
+
+        warmed = 0
+        for category in categories:
+            try:
+                response = self._overview_response(category, rows)
+            except ProviderException as e:
+                self.logger.warning(e.message)
+                continue
+            if settings.ENABLE_CACHE:
+                markets = [market_for_symbol(s) for s in MARKET_OVERVIEW_SYMBOLS[category]]
+                ttl = self._ttl_for(60, markets) if refresh_ttl is None else refresh_ttl
+                self._store(f"market_overview:{category}", ttl, response)
+            warmed += 1
+        return warmed
+
+    def _overview_row(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Busca a cotação de um símbolo da visão geral (None em caso de erro)."""
+        try:
+            ticker = yf.Ticker(symbol)
+            info = upstream_gateway.call("info", lambda: ticker.info)
+
+            if info.get("website", False):
+                logo = f"https://t1.gstatic.com/faviconV2?client=SOCIAL&type=FAVICON&fallback_opts=TYPE,SIZE,URL&size=128&url={info.get('website', None)}"
+            else:
+                logo = None
+
+            return {
+                "symbol": symbol,
+                "name": SYMBOL_NAMES.get(symbol, info.get("shortName", "N/A")),
+                "price": info.get("regularMarketPrice", 0),
+                "change": info.get("regularMarketChangePercent", 0),
+                "website": info.get("website", None),
+                "currency": info.get("currency", "N/A"),
+                "logo": logo
+            }
+        except Exception as e:
+            self.logger.warning(f"Erro ao processar {symbol}: {str(e)}")
+            return None
+
+    def _overview_response(
+        self, category: str, rows: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Monta a resposta de uma categoria a partir das cotações por símbolo.
+
+        Raises:
+            ProviderException: Nenhum símbolo da categoria com dados
+        """
+        # Filtrar falhas, preservando a ordem da categoria
+        market_data = [
+            rows[s] for s in MARKET_OVERVIEW_SYMBOLS[category] if rows.get(s) is not None
+        ]
+        if not market_data:
+            # Não armazena resposta vazia; permite servir a última válida
+            raise ProviderException(
+                message=f"Nenhum dado encontrado para a categoria: {category}",
+                provider="market_data_service",
+                error_code="NO_DATA"
+            )
+
+        return {
+            "category": category,
+            "timestamp": datetime.now().isoformat(),
+            "count": len(market_data),
+            "data": market_data
+        }
+
     # ==================== ENDPOINT PERIOD-PERFORMANCE ====================   
     def get_period_performance(
         self,
@@ -1575,96 +2280,100 @@ class MarketDataService(LoggerMixin):
     ):
         """
         Calcula a performance de múltiplos ativos em diferentes períodos.
+        
+        Uma única série diária de 1 ano é baixada para todos os símbolos sem
+        resultado no cache (um `yf.download` em lote quando são todos da
+        mesma bolsa, senão uma busca por símbolo) e cada horizonte é
+        obtido por fatiamento por data sobre essa série. Nome e setor vêm da
+        lista local de tickers do provedor (tickers.csv); só os símbolos
+        ausentes dela buscam o perfil no provedor (`.info`, em cache por
+        PROFILE_CACHE_TTL_SECONDS).
         """
         try:
             # Limpar e validar símbolos
-            symbol_list = [s.strip().upper() for s in symbols.split(',') if s.strip()]
-            
-            # Validar número máximo de tickers
-            if len(symbol_list) > 5:
+            symbol_list = list(dict.fromkeys(
+                s.strip().upper() for s in symbols.split(',') if s.strip()
+            ))
+            if not symbol_list:
                 raise ValueError(
                     
-                   f"Número máximo de tickers excedido. Máximo permitido: 5, fornecido: {len(symbol_list)}"
+                   f"Nenhum símbolo válido fornecido"
                 )
-                
-            # Limpar e validar símbolos
-            symbol_list = [s.strip().upper() for s in symbols.split(',') if s.strip()]
-            if not symbol_list:
+            
+            # Validar número máximo de tickers
+            max_symbols = settings.PERIOD_PERFORMANCE_MAX_SYMBOLS
+            if len(symbol_list) > max_symbols:
                 raise ValueError(
                     
-                   f"Nenhum símbolo válido fornecido"
+                   f"Número máximo de tickers excedido. Máximo permitido: {max_symbols}, fornecido: {len(symbol_list)}"
                 )
-
-            # Definir períodos e intervalos para os cálculos
-            periods = {
-                "1D": ("1d", "1d"),    # período, intervalo
-                "7D": ("7d", "1d"),
-                "1M": ("1mo", "1d"),
-                "3M": ("3mo", "1d"),
-                "6M": ("6mo", "1d"),
-                "1Y": ("1y", "1d")
-            }
-
+            
+            cache_keys = {symbol: f"period_performance:{symbol}" for symbol in symbol_list}
+            cached = (
+                self.cache_service.get_many(list(cache_keys.values()))
+                if settings.ENABLE_CACHE else {}
+            )
+            now = time.time()
             results = {}
+            pending = []
             for symbol in symbol_list:
-                try:
-                    ticker = yf.Ticker(symbol)
-                    info = ticker.info
+                entry = cached.get(cache_keys[symbol])
+                if entry is not None and now < entry["fresh_until"]:
+                    results[symbol] = {"success": True, "data": entry["value"]}
+                else:
+                    pending.append(symbol)
+            
+            if pending:
+                frames = self._download_performance_series(pending)
+                profiles = self._local_profiles(pending)
+                remote = [symbol for symbol in pending if symbol not in profiles]
+                profiles.update({
+                    item.item: item.value if item.ok else None
+                    for item in self.fanout.map(self._get_symbol_profile, remote)
+                })
+                
+                new_entries: Dict[int, Dict[str, Any]] = {}
+                for symbol in pending:
+                    hist = frames.get(symbol)
+                    profile = profiles.get(symbol)
+                    if hist is None or hist.empty:
+                        entry = cached.get(cache_keys[symbol])
+                        if entry is not None:
+                            # Stale-if-error: usa o valor vencido do cache
+                            results[symbol] = {"success": True, "data": entry["value"]}
+                            mark_stale()
+                            continue
+                    if (hist is None or hist.empty) and profile is None:
+                        self.logger.error(f"Erro ao processar {symbol}: dados não encontrados")
+                        results[symbol] = {
+                            "success": False,
+                            "error": "Dados não encontrados",
+                            "data": None
+                        }
+                        continue
                     
-                    # Pegar logo se disponível
-                    if info.get("website", False):
-                        logo = f"https://t1.gstatic.com/faviconV2?client=SOCIAL&type=FAVICON&fallback_opts=TYPE,SIZE,URL&size=128&url={info.get('website', None)}"
-                    else:
-                        logo = None
-
-                    # Inicializar dados do ticker
-                    ticker_data = {
-                        "name": info.get("shortName", "") or info.get("longName", ""),
-                        "current_price": info.get("regularMarketPrice", 0),
-                        "currency": info.get("currency", ""),
-                        "logo": logo,
-                        "performance": {}
-                    }
-
-                    # Calcular performance para cada período
-                    for period_name, (period, interval) in periods.items():
-                        try:
-                            hist = ticker.history(period=period, interval=interval)
-                            if not hist.empty:
-                                first_price = hist['Close'].iloc[0]
-                                last_price = hist['Close'].iloc[-1]
-                                change_percent = ((last_price - first_price) / first_price) * 100
-                                
-                                ticker_data["performance"][period_name] = {
-                                    "change_percent": round(change_percent, 2),
-                                    "start_price": round(first_price, 2),
-                                    "end_price": round(last_price, 2),
-                                    "start_date": hist.index[0].strftime('%Y-%m-%d'),
-                                    "end_date": hist.index[-1].strftime('%Y-%m-%d')
-                                }
-                            else:
-                                ticker_data["performance"][period_name] = None
-                        except Exception as e:
-                            self.logger.warning(f"Erro ao calcular {period_name} para {symbol}: {str(e)}")
-                            ticker_data["performance"][period_name] = None
-
-                    results[symbol] = {
-                        "success": True,
-                        "data": ticker_data
-                    }
-
-                except Exception as e:
-                    self.logger.error(f"Erro ao processar {symbol}: {str(e)}")
-                    results[symbol] = {
-                        "success": False,
-                        "error": str(e),
-                        "data": None
-                    }
+                    ticker_data = self._build_performance(symbol, hist, profile or {})
+                    results[symbol] = {"success": True, "data": ticker_data}
+                    if hist is not None and not hist.empty:
+                        ttl = self._ttl_for(
+                            settings.CACHE_TTL_SECONDS, [market_for_symbol(symbol)]
+                        )
+                        new_entries.setdefault(ttl, {})[cache_keys[symbol]] = {
+                            "value": ticker_data,
+                            "fresh_until": time.time() + ttl
+                        }
+                
+                if settings.ENABLE_CACHE:
+                    for ttl, entries in new_entries.items():
+                        self.cache_service.set_many(
+                            entries, ttl=ttl + settings.CACHE_MAX_STALENESS_SECONDS
+                        )
 
             return {
                 "timestamp": datetime.now().isoformat(),
                 "symbols_count": len(symbol_list),
-                "results": results
+                # Preservar a ordem da requisição
+                "results": {symbol: results[symbol] for symbol in symbol_list}
             }
 
         except Exception as e:
@@ -1673,7 +2382,685 @@ class MarketDataService(LoggerMixin):
                 
                 f'Erro ao calcular performance dos ativos: {str(e)}'
             )
+    
+    def _download_performance_series(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Baixa a série diária de 1 ano dos símbolos (em lote, com fallback individual)."""
+        history_kwargs = {"period": "1y", "interval": "1d", "auto_adjust": True}
+        try:
+            return download_history_batch(symbols, **history_kwargs)
+        except ValueError as e:
+            self.logger.warning(f"{e}; usando busca individual por símbolo")
+        
+        items = self.fanout.map(
+            lambda symbol: safe_ticker_operation(
+                symbol, lambda ticker: ticker.history(**history_kwargs), "history"
+            ),
+            symbols
+        )
+        return {item.item: item.value for item in items if item.ok}
+    
+    def _local_profiles(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Perfis dos ativos presentes na lista local de tickers do provedor.
+        
+        Nome e setor vêm da lista; a moeda, do sufixo da bolsa. O site (logo)
+        só é conhecido se o perfil completo já estiver no cache, mesmo vencido.
+        
+        Returns:
+            Perfil por símbolo, apenas para os símbolos encontrados na lista
+        """
+        stocks = {}
+        for symbol in symbols:
+            stock = self.provider.find_ticker(symbol)
+            if stock is not None:
+                stocks[symbol] = stock
+        if not stocks:
+            return {}
+        
+        cached = (
+            self.cache_service.get_many([f"symbol_profile:{symbol}" for symbol in stocks])
+            if settings.ENABLE_CACHE else {}
+        )
+        profiles = {}
+        for symbol, stock in stocks.items():
+            entry = cached.get(f"symbol_profile:{symbol}")
+            website = entry["value"].get("website") if entry is not None else None
+            profiles[symbol] = {
+                "name": stock.get("name", ""),
+                "sector": stock.get("sector"),
+                "currency": "BRL" if symbol.endswith(".SA") else "",
+                "website": website,
+                "price": 0,
+            }
+        return profiles
+    
+    def _get_symbol_profile(self, symbol: str) -> Dict[str, Any]:
+        """Obtém nome, setor, moeda e site do ativo (dados estáveis, com cache longo)."""
+        def load_profile() -> Dict[str, Any]:
+            ticker = yf.Ticker(symbol)
+            info = upstream_gateway.call("info", lambda: ticker.info)
+            return {
+                "name": info.get("shortName", "") or info.get("longName", ""),
+                "sector": info.get("sector"),
+                "currency": info.get("currency", ""),
+                "website": info.get("website"),
+                "price": info.get("regularMarketPrice", 0),
+            }
+        
+        profile, _ = self._cached_call(
+            f"symbol_profile:{symbol}", settings.PROFILE_CACHE_TTL_SECONDS, load_profile
+        )
+        return profile
+    
+    def _build_performance(
+        self,
+        symbol: str,
+        hist: Optional[pd.DataFrame],
+        profile: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Monta a linha da tabela de performance de um ativo.
+        
+        O início de cada horizonte é o primeiro pregão a partir de
+        `último pregão - horizonte` (o 1D usa o pregão anterior); os índices
+        de todos os horizontes saem de um único `searchsorted` sobre as datas.
+        """
+        website = profile.get("website")
+        if website:
+            logo = f"https://t1.gstatic.com/faviconV2?client=SOCIAL&type=FAVICON&fallback_opts=TYPE,SIZE,URL&size=128&url={website}"
+        else:
+            logo = None
+        
+        ticker_data = {
+            "name": profile.get("name", ""),
+            "sector": profile.get("sector"),
+            "current_price": profile.get("price", 0),
+            "currency": profile.get("currency", ""),
+            "logo": logo,
+            "performance": {name: None for name in PERFORMANCE_HORIZONS}
+        }
+        
+        closes = hist["Close"].dropna() if hist is not None and "Close" in hist else None
+        if closes is None or closes.empty:
+            return ticker_data
+        
+        dates = closes.index
+        prices = closes.to_numpy(dtype=float)
+        last = len(prices) - 1
+        ticker_data["current_price"] = round(float(prices[last]), 2)
+        
+        offsets = [o for o in PERFORMANCE_HORIZONS.values() if o is not None]
+        starts = np.searchsorted(
+            dates.values, pd.DatetimeIndex([dates[last] - o for o in offsets]).values
+        )
+        start_indexes = iter(starts)
+        for name, offset in PERFORMANCE_HORIZONS.items():
+            start = max(last - 1, 0) if offset is None else int(next(start_indexes))
+            if start >= last:
+                continue
+            first_price, last_price = prices[start], prices[last]
+            ticker_data["performance"][name] = {
+                "change_percent": round(float((last_price - first_price) / first_price * 100), 2),
+                "start_price": round(float(first_price), 2),
+                "end_price": round(float(last_price), 2),
+                "start_date": dates[start].strftime('%Y-%m-%d'),
+                "end_date": dates[last].strftime('%Y-%m-%d')
+            }
+        
+        return ticker_data
+    
+    # ==================== ENDPOINT DE INDICADORES TÉCNICOS ====================
+    def get_indicators(
+        self,
+        symbols: str,
+        indicators: str,
+        period: str = "1y",
+        interval: str = "1d",
+    ) -> Dict[str, Any]:
+        """
+        Calcula indicadores técnicos para vários ativos no servidor.
+        
+        O histórico de cada ativo vem pelo mesmo caminho da rota de histórico
+        (armazenamento OHLCV local quando o intervalo é suportado) e os
+        indicadores são calculados de uma vez para todos os ativos pelo
+        motor vetorizado, memorizado por última barra.
+        
+        Args:
+            symbols: Símbolos separados por vírgula
+            indicators: Indicadores separados por vírgula (ex: "sma:20,rsi:14,macd:12:26:9")
+            period: Período do histórico
+            interval: Intervalo das barras
             
+        Returns:
+            Dicionário com as colunas calculadas e, por símbolo, as séries colunares
+        """
+        symbol_list = self._parse_symbol_list(symbols, settings.INDICATORS_MAX_SYMBOLS)
+        specs = parse_indicator_specs(indicators)
+        
+        frames = self._load_histories(symbol_list, period, interval)
+        computed = indicator_engine.compute(frames, interval, specs)
+        
+        results = {}
+        for symbol in symbol_list:
+            if symbol in computed:
+                results[symbol] = {"success": True, "data": computed[symbol]}
+            else:
+                results[symbol] = {
+                    "success": False,
+                    "error": "Dados não encontrados",
+                    "data": None
+                }
+        
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "period": period,
+            "interval": interval,
+            "indicators": [column for spec in specs for column in spec.columns],
+            "symbols_count": len(symbol_list),
+            "results": results
+        }
+    
+    def _parse_symbol_list(self, symbols: str, max_symbols: int) -> List[str]:
+        """Separa os símbolos da requisição (sem repetições) e valida o limite."""
+        symbol_list = list(dict.fromkeys(
+            s.strip().upper() for s in symbols.split(',') if s.strip()
+        ))
+        if not symbol_list:
+            raise ValueError("Nenhum símbolo válido fornecido")
+        if len(symbol_list) > max_symbols:
+            raise ValueError(
+                f"Número máximo de tickers excedido. Máximo permitido: {max_symbols}, fornecido: {len(symbol_list)}"
+            )
+        return symbol_list
+    
+    def _load_histories(
+        self, symbols: List[str], period: str, interval: str
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Obtém o histórico ajustado de vários ativos pelo fan-out.
+        
+        Ativos sem dados ficam de fora do resultado; se o provedor estiver
+        indisponível para todos, a recusa do gateway é repassada (503).
+        """
+        items = self.fanout.map(
+            lambda symbol: self._load_adjusted_history(symbol, period, interval),
+            symbols
+        )
+        if items and all(isinstance(item.error, UpstreamUnavailableError) for item in items):
+            raise items[0].error
+        return {item.item: item.value for item in items if item.ok}
+    
+    def _load_adjusted_history(self, symbol: str, period: str, interval: str) -> pd.DataFrame:
+        """
+        Obtém o histórico ajustado de um ativo (armazenamento OHLCV quando suportado).
+        
+        A leitura do armazenamento fica fora do gateway: apenas a busca da
+        cauda disputa vagas e conta nas métricas do provedor.
+        """
+        if ohlcv_store.supports(interval, period=period):
+            return safe_ticker_operation(
+                symbol,
+                lambda ticker: ohlcv_store.get_history(
+                    symbol, interval, fetch=gateway_history_fetch(ticker), period=period
+                ),
+                endpoint=None
+            )
+        return safe_ticker_operation(
+            symbol,
+            lambda ticker: ticker.history(period=period, interval=interval, auto_adjust=True),
+            "history"
+        )
+    
+    # ==================== ENDPOINT DE CORRELAÇÃO ====================
+    def get_correlation(
+        self,
+        symbols: str,
+        period: str = "1y",
+        window: int = 60,
+        benchmark: Optional[str] = None,
+        include_returns: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Calcula covariância, correlação e correlação móvel entre ativos.
+        
+        Os fechamentos diários ajustados de todos os ativos (do armazenamento
+        OHLCV) são alinhados por data em uma matriz e as estatísticas saem de
+        operações vetorizadas sobre ela. O resultado fica em cache pelo
+        conjunto de símbolos (independente da ordem), período, janela e
+        referência.
+        
+        Args:
+            symbols: Símbolos separados por vírgula
+            period: Período do histórico diário
+            window: Janela da correlação móvel em pregões
+            benchmark: Referência da correlação móvel (padrão: cesta de pesos iguais)
+            include_returns: Inclui a matriz de retornos alinhada na resposta
+            
+        Returns:
+            Dicionário com as matrizes (na ordem de `symbols`), a correlação
+            móvel por ativo e os ativos excluídos
+        """
+        symbol_list = self._parse_symbol_list(symbols, settings.CORRELATION_MAX_SYMBOLS)
+        if len(symbol_list) < 2:
+            raise ValueError("Informe ao menos dois símbolos para calcular a correlação")
+        if window < 2:
+            raise ValueError("A janela da correlação móvel deve ter ao menos 2 pregões")
+        benchmark = benchmark.strip().upper() if benchmark and benchmark.strip() else None
+        
+        # O cache é compartilhado por qualquer ordem dos símbolos: o cálculo
+        # usa a ordem canônica e a resposta é reordenada para a da requisição
+        canonical = sorted(symbol_list)
+        digest = hashlib.sha1(",".join(canonical).encode()).hexdigest()
+        cache_key = f"correlation:{digest}:{period}:{window}:{benchmark}:{include_returns}"
+        ttl = self._ttl_for(
+            settings.ANALYTICS_CACHE_TTL_SECONDS,
+            [market_for_symbol(symbol) for symbol in symbol_list]
+        )
+        response, stale = self._cached_call(
+            cache_key, ttl,
+            lambda: self._compute_correlation(
+                canonical, period, window, benchmark, include_returns
+            )
+        )
+        
+        positions = {symbol: i for i, symbol in enumerate(response["symbols"])}
+        order = [positions[s] for s in symbol_list if s in positions]
+        return {
+            **response,
+            "symbols": [response["symbols"][i] for i in order],
+            "excluded": [s for s in symbol_list if s in response["excluded"]],
+            "covariance": [[response["covariance"][i][j] for j in order] for i in order],
+            "correlation": [[response["correlation"][i][j] for j in order] for i in order],
+            "annualized_volatility": [response["annualized_volatility"][i] for i in order],
+            "stale": stale,
+        }
+    
+    def _compute_correlation(
+        self,
+        symbols: List[str],
+        period: str,
+        window: int,
+        benchmark: Optional[str],
+        include_returns: bool,
+    ) -> Dict[str, Any]:
+        """Monta a matriz de retornos alinhada e calcula as estatísticas."""
+        to_load = symbols + [benchmark] if benchmark and benchmark not in symbols else symbols
+        frames = self._load_histories(to_load, period, "1d")
+        prices, excluded = align_closes(frames)
+        excluded += [s for s in to_load if s not in frames]
+        
+        if benchmark and benchmark not in prices:
+            raise ValueError(f"Histórico da referência {benchmark} não encontrado")
+        columns = [s for s in symbols if s in prices]
+        if len(columns) < 2 or len(prices) <= window:
+            raise ValueError(
+                f"Histórico insuficiente: {len(columns)} ativos com {max(len(prices) - 1, 0)} "
+                f"retornos alinhados (janela de {window} pregões)"
+            )
+        
+        returns = simple_returns(prices.to_numpy(dtype=np.float64))
+        asset_returns = returns[:, [prices.columns.get_loc(s) for s in columns]]
+        reference = (
+            returns[:, prices.columns.get_loc(benchmark)]
+            if benchmark else asset_returns.mean(axis=1)
+        )
+        
+        covariance = covariance_matrix(asset_returns)
+        correlation = correlation_from_covariance(covariance)
+        rolling = rolling_correlation(asset_returns, reference, window)
+        dates = prices.index[1:].strftime('%Y-%m-%d').tolist()
+        
+        response = {
+            "timestamp": datetime.now().isoformat(),
+            "period": period,
+            "window": window,
+            "benchmark": benchmark or "equal_weight",
+            "symbols": columns,
+            "observations": len(asset_returns),
+            "start_date": dates[0],
+            "end_date": dates[-1],
+            "excluded": [s for s in symbols if s in excluded],
+            "covariance": rounded_list(covariance, 8),
+            "correlation": rounded_list(correlation, 4),
+            "annualized_volatility": rounded_list(
+                np.sqrt(np.diag(covariance) * TRADING_DAYS_PER_YEAR), 4
+            ),
+            "rolling_correlation": {
+                "dates": dates[window - 1:],
+                **{
+                    symbol: rounded_list(rolling[window - 1:, i], 4)
+                    for i, symbol in enumerate(columns)
+                },
+            },
+        }
+        if include_returns:
+            response["returns"] = {
+                "dates": dates,
+                **{
+                    symbol: rounded_list(asset_returns[:, i], 6)
+                    for i, symbol in enumerate(columns)
+                },
+            }
+        return response
+            
+    # ==================== ENDPOINT DE RISCO DE CARTEIRA ====================
+    def get_portfolio_risk(
+        self,
+        symbols: str,
+        weights: Optional[str] = None,
+        period: str = "1y",
+        confidence: float = 0.95,
+        horizon: int = 1,
+        paths: Optional[int] = None,
+        risk_free_rate: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Calcula as métricas de risco de uma carteira.
+        
+        As métricas históricas (volatilidade, drawdown máximo, Sharpe,
+        Sortino, VaR/CVaR) usam os retornos diários alinhados da carteira com
+        pesos constantes. O VaR/CVaR por Monte Carlo sorteia log-retornos
+        normais multivariados estimados do mesmo histórico; as trajetórias
+        são divididas em tarefas executadas no pool de processos.
+        
+        Args:
+            symbols: Símbolos separados por vírgula
+            weights: Pesos na ordem dos símbolos (normalizados para somar 1;
+                padrão: pesos iguais)
+            period: Período do histórico diário
+            confidence: Nível de confiança do VaR/CVaR (entre 0.5 e 1)
+            horizon: Horizonte do VaR/CVaR em pregões
+            paths: Trajetórias do Monte Carlo (padrão: MONTE_CARLO_DEFAULT_PATHS)
+            risk_free_rate: Taxa livre de risco anual (padrão: RISK_FREE_RATE)
+            
+        Returns:
+            Dicionário com os pesos normalizados, as métricas históricas e as de Monte Carlo
+        """
+        raw_symbols = [s.strip().upper() for s in symbols.split(',') if s.strip()]
+        symbol_list = self._parse_symbol_list(symbols, settings.PORTFOLIO_MAX_SYMBOLS)
+        if len(symbol_list) != len(raw_symbols):
+            raise ValueError("Símbolos repetidos na carteira")
+        weight_values = self._parse_weights(weights, len(symbol_list))
+        
+        paths = settings.MONTE_CARLO_DEFAULT_PATHS if paths is None else paths
+        risk_free_rate = settings.RISK_FREE_RATE if risk_free_rate is None else risk_free_rate
+        if not 0.5 <= confidence < 1:
+            raise ValueError("O nível de confiança deve estar entre 0.5 e 1")
+        if not 1 <= horizon <= settings.MONTE_CARLO_MAX_HORIZON:
+            raise ValueError(
+                f"O horizonte deve estar entre 1 e {settings.MONTE_CARLO_MAX_HORIZON} pregões"
+            )
+        if not 100 <= paths <= settings.MONTE_CARLO_MAX_PATHS:
+            raise ValueError(
+                f"O número de trajetórias deve estar entre 100 e {settings.MONTE_CARLO_MAX_PATHS}"
+            )
+        
+        portfolio = ",".join(
+            f"{symbol}={weight:.10g}"
+            for symbol, weight in sorted(zip(symbol_list, weight_values))
+        )
+        digest = hashlib.sha1(portfolio.encode()).hexdigest()
+        cache_key = (
+            f"portfolio_risk:{digest}:{period}:{confidence}:{horizon}:{paths}:{risk_free_rate}"
+        )
+        ttl = self._ttl_for(
+            settings.ANALYTICS_CACHE_TTL_SECONDS,
+            [market_for_symbol(symbol) for symbol in symbol_list]
+        )
+        response, stale = self._cached_call(
+            cache_key, ttl,
+            lambda: self._compute_portfolio_risk(
+                symbol_list, weight_values, period, confidence, horizon, paths, risk_free_rate
+            )
+        )
+        # O cache é compartilhado por qualquer ordem dos ativos
+        weight_of = dict(zip(response["symbols"], response["weights"]))
+        return {
+            **response,
+            "symbols": symbol_list,
+            "weights": [weight_of[symbol] for symbol in symbol_list],
+            "stale": stale,
+        }
+    
+    def _parse_weights(self, weights: Optional[str], count: int) -> np.ndarray:
+        """Interpreta os pesos da carteira e os normaliza para somar 1."""
+        if not weights or not weights.strip():
+            return np.full(count, 1.0 / count)
+        try:
+            values = np.array([float(w) for w in weights.split(',') if w.strip()])
+        except ValueError:
+            raise ValueError(f"Pesos inválidos: {weights}")
+        if len(values) != count:
+            raise ValueError(
+                f"Número de pesos ({len(values)}) diferente do número de símbolos ({count})"
+            )
+        if not np.all(np.isfinite(values)) or np.any(values < 0) or values.sum() <= 0:
+            raise ValueError("Os pesos devem ser não negativos e com soma positiva")
+        return values / values.sum()
+    
+    def _compute_portfolio_risk(
+        self,
+        symbols: List[str],
+        weights: np.ndarray,
+        period: str,
+        confidence: float,
+        horizon: int,
+        paths: int,
+        risk_free_rate: float,
+    ) -> Dict[str, Any]:
+        """Calcula as métricas históricas e o Monte Carlo da carteira."""
+        frames = self._load_histories(symbols, period, "1d")
+        prices, _ = align_closes(frames)
+        missing = [s for s in symbols if s not in prices]
+        if missing:
+            raise ValueError(f"Histórico insuficiente para: {', '.join(missing)}")
+        if len(prices) <= max(horizon, settings.PORTFOLIO_MIN_OBSERVATIONS):
+            raise ValueError(
+                f"Histórico insuficiente: {max(len(prices) - 1, 0)} retornos alinhados"
+            )
+        
+        returns = simple_returns(prices[symbols].to_numpy(dtype=np.float64))
+        metrics = risk_metrics(returns @ weights, risk_free_rate, confidence, horizon)
+        
+        log_returns = np.log1p(returns)
+        mean = log_returns.mean(axis=0)
+        factor = covariance_factor(covariance_matrix(log_returns))
+        
+        # Blocos de trajetórias com sementes próprias, agrupados em tarefas do pool
+        blocks = simulation_blocks(paths, settings.MONTE_CARLO_SEED)
+        per_task = max(1, settings.MONTE_CARLO_PATHS_PER_TASK // SIMULATION_BLOCK_PATHS)
+        outcomes = np.concatenate(self.compute.map(
+            simulate_portfolio_returns,
+            [
+                (mean, factor, weights, horizon, blocks[i:i + per_task],
+                 settings.MONTE_CARLO_CHUNK_ELEMENTS)
+                for i in range(0, len(blocks), per_task)
+            ]
+        ))
+        mc_var, mc_cvar = var_cvar(outcomes, confidence)
+        percentiles = np.percentile(outcomes, [1, 5, 50, 95, 99])
+        
+        dates = prices.index.strftime('%Y-%m-%d')
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "symbols": symbols,
+            "weights": [round(float(w), 6) for w in weights],
+            "period": period,
+            "observations": len(returns),
+            "start_date": dates[1],
+            "end_date": dates[-1],
+            "confidence": confidence,
+            "horizon_days": horizon,
+            "risk_free_rate": risk_free_rate,
+            "historical": {
+                name: round(value, 6) if value is not None else None
+                for name, value in metrics.items()
+            },
+            "monte_carlo": {
+                "paths": paths,
+                "var": round(mc_var, 6),
+                "cvar": round(mc_cvar, 6),
+                "expected_return": round(float(outcomes.mean()), 6),
+                "percentiles": {
+                    f"p{p}": round(float(v), 6) for p, v in zip([1, 5, 50, 95, 99], percentiles)
+                },
+            },
+        }
+    
+    # ==================== ENDPOINT DE FRONTEIRA EFICIENTE ====================
+    def get_efficient_frontier(
+        self,
+        symbols: str,
+        period: str = "1y",
+        points: int = 20,
+        shrinkage: str = "ledoit_wolf",
+        min_weight: float = 0.0,
+        max_weight: float = 1.0,
+        risk_free_rate: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Calcula a fronteira eficiente e as carteiras de mínima variância e máximo Sharpe.
+        
+        Retornos esperados e covariância (com encolhimento opcional) são
+        estimados dos retornos diários alinhados do período e anualizados.
+        Os pontos da fronteira são resolvidos em segmentos paralelos no pool
+        de processos, cada ponto partindo da solução do vizinho.
+        
+        Args:
+            symbols: Universo de símbolos separados por vírgula
+            period: Período do histórico diário usado na estimação
+            points: Número de pontos da fronteira
+            shrinkage: Encolhimento da covariância ("none", "ledoit_wolf" ou "oas")
+            min_weight: Peso mínimo de cada ativo (negativo permite venda a descoberto)
+            max_weight: Peso máximo de cada ativo
+            risk_free_rate: Taxa livre de risco anual (padrão: RISK_FREE_RATE)
+            
+        Returns:
+            Dicionário com as carteiras da fronteira, de mínima variância e de máximo Sharpe
+        """
+        symbol_list = self._parse_symbol_list(symbols, settings.FRONTIER_MAX_SYMBOLS)
+        if len(symbol_list) < 2:
+            raise ValueError("Informe ao menos dois símbolos para a fronteira eficiente")
+        if not 2 <= points <= settings.FRONTIER_MAX_POINTS:
+            raise ValueError(
+                f"O número de pontos deve estar entre 2 e {settings.FRONTIER_MAX_POINTS}"
+            )
+        if min_weight > max_weight:
+            raise ValueError("O peso mínimo deve ser menor ou igual ao máximo")
+        shrinkage = shrinkage.strip().lower()
+        risk_free_rate = settings.RISK_FREE_RATE if risk_free_rate is None else risk_free_rate
+        
+        canonical = sorted(symbol_list)
+        digest = hashlib.sha1(",".join(canonical).encode()).hexdigest()
+        cache_key = (
+            f"efficient_frontier:{digest}:{period}:{points}:{shrinkage}:"
+            f"{min_weight}:{max_weight}:{risk_free_rate}"
+        )
+        ttl = self._ttl_for(
+            settings.ANALYTICS_CACHE_TTL_SECONDS,
+            [market_for_symbol(symbol) for symbol in symbol_list]
+        )
+        response, stale = self._cached_call(
+            cache_key, ttl,
+            lambda: self._compute_efficient_frontier(
+                canonical, period, points, shrinkage, (min_weight, max_weight), risk_free_rate
+            )
+        )
+        return {
+            **response,
+            "symbols": [s for s in symbol_list if s in response["symbols"]],
+            "excluded": [s for s in symbol_list if s in response["excluded"]],
+            "stale": stale,
+        }
+    
+    def _compute_efficient_frontier(
+        self,
+        symbols: List[str],
+        period: str,
+        points: int,
+        shrinkage: str,
+        bounds: Tuple[float, float],
+        risk_free_rate: float,
+    ) -> Dict[str, Any]:
+        """Estima μ e Σ e resolve as carteiras ótimas."""
+        frames = self._load_histories(symbols, period, "1d")
+        prices, excluded = align_closes(frames)
+        excluded += [s for s in symbols if s not in frames]
+        universe = [s for s in symbols if s in prices]
+        if len(universe) < 2 or len(prices) <= settings.PORTFOLIO_MIN_OBSERVATIONS:
+            raise ValueError(
+                f"Histórico insuficiente: {len(universe)} ativos com "
+                f"{max(len(prices) - 1, 0)} retornos alinhados"
+            )
+        check_bounds(len(universe), bounds)
+        low, high = bounds
+        
+        returns = simple_returns(prices[universe].to_numpy(dtype=np.float64))
+        daily_covariance, intensity = shrink_covariance(returns, shrinkage)
+        expected, covariance = annualize(returns, daily_covariance)
+        
+        minimum = min_variance(covariance, bounds)
+        maximum = max_return_weights(expected, bounds)
+        targets = np.linspace(float(minimum @ expected), float(maximum @ expected), points)
+        
+        # Segmentos contíguos em paralelo, cada um partindo de um ponto viável no seu primeiro alvo
+        segments = np.array_split(targets[1:], min(points - 1, max(self.compute.max_workers, 1)))
+        frontier = [minimum] + [
+            weights
+            for solved in self.compute.map(
+                solve_frontier_segment,
+                [
+                    (
+                        expected, covariance, bounds, segment.tolist(),
+                        interpolated_start(minimum, maximum, expected, segment[0]),
+                    )
+                    for segment in segments if len(segment)
+                ]
+            )
+            for weights in solved
+            # Pontos sem convergência ficam fora da fronteira
+            if weights is not None
+        ]
+        
+        # Máximo Sharpe parte do ponto da fronteira com o maior Sharpe
+        best = max(
+            frontier,
+            key=lambda w: describe_portfolio(w, expected, covariance, risk_free_rate)["sharpe_ratio"] or -np.inf
+        )
+        try:
+            tangency = max_sharpe(expected, covariance, risk_free_rate, bounds, x0=best)
+        except OptimizationError as e:
+            # O melhor ponto convergido da fronteira é a aproximação disponível
+            self.logger.warning(f"Máximo Sharpe sem convergência, usando a fronteira: {e}")
+            tangency = best
+        
+        def portfolio(weights: np.ndarray) -> Dict[str, Any]:
+            stats = describe_portfolio(weights, expected, covariance, risk_free_rate)
+            return {
+                **{k: round(v, 6) if v is not None else None for k, v in stats.items()},
+                "weights": {
+                    symbol: round(float(w), 6) for symbol, w in zip(universe, weights)
+                },
+            }
+        
+        dates = prices.index.strftime('%Y-%m-%d')
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "symbols": universe,
+            "excluded": excluded,
+            "period": period,
+            "observations": len(returns),
+            "start_date": dates[1],
+            "end_date": dates[-1],
+            "shrinkage": shrinkage,
+            "shrinkage_intensity": round(intensity, 6),
+            "constraints": {"min_weight": low, "max_weight": high},
+            "risk_free_rate": risk_free_rate,
+            "min_variance": portfolio(minimum),
+            "max_sharpe": portfolio(tangency),
+            "frontier": [portfolio(weights) for weights in frontier],
+        }
+    
     # ==================== ENDPOINT DE HEALTH CHECK ====================
 
     def yfinance_health_check(self):
@@ -1681,7 +3068,7 @@ class MarketDataService(LoggerMixin):
         try:
             # Teste simples com um ticker conhecido
             test_ticker = yf.Ticker("AAPL")
-            test_info = test_ticker.info
+            test_info = upstream_gateway.call("health", lambda: test_ticker.info)
             
             return {
                 "status": "healthy",
@@ -0,0 +1,439 @@
+"""
+Armazenamento local de séries OHLCV com busca incremental.
+
+Este módulo mantém em disco, em formato colunar (.npz), as barras históricas
+já baixadas de cada par (símbolo, intervalo). Em uma nova requisição, o que
+já está armazenado é servido localmente e apenas a cauda desde a última barra
+é buscada no provedor e anexada ao arquivo, de modo que gráficos de vários
+anos viram uma leitura local mais uma pequena chamada incremental.
+
+Example:
+    from services.ohlcv_store import ohlcv_store
+
+    if ohlcv_store.supports("1d", period="5y"):
+        hist = ohlcv_store.get_history(
+            "PETR4.SA", "1d", fetch=lambda **kw: ticker.history(**kw), period="5y"
+        )
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from core.config import settings
+from core.logging import LoggerMixin
+from utils.market_calendar import get_calendar, market_for_symbol
+
+# Intervalos armazenados (barras intraday mudam demais e têm janelas curtas no Yahoo)
+STORE_INTERVALS = ["1d", "5d", "1wk", "1mo", "3mo"]
+
+# Períodos longos o suficiente para compensar o armazenamento
+STORE_PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+class OHLCVStore(LoggerMixin):
+    """
+    Armazenamento em disco de barras OHLCV por (símbolo, intervalo).
+
+    Cada par é gravado em um arquivo .npz com os timestamps em nanossegundos
+    UTC (int64), uma coluna por campo e metadados em JSON (fuso horário,
+    início coberto e horário da última busca). As gravações são atômicas
+    (arquivo temporário + `os.replace`) e cada par tem seu próprio lock, o que
+    também evita buscas duplicadas concorrentes para o mesmo par.
+
+    A busca incremental começa na penúltima barra armazenada: a última pode
+    ser o pregão em andamento e é sempre substituída, e a penúltima serve
+    para detectar ajustes retroativos (dividendos/desdobramentos). Se o
+    fechamento dela mudou, a série inteira é baixada novamente.
+
+    Attributes:
+        base_dir: Diretório dos arquivos
+        enabled: Indica se o armazenamento está habilitado
+        refresh_seconds: Intervalo mínimo entre buscas incrementais do mesmo par
+    """
+
+    def __init__(
+        self,
+        base_dir: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        refresh_seconds: Optional[int] = None,
+    ):
+        """
+        Inicializa o armazenamento.
+
+        Args:
+            base_dir: Diretório dos arquivos (padrão: configuração global)
+            enabled: Habilita o armazenamento (padrão: configuração global)
+            refresh_seconds: Intervalo mínimo entre buscas incrementais
+        """
+        self.base_dir = base_dir or settings.OHLCV_STORE_DIR
+        self.enabled = settings.ENABLE_OHLCV_STORE if enabled is None else enabled
+        self.refresh_seconds = (
+            settings.OHLCV_STORE_REFRESH_SECONDS
+            if refresh_seconds is None
+            else refresh_seconds
+        )
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def supports(
+        self,
+        interval: str,
+        period: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        prepost: bool = False,
+        auto_adjust: bool = True,
+    ) -> bool:
+        """
+        Indica se a requisição pode ser servida pelo armazenamento.
+
+        Apenas intervalos diários ou maiores, com períodos de um mês ou mais
+        (ou start explícito) e com prepost/auto_adjust padrão são armazenados.
+
+        Args:
+            interval: Intervalo dos dados
+            period: Período solicitado
+            start: Data de início (YYYY-MM-DD)
+            end: Data de fim (YYYY-MM-DD)
+            prepost: Incluir pre/post market
+            auto_adjust: Ajustar dividendos/splits
+
+        Returns:
+            True se a requisição é elegível
+        """
+        if not self.enabled or prepost or not auto_adjust:
+            return False
+        if interval not in STORE_INTERVALS:
+            return False
+        if start:
+            return True
+        return period in STORE_PERIOD_OFFSETS or period in ("ytd", "max")
+
+    def get_history(
+        self,
+        symbol: str,
+        interval: str,
+        fetch: Callable[..., pd.DataFrame],
+        period: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Retorna o histórico solicitado, buscando no provedor apenas o que falta.
+
+        Args:
+            symbol: Símbolo do ativo
+            interval: Intervalo dos dados
+            fetch: Função que recebe os argumentos de `Ticker.history`
+                (period ou start e end, e interval) e retorna o DataFrame
+            period: Período solicitado (ignorado se `start` for informado)
+            start: Data de início (YYYY-MM-DD)
+            end: Data de fim exclusiva (YYYY-MM-DD)
+
+        Returns:
+            DataFrame no mesmo formato de `Ticker.history`
+        """
+        symbol = symbol.upper()
+        key = self._key(symbol, interval)
+        required_start = self._required_start(period, start)
+
+        with self._lock_for(key):
+            stored, meta = self._load(key)
+
+            if stored is None or not self._covers(meta, required_start):
+                fetch_end = self._fetch_end(stored, start, end)
+                frame = self._fetch_full(fetch, interval, period, start, fetch_end)
+                if frame is None or frame.empty:
+                    frame = stored if stored is not None else pd.DataFrame()
+                else:
+                    if stored is not None:
+                        frame = self._merge(stored, frame)
+                    # Busca limitada por `end`: a cauda vale o que já valia
+                    # (ou precisa ser buscada, se não havia série)
+                    fetched_at = None if fetch_end is None else meta.get("fetched_at", 0.0)
+                    self._save(key, frame, required_start, fetched_at)
+            elif self._needs_refresh(symbol, meta):
+                frame = self._refresh_tail(key, stored, meta, fetch, interval)
+            else:
+                self.logger.debug(f"OHLCV {symbol} {interval} servido do disco")
+                frame = stored
+
+        return self._slice(frame, required_start, start, end)
+
+    def _needs_refresh(self, symbol: str, meta: dict) -> bool:
+        """
+        Indica se a cauda armazenada pode estar desatualizada.
+
+        Além do intervalo mínimo entre buscas, séries obtidas com o mercado
+        do símbolo fechado (e já assentado) só mudam na próxima abertura.
+        """
+        if time.time() - meta["fetched_at"] < self.refresh_seconds:
+            return False
+        calendar = get_calendar(market_for_symbol(symbol))
+        if calendar is None:
+            return True
+        fetched_at = datetime.fromtimestamp(meta["fetched_at"], timezone.utc)
+        return not calendar.closed_since(fetched_at)
+
+    def _refresh_tail(
+        self,
+        key: str,
+        stored: pd.DataFrame,
+        meta: dict,
+        fetch: Callable[..., pd.DataFrame],
+        interval: str,
+    ) -> pd.DataFrame:
+        """Busca e anexa a cauda a partir da penúltima barra armazenada."""
+        anchor = stored.index[-2] if len(stored) >= 2 else stored.index[-1]
+        try:
+            tail = fetch(start=anchor.strftime("%Y-%m-%d"), interval=interval)
+        except Exception as e:
+            self.logger.warning(
+                f"Falha na busca incremental de {key}, servindo dados armazenados: {e}"
+            )
+            return stored
+
+        if tail is None or tail.empty:
+            self._save(key, stored, self._covered_from(meta))
+            return stored
+
+        if len(stored) >= 2 and anchor in tail.index:
+            old_close = stored.at[anchor, "Close"]
+            new_close = tail.at[anchor, "Close"]
+            if not np.isclose(old_close, new_close, rtol=1e-6, equal_nan=True):
+                self.logger.info(
+                    f"Ajuste detectado em {key} ({old_close} -> {new_close}), "
+                    "baixando a série completa"
+                )
+                covered_from = self._covered_from(meta)
+                try:
+                    if covered_from is None:
+                        frame = fetch(period="max", interval=interval)
+                    else:
+                        frame = fetch(
+                            start=covered_from.strftime("%Y-%m-%d"), interval=interval
+                        )
+                except Exception as e:
+                    self.logger.warning(
+                        f"Falha ao baixar novamente {key}, servindo dados armazenados: {e}"
+                    )
+                    return stored
+                if frame is None or frame.empty:
+                    self.logger.warning(
+                        f"Nova busca de {key} veio vazia, servindo dados armazenados"
+                    )
+                    return stored
+                self._save(key, frame, covered_from)
+                return frame
+
+        frame = self._merge(stored, tail)
+        self._save(key, frame, self._covered_from(meta))
+        self.logger.debug(f"OHLCV {key}: {len(tail)} barras incrementais")
+        return frame
+
+    def _fetch_end(
+        self, stored: Optional[pd.DataFrame], start: Optional[str], end: Optional[str]
+    ) -> Optional[str]:
+        """
+        Fim exclusivo da busca completa (None = até o presente).
+
+        Com `end`, a busca para nele; se já há série armazenada, vai ao
+        menos até a primeira barra dela, para que a série unida não tenha
+        lacunas.
+        """
+        if not start or not end:
+            return None
+        if stored is None or stored.empty:
+            return end
+        first_stored = (stored.index[0] + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        return max(end, first_stored)
+
+    def _fetch_full(
+        self,
+        fetch: Callable[..., pd.DataFrame],
+        interval: str,
+        period: Optional[str],
+        start: Optional[str],
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Baixa o período solicitado até `end` (exclusivo) ou até o presente."""
+        if start and end:
+            return fetch(start=start, end=end, interval=interval)
+        if start:
+            return fetch(start=start, interval=interval)
+        return fetch(period=period, interval=interval)
+
+    def _merge(self, stored: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        """Une as barras armazenadas com as novas (as novas prevalecem)."""
+        if new.index.tz is not None and stored.index.tz is not None:
+            new = new.tz_convert(stored.index.tz)
+        frame = pd.concat([stored, new])
+        frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+        return frame
+
+    def _slice(
+        self,
+        frame: pd.DataFrame,
+        required_start: Optional[pd.Timestamp],
+        start: Optional[str],
+        end: Optional[str],
+    ) -> pd.DataFrame:
+        """Recorta o DataFrame para o intervalo solicitado."""
+        if frame.empty:
+            return frame
+        tz = frame.index.tz
+        if start:
+            frame = frame[frame.index >= self._localize(start, tz)]
+        elif required_start is not None:
+            if tz is None:
+                required_start = required_start.tz_localize(None)
+            frame = frame[frame.index >= required_start]
+        if end:
+            frame = frame[frame.index < self._localize(end, tz)]
+        return frame
+
+    def _required_start(
+        self, period: Optional[str], start: Optional[str]
+    ) -> Optional[pd.Timestamp]:
+        """Calcula o início exigido pela requisição em UTC (None = desde sempre)."""
+        if start:
+            return self._localize(start, "UTC")
+        now = pd.Timestamp.now(tz="UTC").normalize()
+        if period == "ytd":
+            return now.replace(month=1, day=1)
+        if period in STORE_PERIOD_OFFSETS:
+            return now - STORE_PERIOD_OFFSETS[period]
+        return None
+
+    def _covers(self, meta: dict, required_start: Optional[pd.Timestamp]) -> bool:
+        """Indica se a série armazenada cobre o início exigido."""
+        covered_from = self._covered_from(meta)
+        if covered_from is None:
+            return True
+        return required_start is not None and covered_from <= required_start
+
+    def _covered_from(self, meta: dict) -> Optional[pd.Timestamp]:
+        """Início coberto pela série armazenada (None = período máximo)."""
+        if meta.get("covered_from") is None:
+            return None
+        return pd.Timestamp(meta["covered_from"]).tz_convert("UTC")
+
+    def _localize(self, date: str, tz) -> pd.Timestamp:
+        """Converte uma data YYYY-MM-DD para Timestamp no fuso informado."""
+        timestamp = pd.Timestamp(date)
+        if tz is None:
+            return timestamp
+        if timestamp.tzinfo is None:
+            return timestamp.tz_localize(tz)
+        return timestamp.tz_convert(tz)
+
+    def _key(self, symbol: str, interval: str) -> str:
+        """Chave do par (também usada como nome do arquivo)."""
+        return f"{quote(symbol, safe='')}__{interval}"
+
+    def _path(self, key: str) -> str:
+        """Caminho do arquivo do par."""
+        return os.path.join(self.base_dir, f"{key}.npz")
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        """Obtém (ou cria) o lock do par."""
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _load(self, key: str):
+        """Carrega a série armazenada e seus metadados (ou None se ausente)."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None, {}
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                index = pd.to_datetime(data["ts"], utc=True)
+                if meta.get("tz"):
+                    index = index.tz_convert(meta["tz"])
+                index.name = meta.get("index_name", "Date")
+                columns = {
+                    name: data[f"col_{position}"]
+                    for position, name in enumerate(meta["columns"])
+                }
+            frame = pd.DataFrame(columns, index=index)
+            if "Volume" in frame.columns:
+                frame["Volume"] = frame["Volume"].fillna(0).astype("int64")
+            return frame, meta
+        except Exception as e:
+            self.logger.warning(f"Arquivo OHLCV inválido para {key}, ignorando: {e}")
+            return None, {}
+
+    def _save(
+        self,
+        key: str,
+        frame: pd.DataFrame,
+        covered_from: Optional[pd.Timestamp],
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        """
+        Grava a série de forma atômica (arquivo temporário + os.replace).
+
+        `fetched_at` é o instante até o qual a cauda está atualizada (padrão:
+        agora); 0 força a busca incremental na próxima leitura.
+        """
+        if frame is None or frame.empty:
+            return
+        if not isinstance(frame.index, pd.DatetimeIndex):
+            return
+
+        index = frame.index
+        tz = str(index.tz) if index.tz is not None else None
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        meta = {
+            "tz": tz,
+            "index_name": frame.index.name or "Date",
+            "columns": [str(column) for column in frame.columns],
+            "covered_from": covered_from.isoformat() if covered_from is not None else None,
+            "fetched_at": time.time() if fetched_at is None else fetched_at,
+        }
+        arrays = {
+            f"col_{position}": frame[column].to_numpy(dtype=float)
+            for position, column in enumerate(frame.columns)
+        }
+
+        os.makedirs(self.base_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                np.savez(
+                    tmp_file,
+                    ts=index.tz_convert("UTC").as_unit("ns").asi8,
+                    meta=np.array(json.dumps(meta)),
+                    **arrays,
+                )
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            self.logger.warning(f"Falha ao gravar OHLCV de {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+# Instância compartilhada pelo provedor, pelo serviço e pelo módulo cadu
+ohlcv_store = OHLCVStore()
@@ -0,0 +1,318 @@
+"""
+Estatísticas entre ativos calculadas sobre uma matriz de retornos alinhada.
+
+Os históricos diários de cada ativo são alinhados por data em uma única
+matriz (datas x ativos) e todas as estatísticas saem de operações
+vetorizadas sobre ela, sem laços por par de ativos:
+
+- covariância e correlação a partir de um único produto matricial dos
+  retornos centrados;
+- correlação móvel de cada ativo com uma referência (um símbolo ou a cesta
+  de pesos iguais) por somas acumuladas, em O(datas x ativos).
+
+Example:
+    from services.portfolio_analytics import align_closes, simple_returns
+
+    prices, excluded = align_closes(frames)
+    returns = simple_returns(prices.to_numpy())
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Pregões por ano usados na anualização
+TRADING_DAYS_PER_YEAR = 252
+
+# Pregões seguidos sem cotação preenchidos com o último fechamento
+# (feriados de um mercado em carteiras com ativos de outro)
+MAX_FILL_DAYS = 5
+
+# Trajetórias do Monte Carlo por semente; as tarefas agrupam blocos inteiros,
+# então o resultado com uma semente fixa não depende da divisão em tarefas
+SIMULATION_BLOCK_PATHS = 10_000
+
+
+def align_closes(
+    frames: Dict[str, pd.DataFrame], min_coverage: float = 0.5
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Alinha os fechamentos diários de vários ativos por data.
+
+    As datas são a união dos pregões de todos os ativos; lacunas de até
+    MAX_FILL_DAYS pregões (feriados de outro mercado) repetem o último
+    fechamento. A matriz começa na primeira data em que todos os ativos
+    mantidos têm cotação; ativos listados tarde demais ou sem cotações
+    recentes (cobrindo menos de `min_coverage` das datas) são excluídos em
+    vez de encurtar a matriz.
+
+    Args:
+        frames: Histórico (com coluna "Close") por símbolo
+        min_coverage: Fração mínima das datas que um ativo precisa cobrir
+
+    Returns:
+        Tupla (fechamentos datas x ativos sem NaN, símbolos excluídos)
+    """
+    dates = {}
+    values = {}
+    excluded = []
+    for symbol, hist in frames.items():
+        if hist is None or hist.empty or "Close" not in hist:
+            excluded.append(symbol)
+            continue
+        series = hist["Close"].dropna()
+        if series.empty:
+            excluded.append(symbol)
+            continue
+        index = series.index
+        if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+            index = index.tz_localize(None)
+        day = pd.DatetimeIndex(index).to_numpy().astype("datetime64[D]")
+        # Última cotação de cada dia (barras repetidas ou do pregão em andamento)
+        keep = np.append(day[1:] != day[:-1], True)
+        dates[symbol] = day[keep]
+        values[symbol] = series.to_numpy(dtype=np.float64)[keep]
+
+    if not dates:
+        return pd.DataFrame(), excluded
+
+    # Matriz na união das datas, preenchida por posição (sem reindexações do pandas)
+    index = np.unique(np.concatenate(list(dates.values())))
+    matrix = np.full((len(index), len(dates)), np.nan)
+    for column, symbol in enumerate(dates):
+        matrix[np.searchsorted(index, dates[symbol]), column] = values[symbol]
+    prices = pd.DataFrame(
+        matrix, index=pd.DatetimeIndex(index.astype("datetime64[ns]")), columns=list(dates)
+    ).ffill(limit=MAX_FILL_DAYS)
+
+    valid = prices.notna().to_numpy()
+    first_valid = valid.argmax(axis=0)
+    last_valid = len(valid) - 1 - valid[::-1].argmax(axis=0)
+    coverage = (last_valid - first_valid + 1) / len(valid)
+    late = [symbol for symbol, c in zip(prices.columns, coverage) if c < min_coverage]
+    if late:
+        prices = prices.drop(columns=late)
+        excluded.extend(late)
+
+    return prices.dropna(), excluded
+
+
+def simple_returns(prices: np.ndarray) -> np.ndarray:
+    """Retornos simples por período (uma linha a menos que os preços)."""
+    return prices[1:] / prices[:-1] - 1.0
+
+
+def covariance_matrix(returns: np.ndarray) -> np.ndarray:
+    """Covariância amostral (ddof=1) das colunas em um único produto matricial."""
+    centered = returns - returns.mean(axis=0)
+    return centered.T @ centered / (len(returns) - 1)
+
+
+def correlation_from_covariance(covariance: np.ndarray) -> np.ndarray:
+    """Correlação a partir da covariância (ativos sem variação ficam com 0)."""
+    std = np.sqrt(np.diag(covariance))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance / np.outer(std, std)
+    correlation = np.nan_to_num(correlation, nan=0.0, posinf=0.0, neginf=0.0)
+    np.fill_diagonal(correlation, np.where(std > 0, 1.0, 0.0))
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def rolling_correlation(
+    returns: np.ndarray, reference: np.ndarray, window: int
+) -> np.ndarray:
+    """
+    Correlação móvel de cada coluna com uma série de referência.
+
+    Usa somas acumuladas de x, y, x², y² e xy, de modo que todas as janelas
+    de todos os ativos saem de poucas operações sobre a matriz inteira.
+
+    Args:
+        returns: Matriz de retornos (datas x ativos)
+        reference: Retornos da referência (datas)
+        window: Tamanho da janela em pregões
+
+    Returns:
+        Matriz (datas x ativos) com NaN antes da primeira janela completa
+    """
+    out = np.full(returns.shape, np.nan)
+    if len(returns) < window:
+        return out
+
+    # Centrar pela média global reduz o cancelamento numérico das somas
+    x = returns - returns.mean(axis=0)
+    y = (reference - reference.mean())[:, None]
+
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        csum = np.cumsum(values, axis=0)
+        sums = csum[window - 1:].copy()
+        sums[1:] -= csum[:-window]
+        return sums
+
+    sx, sy = window_sums(x), window_sums(y)
+    sxx, syy, sxy = window_sums(x * x), window_sums(y * y), window_sums(x * y)
+    cov = sxy - sx * sy / window
+    var_x = np.clip(sxx - sx * sx / window, 0, None)
+    var_y = np.clip(syy - sy * sy / window, 0, None)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[window - 1:] = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+    return out
+
+
+def rounded_list(values: np.ndarray, decimals: int) -> list:
+    """Converte um array para listas aninhadas arredondadas, com None no lugar de NaN."""
+    rounded = np.round(values, decimals).astype(object)
+    rounded[np.isnan(values)] = None
+    return rounded.tolist()
+
+
+# ==================== RISCO DE CARTEIRA ====================
+
+
+def max_drawdown(returns: np.ndarray) -> float:
+    """Maior queda do patrimônio em relação ao pico anterior (fração positiva)."""
+    wealth = np.cumprod(1.0 + returns)
+    peaks = np.maximum.accumulate(np.concatenate(([1.0], wealth)))[1:]
+    return float(np.max(1.0 - wealth / peaks)) if len(wealth) else 0.0
+
+
+def var_cvar(outcomes: np.ndarray, confidence: float) -> Tuple[float, float]:
+    """
+    VaR e CVaR (expected shortfall) de uma amostra de retornos.
+
+    Args:
+        outcomes: Retornos observados ou simulados
+        confidence: Nível de confiança (ex: 0.95)
+
+    Returns:
+        Tupla (VaR, CVaR) como perdas positivas
+    """
+    threshold = np.quantile(outcomes, 1.0 - confidence)
+    tail = outcomes[outcomes <= threshold]
+    return float(-threshold), float(-tail.mean())
+
+
+def horizon_returns(returns: np.ndarray, horizon: int) -> np.ndarray:
+    """Retornos compostos em janelas sobrepostas de `horizon` pregões."""
+    if horizon == 1:
+        return returns
+    log_wealth = np.concatenate(([0.0], np.cumsum(np.log1p(returns))))
+    return np.expm1(log_wealth[horizon:] - log_wealth[:-horizon])
+
+
+def risk_metrics(
+    returns: np.ndarray, risk_free_rate: float, confidence: float, horizon: int
+) -> Dict[str, float]:
+    """
+    Métricas de risco históricas de uma série de retornos diários da carteira.
+
+    Args:
+        returns: Retornos diários da carteira
+        risk_free_rate: Taxa livre de risco anual (ex: 0.1 para 10% a.a.)
+        confidence: Nível de confiança do VaR/CVaR
+        horizon: Horizonte do VaR/CVaR em pregões
+
+    Returns:
+        Dicionário com retorno e volatilidade anualizados, drawdown máximo,
+        Sharpe, Sortino e VaR/CVaR históricos
+    """
+    annual_return = float(returns.mean() * TRADING_DAYS_PER_YEAR)
+    volatility = float(returns.std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR))
+    downside = np.minimum(returns - risk_free_rate / TRADING_DAYS_PER_YEAR, 0.0)
+    downside_deviation = float(np.sqrt(np.mean(downside ** 2) * TRADING_DAYS_PER_YEAR))
+    excess = annual_return - risk_free_rate
+    var, cvar = var_cvar(horizon_returns(returns, horizon), confidence)
+    return {
+        "total_return": float(np.prod(1.0 + returns) - 1.0),
+        "annualized_return": annual_return,
+        "annualized_volatility": volatility,
+        "max_drawdown": max_drawdown(returns),
+        "sharpe_ratio": excess / volatility if volatility > 0 else None,
+        "sortino_ratio": excess / downside_deviation if downside_deviation > 0 else None,
+        "historical_var": var,
+        "historical_cvar": cvar,
+    }
+
+
+def covariance_factor(covariance: np.ndarray) -> np.ndarray:
+    """
+    Fator F com F @ F.T = covariância (Cholesky).
+
+    Covariâncias semidefinidas (ativos redundantes, poucas observações)
+    caem para a decomposição espectral com autovalores negativos zerados.
+    """
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(covariance)
+        return vectors * np.sqrt(np.clip(values, 0.0, None))
+
+
+def simulation_blocks(
+    paths: int, seed: Optional[int]
+) -> List[Tuple[np.random.SeedSequence, int]]:
+    """
+    Divide as trajetórias em blocos de SIMULATION_BLOCK_PATHS com sementes independentes.
+
+    Args:
+        paths: Número total de trajetórias
+        seed: Semente raiz (None: aleatória)
+
+    Returns:
+        Lista de (semente, trajetórias) na ordem das trajetórias
+    """
+    count = -(-paths // SIMULATION_BLOCK_PATHS)
+    seeds = np.random.SeedSequence(seed).spawn(count)
+    return [
+        (block_seed, min(SIMULATION_BLOCK_PATHS, paths - i * SIMULATION_BLOCK_PATHS))
+        for i, block_seed in enumerate(seeds)
+    ]
+
+
+def simulate_portfolio_returns(
+    mean: np.ndarray,
+    factor: np.ndarray,
+    weights: np.ndarray,
+    horizon: int,
+    blocks: List[Tuple[np.random.SeedSequence, int]],
+    chunk_elements: int,
+) -> np.ndarray:
+    """
+    Simula retornos da carteira no horizonte por Monte Carlo.
+
+    Os log-retornos diários dos ativos seguem uma normal multivariada
+    (média `mean`, covariância F @ F.T), independentes entre os dias; a
+    soma de `horizon` dias é então exatamente normal com média
+    horizon * mean e fator sqrt(horizon) * F, e cada trajetória precisa de
+    um único vetor sorteado. Cada bloco (ver `simulation_blocks`) tem o seu
+    gerador, sorteado em lotes de até `chunk_elements` números; como os
+    lotes consomem o gerador em sequência, nem o tamanho do lote nem a
+    divisão dos blocos entre tarefas alteram as trajetórias. A carteira é
+    mantida sem rebalanceamento (buy-and-hold) no horizonte. Executada no
+    pool de processos.
+
+    Args:
+        mean: Média dos log-retornos diários por ativo
+        factor: Fator da covariância dos log-retornos (ver covariance_factor)
+        weights: Pesos iniciais da carteira
+        horizon: Horizonte em pregões
+        blocks: Blocos (semente, trajetórias) simulados por esta tarefa
+        chunk_elements: Máximo de números sorteados por lote
+
+    Returns:
+        Retornos simulados da carteira no horizonte (um por trajetória)
+    """
+    chunk = max(1, chunk_elements // len(weights))
+    scaled = np.sqrt(horizon) * factor.T
+    drift = horizon * mean
+    outcomes = np.empty(sum(paths for _, paths in blocks))
+    position = 0
+    for seed, paths in blocks:
+        rng = np.random.default_rng(seed)
+        for start in range(0, paths, chunk):
+            size = min(chunk, paths - start)
+            log_growth = rng.standard_normal((size, len(weights))) @ scaled + drift
+            outcomes[position:position + size] = np.exp(log_growth) @ weights - 1.0
+            position += size
+    return outcomes
@@ -0,0 +1,283 @@
+"""
+Otimização média-variância e fronteira eficiente de carteiras.
+
+A covariância é estimada dos retornos diários alinhados (ver
+`services.portfolio_analytics`), opcionalmente com encolhimento para a
+identidade escalada (Ledoit-Wolf ou OAS), o que estabiliza a matriz quando
+há muitos ativos para poucas observações. Cada carteira sai de um problema
+quadrático resolvido por SLSQP com gradientes analíticos:
+
+- mínima variância: min wᵀΣw com soma 1 e limites por ativo;
+- máximo Sharpe: max (wᵀμ - rf) / sqrt(wᵀΣw) com as mesmas restrições;
+- fronteira: mínima variância com retorno-alvo fixo, para alvos entre o
+  retorno da mínima variância e o maior retorno possível.
+
+Os alvos da fronteira são divididos em segmentos contíguos resolvidos em
+paralelo no pool de processos. Cada segmento parte de uma combinação
+viável entre a mínima variância e a carteira de maior retorno, e dentro
+dele cada ponto parte da solução do ponto vizinho (warm start), que já
+está perto do ótimo.
+
+Só soluções em que o SLSQP convergiu são devolvidas: as carteiras de
+mínima variância e de máximo Sharpe levantam OptimizationError, e pontos
+da fronteira sem convergência são descartados.
+
+Example:
+    from services.portfolio_optimizer import shrink_covariance, min_variance
+
+    covariance, intensity = shrink_covariance(returns, "ledoit_wolf")
+    weights = min_variance(covariance, bounds=(0.0, 1.0))
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+
+from services.portfolio_analytics import TRADING_DAYS_PER_YEAR, covariance_matrix
+
+# Métodos de encolhimento da covariância aceitos
+SHRINKAGE_METHODS = ("none", "ledoit_wolf", "oas")
+
+# Tolerância e iterações do SLSQP
+SOLVER_TOLERANCE = 1e-9
+SOLVER_MAX_ITERATIONS = 500
+
+
+def shrink_covariance(returns: np.ndarray, method: str) -> Tuple[np.ndarray, float]:
+    """
+    Estima a covariância diária com encolhimento para a identidade escalada.
+
+    Args:
+        returns: Matriz de retornos (datas x ativos)
+        method: "none" (amostral), "ledoit_wolf" ou "oas"
+
+    Returns:
+        Tupla (covariância, intensidade do encolhimento entre 0 e 1)
+
+    Raises:
+        ValueError: Se o método for desconhecido
+    """
+    if method not in SHRINKAGE_METHODS:
+        raise ValueError(
+            f"Encolhimento inválido: {method}. Disponíveis: {', '.join(SHRINKAGE_METHODS)}"
+        )
+    if method == "none":
+        return covariance_matrix(returns), 0.0
+
+    observations, assets = returns.shape
+    centered = returns - returns.mean(axis=0)
+    sample = centered.T @ centered / observations
+    mu = np.trace(sample) / assets
+    sample_norm = np.sum(sample ** 2)
+
+    if method == "ledoit_wolf":
+        # b² = (Σ_k ||x_k||⁴ - n ||S||²) / n², d² = ||S - μI||²
+        distance = sample_norm - 2 * mu * np.trace(sample) + mu ** 2 * assets
+        row_norms = np.sum(centered ** 2, axis=1)
+        dispersion = (np.sum(row_norms ** 2) - observations * sample_norm) / observations ** 2
+        intensity = 0.0 if distance <= 0 else min(max(dispersion, 0.0), distance) / distance
+    else:
+        alpha = sample_norm / assets ** 2
+        denominator = (observations + 1) * (alpha - mu ** 2 / assets)
+        intensity = 1.0 if denominator == 0 else min((alpha + mu ** 2) / denominator, 1.0)
+
+    shrunk = (1.0 - intensity) * sample
+    shrunk[np.diag_indices(assets)] += intensity * mu
+    return shrunk, float(intensity)
+
+
+class OptimizationError(ValueError):
+    """O otimizador não convergiu para uma carteira que respeite as restrições."""
+
+
+def check_bounds(assets: int, bounds: Tuple[float, float]) -> None:
+    """
+    Verifica se os limites por ativo admitem pesos com soma 1.
+
+    Raises:
+        ValueError: Se nenhuma carteira respeitar os limites
+    """
+    low, high = bounds
+    if low > high or not low * assets <= 1.0 <= high * assets:
+        raise ValueError(
+            f"Limites de peso inviáveis para {assets} ativos: "
+            f"a soma dos pesos precisa poder ser 1"
+        )
+
+
+def _solve(
+    objective,
+    x0: np.ndarray,
+    bounds: Tuple[float, float],
+    constraints: List[dict],
+) -> np.ndarray:
+    """
+    Executa o SLSQP com soma dos pesos igual a 1 e limites por ativo.
+
+    Raises:
+        ValueError: Se os limites forem inviáveis
+        OptimizationError: Se o SLSQP não convergir
+    """
+    check_bounds(len(x0), bounds)
+    result = minimize(
+        objective,
+        x0,
+        jac=True,
+        method="SLSQP",
+        bounds=[bounds] * len(x0),
+        constraints=[
+            {"type": "eq", "fun": lambda w: w.sum() - 1.0, "jac": lambda w: np.ones_like(w)},
+            *constraints,
+        ],
+        options={"ftol": SOLVER_TOLERANCE, "maxiter": SOLVER_MAX_ITERATIONS},
+    )
+    if not result.success:
+        raise OptimizationError(f"Otimização não convergiu: {result.message}")
+    return result.x
+
+
+def _variance(covariance: np.ndarray):
+    """
+    Objetivo wᵀΣw com o gradiente 2Σw.
+
+    A variância é dividida pela variância média dos ativos, para que a
+    tolerância do SLSQP (absoluta) valha igualmente para carteiras de
+    baixa e de alta volatilidade.
+    """
+    scale = 1.0 / max(float(np.trace(covariance)) / len(covariance), 1e-18)
+
+    def objective(w: np.ndarray) -> Tuple[float, np.ndarray]:
+        product = scale * (covariance @ w)
+        return float(w @ product), 2.0 * product
+    return objective
+
+
+def feasible_start(assets: int) -> np.ndarray:
+    """Pesos iguais, que respeitam os limites sempre que o problema é viável."""
+    return np.full(assets, 1.0 / assets)
+
+
+def min_variance(
+    covariance: np.ndarray, bounds: Tuple[float, float], x0: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Carteira de mínima variância."""
+    start = feasible_start(len(covariance)) if x0 is None else x0
+    return _solve(_variance(covariance), start, bounds, [])
+
+
+def max_sharpe(
+    expected: np.ndarray,
+    covariance: np.ndarray,
+    risk_free_rate: float,
+    bounds: Tuple[float, float],
+    x0: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Carteira de máximo índice de Sharpe (minimiza o Sharpe negativo)."""
+    def objective(w: np.ndarray) -> Tuple[float, np.ndarray]:
+        product = covariance @ w
+        volatility = np.sqrt(max(float(w @ product), 1e-18))
+        excess = float(w @ expected) - risk_free_rate
+        gradient = expected / volatility - excess * product / volatility ** 3
+        return -excess / volatility, -gradient
+
+    start = feasible_start(len(covariance)) if x0 is None else x0
+    return _solve(objective, start, bounds, [])
+
+
+def max_return_weights(expected: np.ndarray, bounds: Tuple[float, float]) -> np.ndarray:
+    """
+    Carteira de maior retorno esperado com soma 1 e limites por ativo.
+
+    Parte do limite inferior em todos os ativos e distribui o restante, até
+    o limite superior, pelos ativos de maior retorno (solução exata do
+    problema linear).
+    """
+    low, high = bounds
+    weights = np.full(len(expected), low)
+    budget = 1.0 - weights.sum()
+    for index in np.argsort(expected)[::-1]:
+        if budget <= 0:
+            break
+        step = min(high - low, budget)
+        weights[index] += step
+        budget -= step
+    return weights
+
+
+def interpolated_start(
+    minimum: np.ndarray, maximum: np.ndarray, expected: np.ndarray, target: float
+) -> np.ndarray:
+    """
+    Ponto de partida viável para um retorno-alvo.
+
+    A combinação convexa entre a carteira de mínima variância e a de maior
+    retorno respeita os limites e, como o retorno é linear nos pesos, atinge
+    o alvo exatamente.
+    """
+    low, high = float(minimum @ expected), float(maximum @ expected)
+    t = 0.0 if high <= low else min(max((target - low) / (high - low), 0.0), 1.0)
+    return (1.0 - t) * minimum + t * maximum
+
+
+def solve_frontier_segment(
+    expected: np.ndarray,
+    covariance: np.ndarray,
+    bounds: Tuple[float, float],
+    targets: List[float],
+    x0: np.ndarray,
+) -> List[Optional[np.ndarray]]:
+    """
+    Resolve pontos contíguos da fronteira, cada um partindo do anterior.
+
+    Executada no pool de processos: recebe apenas μ, Σ e os alvos. Um ponto
+    sem convergência vem como None e o seguinte parte da última solução
+    convergida.
+
+    Args:
+        expected: Retornos esperados anualizados
+        covariance: Covariância anualizada
+        bounds: Limites (mínimo, máximo) do peso de cada ativo
+        targets: Retornos-alvo em ordem crescente
+        x0: Ponto de partida do primeiro alvo
+
+    Returns:
+        Pesos de cada alvo (None se não convergiu), na ordem dos alvos
+    """
+    objective = _variance(covariance)
+    solutions: List[Optional[np.ndarray]] = []
+    start = x0
+    for target in targets:
+        constraint = {
+            "type": "eq",
+            "fun": lambda w, target=target: float(w @ expected) - target,
+            "jac": lambda w: expected,
+        }
+        try:
+            start = _solve(objective, start, bounds, [constraint])
+        except OptimizationError:
+            solutions.append(None)
+            continue
+        solutions.append(start)
+    return solutions
+
+
+def describe_portfolio(
+    weights: np.ndarray,
+    expected: np.ndarray,
+    covariance: np.ndarray,
+    risk_free_rate: float,
+) -> Dict[str, float]:
+    """Retorno, volatilidade e Sharpe anualizados de uma carteira."""
+    ret = float(weights @ expected)
+    volatility = float(np.sqrt(max(weights @ covariance @ weights, 0.0)))
+    return {
+        "expected_return": ret,
+        "volatility": volatility,
+        "sharpe_ratio": (ret - risk_free_rate) / volatility if volatility > 0 else None,
+    }
+
+
+def annualize(returns: np.ndarray, covariance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Retornos esperados e covariância anualizados a partir dos diários."""
+    return returns.mean(axis=0) * TRADING_DAYS_PER_YEAR, covariance * TRADING_DAYS_PER_YEAR
@@ -0,0 +1,637 @@
+"""
+Rate limiters para o Market Data Service.
+
+Este módulo implementa a interface IRateLimiter com o algoritmo token bucket:
+cada identificador tem um balde com capacidade de `max_requests` fichas, que
+é reabastecido continuamente à taxa de `max_requests / window_seconds`
+fichas por segundo. Cada verificação custa O(1), independentemente do limite
+configurado.
+
+Três backends estão disponíveis (selecionados por RATE_LIMIT_BACKEND):
+
+- TokenBucketRateLimiter: estado no próprio processo (um worker)
+- SharedMemoryRateLimiter: tabela em arquivo mapeado em memória,
+  compartilhada pelos workers de um mesmo host
+- RedisRateLimiter: estado em um servidor Redis, compartilhado entre hosts
+
+Example:
+    from services.rate_limiter import TokenBucketRateLimiter
+
+    limiter = TokenBucketRateLimiter(max_requests=100, window_seconds=60)
+    if limiter.is_allowed("client-1", cost=len(symbols)):
+        ...
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from core.config import settings
+from core.logging import LoggerMixin
+from services.interfaces import IRateLimiter
+from services.redis_cache import RedisConnectionPool, RedisError, RedisReplyError
+
+# Layout da tabela compartilhada: cabeçalho seguido de slots de tamanho fixo
+_SHM_MAGIC = b"MDRL"
+_SHM_VERSION = 1
+_SHM_HEADER = struct.Struct("<4sII")  # magic, versão, número de slots
+_SHM_HEADER_SIZE = 64
+_SHM_SLOT = struct.Struct("<Qdd")  # hash do identificador, fichas, última atualização
+_SHM_SLOT_DTYPE = np.dtype([("key", "<u8"), ("tokens", "<f8"), ("updated_at", "<f8")])
+_SHM_STRIPES = 64
+_SHM_PROBE_LIMIT = 16
+
+
+class _Bucket:
+    """Estado do balde de um identificador."""
+
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, tokens: float, updated_at: float):
+        self.tokens = tokens
+        self.updated_at = updated_at
+
+
+class TokenBucketRateLimiter(IRateLimiter, LoggerMixin):
+    """
+    Rate limiter thread-safe baseado em token bucket.
+
+    Em vez de guardar o instante de cada requisição, cada identificador guarda
+    apenas o saldo de fichas e o instante da última atualização; o reabastecimento
+    é calculado sob demanda a partir do tempo decorrido. O limite de longo prazo
+    é o mesmo da janela deslizante (`max_requests` por `window_seconds`), com
+    rajadas de até `max_requests` requisições.
+
+    Um balde ocioso por uma janela inteira está cheio de novo, ou seja, é
+    indistinguível de um identificador nunca visto; por isso a thread de limpeza
+    pode removê-lo sem alterar o comportamento, e a memória fica proporcional
+    aos clientes ativos em vez de a todos os clientes já vistos.
+
+    Attributes:
+        max_requests: Capacidade do balde (requisições por janela)
+        window_seconds: Tempo em segundos para reabastecer o balde vazio
+        sweep_interval: Intervalo entre limpezas de ociosos em segundos
+    """
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        window_seconds: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        """
+        Inicializa o rate limiter.
+
+        Args:
+            max_requests: Número máximo de requisições por janela
+            window_seconds: Tamanho da janela em segundos
+            sweep_interval: Intervalo da limpeza em segundos (0 desabilita a thread)
+        """
+        self.max_requests = max_requests or settings.RATE_LIMIT_REQUESTS
+        self.window_seconds = window_seconds or settings.RATE_LIMIT_WINDOW
+        self.sweep_interval = (
+            settings.RATE_LIMIT_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
+        )
+        self._refill_rate = self.max_requests / self.window_seconds
+
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+        self._evicted = 0
+
+        self._stop_event = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if self.sweep_interval > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="rate-limit-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def is_allowed(self, identifier: str, cost: int = 1) -> bool:
+        """
+        Verifica se a requisição é permitida e consome `cost` fichas.
+
+        O custo é limitado à capacidade do balde, para que uma requisição
+        maior que o limite ainda seja possível com o balde cheio.
+        """
+        cost = min(max(cost, 1), self.max_requests)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(identifier)
+            if bucket is None:
+                bucket = self._buckets[identifier] = _Bucket(self.max_requests, now)
+            else:
+                self._refill(bucket, now)
+
+            if bucket.tokens < cost:
+                self._rejected += 1
+                return False
+
+            bucket.tokens -= cost
+            self._allowed += 1
+            return True
+
+    def get_remaining_requests(self, identifier: str) -> int:
+        """Obtém o número de fichas disponíveis, sem consumi-las."""
+        with self._lock:
+            bucket = self._buckets.get(identifier)
+            if bucket is None:
+                return self.max_requests
+            elapsed = time.monotonic() - bucket.updated_at
+            tokens = min(self.max_requests, bucket.tokens + elapsed * self._refill_rate)
+        return int(tokens)
+
+    def reset_limit(self, identifier: str) -> bool:
+        """Reseta limite para um identificador."""
+        with self._lock:
+            self._buckets.pop(identifier, None)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna contadores do rate limiter.
+
+        Returns:
+            Dicionário com clientes rastreados, requisições aceitas, rejeitadas
+            e identificadores removidos por ociosidade
+        """
+        with self._lock:
+            return {
+                "algorithm": "token_bucket",
+                "backend": "memory",
+                "tracked_clients": len(self._buckets),
+                "allowed": self._allowed,
+                "rejected": self._rejected,
+                "evicted": self._evicted,
+            }
+
+    def sweep(self) -> int:
+        """
+        Remove os identificadores cujo balde já está cheio novamente.
+
+        Returns:
+            Número de identificadores removidos
+        """
+        idle_since = time.monotonic() - self.window_seconds
+        with self._lock:
+            idle = [
+                identifier for identifier, bucket in self._buckets.items()
+                if bucket.updated_at <= idle_since
+            ]
+            for identifier in idle:
+                del self._buckets[identifier]
+            self._evicted += len(idle)
+
+        if idle:
+            self.logger.debug(f"Limpeza do rate limiter removeu {len(idle)} clientes ociosos")
+        return len(idle)
+
+    def close(self) -> None:
+        """Interrompe a thread de limpeza."""
+        self._stop_event.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=self.sweep_interval)
+
+    def _refill(self, bucket: _Bucket, now: float) -> None:
+        """Reabastece o balde pelo tempo decorrido desde a última atualização."""
+        elapsed = now - bucket.updated_at
+        if elapsed > 0:
+            bucket.tokens = min(
+                self.max_requests, bucket.tokens + elapsed * self._refill_rate
+            )
+            bucket.updated_at = now
+
+    def _sweep_loop(self) -> None:
+        """Laço da thread de limpeza periódica."""
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error(f"Erro na limpeza do rate limiter: {e}")
+
+
+class SharedMemoryRateLimiter(IRateLimiter, LoggerMixin):
+    """
+    Token bucket compartilhado entre os processos de um mesmo host.
+
+    O estado fica em uma tabela hash de tamanho fixo dentro de um arquivo
+    mapeado em memória (mmap), aberto por todos os workers do uvicorn. Cada
+    slot guarda o hash de 64 bits do identificador, o saldo de fichas e o
+    instante da última atualização. A tabela é dividida em faixas (stripes)
+    com sondagem linear limitada dentro da faixa; cada faixa é protegida por
+    um lock de região do arquivo (fcntl, entre processos) e por um lock de
+    thread (entre threads do mesmo processo, que o fcntl não exclui).
+
+    Slots ociosos por uma janela inteira equivalem a baldes cheios e são
+    reaproveitados na hora da inserção, então não há thread de limpeza. Se
+    todos os slots sondados estiverem ocupados por clientes ativos, o slot
+    menos recente é reaproveitado (o cliente despejado recomeça com o balde
+    cheio), mantendo a memória fixa em `slots` entradas.
+
+    Todos os workers devem usar os mesmos RATE_LIMIT_* e o mesmo arquivo. Usa
+    o relógio de parede (time.time) porque o arquivo sobrevive a reinícios.
+
+    Attributes:
+        max_requests: Capacidade do balde (requisições por janela)
+        window_seconds: Tempo em segundos para reabastecer o balde vazio
+        path: Arquivo da tabela compartilhada
+        slots: Número de slots da tabela
+    """
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        window_seconds: Optional[int] = None,
+        path: Optional[str] = None,
+        slots: Optional[int] = None,
+    ):
+        """
+        Inicializa o rate limiter, criando a tabela se necessário.
+
+        Args:
+            max_requests: Número máximo de requisições por janela
+            window_seconds: Tamanho da janela em segundos
+            path: Arquivo da tabela (padrão: RATE_LIMIT_SHM_PATH)
+            slots: Número de slots, arredondado para múltiplo das faixas
+        """
+        self.max_requests = max_requests or settings.RATE_LIMIT_REQUESTS
+        self.window_seconds = window_seconds or settings.RATE_LIMIT_WINDOW
+        self.path = path or settings.RATE_LIMIT_SHM_PATH
+        self._refill_rate = self.max_requests / self.window_seconds
+
+        requested = slots or settings.RATE_LIMIT_SHM_SLOTS
+        self._stripe_slots = max(_SHM_PROBE_LIMIT, -(-requested // _SHM_STRIPES))
+        self.slots = self._stripe_slots * _SHM_STRIPES
+        self._stripe_bytes = self._stripe_slots * _SHM_SLOT.size
+        size = _SHM_HEADER_SIZE + self.slots * _SHM_SLOT.size
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._initialize(size)
+            self._mm = mmap.mmap(self._fd, size)
+        except Exception:
+            os.close(self._fd)
+            raise
+
+        self._thread_locks = [threading.Lock() for _ in range(_SHM_STRIPES)]
+        self._stats_lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+        self._evicted = 0
+
+    def is_allowed(self, identifier: str, cost: int = 1) -> bool:
+        """
+        Verifica se a requisição é permitida e consome `cost` fichas.
+
+        O custo é limitado à capacidade do balde, para que uma requisição
+        maior que o limite ainda seja possível com o balde cheio.
+        """
+        cost = min(max(cost, 1), self.max_requests)
+        key = self._hash(identifier)
+        stripe, home = self._locate(key)
+        now = time.time()
+        with self._locked(stripe):
+            offset, tokens, evicted = self._find_slot(stripe, home, key, now)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            _SHM_SLOT.pack_into(self._mm, offset, key, tokens, now)
+
+        with self._stats_lock:
+            self._evicted += evicted
+            if allowed:
+                self._allowed += 1
+            else:
+                self._rejected += 1
+        return allowed
+
+    def get_remaining_requests(self, identifier: str) -> int:
+        """Obtém o número de fichas disponíveis, sem consumi-las."""
+        key = self._hash(identifier)
+        stripe, home = self._locate(key)
+        now = time.time()
+        with self._locked(stripe):
+            for offset in self._probe(stripe, home):
+                slot_key, tokens, updated_at = _SHM_SLOT.unpack_from(self._mm, offset)
+                if slot_key == key:
+                    return int(self._refilled(tokens, updated_at, now))
+        return self.max_requests
+
+    def reset_limit(self, identifier: str) -> bool:
+        """Reseta limite para um identificador."""
+        key = self._hash(identifier)
+        stripe, home = self._locate(key)
+        with self._locked(stripe):
+            for offset in self._probe(stripe, home):
+                if _SHM_SLOT.unpack_from(self._mm, offset)[0] == key:
+                    _SHM_SLOT.pack_into(self._mm, offset, 0, 0.0, 0.0)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna a ocupação da tabela e os contadores deste processo.
+
+        Returns:
+            Dicionário com slots ocupados por clientes ativos e requisições
+            aceitas/rejeitadas por este worker
+        """
+        table = np.frombuffer(
+            self._mm, dtype=_SHM_SLOT_DTYPE, count=self.slots, offset=_SHM_HEADER_SIZE
+        )
+        active = int(np.count_nonzero(
+            (table["key"] != 0)
+            & (table["updated_at"] > time.time() - self.window_seconds)
+        ))
+        del table  # libera a referência ao mmap
+        with self._stats_lock:
+            return {
+                "algorithm": "token_bucket",
+                "backend": "shared_memory",
+                "tracked_clients": active,
+                "slots": self.slots,
+                "allowed": self._allowed,
+                "rejected": self._rejected,
+                "evicted": self._evicted,
+            }
+
+    def close(self) -> None:
+        """Desmapeia a tabela e fecha o arquivo."""
+        try:
+            self._mm.close()
+        finally:
+            os.close(self._fd)
+
+    def _initialize(self, size: int) -> None:
+        """Cria ou valida a tabela sob lock exclusivo do arquivo inteiro."""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, _SHM_HEADER.size, 0)
+            expected = _SHM_HEADER.pack(_SHM_MAGIC, _SHM_VERSION, self.slots)
+            if header == expected and os.fstat(self._fd).st_size == size:
+                return
+            if header:
+                self.logger.warning(
+                    f"Tabela de rate limit em {self.path} com layout diferente; recriando"
+                )
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, size)
+            os.pwrite(self._fd, expected, 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _locked(self, stripe: int) -> Iterator[None]:
+        """Trava a faixa entre threads e entre processos."""
+        start = _SHM_HEADER_SIZE + stripe * self._stripe_bytes
+        with self._thread_locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, self._stripe_bytes, start)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self._stripe_bytes, start)
+
+    def _locate(self, key: int) -> Tuple[int, int]:
+        """Retorna a faixa e o slot inicial (dentro da faixa) de uma chave."""
+        return key % _SHM_STRIPES, (key // _SHM_STRIPES) % self._stripe_slots
+
+    def _probe(self, stripe: int, home: int) -> Iterator[int]:
+        """Offsets dos slots sondados para uma chave, em ordem."""
+        base = _SHM_HEADER_SIZE + stripe * self._stripe_bytes
+        for i in range(_SHM_PROBE_LIMIT):
+            yield base + ((home + i) % self._stripe_slots) * _SHM_SLOT.size
+
+    def _find_slot(
+        self, stripe: int, home: int, key: int, now: float
+    ) -> Tuple[int, float, int]:
+        """
+        Localiza o slot da chave ou escolhe um slot para ela.
+
+        Returns:
+            Offset do slot, saldo atual de fichas e 1 se um cliente ativo
+            foi despejado (0 caso contrário)
+        """
+        free_offset = None
+        oldest_offset, oldest_at = None, float("inf")
+        for offset in self._probe(stripe, home):
+            slot_key, tokens, updated_at = _SHM_SLOT.unpack_from(self._mm, offset)
+            if slot_key == key:
+                return offset, self._refilled(tokens, updated_at, now), 0
+            if free_offset is None and (
+                slot_key == 0 or now - updated_at >= self.window_seconds
+            ):
+                free_offset = offset
+            if updated_at < oldest_at:
+                oldest_offset, oldest_at = offset, updated_at
+
+        if free_offset is not None:
+            return free_offset, float(self.max_requests), 0
+        return oldest_offset, float(self.max_requests), 1
+
+    def _refilled(self, tokens: float, updated_at: float, now: float) -> float:
+        """Saldo reabastecido pelo tempo decorrido (ignora relógio que voltou)."""
+        elapsed = max(0.0, now - updated_at)
+        return min(self.max_requests, tokens + elapsed * self._refill_rate)
+
+    @staticmethod
+    def _hash(identifier: str) -> int:
+        """Hash estável de 64 bits do identificador (0 indica slot vazio)."""
+        digest = hashlib.blake2b(identifier.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1
+
+
+# Token bucket atômico no servidor: KEYS[1] = balde,
+# ARGV = capacidade, fichas por segundo, custo, TTL da chave
+_REDIS_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {allowed, math.floor(tokens)}
+"""
+
+
+class RedisRateLimiter(IRateLimiter, LoggerMixin):
+    """
+    Token bucket compartilhado entre hosts via servidor Redis.
+
+    Cada verificação executa um script Lua (EVALSHA) que reabastece e consome
+    as fichas atomicamente no servidor, usando o relógio do próprio servidor
+    para não depender da sincronia entre hosts. As chaves expiram após duas
+    janelas sem uso, então clientes ociosos não ocupam memória no servidor.
+
+    Se o servidor falhar, o limite passa a ser aplicado por um
+    TokenBucketRateLimiter local por `retry_cooldown` segundos, em vez de
+    bloquear ou liberar todas as requisições.
+
+    Attributes:
+        max_requests: Capacidade do balde (requisições por janela)
+        window_seconds: Tempo em segundos para reabastecer o balde vazio
+        key_prefix: Prefixo das chaves dos baldes
+        retry_cooldown: Tempo em segundos usando o fallback após uma falha
+        fallback: Rate limiter local usado enquanto o servidor está indisponível
+    """
+
+    is_remote = True
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        window_seconds: Optional[int] = None,
+        url: Optional[str] = None,
+        key_prefix: str = "market_data:rate_limit:",
+        retry_cooldown: Optional[int] = None,
+        fallback: Optional[IRateLimiter] = None,
+    ):
+        """
+        Inicializa o rate limiter Redis.
+
+        Args:
+            max_requests: Número máximo de requisições por janela
+            window_seconds: Tamanho da janela em segundos
+            url: URL do servidor (padrão: REDIS_URL)
+            key_prefix: Prefixo das chaves
+            retry_cooldown: Tempo usando o fallback após uma falha
+            fallback: Rate limiter local (padrão: TokenBucketRateLimiter)
+        """
+        self.max_requests = max_requests or settings.RATE_LIMIT_REQUESTS
+        self.window_seconds = window_seconds or settings.RATE_LIMIT_WINDOW
+        self.key_prefix = key_prefix
+        self.retry_cooldown = (
+            settings.REDIS_RETRY_COOLDOWN if retry_cooldown is None else retry_cooldown
+        )
+        self.fallback = fallback or TokenBucketRateLimiter(
+            self.max_requests, self.window_seconds
+        )
+        self._pool = RedisConnectionPool.from_url(
+            url or settings.REDIS_URL,
+            size=settings.REDIS_POOL_SIZE,
+            timeout=settings.REDIS_TIMEOUT,
+        )
+        self._script_sha = hashlib.sha1(_REDIS_TOKEN_BUCKET_SCRIPT.encode()).hexdigest()
+
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+        self._errors = 0
+
+    def is_allowed(self, identifier: str, cost: int = 1) -> bool:
+        """
+        Verifica se a requisição é permitida e consome `cost` fichas.
+
+        O custo é limitado à capacidade do balde, para que uma requisição
+        maior que o limite ainda seja possível com o balde cheio.
+        """
+        cost = min(max(cost, 1), self.max_requests)
+        if time.time() < self._down_until:
+            return self.fallback.is_allowed(identifier, cost)
+        try:
+            allowed, _ = self._run_script(identifier, cost)
+        except RedisError as e:
+            self._mark_down(e)
+            return self.fallback.is_allowed(identifier, cost)
+
+        with self._lock:
+            if allowed:
+                self._allowed += 1
+            else:
+                self._rejected += 1
+        return allowed
+
+    def get_remaining_requests(self, identifier: str) -> int:
+        """Obtém o número de fichas disponíveis, sem consumi-las."""
+        if time.time() < self._down_until:
+            return self.fallback.get_remaining_requests(identifier)
+        try:
+            _, remaining = self._run_script(identifier, 0)
+            return remaining
+        except RedisError as e:
+            self._mark_down(e)
+            return self.fallback.get_remaining_requests(identifier)
+
+    def reset_limit(self, identifier: str) -> bool:
+        """Reseta limite para um identificador."""
+        self.fallback.reset_limit(identifier)
+        try:
+            self._pool.execute(("DEL", self.key_prefix + identifier))
+            return True
+        except RedisError as e:
+            self._mark_down(e)
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna contadores deste processo e do fallback local.
+
+        Returns:
+            Dicionário com requisições aceitas/rejeitadas, erros e estado do fallback
+        """
+        with self._lock:
+            return {
+                "algorithm": "token_bucket",
+                "backend": "redis",
+                "available": time.time() >= self._down_until,
+                "allowed": self._allowed,
+                "rejected": self._rejected,
+                "errors": self._errors,
+                "fallback": self.fallback.get_stats(),
+            }
+
+    def close(self) -> None:
+        """Fecha as conexões e o fallback local."""
+        self._pool.close()
+        self.fallback.close()
+
+    def _run_script(self, identifier: str, cost: int) -> Tuple[bool, int]:
+        """Executa o script do token bucket, carregando-o se o servidor não o tiver."""
+        args = (
+            1,
+            self.key_prefix + identifier,
+            self.max_requests,
+            repr(self.max_requests / self.window_seconds),
+            cost,
+            self.window_seconds * 2,
+        )
+        try:
+            ((allowed, remaining),) = self._pool.execute(
+                ("EVALSHA", self._script_sha, *args)
+            )
+        except RedisReplyError as e:
+            if not str(e).startswith("NOSCRIPT"):
+                raise
+            ((allowed, remaining),) = self._pool.execute(
+                ("EVAL", _REDIS_TOKEN_BUCKET_SCRIPT, *args)
+            )
+        return bool(allowed), int(remaining)
+
+    def _mark_down(self, error: Exception) -> None:
+        with self._lock:
+            self._errors += 1
+            self._down_until = time.time() + self.retry_cooldown
+        self.logger.warning(
+            f"Redis indisponível ({error}); usando rate limit local por {self.retry_cooldown}s"
+        )
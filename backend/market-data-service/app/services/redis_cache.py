@@ -0,0 +1,415 @@
+"""
+Cache compartilhado via protocolo Redis (RESP).
+
+Este módulo implementa a interface ICacheService sobre um servidor Redis
+(ou compatível, como KeyDB/Valkey), para que vários workers do uvicorn
+compartilhem o mesmo cache. Inclui um cliente RESP mínimo com pool de
+conexões e pipelining, serialização binária compacta (JSON + zlib) e
+fallback automático para o cache local quando o servidor está indisponível.
+
+Example:
+    from services.redis_cache import RedisCache
+
+    cache = RedisCache("redis://localhost:6379/0")
+    cache.set("stock_data:PETR4.SA", data, ttl=300)
+    values = cache.get_many(["stock_data:PETR4.SA", "stock_data:VALE3.SA"])
+"""
+
+import json
+import queue
+import socket
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from core.config import settings
+from core.logging import LoggerMixin
+from services.cache_service import BoundedLRUCache
+from services.interfaces import ICacheService
+
+# Byte de cabeçalho do valor serializado
+_FORMAT_JSON = b"\x00"
+_FORMAT_JSON_ZLIB = b"\x01"
+
+# Valores maiores que isso são comprimidos
+_COMPRESS_THRESHOLD = 1024
+
+
+class RedisError(Exception):
+    """Erro retornado pelo servidor ou falha de comunicação com ele."""
+    pass
+
+
+class RedisReplyError(RedisError):
+    """Erro retornado pelo servidor para um comando (a conexão continua válida)."""
+    pass
+
+
+class _RespConnection:
+    """Conexão TCP com o servidor falando o protocolo RESP2."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+
+    def execute(self, *commands: tuple) -> List[Any]:
+        """
+        Envia um ou mais comandos em um único write (pipeline) e lê as respostas.
+
+        Args:
+            *commands: Comandos como tuplas de argumentos (ex: ("GET", "chave"))
+
+        Returns:
+            Lista de respostas, na ordem dos comandos
+        """
+        payload = bytearray()
+        for command in commands:
+            payload += b"*%d\r\n" % len(command)
+            for arg in command:
+                if isinstance(arg, str):
+                    arg = arg.encode()
+                elif isinstance(arg, int):
+                    arg = str(arg).encode()
+                payload += b"$%d\r\n%s\r\n" % (len(arg), arg)
+        self._sock.sendall(payload)
+
+        # Todas as respostas são lidas antes de propagar um erro de comando,
+        # para não deixar respostas pendentes na conexão
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisReplyError):
+                raise reply
+        return replies
+
+    def close(self) -> None:
+        """Fecha a conexão."""
+        try:
+            self._reader.close()
+            self._sock.close()
+        except OSError:
+            pass
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise RedisError("Conexão encerrada pelo servidor")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            return RedisReplyError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RedisError(f"Resposta RESP inválida: {line!r}")
+
+
+class RedisConnectionPool:
+    """Pool de conexões RESP reaproveitadas entre threads."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        db: int,
+        password: Optional[str],
+        size: int,
+        timeout: float,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[_RespConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @classmethod
+    def from_url(cls, url: str, size: int, timeout: float) -> "RedisConnectionPool":
+        """
+        Cria o pool a partir de uma URL redis://[:senha@]host:porta/db.
+
+        Args:
+            url: URL do servidor
+            size: Número máximo de conexões simultâneas
+            timeout: Timeout de conexão e leitura em segundos
+
+        Returns:
+            Pool de conexões (as conexões são abertas sob demanda)
+        """
+        parsed = urlparse(url)
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=unquote(parsed.password) if parsed.password else None,
+            size=size,
+            timeout=timeout,
+        )
+
+    def execute(self, *commands: tuple) -> List[Any]:
+        """Executa comandos em uma conexão do pool, descartando-a em caso de falha."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise RedisError("Pool de conexões esgotado")
+        connection = None
+        try:
+            connection = self._acquire()
+            replies = connection.execute(*commands)
+            self._idle.put(connection)
+            return replies
+        except RedisReplyError:
+            # Erros de comando (ex: WRONGTYPE) mantêm a conexão utilizável
+            self._idle.put(connection)
+            raise
+        except (RedisError, OSError, ValueError) as e:
+            if connection is not None:
+                connection.close()
+            raise RedisError(f"Falha de comunicação com {self.host}:{self.port}: {e}")
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Fecha todas as conexões ociosas."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _acquire(self) -> _RespConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        connection = _RespConnection(self.host, self.port, self.timeout)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            try:
+                connection.execute(*setup)
+            except Exception as e:
+                connection.close()
+                # Falha de autenticação/seleção invalida a conexão inteira
+                raise RedisError(f"Falha ao preparar conexão: {e}")
+        return connection
+
+
+class RedisCache(ICacheService, LoggerMixin):
+    """
+    Cache compartilhado entre processos usando um servidor Redis.
+
+    Os valores são serializados como JSON (comprimido com zlib acima de 1 KB)
+    com um byte de cabeçalho indicando o formato. JSON é usado em vez de
+    pickle porque o servidor é compartilhado: desserializar pickle de uma
+    fonte de rede permitiria execução de código arbitrário.
+
+    Se o servidor falhar, o cache passa a usar o cache local em memória por
+    `retry_cooldown` segundos antes de tentar novamente, de modo que a
+    indisponibilidade do Redis degrada o serviço para o comportamento de um
+    único worker em vez de derrubá-lo.
+
+    Attributes:
+        url: URL do servidor (redis://[:senha@]host:porta/db)
+        key_prefix: Prefixo aplicado a todas as chaves
+        retry_cooldown: Tempo em segundos usando o fallback após uma falha
+        fallback: Cache local usado enquanto o servidor está indisponível
+    """
+
+    is_remote = True
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retry_cooldown: Optional[int] = None,
+        key_prefix: str = "market_data:",
+        fallback: Optional[ICacheService] = None,
+    ):
+        """
+        Inicializa o cache Redis.
+
+        Args:
+            url: URL do servidor (padrão: configuração global)
+            pool_size: Número máximo de conexões simultâneas
+            timeout: Timeout de conexão e leitura em segundos
+            retry_cooldown: Tempo usando o fallback após uma falha
+            key_prefix: Prefixo das chaves
+            fallback: Cache local (padrão: BoundedLRUCache)
+        """
+        self.url = url or settings.REDIS_URL
+        self.key_prefix = key_prefix
+        self.retry_cooldown = (
+            settings.REDIS_RETRY_COOLDOWN if retry_cooldown is None else retry_cooldown
+        )
+        self.fallback = fallback or BoundedLRUCache()
+
+        self._pool = RedisConnectionPool.from_url(
+            self.url,
+            size=pool_size or settings.REDIS_POOL_SIZE,
+            timeout=timeout or settings.REDIS_TIMEOUT,
+        )
+
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        self._fallback_uses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Obtém valor do cache compartilhado."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Obtém vários valores com um único MGET."""
+        if not keys:
+            return {}
+        if self._is_down():
+            return self.fallback.get_many(keys)
+        try:
+            (raw_values,) = self._pool.execute(
+                ("MGET", *[self.key_prefix + key for key in keys])
+            )
+        except RedisError as e:
+            self._mark_down(e)
+            return self.fallback.get_many(keys)
+
+        result = {}
+        for key, raw in zip(keys, raw_values):
+            if raw is None:
+                continue
+            try:
+                result[key] = self._loads(raw)
+            except Exception as e:
+                self.logger.warning(f"Valor inválido no cache para '{key}': {e}")
+        with self._lock:
+            self._hits += len(result)
+            self._misses += len(keys) - len(result)
+        return result
+
+    def set(self, key: str, value: Any, ttl: int = 300) -> bool:
+        """Armazena valor no cache compartilhado com TTL."""
+        return self.set_many({key: value}, ttl=ttl)
+
+    def set_many(self, items: Dict[str, Any], ttl: int = 300) -> bool:
+        """Armazena vários valores em um único pipeline de SETs."""
+        if not items:
+            return True
+        if self._is_down():
+            return self.fallback.set_many(items, ttl=ttl)
+        try:
+            commands = [
+                ("SET", self.key_prefix + key, self._dumps(value), "EX", max(1, int(ttl)))
+                for key, value in items.items()
+            ]
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Valor não serializável para o cache: {e}")
+            return False
+        try:
+            self._pool.execute(*commands)
+            return True
+        except RedisError as e:
+            self._mark_down(e)
+            return self.fallback.set_many(items, ttl=ttl)
+
+    def delete(self, key: str) -> bool:
+        """Remove chave do cache."""
+        self.fallback.delete(key)
+        if self._is_down():
+            return True
+        try:
+            self._pool.execute(("DEL", self.key_prefix + key))
+            return True
+        except RedisError as e:
+            self._mark_down(e)
+            return False
+
+    def clear(self) -> bool:
+        """Remove todas as chaves com o prefixo do serviço."""
+        self.fallback.clear()
+        if self._is_down():
+            return True
+        try:
+            cursor = b"0"
+            while True:
+                ((cursor, keys),) = self._pool.execute(
+                    ("SCAN", cursor, "MATCH", self.key_prefix + "*", "COUNT", 500)
+                )
+                if keys:
+                    self._pool.execute(("DEL", *keys))
+                if cursor == b"0":
+                    return True
+        except RedisError as e:
+            self._mark_down(e)
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna contadores do cache compartilhado e do fallback local.
+
+        Returns:
+            Dicionário com acertos, falhas, erros e estado do fallback
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": "redis",
+                "available": time.time() >= self._down_until,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "errors": self._errors,
+                "fallback_uses": self._fallback_uses,
+                "fallback": self.fallback.get_stats(),
+            }
+
+    def close(self) -> None:
+        """Fecha as conexões e o cache local."""
+        self._pool.close()
+        self.fallback.close()
+
+    def _is_down(self) -> bool:
+        if time.time() < self._down_until:
+            with self._lock:
+                self._fallback_uses += 1
+            return True
+        return False
+
+    def _mark_down(self, error: Exception) -> None:
+        with self._lock:
+            self._errors += 1
+            self._down_until = time.time() + self.retry_cooldown
+        self.logger.warning(
+            f"Redis indisponível ({error}); usando cache local por {self.retry_cooldown}s"
+        )
+
+    def _dumps(self, value: Any) -> bytes:
+        data = json.dumps(value, separators=(",", ":"), default=str).encode()
+        if len(data) > _COMPRESS_THRESHOLD:
+            return _FORMAT_JSON_ZLIB + zlib.compress(data, 6)
+        return _FORMAT_JSON + data
+
+    def _loads(self, raw: bytes) -> Any:
+        header, body = raw[:1], raw[1:]
+        if header == _FORMAT_JSON_ZLIB:
+            body = zlib.decompress(body)
+        elif header != _FORMAT_JSON:
+            raise ValueError("formato desconhecido")
+        return json.loads(body)
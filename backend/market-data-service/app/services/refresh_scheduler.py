@@ -0,0 +1,376 @@
+"""
+Agendador de atualização em segundo plano dos conjuntos de dados mais usados.
+
+Visão geral do mercado, categorias de screening e ações em tendência eram
+atualizadas apenas quando uma requisição encontrava o cache vencido. O
+agendador mantém esses conjuntos frescos em cadências configuráveis, de modo
+que as requisições dos painéis sejam sempre acertos de cache:
+
+- as categorias da visão geral são atualizadas juntas, com uma única busca
+  da união dos seus símbolos ("all" contém as demais);
+- as categorias de screening são atualizadas pelas ordenações que os
+  painéis pedem; o cache do screening não depende do `limit`, então os
+  pedidos menores dos painéis são servidos pela mesma página;
+- com o mercado aberto, cada conjunto é atualizado na sua cadência;
+- com o mercado fechado, a cadência cai para REFRESH_CLOSED_INTERVAL e o
+  valor é armazenado com TTL equivalente (os dados não mudam);
+- na abertura, todos os conjuntos do mercado são atualizados imediatamente;
+- as cadências têm jitter, para que os conjuntos não sejam buscados juntos;
+- um orçamento global (chamadas ao provedor por minuto) limita o custo das
+  atualizações, e nada é buscado com o circuito do gateway aberto ou em
+  backoff, deixando a capacidade para as requisições dos usuários.
+
+Example:
+    scheduler = RefreshScheduler(market_data_service)
+    task = asyncio.create_task(scheduler.run())
+"""
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.config import settings
+from core.logging import LoggerMixin
+from core.upstream import upstream_gateway
+from services.market_data_service import (
+    BR_PREDEFINED_SCREENER_QUERIES,
+    MARKET_OVERVIEW_SYMBOLS,
+    MarketDataService,
+)
+from utils.validators import is_market_open
+
+# Mercados que definem a cadência de cada categoria da visão geral
+OVERVIEW_MARKETS = {
+    "all": ("BR", "US"),
+    "eua": ("US",),
+}
+
+# Ordenações atualizadas de cada categoria de screening: as dos painéis do
+# frontend (a aba internacional usa mercado_todo com as ordenações das quatro
+# categorias); as demais usam a ordenação padrão da rota
+SCREENER_DEFAULT_SORT = ("percentchange", False)
+SCREENER_REFRESH_SORTS = {
+    "baixa_do_dia": [("percentchange", True)],
+    "mais_negociadas": [("dayvolume", False)],
+    "valor_dividendos": [("forward_dividend_yield", False)],
+    "mercado_todo": [
+        ("percentchange", False),
+        ("percentchange", True),
+        ("dayvolume", False),
+        ("forward_dividend_yield", False),
+    ],
+}
+
+
+@dataclass
+class RefreshJob:
+    """
+    Conjunto de dados mantido fresco pelo agendador.
+
+    Attributes:
+        name: Nome do conjunto (ex: "screener:alta_do_dia")
+        refresh: Função que atualiza o cache recebendo o TTL a armazenar
+        interval: Cadência em segundos com o mercado aberto
+        cost: Chamadas ao provedor consumidas por atualização
+        markets: Mercados cujo horário define a cadência
+        next_run: Instante (monotônico) da próxima atualização
+        running: Indica se há uma atualização em andamento
+        runs: Atualizações concluídas
+        failures: Atualizações com erro
+    """
+
+    name: str
+    refresh: Callable[[int], Any]
+    interval: float
+    cost: int = 1
+    markets: Tuple[str, ...] = ("BR",)
+    next_run: float = 0.0
+    running: bool = False
+    runs: int = 0
+    failures: int = 0
+
+
+class UpstreamBudget:
+    """
+    Orçamento de chamadas ao provedor por minuto (token bucket).
+
+    Attributes:
+        per_minute: Chamadas permitidas por minuto (também é a capacidade)
+    """
+
+    def __init__(self, per_minute: int):
+        """
+        Inicializa o orçamento cheio.
+
+        Args:
+            per_minute: Chamadas permitidas por minuto
+        """
+        self.per_minute = per_minute
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    def try_spend(self, cost: int) -> bool:
+        """
+        Consome o custo se houver saldo.
+
+        Args:
+            cost: Chamadas a consumir (limitado à capacidade)
+
+        Returns:
+            True se o custo foi consumido
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self.per_minute, self._tokens + (now - self._updated) * self.per_minute / 60.0
+        )
+        self._updated = now
+        cost = min(cost, self.per_minute)
+        if self._tokens < cost:
+            return False
+        self._tokens -= cost
+        return True
+
+    @property
+    def available(self) -> float:
+        """Saldo atual (sem considerar a recarga desde a última consulta)."""
+        return self._tokens
+
+
+class RefreshScheduler(LoggerMixin):
+    """
+    Atualiza periodicamente os conjuntos de dados dos painéis.
+
+    Roda como uma tarefa no event loop; cada atualização executa no executor
+    de trabalho bloqueante do serviço e grava o cache com TTL igual ao
+    intervalo até a próxima atualização mais uma margem.
+
+    Attributes:
+        service: Serviço de market data cujo cache é atualizado
+        jobs: Conjuntos de dados agendados
+        budget: Orçamento global de chamadas ao provedor
+        market_open: Função que indica se um mercado está aberto
+    """
+
+    def __init__(
+        self,
+        service: MarketDataService,
+        jobs: Optional[List[RefreshJob]] = None,
+        budget: Optional[UpstreamBudget] = None,
+        market_open: Callable[[str], bool] = is_market_open,
+        tick: float = 1.0,
+    ):
+        """
+        Inicializa o agendador.
+
+        Args:
+            service: Serviço de market data
+            jobs: Conjuntos agendados (padrão: visão geral, screening e tendências)
+            budget: Orçamento de chamadas (padrão: REFRESH_UPSTREAM_BUDGET por minuto)
+            market_open: Função de horário de mercado (padrão: is_market_open)
+            tick: Intervalo em segundos entre verificações da agenda
+        """
+        self.service = service
+        self.jobs = jobs if jobs is not None else self._default_jobs()
+        self.budget = budget or UpstreamBudget(settings.REFRESH_UPSTREAM_BUDGET)
+        self.market_open = market_open
+        self.tick = tick
+        self._open: Dict[str, bool] = {}
+        self._running = 0
+        self._deferred = 0
+        self._tasks: set = set()
+
+        # Primeira rodada espalhada, para não buscar tudo no mesmo instante
+        now = time.monotonic()
+        for job in self.jobs:
+            job.next_run = now + random.uniform(0, min(job.interval, 10.0))
+
+    def _default_jobs(self) -> List[RefreshJob]:
+        """Monta os conjuntos padrão a partir das configurações."""
+        service = self.service
+        jobs = []
+
+        categories = [
+            c for c in settings.REFRESH_OVERVIEW_CATEGORIES if c in MARKET_OVERVIEW_SYMBOLS
+        ]
+        if categories:
+
+            def refresh_overview(ttl: int) -> None:
+                # Uma busca da união dos símbolos atualiza todas as categorias
+                if not service.warm_market_overview(categories, refresh_ttl=ttl):
+                    raise RuntimeError("Visão geral sem dados")
+
+            symbols = {s for c in categories for s in MARKET_OVERVIEW_SYMBOLS[c]}
+            markets = {m for c in categories for m in OVERVIEW_MARKETS.get(c, ("BR",))}
+            jobs.append(RefreshJob(
+                name="market_overview",
+                refresh=refresh_overview,
+                interval=settings.REFRESH_OVERVIEW_INTERVAL,
+                cost=len(symbols),
+                markets=tuple(sorted(markets)),
+            ))
+
+        for categoria in settings.REFRESH_SCREENER_CATEGORIES:
+            if categoria not in BR_PREDEFINED_SCREENER_QUERIES:
+                continue
+            sorts = SCREENER_REFRESH_SORTS.get(categoria, [SCREENER_DEFAULT_SORT])
+            for sort_field, sort_asc in sorts:
+
+                def refresh_screener(
+                    ttl: int,
+                    categoria: str = categoria,
+                    sort_field: str = sort_field,
+                    sort_asc: bool = sort_asc,
+                ) -> None:
+                    response = service.get_trending(
+                        categoria, None, settings.SCREENER_PAGE_SIZE, 0, sort_field, sort_asc,
+                        refresh_ttl=ttl,
+                    )
+                    if not response.get("resultados"):
+                        raise RuntimeError(f"Screening '{categoria}' sem resultados")
+
+                name = f"screener:{categoria}"
+                if len(sorts) > 1:
+                    name += f":{sort_field}:{'asc' if sort_asc else 'desc'}"
+                jobs.append(RefreshJob(
+                    name=name,
+                    refresh=refresh_screener,
+                    interval=settings.REFRESH_SCREENER_INTERVAL,
+                ))
+
+        for market in settings.REFRESH_TRENDING_MARKETS:
+
+            def refresh_trending(ttl: int, market: str = market) -> None:
+                service.get_trending_stocks(market, "refresh-scheduler", refresh_ttl=ttl)
+
+            jobs.append(RefreshJob(
+                name=f"trending:{market}",
+                refresh=refresh_trending,
+                interval=settings.REFRESH_TRENDING_INTERVAL,
+                markets=(market.upper(),),
+            ))
+
+        return jobs
+
+    async def run(self) -> None:
+        """Executa a agenda até a tarefa ser cancelada."""
+        if not settings.ENABLE_REFRESH_SCHEDULER or not self.jobs:
+            return
+
+        self.logger.info(f"Agendador de atualização iniciado com {len(self.jobs)} conjuntos")
+        try:
+            while True:
+                try:
+                    self._dispatch_due()
+                except Exception as e:
+                    self.logger.error(f"Erro no agendador de atualização: {e}")
+                await asyncio.sleep(self.tick)
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+
+    def _dispatch_due(self) -> None:
+        """Inicia as atualizações vencidas que cabem na concorrência e no orçamento."""
+        self._check_market_transitions()
+
+        # Circuito aberto ou backoff: a capacidade fica para os usuários
+        if upstream_gateway.blocked_for() > 0:
+            return
+
+        now = time.monotonic()
+        due = sorted(
+            (job for job in self.jobs if not job.running and job.next_run <= now),
+            key=lambda job: job.next_run,
+        )
+        for job in due:
+            if self._running >= settings.REFRESH_MAX_CONCURRENCY:
+                break
+            if not self.budget.try_spend(job.cost):
+                # Mantém a ordem: o mais atrasado é o próximo quando houver saldo
+                self._deferred += 1
+                break
+            self._start(job)
+
+    def _start(self, job: RefreshJob) -> None:
+        """Agenda a próxima rodada e dispara a atualização do conjunto."""
+        delay = self._next_delay(job)
+        job.next_run = time.monotonic() + delay
+        job.running = True
+        self._running += 1
+
+        ttl = math.ceil(delay) + settings.REFRESH_TTL_MARGIN_SECONDS
+        task = asyncio.create_task(self._execute(job, ttl))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, job: RefreshJob, ttl: int) -> None:
+        """Executa a atualização no executor de trabalho bloqueante."""
+        try:
+            await self.service.blocking.run(job.refresh, ttl)
+            job.runs += 1
+            self.logger.debug(f"Conjunto {job.name} atualizado (TTL {ttl}s)")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            self.logger.warning(f"Falha ao atualizar {job.name}: {e}")
+        finally:
+            job.running = False
+            self._running -= 1
+
+    def _next_delay(self, job: RefreshJob) -> float:
+        """Intervalo até a próxima rodada: a cadência do conjunto com jitter."""
+        return self._interval_for(job) * random.uniform(
+            1 - settings.REFRESH_JITTER, 1 + settings.REFRESH_JITTER
+        )
+
+    def _interval_for(self, job: RefreshJob) -> float:
+        """Cadência do conjunto conforme o horário dos seus mercados."""
+        if any(self._is_open(market) for market in job.markets):
+            return job.interval
+        return max(job.interval, settings.REFRESH_CLOSED_INTERVAL)
+
+    def _is_open(self, market: str) -> bool:
+        """Estado do mercado na verificação atual da agenda."""
+        if market not in self._open:
+            self._open[market] = self.market_open(market)
+        return self._open[market]
+
+    def _check_market_transitions(self) -> None:
+        """Atualiza o estado dos mercados e antecipa os conjuntos de um que abriu."""
+        previous = self._open
+        markets = {market for job in self.jobs for market in job.markets}
+        self._open = {market: self.market_open(market) for market in markets}
+        now = time.monotonic()
+        for market, is_open in self._open.items():
+            if is_open and previous.get(market) is False:
+                self.logger.info(f"Mercado {market} aberto: atualizando conjuntos")
+                for job in self.jobs:
+                    if market in job.markets:
+                        job.next_run = min(job.next_run, now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna o estado da agenda.
+
+        Returns:
+            Dicionário com orçamento, execuções adiadas e contadores por conjunto
+        """
+        now = time.monotonic()
+        return {
+            "enabled": settings.ENABLE_REFRESH_SCHEDULER,
+            "running": self._running,
+            "deferred_by_budget": self._deferred,
+            "budget_available": round(self.budget.available, 1),
+            "markets_open": dict(self._open),
+            "jobs": {
+                job.name: {
+                    "runs": job.runs,
+                    "failures": job.failures,
+                    "next_run_in": round(max(0.0, job.next_run - now), 1),
+                }
+                for job in self.jobs
+            },
+        }
@@ -0,0 +1,126 @@
+"""
+Contagem de popularidade dos símbolos consultados.
+
+Registra quantas vezes cada símbolo foi servido com sucesso, para que o
+aquecimento na inicialização busque antecipadamente os mais consultados.
+As contagens são gravadas em disco no desligamento e carregadas pela metade
+na inicialização seguinte, de modo que a popularidade antiga perca peso com
+o tempo.
+
+Example:
+    from services.symbol_popularity import symbol_popularity
+
+    symbol_popularity.record("PETR4.SA")
+    top = symbol_popularity.top(20)
+"""
+
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+from core.config import settings
+from core.logging import LoggerMixin
+
+
+class SymbolPopularity(LoggerMixin):
+    """
+    Contador thread-safe de consultas por símbolo.
+
+    Attributes:
+        path: Arquivo JSON onde as contagens são persistidas
+        max_symbols: Número máximo de símbolos mantidos em memória
+    """
+
+    def __init__(self, path: Optional[str] = None, max_symbols: Optional[int] = None):
+        """
+        Inicializa o contador e carrega as contagens persistidas.
+
+        Args:
+            path: Arquivo das contagens (padrão: configuração global)
+            max_symbols: Limite de símbolos mantidos (padrão: configuração global)
+        """
+        self.path = path or settings.POPULAR_SYMBOLS_PATH
+        self.max_symbols = max_symbols or settings.POPULAR_SYMBOLS_MAX
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._load()
+
+    def record(self, symbol: str) -> None:
+        """
+        Registra uma consulta servida para o símbolo.
+
+        Args:
+            symbol: Símbolo consultado
+        """
+        symbol = symbol.strip().upper()
+        if not symbol:
+            return
+        with self._lock:
+            self._counts[symbol] += 1
+            # Poda amortizada: só quando o limite é ultrapassado com folga
+            if len(self._counts) > 2 * self.max_symbols:
+                self._counts = Counter(dict(self._counts.most_common(self.max_symbols)))
+
+    def top(self, limit: int) -> List[str]:
+        """
+        Retorna os símbolos mais consultados.
+
+        Args:
+            limit: Número máximo de símbolos
+
+        Returns:
+            Símbolos em ordem decrescente de consultas
+        """
+        with self._lock:
+            return [symbol for symbol, _ in self._counts.most_common(limit)]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retorna o tamanho do contador.
+
+        Returns:
+            Dicionário com o número de símbolos e de consultas registradas
+        """
+        with self._lock:
+            return {"symbols": len(self._counts), "requests": sum(self._counts.values())}
+
+    def save(self) -> None:
+        """Grava as contagens em disco (escrita atômica)."""
+        with self._lock:
+            counts = dict(self._counts.most_common(self.max_symbols))
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(counts, f)
+            os.replace(tmp_path, self.path)
+            self.logger.info(f"Popularidade de {len(counts)} símbolos gravada")
+        except OSError as e:
+            self.logger.warning(f"Falha ao gravar popularidade dos símbolos: {e}")
+
+    def _load(self) -> None:
+        """Carrega as contagens persistidas, reduzindo-as pela metade."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Falha ao carregar popularidade dos símbolos: {e}")
+            return
+
+        decayed = {
+            str(symbol): int(count) // 2
+            for symbol, count in stored.items()
+            if isinstance(count, int) and count > 1
+        }
+        self._counts = Counter(decayed)
+        self.logger.info(f"Popularidade de {len(decayed)} símbolos carregada")
+
+
+# Instância única compartilhada pelo serviço e pelo aquecimento
+symbol_popularity = SymbolPopularity()
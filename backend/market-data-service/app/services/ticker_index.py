@@ -0,0 +1,417 @@
+"""
+Índice de busca de tickers em memória.
+
+Construído uma única vez sobre o universo de tickers (tickers.csv ou lista
+estática) para que o autocomplete não percorra todos os ativos a cada tecla.
+Símbolos e nomes são normalizados (minúsculas, sem acentos, sem o sufixo
+".SA") na construção, e a consulta usa apenas buscas binárias em listas
+ordenadas e interseções de postings:
+
+- prefixo do símbolo: "petr" -> PETR3.SA, PETR4.SA
+- prefixo de palavras do nome: "banco bra" -> Banco Bradesco, Banco do Brasil
+- substring (trigramas) no símbolo ou nome: "bras" -> Petróleo Brasileiro
+- distância de edição (índice de remoções) no símbolo ou nas palavras do
+  nome, para erros de digitação: "PERT4" -> PETR4.SA, "VAL3" -> VALE3.SA
+
+Os resultados são devolvidos em ordem de relevância (símbolo exato, prefixo
+do símbolo, prefixo do nome, substring, aproximados) até o limite pedido.
+
+Example:
+    from services.ticker_index import TickerIndex
+
+    index = TickerIndex(stocks)
+    for stock, score in index.search("petro", limit=5):
+        print(stock["symbol"], score)
+
+    suggestions = index.suggest("PERT4")  # [(PETR4.SA, 1), ...]
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Scores por tipo de correspondência (maior = mais relevante)
+SCORE_EXACT_SYMBOL = 3.0
+SCORE_SYMBOL_PREFIX = 2.0
+SCORE_NAME_PREFIX = 1.0
+SCORE_SUBSTRING = 0.5
+SCORE_FUZZY = 0.25  # dividido pela distância de edição
+
+# Palavras do nome mais curtas que isso não entram na busca aproximada
+_MIN_FUZZY_WORD = 4
+
+# Limite superior para a busca por prefixo em listas ordenadas
+_PREFIX_END = "\uffff"
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """
+    Normaliza um texto para busca: sem acentos, minúsculo e só alfanumérico.
+
+    Args:
+        text: Texto original (ex: "Petróleo Brasileiro S.A.")
+
+    Returns:
+        Texto normalizado com palavras separadas por espaço (ex: "petroleo brasileiro s a")
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    ascii_text = decomposed.encode("ascii", "ignore").decode("ascii").lower()
+    return _NON_ALNUM.sub(" ", ascii_text).strip()
+
+
+def symbol_key(symbol: str) -> str:
+    """
+    Chave de busca de um símbolo: normalizado, sem ".SA" e sem separadores.
+
+    Args:
+        symbol: Símbolo (ex: "PETR4.SA", "brk-b")
+
+    Returns:
+        Chave compacta (ex: "petr4", "brkb")
+    """
+    key = fold(symbol)
+    if key.endswith(" sa"):
+        key = key[:-3]
+    return key.replace(" ", "")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def osa_distance(a: str, b: str) -> int:
+    """
+    Distância de edição com transposições (optimal string alignment).
+
+    Conta inserções, remoções, substituições e trocas de caracteres vizinhos,
+    de modo que "PERT4" fica a uma edição de "PETR4".
+
+    Args:
+        a: Primeiro texto
+        b: Segundo texto
+
+    Returns:
+        Número mínimo de edições para transformar `a` em `b`
+    """
+    rows = [list(range(len(b) + 1))]
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(rows[i - 1][j] + 1, row[j - 1] + 1, rows[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], rows[i - 2][j - 2] + 1)
+        rows.append(row)
+    return rows[-1][-1]
+
+
+def max_edits(text: str) -> int:
+    """Tolerância de edição para um termo: 1 até 6 caracteres, 2 acima disso."""
+    return 1 if len(text) <= 6 else 2
+
+
+def _deletions(term: str, max_distance: int) -> Set[str]:
+    """O termo e todas as variantes com até `max_distance` caracteres removidos."""
+    variants = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        frontier = {
+            variant[:i] + variant[i + 1:]
+            for variant in frontier
+            for i in range(len(variant))
+        }
+        variants |= frontier
+    return variants
+
+
+class EditDistanceIndex:
+    """
+    Índice de vizinhança por remoções (estilo SymSpell) para busca aproximada.
+
+    Cada termo é indexado por todas as suas variantes com até `max_distance`
+    caracteres removidos. Dois termos a até `d` edições compartilham uma
+    variante com no máximo `d` remoções de cada lado, então a consulta gera
+    as variantes do termo buscado, junta os termos das postings e confirma a
+    distância só nesses candidatos, sem percorrer o universo.
+
+    Attributes:
+        max_distance: Maior tolerância suportada nas consultas
+        size: Número de termos indexados
+    """
+
+    def __init__(self, terms: Iterable[str], max_distance: int = 2):
+        """
+        Constrói o índice.
+
+        Args:
+            terms: Termos a indexar (duplicados são ignorados)
+            max_distance: Maior tolerância suportada nas consultas
+        """
+        self.max_distance = max_distance
+        self._variants: Dict[str, List[str]] = defaultdict(list)
+        unique_terms = dict.fromkeys(terms)
+        for term in unique_terms:
+            for variant in _deletions(term, max_distance):
+                self._variants[variant].append(term)
+        self.size = len(unique_terms)
+
+    def search(self, term: str, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        Retorna os termos a até `max_distance` edições, do mais próximo ao mais distante.
+
+        Empates são desfeitos pela diferença entre os caracteres dos termos,
+        favorecendo trocas de posição (mesmas letras) sobre letras diferentes.
+
+        Args:
+            term: Termo consultado
+            max_distance: Distância máxima aceita (limitada a `self.max_distance`)
+
+        Returns:
+            Lista de (distância, termo) ordenada
+        """
+        max_distance = min(max_distance, self.max_distance)
+        candidates: Set[str] = set()
+        for variant in _deletions(term, max_distance):
+            candidates.update(self._variants.get(variant, ()))
+
+        matches = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(term)) > max_distance:
+                continue
+            distance = osa_distance(term, candidate)
+            if distance <= max_distance:
+                term_letters, candidate_letters = Counter(term), Counter(candidate)
+                letters = sum(((term_letters - candidate_letters) + (candidate_letters - term_letters)).values())
+                matches.append((distance, letters, candidate))
+        matches.sort()
+        return [(distance, candidate) for distance, _, candidate in matches]
+
+
+class TickerIndex:
+    """
+    Índice imutável de prefixos e trigramas sobre uma lista de tickers.
+
+    Attributes:
+        source: Lista de tickers usada na construção (para detectar mudanças)
+        size: Número de tickers indexados
+    """
+
+    def __init__(self, stocks: List[Dict[str, Any]]):
+        """
+        Constrói o índice.
+
+        Args:
+            stocks: Tickers com pelo menos "symbol" e "name"
+        """
+        self.source = stocks
+        self._stocks: List[Dict[str, Any]] = []
+        self._by_symbol: Dict[str, int] = {}
+        self._texts: List[str] = []
+
+        symbol_entries: List[Tuple[str, int]] = []
+        word_entries: List[Tuple[str, int]] = []
+        postings: Dict[str, Set[int]] = defaultdict(set)
+
+        for stock in stocks:
+            symbol = stock.get("symbol") or ""
+            key = symbol_key(symbol)
+            if not key or key in self._by_symbol:
+                continue
+            stock_id = len(self._stocks)
+            self._stocks.append(stock)
+            self._by_symbol[key] = stock_id
+            self._by_symbol.setdefault(symbol.upper(), stock_id)
+
+            name = fold(stock.get("name") or "")
+            text = f"{key} {name}"
+            self._texts.append(text)
+
+            symbol_entries.append((key, stock_id))
+            for word in set(name.split()):
+                word_entries.append((word, stock_id))
+            for trigram in _trigrams(text):
+                postings[trigram].add(stock_id)
+
+        symbol_entries.sort()
+        word_entries.sort()
+        self._symbol_keys = [key for key, _ in symbol_entries]
+        self._symbol_ids = [stock_id for _, stock_id in symbol_entries]
+        self._word_keys = [word for word, _ in word_entries]
+        self._word_ids = [stock_id for _, stock_id in word_entries]
+        self._postings = {trigram: frozenset(ids) for trigram, ids in postings.items()}
+        self.size = len(self._stocks)
+
+        # Busca aproximada: símbolos e palavras (não triviais) dos nomes
+        self._symbol_fuzzy = EditDistanceIndex(self._symbol_keys)
+        self._word_fuzzy = EditDistanceIndex(
+            word for word in dict.fromkeys(self._word_keys)
+            if len(word) >= _MIN_FUZZY_WORD and not word.isdigit()
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca um ticker pelo símbolo exato.
+
+        Args:
+            symbol: Símbolo com ou sem ".SA" (ex: "PETR4", "petr4.sa")
+
+        Returns:
+            Ticker encontrado ou None
+        """
+        stock_id = self._by_symbol.get(symbol.upper())
+        if stock_id is None:
+            stock_id = self._by_symbol.get(symbol_key(symbol))
+        return self._stocks[stock_id] if stock_id is not None else None
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Retorna os tickers mais relevantes para a consulta.
+
+        Args:
+            query: Termo de busca (símbolo ou nome, parcial)
+            limit: Número máximo de resultados
+
+        Returns:
+            Lista de (ticker, score) em ordem decrescente de relevância
+        """
+        text = fold(query)
+        if not text or limit <= 0:
+            return []
+
+        results: List[Tuple[Dict[str, Any], float]] = []
+        seen: Set[int] = set()
+
+        def collect(ids: Iterable[int], score: float) -> bool:
+            for stock_id in ids:
+                if stock_id not in seen:
+                    seen.add(stock_id)
+                    results.append((self._stocks[stock_id], score))
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        # 1. Símbolo: exato e depois prefixo, em ordem alfabética
+        key = symbol_key(query)
+        if key:
+            start, end = self._prefix_range(self._symbol_keys, key)
+            if start < end and self._symbol_keys[start] == key:
+                if collect((self._symbol_ids[start],), SCORE_EXACT_SYMBOL):
+                    return results
+                start += 1
+            if collect(self._symbol_ids[start:end], SCORE_SYMBOL_PREFIX):
+                return results
+
+        # 2. Nome: todas as palavras da consulta são prefixo de alguma palavra do nome
+        words = text.split()
+        if len(words) == 1:
+            start, end = self._prefix_range(self._word_keys, words[0])
+            if collect(self._word_ids[start:end], SCORE_NAME_PREFIX):
+                return results
+        else:
+            matches: Optional[Set[int]] = None
+            # Palavras mais longas primeiro: conjuntos menores na interseção
+            for word in sorted(words, key=len, reverse=True):
+                start, end = self._prefix_range(self._word_keys, word)
+                ids = set(self._word_ids[start:end])
+                matches = ids if matches is None else matches & ids
+                if not matches:
+                    break
+            if matches and collect(sorted(matches), SCORE_NAME_PREFIX):
+                return results
+
+        # 3. Substring: interseção dos trigramas, confirmada no texto
+        if len(text) >= 3:
+            candidates: Optional[frozenset] = None
+            for trigram in sorted(_trigrams(text), key=lambda t: len(self._postings.get(t, ()))):
+                ids = self._postings.get(trigram, frozenset())
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    break
+            if candidates and collect(
+                (stock_id for stock_id in sorted(candidates) if text in self._texts[stock_id]),
+                SCORE_SUBSTRING,
+            ):
+                return results
+
+        # 4. Aproximados: erros de digitação no símbolo ou no nome
+        if len(text) >= 3:
+            for stock_id, distance in self._fuzzy_ids(query, text):
+                if collect((stock_id,), SCORE_FUZZY / distance):
+                    break
+
+        return results
+
+    def suggest(self, query: str, limit: int = 5) -> List[Tuple[Dict[str, Any], int]]:
+        """
+        Sugere tickers próximos de um símbolo ou nome possivelmente digitado errado.
+
+        Símbolos próximos vêm antes de nomes próximos; dentro de cada grupo,
+        a ordem é pela distância de edição.
+
+        Args:
+            query: Símbolo ou nome consultado (ex: "PERT4", "VAL3.SA", "petrobas")
+            limit: Número máximo de sugestões
+
+        Returns:
+            Lista de (ticker, distância de edição)
+        """
+        suggestions: List[Tuple[Dict[str, Any], int]] = []
+        for stock_id, distance in self._fuzzy_ids(query, fold(query)):
+            suggestions.append((self._stocks[stock_id], distance))
+            if len(suggestions) >= limit:
+                break
+        return suggestions
+
+    def _fuzzy_ids(self, query: str, text: str) -> List[Tuple[int, int]]:
+        """Ids (sem repetição) a até `max_edits` edições do símbolo ou das palavras do nome."""
+        matches: List[Tuple[int, int]] = []
+        seen: Set[int] = set()
+
+        key = symbol_key(query)
+        if key:
+            for distance, term in self._symbol_fuzzy.search(key, max_edits(key)):
+                stock_id = self._by_symbol[term]
+                if stock_id in seen:
+                    continue
+                # O próprio símbolo consultado não é sugestão, nem pelo nome
+                seen.add(stock_id)
+                if distance:
+                    matches.append((stock_id, distance))
+
+        # Uma palavra do nome por termo da consulta; todas as palavras devem casar
+        words = [word for word in text.split() if len(word) >= _MIN_FUZZY_WORD]
+        if not words:
+            return matches
+        best: Optional[Dict[int, int]] = None
+        for word in words:
+            by_id: Dict[int, int] = {}
+            for distance, term in self._word_fuzzy.search(word, max_edits(word)):
+                start = bisect_left(self._word_keys, term)
+                end = bisect_right(self._word_keys, term)
+                for stock_id in self._word_ids[start:end]:
+                    if stock_id not in by_id:
+                        by_id[stock_id] = distance
+            best = by_id if best is None else {
+                stock_id: max(best[stock_id], distance)
+                for stock_id, distance in by_id.items() if stock_id in best
+            }
+            if not best:
+                return matches
+        for stock_id, distance in sorted(best.items(), key=lambda item: (item[1], item[0])):
+            if distance and stock_id not in seen:
+                seen.add(stock_id)
+                matches.append((stock_id, distance))
+        return matches
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        """Intervalo [início, fim) das chaves ordenadas que começam com o prefixo."""
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + _PREFIX_END)
+
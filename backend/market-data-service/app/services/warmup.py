@@ -0,0 +1,164 @@
+"""
+Aquecimento do serviço na inicialização.
+
+Sem aquecimento, o primeiro usuário após cada deploy paga pela leitura do
+`tickers.csv`, pela construção do índice de busca e pelas buscas a frio no
+provedor. O aquecimento roda em segundo plano a partir do `lifespan`:
+carrega o universo de tickers e as estruturas de busca e, em paralelo,
+busca as categorias da visão geral do mercado e os símbolos mais
+consultados nas execuções anteriores e inicia o pool de processos dos
+cálculos de carteira.
+
+A prontidão (`/ready`) é reportada separadamente da vivacidade (`/health`):
+o serviço responde desde o início, mas só se declara pronto para receber
+tráfego quando o aquecimento termina ou esgota o prazo.
+
+Example:
+    warmup = ServiceWarmup(market_data_service)
+    task = asyncio.create_task(warmup.run())
+    ...
+    if warmup.ready:
+        ...
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from core.config import settings
+from core.logging import LoggerMixin
+from services.market_data_service import MARKET_OVERVIEW_SYMBOLS, MarketDataService
+from services.symbol_popularity import SymbolPopularity, symbol_popularity
+
+# Módulos importados nos processos do pool de cálculos durante o aquecimento
+COMPUTE_MODULES = ("services.portfolio_analytics", "services.portfolio_optimizer")
+
+
+class ServiceWarmup(LoggerMixin):
+    """
+    Executa o aquecimento e mantém o estado de prontidão do serviço.
+
+    Falhas do provedor durante o aquecimento não impedem a prontidão: elas
+    são contadas e o serviço fica pronto mesmo assim, pois as requisições
+    buscariam os mesmos dados a frio de qualquer forma.
+
+    Attributes:
+        service: Serviço de market data a ser aquecido
+        popularity: Contador de popularidade dos símbolos
+        state: Estado do aquecimento ("pending", "running" ou "ready")
+    """
+
+    def __init__(
+        self,
+        service: MarketDataService,
+        popularity: Optional[SymbolPopularity] = None,
+    ):
+        """
+        Inicializa o aquecimento.
+
+        Args:
+            service: Serviço de market data a ser aquecido
+            popularity: Contador de popularidade (padrão: instância global)
+        """
+        self.service = service
+        self.popularity = popularity or symbol_popularity
+        self.state = "pending"
+        self._started_at: Optional[float] = None
+        self._duration: Optional[float] = None
+        self._timed_out = False
+        self._stats: Dict[str, Any] = {}
+
+    @property
+    def ready(self) -> bool:
+        """Indica se o serviço está pronto para receber tráfego."""
+        return self.state == "ready"
+
+    async def run(self) -> None:
+        """
+        Executa o aquecimento, limitado por WARMUP_TIMEOUT_SECONDS.
+
+        Com ENABLE_WARMUP desligado, o serviço fica pronto imediatamente.
+        """
+        if not settings.ENABLE_WARMUP:
+            self.state = "ready"
+            return
+
+        self.state = "running"
+        self._started_at = time.time()
+        self.logger.info("🔥 Aquecimento iniciado")
+        try:
+            await asyncio.wait_for(self._warm(), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self._timed_out = True
+            self.logger.warning(
+                f"Aquecimento excedeu {settings.WARMUP_TIMEOUT_SECONDS}s; "
+                f"serviço marcado como pronto"
+            )
+        except Exception as e:
+            self.logger.error(f"Erro no aquecimento: {e}")
+        finally:
+            self._duration = time.time() - self._started_at
+            self.state = "ready"
+
+        self.logger.info(f"✅ Aquecimento concluído em {self._duration:.2f}s: {self._stats}")
+
+    async def _warm(self) -> None:
+        """Carrega o universo de tickers e busca os dados mais usados em paralelo."""
+        blocking = self.service.blocking
+
+        self._stats["tickers"] = await blocking.run(self.service.provider.warm_up)
+        compute_warmup = asyncio.ensure_future(
+            blocking.run(self.service.compute.warm_up, COMPUTE_MODULES)
+        )
+
+        categories = [
+            c for c in settings.WARMUP_OVERVIEW_CATEGORIES if c in MARKET_OVERVIEW_SYMBOLS
+        ]
+        symbols = self.popularity.top(settings.WARMUP_TOP_SYMBOLS)
+
+        # As categorias se sobrepõem ("all" contém as demais): a união dos
+        # símbolos é buscada uma única vez para todas elas
+        overviews, prefetched = await asyncio.gather(
+            blocking.run(self._warm_overview, categories),
+            blocking.run(self._prefetch_symbols, symbols),
+        )
+
+        self._stats["overview_categories"] = overviews
+        self._stats["overview_failed"] = len(categories) - self._stats["overview_categories"]
+        self._stats["symbols"] = prefetched
+        self._stats["symbols_failed"] = len(symbols) - prefetched
+        try:
+            self._stats["compute_workers"] = await compute_warmup
+        except Exception as e:
+            self.logger.warning(f"Falha ao aquecer o pool de processos: {e}")
+            self._stats["compute_workers"] = 0
+
+    def _warm_overview(self, categories: List[str]) -> int:
+        """Busca as categorias da visão geral (a união dos símbolos, uma vez)."""
+        try:
+            return self.service.warm_market_overview(categories)
+        except Exception as e:
+            self.logger.warning(f"Falha ao aquecer a visão geral do mercado: {e}")
+            return 0
+
+    def _prefetch_symbols(self, symbols: List[str]) -> int:
+        """Busca os dados dos símbolos pelo executor de fan-out do serviço."""
+        if not symbols:
+            return 0
+        results = self.service.fanout.map(self.service.warm_stock_data, symbols)
+        return sum(1 for r in results if r.ok)
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Retorna o estado do aquecimento.
+
+        Returns:
+            Dicionário com estado, duração e contagens do aquecimento
+        """
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "duration_seconds": round(self._duration, 3) if self._duration is not None else None,
+            "timed_out": self._timed_out,
+            **self._stats,
+        }
@@ -11,24 +11,43 @@ Example:
     data = provider.get_stock_data("PETR4.SA", request)
 """
 
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from deep_translator import GoogleTranslator
 import os
+from pydantic import TypeAdapter
 
 from core.config import settings
 from core.logging import LoggerMixin
+from core.upstream import UpstreamUnavailableError, upstream_gateway
 from models.requests import StockDataRequest
 from models.responses import (
+    ColumnarHistoryResponse,
     FundamentalData,
     HistoricalDataPoint,
     StockDataResponse,
     ValidationResponse,
 )
 from services.interfaces import IMarketDataProvider, ProviderException
+from services.ohlcv_store import ohlcv_store
+from services.ticker_index import TickerIndex
+from utils.Ticker_ops import download_history_batch, group_by_exchange
+
+# Intervalos cujas datas incluem hora
+INTRADAY_INTERVALS = ["1m", "2m", "5m", "15m", "30m", "1h"]
+
+_HISTORICAL_POINTS_ADAPTER = TypeAdapter(List[HistoricalDataPoint])
+
+# Universo de tickers brasileiros e intervalo entre verificações de mudança do arquivo
+TICKERS_CSV_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "data", "tickers.csv")
+)
+_CSV_CHECK_INTERVAL = 5.0  # seconds
 
 
 class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
@@ -47,33 +66,41 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
     
     Implementa a interface IMarketDataProvider utilizando a biblioteca yfinance
     para obter dados de mercado financeiro. Inclui tratamento de erros,
-    retry automático e normalização de dados.
+    normalização de dados e chamadas de rede pelo gateway do provedor
+    (concorrência adaptativa, backoff e circuit breaker).
     
     Attributes:
         timeout: Timeout para requisições HTTP
-        max_retries: Número máximo de tentativas
-        retry_delay: Delay entre tentativas em segundos
+        max_retries: Número máximo de tentativas em falhas de rede
     """
 
-    def __init__(
-        self, timeout: int = None, max_retries: int = None, retry_delay: float = 1.0
-    ):
+    def __init__(self, timeout: int = None, max_retries: int = None):
         """
         Inicializa o provedor Yahoo Finance.
 
         Args:
             timeout: Timeout para requisições (padrão: configuração global)
             max_retries: Número máximo de tentativas (padrão: configuração global)
-            retry_delay: Delay entre tentativas em segundos
         """
         self.timeout = timeout or settings.YAHOO_FINANCE_TIMEOUT
         self.max_retries = max_retries or settings.MAX_RETRIES
-        self.retry_delay = retry_delay
 
         # Cache de tickers brasileiros para otimização
         self._brazilian_stocks_cache: Optional[List[Dict[str, str]]] = None
         self._cache_timestamp: Optional[datetime] = None
         self._cache_ttl = timedelta(hours=24)  # Cache válido por 24h
+        self._cache_signature: Optional[Tuple[int, int]] = None
+
+        # Assinatura (mtime, tamanho) do tickers.csv, verificada periodicamente
+        self._csv_signature: Optional[Tuple[int, int]] = None
+        self._csv_checked_at = float("-inf")
+
+        # Índice de busca, reconstruído quando a lista de tickers é recarregada
+        self._ticker_index: Optional[TickerIndex] = None
+        self._index_lock = threading.Lock()
+
+        # Snapshot de cotações da busca: símbolo -> (expira em, último preço ou None)
+        self._quote_snapshot: Dict[str, Tuple[float, Optional[float]]] = {}
 
     def get_stock_data(
         self, symbol: str, request: StockDataRequest
@@ -98,10 +125,10 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
             normalized_symbol = self._normalize_symbol(symbol)
 
             # Criar ticker object
-            ticker = self._create_ticker_with_retry(normalized_symbol)
+            ticker = self._create_ticker(normalized_symbol)
 
             # Obter informações básicas
-            info = self._get_ticker_info_with_retry(ticker, normalized_symbol)
+            info = self._get_ticker_info(ticker, normalized_symbol)
 
             # Determinar tipo de ativo
             if normalized_symbol.endswith("34.SA") or normalized_symbol.endswith(
@@ -167,6 +194,9 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
             self.logger.info(f"Dados obtidos com sucesso para {symbol}")
             return response
 
+        except UpstreamUnavailableError:
+            # Provedor indisponível: repassa para o cache servir o valor vencido
+            raise
         except Exception as e:
             error_msg = f"Erro ao obter dados para {symbol}: {str(e)}"
             self.logger.error(error_msg)
@@ -184,14 +214,14 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
         try:
             self.logger.info(f"Validando ticker {symbol}")
             normalized_symbol = self._normalize_symbol(symbol)
-            ticker = self._create_ticker_with_retry(normalized_symbol)
+            ticker = self._create_ticker(normalized_symbol)
             info = None
             is_valid = False
             tradeable = False
             last_trade_date = None
             # Tentar obter informações básicas do yfinance
             try:
-                info = ticker.info
+                info = upstream_gateway.call("info", lambda: ticker.info)
                 # Considera válido se info['symbol'] bate com o símbolo normalizado (case-insensitive)
                 if info and "symbol" in info and info["symbol"]:
                     if str(info["symbol"]).upper() == normalized_symbol.upper():
@@ -207,12 +237,9 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
                 )
             # Fallback: se não for válido, checar se está no CSV de ações brasileiras
             if not is_valid and normalized_symbol.endswith(".SA"):
-                brazilian_stocks = self._get_brazilian_stocks()
-                for stock in brazilian_stocks:
-                    if stock["symbol"].upper() == normalized_symbol.upper():
-                        is_valid = True
-                        tradeable = True  # Assume negociável se está no CSV
-                        break
+                if self._get_ticker_index().get(normalized_symbol) is not None:
+                    is_valid = True
+                    tradeable = True  # Assume negociável se está no CSV
             # Montar resposta
             if is_valid:
                 return ValidationResponse(
@@ -245,13 +272,20 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
                 error_message=error_msg,
             )
 
-    def search_tickers(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def search_tickers(
+        self, query: str, limit: int = 10, enrich: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Busca tickers por nome ou símbolo.
 
+        Os candidatos vêm do índice em memória. Com `enrich`, preço e moeda
+        vêm do snapshot local de cotações, e os símbolos ausentes ou vencidos
+        são buscados juntos em uma única chamada ao provedor.
+
         Args:
             query: Termo de busca
             limit: Número máximo de resultados
+            enrich: Se True, inclui preço e moeda atualizados
 
         Returns:
             Lista de tickers encontrados com informações básicas
@@ -259,85 +293,33 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
         try:
             self.logger.info(f"Buscando tickers para query: '{query}'")
 
-            # Passo 1: Obter lista de ações brasileiras do cache (populado por investpy)
-            brazilian_stocks = self._get_brazilian_stocks()
-            self.logger.info(
-                f"Total de ações brasileiras para busca: {len(brazilian_stocks)}"
-            )
-
-            # Passo 2: Filtrar baseado na query para encontrar candidatos
-            query_lower = query.lower()
-            self.logger.info(f"Query normalizada: {query_lower}")
-            candidate_results = []
-
-            for stock in brazilian_stocks:
-                stock_name = stock.get("name", "") or ""
-
-                if (
-                    query_lower in stock_name.lower()
-                    or query_lower in stock["symbol"].lower()
-                    or query_lower in stock["name"].lower()
-                    or query_lower.replace(".sa", "") in stock["symbol"].lower()
-                ):
-                    self.logger.info(f"Encontrado candidato: {stock['name']}")
-
-                    candidate_results.append(
-                        {
-                            "symbol": stock["symbol"],
-                            "name": stock["name"],
-                            "sector": stock.get("sector", "Unknown"),
-                            "market": self._extract_market_from_symbol(stock["symbol"]),
-                            "current_price": stock.get("current_price", 0.0),
-                            "currency": stock.get("currency", "BRL"),
-                            "relevance_score": self._calculate_relevance_score(
-                                query_lower, stock
-                            ),
-                        }
-                    )
-
-            # Passo 3: Ordenar candidatos por relevância e pegar o top 'limit'
-            candidate_results.sort(key=lambda x: x["relevance_score"], reverse=True)
-            top_candidates = candidate_results[:limit]
+            # Passo 1: Candidatos mais relevantes pelo índice em memória
+            candidates = self._get_ticker_index().search(query, limit)
 
-            # Passo 4: Usar yfinance para obter dados atualizados e construir resultado final
-            final_results = []
-            for candidate in top_candidates:
-                try:
-                    symbol = candidate["symbol"]
-                    ticker = self._create_ticker_with_retry(symbol)
-                    info = self._get_ticker_info_with_retry(ticker, symbol)
-
-                    if not info:
-                        self.logger.warning(
-                            f"Sem informações do yfinance para {symbol}, pulando."
-                        )
-                        continue
+            # Passo 2: Preços do snapshot local, completado em lote
+            prices = (
+                self._get_quote_prices([stock["symbol"] for stock, _ in candidates])
+                if enrich and candidates
+                else {}
+            )
 
-                    final_results.append(
-                        {
-                            "symbol": symbol,
-                            "name": info.get("longName")
-                            or info.get("shortName")
-                            or candidate["name"],
-                            "sector": info.get("sector", "Unknown"),
-                            "market": self._extract_market_from_symbol(symbol),
-                            "currency": info.get("currency", "BRL"),
-                            "current_price": self._safe_get_price(
-                                info, "currentPrice", "regularMarketPrice"
-                            ),
-                            "relevance_score": candidate["relevance_score"],
-                        }
-                    )
-                except Exception as e:
-                    self.logger.warning(
-                        f"Erro ao buscar dados do yfinance para {candidate['symbol']}: {e}"
-                    )
-                    continue
+            results = []
+            for stock, score in candidates:
+                symbol = stock["symbol"]
+                results.append(
+                    {
+                        "symbol": symbol,
+                        "name": stock["name"],
+                        "sector": stock.get("sector", "Unknown"),
+                        "market": self._extract_market_from_symbol(symbol),
+                        "currency": "BRL" if symbol.endswith(".SA") else None,
+                        "current_price": prices.get(symbol),
+                        "relevance_score": score,
+                    }
+                )
 
-            self.logger.info(
-                f"Encontrados {len(final_results)} resultados para '{query}' via yfinance"
-            )
-            return final_results
+            self.logger.info(f"Encontrados {len(results)} resultados para '{query}'")
+            return results
 
         except Exception as e:
             error_msg = f"Erro na busca de tickers: {str(e)}"
@@ -431,6 +413,28 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
             self.logger.error(error_msg)
             return []
 
+    def warm_up(self) -> Dict[str, Any]:
+        """
+        Carrega o universo de tickers e constrói o índice de busca.
+
+        Returns:
+            Dicionário com o número de tickers indexados
+        """
+        index = self._get_ticker_index()
+        return {"indexed": index.size}
+
+    def find_ticker(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca um ticker do tickers.csv pelo símbolo exato, no índice local.
+
+        Args:
+            symbol: Símbolo com ou sem ".SA" (ex: "PETR4", "PETR4.SA")
+
+        Returns:
+            Dicionário com symbol, name, sector e type, ou None se ausente
+        """
+        return self._get_ticker_index().get(symbol)
+
     # Métodos privados auxiliares
 
     def _normalize_symbol(self, symbol: str) -> str:
@@ -445,36 +449,32 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
 
         return symbol
 
-    def _create_ticker_with_retry(self, symbol: str) -> yf.Ticker:
-        """Cria objeto Ticker com retry automático."""
-        for attempt in range(self.max_retries):
-            try:
-                return yf.Ticker(symbol)
-            except Exception as e:
-                if attempt == self.max_retries - 1:
-                    raise e
-                time.sleep(self.retry_delay * (attempt + 1))
+    def _create_ticker(self, symbol: str) -> yf.Ticker:
+        """Cria objeto Ticker (não faz chamada de rede)."""
+        return yf.Ticker(symbol)
 
-        raise ProviderException(
-            f"Falha ao criar ticker após {self.max_retries} tentativas"
-        )
+    def _get_ticker_info(self, ticker: yf.Ticker, symbol: str) -> Dict[str, Any]:
+        """
+        Obtém informações do ticker pelo gateway do provedor.
 
-    def _get_ticker_info_with_retry(
-        self, ticker: yf.Ticker, symbol: str
-    ) -> Dict[str, Any]:
-        """Obtém informações do ticker com retry automático."""
+        Falhas de rede são repetidas imediatamente, sem dormir na thread da
+        requisição; throttles e circuito aberto não são repetidos, pois o
+        gateway já controla o backoff.
+        """
         for attempt in range(self.max_retries):
             try:
-                info = ticker.info
-                if not info or "symbol" not in info:
-                    raise ProviderException(f"Dados inválidos para {symbol}")
-                return info
+                info = upstream_gateway.call("info", lambda: ticker.info)
+            except UpstreamUnavailableError:
+                raise
             except Exception as e:
-                if attempt == self.max_retries - 1:
-                    raise ProviderException(
-                        f"Falha ao obter informações para {symbol}: {str(e)}"
-                    )
-                time.sleep(self.retry_delay * (attempt + 1))
+                if isinstance(e, OSError) and attempt < self.max_retries - 1:
+                    continue
+                raise ProviderException(
+                    f"Falha ao obter informações para {symbol}: {str(e)}"
+                )
+            if not info or "symbol" not in info:
+                raise ProviderException(f"Dados inválidos para {symbol}")
+            return info
 
         raise ProviderException(
             f"Falha ao obter informações após {self.max_retries} tentativas"
@@ -510,132 +510,254 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
     ) -> List[HistoricalDataPoint]:
         """Obtém dados históricos formatados."""
         try:
-            # Usar o período e intervalo especificados no request
+            hist = self._fetch_history_frame(ticker, request, symbol)
+            if hist.empty:
+                return []
+
+            historical_points = self._frame_to_historical_points(
+                hist, symbol, request.interval
+            )
+
             self.logger.info(
-                f"Obtendo dados históricos para {symbol} - period: {request.period}, interval: {request.interval}"
+                f"Processados {len(historical_points)} pontos históricos para {symbol}"
             )
+            return historical_points
+
+        except UpstreamUnavailableError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Erro ao obter dados históricos para {symbol}: {e}")
+            return []
 
-            hist = ticker.history(
+    def _get_historical_columnar(
+        self, ticker: yf.Ticker, request: StockDataRequest, symbol: str
+    ) -> ColumnarHistoryResponse:
+        """Obtém dados históricos no formato colunar."""
+        try:
+            hist = self._fetch_history_frame(ticker, request, symbol)
+            return self._frame_to_columnar(hist, symbol, request.interval)
+
+        except UpstreamUnavailableError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Erro ao obter dados históricos para {symbol}: {e}")
+            return ColumnarHistoryResponse(symbol=symbol, interval=request.interval)
+
+    def _fetch_history_frame(
+        self, ticker: yf.Ticker, request: StockDataRequest, symbol: str
+    ) -> pd.DataFrame:
+        """Busca o DataFrame histórico bruto no yfinance."""
+        # Usar o período e intervalo especificados no request
+        self.logger.info(
+            f"Obtendo dados históricos para {symbol} - period: {request.period}, interval: {request.interval}"
+        )
+
+        if ohlcv_store.supports(request.interval, period=request.period):
+            # Barras já armazenadas vêm do disco; só a cauda é buscada
+            hist = ohlcv_store.get_history(
+                symbol,
+                request.interval,
+                fetch=lambda **kwargs: upstream_gateway.call(
+                    "history", lambda: ticker.history(**kwargs)
+                ),
                 period=request.period,
-                interval=request.interval,  # Usar o intervalo do request
+            )
+        else:
+            hist = upstream_gateway.call(
+                "history",
+                lambda: ticker.history(
+                    period=request.period,
+                    interval=request.interval,  # Usar o intervalo do request
+                ),
             )
 
-            self.logger.info(f"Dados retornados pelo yfinance: {len(hist)} linhas")
+        self.logger.info(f"Dados retornados pelo yfinance: {len(hist)} linhas")
 
-            if hist.empty:
-                self.logger.warning(f"Nenhum dado histórico retornado para {symbol}")
-                return []
+        if hist.empty:
+            self.logger.warning(f"Nenhum dado histórico retornado para {symbol}")
+            return hist
 
-            # Debug: mostrar colunas e primeiras linhas
-            self.logger.debug(f"Colunas retornadas: {list(hist.columns)}")
-            self.logger.debug(f"Index type: {type(hist.index)}")
-            self.logger.debug(f"Primeiras 3 linhas:\n{hist.head(3)}")
+        # Debug: mostrar colunas e primeiras linhas
+        self.logger.debug(f"Colunas retornadas: {list(hist.columns)}")
+        self.logger.debug(f"Index type: {type(hist.index)}")
+        self.logger.debug(f"Primeiras 3 linhas:\n{hist.head(3)}")
+        return hist
 
-            # Converter para lista de pontos históricos
-            hist = hist.reset_index()
+    def _frame_to_historical_points(
+        self, hist: pd.DataFrame, symbol: str, interval: str
+    ) -> List[HistoricalDataPoint]:
+        """
+        Converte o DataFrame do yfinance em pontos históricos de forma vetorizada.
 
-            # Determinar nome da coluna de data
-            date_column = "Datetime" if "Datetime" in hist.columns else "Date"
-            self.logger.debug(f"Usando coluna de data: {date_column}")
+        As colunas são extraídas por `_history_columns`, e os modelos são
+        validados em lote por um único `TypeAdapter` em vez de um construtor
+        Pydantic por linha.
 
-            historical_points = []
+        Args:
+            hist: DataFrame retornado por `Ticker.history`
+            symbol: Símbolo da ação
+            interval: Intervalo dos dados (define o formato da data)
 
-            for _, row in hist.iterrows():
-                try:
-                    # Verificar se temos dados válidos
-                    if pd.isna(row["Open"]) or pd.isna(row["Close"]):
-                        continue
+        Returns:
+            Lista de pontos históricos
+        """
+        columns = self._history_columns(hist, interval)
+        return _HISTORICAL_POINTS_ADAPTER.validate_python(
+            [
+                {
+                    "date": date,
+                    "symbol": symbol,
+                    "open": open_,
+                    "high": high,
+                    "low": low,
+                    "close": close,
+                    "volume": volume,
+                    "adj_close": adj_close,
+                }
+                for date, open_, high, low, close, volume, adj_close in zip(
+                    columns["dates"],
+                    columns["open"],
+                    columns["high"],
+                    columns["low"],
+                    columns["close"],
+                    columns["volume"],
+                    columns["adj_close"],
+                )
+            ]
+        )
 
-                    # Formatar data/datetime apropriadamente usando a coluna correta
-                    date_value = row[date_column]
-
-                    if hasattr(date_value, "strftime"):
-                        # Para dados intraday, incluir hora se disponível
-                        if request.interval in ["1m", "2m", "5m", "15m", "30m", "1h"]:
-                            formatted_date = date_value.strftime("%Y-%m-%d %H:%M:%S")
-                        else:
-                            formatted_date = date_value.strftime("%Y-%m-%d")
-                    else:
-                        formatted_date = str(date_value)
-
-                    point = HistoricalDataPoint(
-                        date=formatted_date,
-                        symbol=symbol,
-                        open=round(float(row["Open"]), 2),
-                        high=round(float(row["High"]), 2),
-                        low=round(float(row["Low"]), 2),
-                        close=round(float(row["Close"]), 2),
-                        volume=int(row["Volume"]) if pd.notna(row["Volume"]) else 0,
-                        adj_close=round(float(row.get("Adj Close", row["Close"])), 2),
-                    )
-                    historical_points.append(point)
-                except (ValueError, TypeError) as e:
-                    self.logger.warning(f"Erro ao processar ponto histórico: {e}")
-                    self.logger.debug(f"Dados da linha problemática: {row}")
-                    continue
+    def _frame_to_columnar(
+        self, hist: pd.DataFrame, symbol: str, interval: str
+    ) -> ColumnarHistoryResponse:
+        """
+        Converte o DataFrame do yfinance em uma série histórica colunar.
 
-            self.logger.info(
-                f"Processados {len(historical_points)} pontos históricos para {symbol}"
-            )
-            return historical_points
+        Args:
+            hist: DataFrame retornado por `Ticker.history`
+            symbol: Símbolo da ação
+            interval: Intervalo dos dados (define o formato da data)
 
-        except Exception as e:
-            self.logger.error(f"Erro ao obter dados históricos para {symbol}: {e}")
-            return []
+        Returns:
+            Série histórica com uma lista por campo
+        """
+        return ColumnarHistoryResponse(
+            symbol=symbol, interval=interval, **self._history_columns(hist, interval)
+        )
+
+    def _history_columns(
+        self, hist: pd.DataFrame, interval: str
+    ) -> Dict[str, list]:
+        """
+        Extrai as colunas do histórico como listas, de forma vetorizada.
+
+        Filtragem de NaN, arredondamento e formatação de datas são feitos sobre
+        colunas inteiras em vez de linha a linha.
+
+        Args:
+            hist: DataFrame retornado por `Ticker.history`
+            interval: Intervalo dos dados (define o formato da data)
+
+        Returns:
+            Dicionário com as listas dates, open, high, low, close, volume e adj_close
+        """
+        # Descartar linhas sem abertura ou fechamento
+        if not hist.empty:
+            hist = hist[hist["Open"].notna() & hist["Close"].notna()]
+        if hist.empty:
+            return {
+                "dates": [], "open": [], "high": [], "low": [],
+                "close": [], "volume": [], "adj_close": [],
+            }
+
+        # Para dados intraday, incluir hora (horário local da bolsa)
+        if isinstance(hist.index, pd.DatetimeIndex):
+            index = hist.index
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            if interval in INTRADAY_INTERVALS:
+                dates = np.char.replace(
+                    np.datetime_as_string(index.values, unit="s"), "T", " "
+                ).tolist()
+            else:
+                dates = np.datetime_as_string(index.values, unit="D").tolist()
+        else:
+            dates = hist.index.astype(str).tolist()
+
+        prices = hist[["Open", "High", "Low", "Close"]].to_numpy(dtype=float).round(2)
+        opens, highs, lows, closes = (column.tolist() for column in prices.T)
+        if "Adj Close" in hist.columns:
+            adj_closes = hist["Adj Close"].to_numpy(dtype=float).round(2).tolist()
+        else:
+            adj_closes = closes
+        if "Volume" in hist.columns:
+            volumes = hist["Volume"].fillna(0).to_numpy().astype("int64").tolist()
+        else:
+            volumes = [0] * len(dates)
+
+        return {
+            "dates": dates,
+            "open": opens,
+            "high": highs,
+            "low": lows,
+            "close": closes,
+            "volume": volumes,
+            "adj_close": adj_closes,
+        }
 
     def _get_brazilian_stocks(self) -> List[Dict[str, str]]:
-        """Obtém lista de ações brasileiras a partir do CSV em /data com cache."""
+        """
+        Obtém lista de ações brasileiras a partir do CSV em /data com cache.
+
+        O cache é recarregado quando expira ou quando o tickers.csv muda
+        (mtime ou tamanho). Se o arquivo não puder ser lido, a lista estática
+        é usada e mantida em cache até o arquivo mudar.
+        """
+        signature = self._get_csv_signature()
         # Verificar se o cache é válido
         if (
             self._brazilian_stocks_cache
             and self._cache_timestamp
             and datetime.now() - self._cache_timestamp < self._cache_ttl
+            and self._cache_signature == signature
         ):
-            self.logger.info("Retornando ações brasileiras do cache.")
-            self.logger.debug(
-                f"Primeiros 5 tickers do cache: {self._brazilian_stocks_cache[:5]}"
-            )
             return self._brazilian_stocks_cache
 
         self.logger.info(
-            "Cache de ações brasileiras expirado ou vazio. Carregando do tickers.csv."
+            "Cache de ações brasileiras expirado, vazio ou desatualizado. Carregando do tickers.csv."
         )
-        csv_path = os.path.join(os.path.dirname(__file__), "data", "tickers.csv")
-        csv_path = os.path.abspath(csv_path)
-        brazilian_stocks = []
         try:
             df = pd.read_csv(
-                csv_path, sep=",", dtype=str, encoding="utf-8", on_bad_lines="skip"
+                TICKERS_CSV_PATH, sep=",", dtype=str, encoding="utf-8", on_bad_lines="skip"
             )
             # Detecta se existe coluna de setor
-            has_sector = "Setor" in df.columns or "Sector" in df.columns
             sector_col = (
                 "Setor"
                 if "Setor" in df.columns
                 else ("Sector" if "Sector" in df.columns else None)
             )
-            for _, row in df.iterrows():
-                symbol = row.get("Ticker", "").strip()
-                name = row.get("Nome", "").strip()
-                # Define tipo
-                if symbol.endswith("34.SA") or symbol.endswith("35.SA"):
-                    tipo = "BDR"
-                elif symbol.endswith(".SA"):
-                    tipo = "Ação"
-                else:
-                    tipo = "Outro"
-                # Setor do CSV, se existir
-                sector = (
-                    row.get(sector_col, "Unknown").strip()
-                    if sector_col and row.get(sector_col)
-                    else "Unknown"
-                )
-                brazilian_stocks.append(
-                    {"symbol": symbol, "name": name, "sector": sector, "type": tipo}
+            # Colunas inteiras de uma vez, em vez de linha a linha
+            symbols = df["Ticker"].fillna("").str.strip()
+            names = df["Nome"].fillna("").str.strip()
+            if sector_col:
+                sectors = df[sector_col].fillna("").str.strip().replace("", "Unknown")
+            else:
+                sectors = pd.Series("Unknown", index=df.index)
+            # Define tipo
+            types = np.where(
+                symbols.str.endswith(("34.SA", "35.SA")),
+                "BDR",
+                np.where(symbols.str.endswith(".SA"), "Ação", "Outro"),
+            )
+            brazilian_stocks = [
+                {"symbol": symbol, "name": name, "sector": sector, "type": tipo}
+                for symbol, name, sector, tipo in zip(
+                    symbols.tolist(), names.tolist(), sectors.tolist(), types.tolist()
                 )
+            ]
             # Atualizar cache
             self._brazilian_stocks_cache = brazilian_stocks
             self._cache_timestamp = datetime.now()
+            self._cache_signature = signature
             self.logger.info(
                 f"Cache de ações brasileiras atualizado com {len(brazilian_stocks)} tickers do tickers.csv."
             )
@@ -651,8 +773,88 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
             self.logger.debug(
                 f"Primeiros 5 tickers do fallback estático: {static_stocks[:5]}"
             )
+            self._brazilian_stocks_cache = static_stocks
+            self._cache_timestamp = datetime.now()
+            self._cache_signature = signature
             return static_stocks
 
+    def _get_csv_signature(self) -> Optional[Tuple[int, int]]:
+        """Retorna (mtime, tamanho) do tickers.csv, consultando o disco a cada poucos segundos."""
+        now = time.monotonic()
+        if now - self._csv_checked_at >= _CSV_CHECK_INTERVAL:
+            try:
+                stat = os.stat(TICKERS_CSV_PATH)
+                self._csv_signature = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                self._csv_signature = None
+            self._csv_checked_at = now
+        return self._csv_signature
+
+    def _get_ticker_index(self) -> TickerIndex:
+        """Retorna o índice de busca, reconstruindo-o se a lista de tickers mudou."""
+        stocks = self._get_brazilian_stocks()
+        index = self._ticker_index
+        if index is None or index.source is not stocks:
+            with self._index_lock:
+                if self._ticker_index is None or self._ticker_index.source is not stocks:
+                    self._ticker_index = TickerIndex(stocks)
+                    self.logger.info(
+                        f"Índice de busca construído com {self._ticker_index.size} tickers"
+                    )
+                index = self._ticker_index
+        return index
+
+    def _get_quote_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Obtém o último preço dos símbolos pelo snapshot local de cotações.
+
+        Símbolos ausentes ou vencidos são buscados juntos, em um
+        `yf.download` por bolsa. Símbolos sem dados também ficam no snapshot, para não
+        serem buscados a cada tecla; se o provedor falhar, nada é guardado.
+
+        Args:
+            symbols: Símbolos no formato do Yahoo (ex: "PETR4.SA")
+
+        Returns:
+            Dicionário símbolo -> último preço (apenas símbolos com cotação)
+        """
+        now = time.monotonic()
+        prices: Dict[str, float] = {}
+        missing = []
+        for symbol in symbols:
+            entry = self._quote_snapshot.get(symbol)
+            if entry is not None and entry[0] > now:
+                if entry[1] is not None:
+                    prices[symbol] = entry[1]
+            else:
+                missing.append(symbol)
+
+        if not missing:
+            return prices
+
+        frames: Dict[str, pd.DataFrame] = {}
+        try:
+            # O lote exige uma mesma bolsa; a busca costuma ter uma só (B3)
+            for group in group_by_exchange(missing):
+                frames.update(download_history_batch(
+                    group, period="5d", interval="1d", auto_adjust=False
+                ))
+        except Exception as e:
+            self.logger.warning(f"Falha ao obter cotações em lote para a busca: {e}")
+            return prices
+
+        expires_at = now + settings.SEARCH_QUOTE_TTL_SECONDS
+        for symbol in missing:
+            frame = frames.get(symbol.upper())
+            price = None
+            if frame is not None and "Close" in frame.columns:
+                closes = frame["Close"].dropna()
+                if not closes.empty:
+                    price = round(float(closes.iloc[-1]), 2)
+                    prices[symbol] = price
+            self._quote_snapshot[symbol] = (expires_at, price)
+        return prices
+
     def _get_static_brazilian_stocks(self) -> List[Dict[str, str]]:
         """Retorna uma lista estática de ações brasileiras como fallback."""
         return [
@@ -734,27 +936,6 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
             },
         ]
 
-    def _calculate_relevance_score(self, query: str, stock: Dict[str, str]) -> float:
-        """Calcula score de relevância para busca."""
-        score = 0.0
-        stock_name = stock.get("name", "") or ""
-
-        # Score baseado em correspondência no símbolo
-        if query in stock["symbol"].lower():
-            score += 1.0
-
-        # Score baseado em correspondência no nome
-        if query in stock_name.lower():
-            score += 0.8
-
-        # Score baseado em correspondência parcial
-        words = query.split()
-        for word in words:
-            if word in stock_name.lower():
-                score += 0.3
-
-        return score
-
     def _extract_market_from_symbol(self, symbol: str) -> str:
         """Extrai mercado baseado no símbolo."""
         if symbol.endswith(".SA"):
@@ -765,20 +946,24 @@ class YahooFinanceProvider(IMarketDataProvider, LoggerMixin):
             return "Unknown"
 
     def _generate_ticker_suggestions(self, invalid_symbol: str) -> List[str]:
-        """Gera sugestões de tickers similares."""
-        suggestions = []
+        """
+        Gera sugestões de tickers similares.
 
-        # Se não tem .SA, sugerir versão com .SA
-        if not invalid_symbol.endswith(".SA") and "." not in invalid_symbol:
-            suggestions.append(f"{invalid_symbol}.SA")
+        Usa a busca aproximada do índice (distância de edição sobre símbolos
+        e nomes), então erros de digitação como "PERT4" ou "VAL3" também
+        encontram PETR4.SA e VALE3.SA.
+        """
+        index = self._get_ticker_index()
+        suggestions = []
 
-        # Buscar símbolos similares na lista brasileira
-        brazilian_stocks = self._get_brazilian_stocks()
-        invalid_lower = invalid_symbol.lower().replace(".sa", "")
+        # Se não tem sufixo e a versão .SA existe, sugeri-la primeiro
+        if "." not in invalid_symbol:
+            stock = index.get(f"{invalid_symbol}.SA")
+            if stock is not None:
+                suggestions.append(stock["symbol"])
 
-        for stock in brazilian_stocks:
-            symbol_base = stock["symbol"].replace(".SA", "").lower()
-            if invalid_lower in symbol_base or symbol_base in invalid_lower:
+        for stock, _ in index.suggest(invalid_symbol, limit=3):
+            if stock["symbol"] not in suggestions:
                 suggestions.append(stock["symbol"])
 
         return suggestions[:3]  # Retornar até 3 sugestões
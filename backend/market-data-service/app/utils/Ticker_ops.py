@@ -1,17 +1,157 @@
+from typing import Callable, Dict, List, Optional
+
 import pandas as pd
 import yfinance as yf
 import numpy as np
 
+from core.upstream import UpstreamUnavailableError, upstream_gateway
+from utils.market_calendar import market_for_symbol
+
+
+def safe_ticker_operation(symbol: str, operation, endpoint: Optional[str] = "ticker"):
+        """
+        Executa operação no ticker com tratamento de erro.
 
-def safe_ticker_operation(symbol: str, operation):
-        """Executa operação no ticker com tratamento de erro"""
+        A operação roda pelo gateway do provedor, identificada por `endpoint`
+        nas métricas. Com `endpoint=None` ela roda fora do gateway e encaminha
+        ela mesma suas chamadas de rede (ex: leituras do armazenamento OHLCV
+        com `gateway_history_fetch`). Se o provedor estiver indisponível,
+        UpstreamUnavailableError é repassada sem ser convertida em ValueError.
+        """
         try:
             ticker = yf.Ticker(symbol.upper())
-            result = operation(ticker)
+            if endpoint is None:
+                return operation(ticker)
+            result = upstream_gateway.call(endpoint, lambda: operation(ticker))
             return result
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             raise ValueError(f"Erro ao executar operação no ticker {symbol}: {e}")
 
+def gateway_history_fetch(ticker: yf.Ticker) -> Callable[..., pd.DataFrame]:
+        """
+        Função de busca para o armazenamento OHLCV que passa pelo gateway.
+
+        Apenas a chamada de rede ocupa uma vaga do gateway; a leitura local do
+        armazenamento fica de fora e continua servindo as barras em disco com
+        o circuito aberto ou em backoff.
+        """
+        return lambda **kwargs: upstream_gateway.call(
+            "history", lambda: ticker.history(**kwargs)
+        )
+
+def exchange_for_symbol(symbol: str) -> Optional[str]:
+        """
+        Bolsa de um símbolo, pelo mercado do calendário ou pelo sufixo do Yahoo.
+
+        Retorna "BR", "US", o sufixo da bolsa (ex: "SS", "L") ou None quando
+        ela não pode ser identificada (índices estrangeiros, moedas, cripto).
+        """
+        market = market_for_symbol(symbol)
+        if market:
+            return market
+        symbol = symbol.strip().upper()
+        base, dot, suffix = symbol.rpartition(".")
+        if dot and base and not symbol.startswith("^") and "=" not in symbol:
+            return suffix
+        return None
+
+def group_by_exchange(symbols: List[str]) -> List[List[str]]:
+        """
+        Agrupa os símbolos por bolsa, preservando a ordem.
+
+        Símbolos de bolsa desconhecida ficam cada um em seu próprio grupo.
+        """
+        groups: Dict[object, List[str]] = {}
+        for symbol in symbols:
+            exchange = exchange_for_symbol(symbol)
+            groups.setdefault(exchange if exchange else ("", symbol), []).append(symbol)
+        return list(groups.values())
+
+def download_history_batch(symbols: List[str], **history_kwargs) -> Dict[str, pd.DataFrame]:
+        """
+        Baixa o histórico de vários tickers com uma única chamada ao yf.download
+        e separa o DataFrame largo em um DataFrame por símbolo.
+
+        O lote só é aceito quando todos os símbolos são da mesma bolsa (ver
+        `exchange_for_symbol`). O yf.download alinha todos os tickers em um
+        único índice: com bolsas diferentes (ex: B3 e EUA) as barras
+        intradiárias ficam em um fuso comum e cada símbolo passa a seguir
+        também os horários do outro pregão. Nesse caso é levantado
+        ValueError antes de qualquer chamada ao provedor, e os chamadores
+        fazem a busca individual por símbolo (ou um lote por bolsa, com
+        `group_by_exchange`).
+
+        Símbolos sem dados (ou ausentes do resultado) recebem um DataFrame vazio.
+
+        Raises:
+            ValueError: Símbolos de bolsas diferentes ou erro no download
+            UpstreamUnavailableError: Provedor indisponível
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        if len(group_by_exchange(symbols)) > 1:
+            raise ValueError(
+                f"Histórico em lote exige símbolos de uma mesma bolsa: {', '.join(symbols)}"
+            )
+        try:
+            frame = upstream_gateway.call("download", lambda: yf.download(
+                tickers=symbols,
+                group_by='ticker',
+                actions=True,
+                progress=False,
+                **history_kwargs
+            ))
+        except UpstreamUnavailableError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Erro ao baixar histórico em lote para {', '.join(symbols)}: {e}")
+
+        result = {symbol: pd.DataFrame() for symbol in symbols}
+        if frame is None or frame.empty:
+            return result
+
+        if isinstance(frame.columns, pd.MultiIndex):
+            available = set(frame.columns.get_level_values(0))
+            for symbol in symbols:
+                if symbol in available:
+                    result[symbol] = frame[symbol].dropna(how='all')
+        elif len(symbols) == 1:
+            # Versões antigas do yfinance não usam MultiIndex para um único ticker
+            result[symbols[0]] = frame.dropna(how='all')
+
+        for symbol_frame in result.values():
+            symbol_frame.columns.name = None
+        return result
+
+def convert_to_columnar(data: pd.DataFrame) -> Dict[str, list]:
+        """
+        Converte um DataFrame de histórico para o formato colunar (struct-of-arrays).
+
+        Retorna `{"dates": [...], "open": [...], "close": [...], ...}` com uma lista
+        por coluna, montada direto dos arrays do DataFrame sem criar um dict por linha.
+        Os nomes das colunas são normalizados (ex: "Stock Splits" -> "stock_splits").
+        """
+        if data is None or data.empty:
+            return {"dates": []}
+
+        index = data.index
+        if isinstance(index, pd.DatetimeIndex):
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            dates = np.char.replace(np.datetime_as_string(index.values, unit='s'), 'T', ' ').tolist()
+        else:
+            dates = index.astype(str).tolist()
+
+        result: Dict[str, list] = {"dates": dates}
+        for column in data.columns:
+            values = data[column].fillna(0).to_numpy()
+            key = str(column).strip().lower().replace(' ', '_')
+            if key == 'volume':
+                values = values.astype('int64')
+            result[key] = values.tolist()
+        return result
+
 def convert_to_serializable(data):
         """Converte dados pandas/numpy para formato serializável"""
         if isinstance(data, pd.DataFrame):
@@ -0,0 +1,471 @@
+"""
+Calendário de pregões da B3 e da NYSE.
+
+Substitui a aproximação de `is_market_open` (dia útil e hora local) por
+calendários com tabela pré-calculada de feriados, sessões estendidas
+(pré-abertura e pós-fechamento), pregões com horário especial e consultas
+de próxima abertura e próximo fechamento, sempre no fuso da bolsa.
+
+A camada de cache usa o calendário para dimensionar TTLs: dados obtidos com
+o mercado fechado (e já assentados após o fechamento) continuam válidos até
+a próxima abertura, em vez de serem buscados a cada poucos minutos durante
+a noite e o fim de semana.
+
+Example:
+    from utils.market_calendar import get_calendar, market_for_symbol
+
+    calendar = get_calendar(market_for_symbol("PETR4.SA"))
+    if not calendar.is_open():
+        print(calendar.next_open())
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, FrozenSet, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+# Anos cobertos pelas tabelas de feriados
+CALENDAR_YEARS = range(2022, 2041)
+
+# Minutos após o fim da sessão estendida até as cotações do provedor assentarem
+DATA_SETTLE_MINUTES = 15
+
+# Janela máxima de busca por pregões (cobre feriados prolongados)
+_MAX_SEARCH_DAYS = 15
+
+# Índices americanos negociados no horário da NYSE
+_US_INDEXES = {"^GSPC", "^IXIC", "^DJI", "^VIX", "^RUT", "^NDX"}
+
+# Símbolos brasileiros sem o sufixo .SA
+_BR_SYMBOLS = {"^BVSP", "^SMLL", "^IBX50", "^IFIX", "SELIC"}
+
+# Moedas de cotação de criptoativos (ex: BTC-USD), negociados 24 horas
+_CRYPTO_QUOTES = {"USD", "USDT", "BRL", "EUR", "BTC"}
+
+
+def easter_sunday(year: int) -> date:
+    """
+    Calcula o domingo de Páscoa (algoritmo gregoriano anônimo).
+
+    Args:
+        year: Ano
+
+    Returns:
+        Data do domingo de Páscoa
+    """
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """N-ésimo dia da semana do mês (n negativo conta do fim do mês)."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+
+def _observed(day: date) -> date:
+    """Data observada de um feriado americano de data fixa (fim de semana)."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@dataclass(frozen=True)
+class TradingSession:
+    """
+    Horários de um pregão, no fuso da bolsa.
+
+    Attributes:
+        day: Data do pregão
+        pre_open: Início da pré-abertura
+        open: Abertura da sessão regular
+        close: Fechamento da sessão regular
+        post_close: Fim da sessão pós-fechamento
+    """
+
+    day: date
+    pre_open: datetime
+    open: datetime
+    close: datetime
+    post_close: datetime
+
+
+class ExchangeCalendar:
+    """
+    Calendário de pregões de uma bolsa.
+
+    Consultas aceitam datetimes com fuso (qualquer um) ou ingênuos, que são
+    interpretados no fuso da bolsa; sem data, usam o instante atual.
+
+    Attributes:
+        name: Nome da bolsa
+        tz: Fuso horário da bolsa
+        holidays: Dias sem pregão (além dos fins de semana)
+        special_opens: Dias com abertura atrasada (data -> horário)
+        early_closes: Dias com fechamento antecipado (data -> horário)
+    """
+
+    regular_open = time(10, 0)
+    regular_close = time(17, 0)
+    pre_open_minutes = 0
+    post_close_minutes = 0
+
+    def __init__(
+        self,
+        name: str,
+        tz: str,
+        holidays: Iterable[date],
+        special_opens: Optional[Dict[date, time]] = None,
+        early_closes: Optional[Dict[date, time]] = None,
+    ):
+        """
+        Inicializa o calendário.
+
+        Args:
+            name: Nome da bolsa
+            tz: Nome do fuso horário (IANA)
+            holidays: Dias sem pregão
+            special_opens: Dias com abertura atrasada
+            early_closes: Dias com fechamento antecipado
+        """
+        self.name = name
+        self.tz = ZoneInfo(tz)
+        self.holidays: FrozenSet[date] = frozenset(holidays)
+        self.special_opens = dict(special_opens or {})
+        self.early_closes = dict(early_closes or {})
+
+    def is_trading_day(self, day: date) -> bool:
+        """
+        Indica se há pregão na data.
+
+        Args:
+            day: Data
+
+        Returns:
+            True se for dia útil e não for feriado da bolsa
+        """
+        return day.weekday() < 5 and day not in self.holidays
+
+    def session(self, day: date) -> Optional[TradingSession]:
+        """
+        Retorna os horários do pregão da data.
+
+        Args:
+            day: Data
+
+        Returns:
+            Sessão do dia ou None se não houver pregão
+        """
+        if not self.is_trading_day(day):
+            return None
+        open_at = datetime.combine(day, self.special_opens.get(day, self.regular_open), self.tz)
+        close_at = datetime.combine(day, self.early_closes.get(day, self._close_time(day)), self.tz)
+        return TradingSession(
+            day=day,
+            pre_open=open_at - timedelta(minutes=self.pre_open_minutes),
+            open=open_at,
+            close=close_at,
+            post_close=close_at + timedelta(minutes=self.post_close_minutes),
+        )
+
+    def is_open(self, at: Optional[datetime] = None, extended: bool = False) -> bool:
+        """
+        Indica se o mercado está aberto no instante.
+
+        Args:
+            at: Instante (padrão: agora)
+            extended: Considera a pré-abertura e o pós-fechamento
+
+        Returns:
+            True se o instante está dentro de uma sessão
+        """
+        at = self._localize(at)
+        session = self.session(at.date())
+        if session is None:
+            return False
+        start, end = self._bounds(session, extended)
+        return start <= at < end
+
+    def next_open(self, at: Optional[datetime] = None, extended: bool = False) -> datetime:
+        """
+        Retorna a próxima abertura estritamente após o instante.
+
+        Args:
+            at: Instante (padrão: agora)
+            extended: Usa o início da pré-abertura
+
+        Returns:
+            Instante da próxima abertura no fuso da bolsa
+        """
+        at = self._localize(at)
+        for offset in range(_MAX_SEARCH_DAYS):
+            session = self.session(at.date() + timedelta(days=offset))
+            if session is not None:
+                start, _ = self._bounds(session, extended)
+                if start > at:
+                    return start
+        raise ValueError(f"Nenhum pregão da {self.name} nos próximos {_MAX_SEARCH_DAYS} dias")
+
+    def next_close(self, at: Optional[datetime] = None, extended: bool = False) -> datetime:
+        """
+        Retorna o próximo fechamento (o do pregão atual, se aberto).
+
+        Args:
+            at: Instante (padrão: agora)
+            extended: Usa o fim do pós-fechamento
+
+        Returns:
+            Instante do próximo fechamento no fuso da bolsa
+        """
+        at = self._localize(at)
+        for offset in range(_MAX_SEARCH_DAYS):
+            session = self.session(at.date() + timedelta(days=offset))
+            if session is not None:
+                _, end = self._bounds(session, extended)
+                if end > at:
+                    return end
+        raise ValueError(f"Nenhum pregão da {self.name} nos próximos {_MAX_SEARCH_DAYS} dias")
+
+    def previous_close(self, at: Optional[datetime] = None, extended: bool = False) -> datetime:
+        """
+        Retorna o último fechamento até o instante.
+
+        Args:
+            at: Instante (padrão: agora)
+            extended: Usa o fim do pós-fechamento
+
+        Returns:
+            Instante do último fechamento no fuso da bolsa
+        """
+        at = self._localize(at)
+        for offset in range(_MAX_SEARCH_DAYS):
+            session = self.session(at.date() - timedelta(days=offset))
+            if session is not None:
+                _, end = self._bounds(session, extended)
+                if end <= at:
+                    return end
+        raise ValueError(f"Nenhum pregão da {self.name} nos últimos {_MAX_SEARCH_DAYS} dias")
+
+    def is_quiet(self, at: Optional[datetime] = None) -> bool:
+        """
+        Indica se o mercado está fechado e as cotações do último pregão assentaram.
+
+        Args:
+            at: Instante (padrão: agora)
+
+        Returns:
+            True fora de qualquer sessão e DATA_SETTLE_MINUTES após o último fechamento
+        """
+        at = self._localize(at)
+        if self.is_open(at, extended=True):
+            return False
+        settled = self.previous_close(at, extended=True) + timedelta(minutes=DATA_SETTLE_MINUTES)
+        return at >= settled
+
+    def closed_since(self, since: datetime, at: Optional[datetime] = None) -> bool:
+        """
+        Indica se os dados obtidos em `since` ainda valem em `at`.
+
+        Args:
+            since: Instante em que os dados foram obtidos
+            at: Instante da consulta (padrão: agora)
+
+        Returns:
+            True se os dados foram obtidos com o mercado quieto e nenhuma
+            sessão começou desde então
+        """
+        return self.is_quiet(since) and self.next_open(since, extended=True) > self._localize(at)
+
+    def seconds_until_open(self, at: Optional[datetime] = None) -> float:
+        """
+        Segundos até a próxima sessão (incluindo a pré-abertura).
+
+        Args:
+            at: Instante (padrão: agora)
+
+        Returns:
+            Segundos até a próxima abertura estendida
+        """
+        at = self._localize(at)
+        # Pelos timestamps: a subtração de datetimes no mesmo fuso ignora a
+        # mudança de horário de verão entre eles
+        return self.next_open(at, extended=True).timestamp() - at.timestamp()
+
+    def _close_time(self, day: date) -> time:
+        """Horário de fechamento regular da data."""
+        return self.regular_close
+
+    def _bounds(self, session: TradingSession, extended: bool):
+        """Início e fim da sessão, regular ou estendida."""
+        if extended:
+            return session.pre_open, session.post_close
+        return session.open, session.close
+
+    def _localize(self, at: Optional[datetime]) -> datetime:
+        """Converte o instante para o fuso da bolsa."""
+        if at is None:
+            return datetime.now(self.tz)
+        if at.tzinfo is None:
+            return at.replace(tzinfo=self.tz)
+        return at.astimezone(self.tz)
+
+
+class B3Calendar(ExchangeCalendar):
+    """
+    Calendário da B3 (horário de Brasília).
+
+    A sessão regular vai das 10h às 17h enquanto vigora o horário de verão
+    americano e das 10h às 18h no restante do ano. Há pré-abertura de 15
+    minutos e call de fechamento de 10 minutos; na Quarta-feira de Cinzas o
+    pregão começa às 13h.
+    """
+
+    pre_open_minutes = 15
+    post_close_minutes = 10
+
+    def __init__(self):
+        """Inicializa o calendário com a tabela de feriados pré-calculada."""
+        holidays = set()
+        special_opens = {}
+        for year in CALENDAR_YEARS:
+            easter = easter_sunday(year)
+            holidays.update({
+                date(year, 1, 1),                # Confraternização Universal
+                easter - timedelta(days=48),     # Carnaval (segunda)
+                easter - timedelta(days=47),     # Carnaval (terça)
+                easter - timedelta(days=2),      # Sexta-feira Santa
+                date(year, 4, 21),               # Tiradentes
+                date(year, 5, 1),                # Dia do Trabalho
+                easter + timedelta(days=60),     # Corpus Christi
+                date(year, 9, 7),                # Independência
+                date(year, 10, 12),              # Nossa Senhora Aparecida
+                date(year, 11, 2),               # Finados
+                date(year, 11, 15),              # Proclamação da República
+                date(year, 12, 24),              # Véspera de Natal
+                date(year, 12, 25),              # Natal
+                date(year, 12, 31),              # Último dia do ano
+            })
+            if year >= 2024:
+                holidays.add(date(year, 11, 20))  # Consciência Negra (feriado nacional)
+            special_opens[easter - timedelta(days=46)] = time(13, 0)  # Quarta-feira de Cinzas
+
+        super().__init__("B3", "America/Sao_Paulo", holidays, special_opens=special_opens)
+        self._new_york = ZoneInfo("America/New_York")
+
+    def _close_time(self, day: date) -> time:
+        """Fechamento às 17h no horário de verão americano e às 18h fora dele."""
+        if datetime.combine(day, time(12, 0), self._new_york).dst():
+            return time(17, 0)
+        return time(18, 0)
+
+
+class NYSECalendar(ExchangeCalendar):
+    """
+    Calendário da NYSE (horário de Nova York).
+
+    Sessão regular das 9h30 às 16h, pré-mercado a partir das 4h e
+    pós-mercado até as 20h. Fecha às 13h na véspera da Independência, no dia
+    seguinte ao Dia de Ação de Graças e na véspera de Natal.
+    """
+
+    regular_open = time(9, 30)
+    regular_close = time(16, 0)
+    pre_open_minutes = 330
+    post_close_minutes = 240
+
+    def __init__(self):
+        """Inicializa o calendário com a tabela de feriados pré-calculada."""
+        holidays = {date(2025, 1, 9)}  # Luto nacional (Jimmy Carter)
+        early_closes = {}
+        early = time(13, 0)
+        for year in CALENDAR_YEARS:
+            easter = easter_sunday(year)
+            thanksgiving = _nth_weekday(year, 11, 3, 4)
+            holidays.update({
+                _nth_weekday(year, 1, 0, 3),     # Martin Luther King Jr. Day
+                _nth_weekday(year, 2, 0, 3),     # Washington's Birthday
+                easter - timedelta(days=2),      # Good Friday
+                _nth_weekday(year, 5, 0, -1),    # Memorial Day
+                _observed(date(year, 6, 19)),    # Juneteenth
+                _observed(date(year, 7, 4)),     # Independence Day
+                _nth_weekday(year, 9, 0, 1),     # Labor Day
+                thanksgiving,                    # Thanksgiving Day
+                _observed(date(year, 12, 25)),   # Christmas Day
+            })
+            # Ano-Novo no sábado não é observado na sexta anterior
+            new_year = date(year, 1, 1)
+            if new_year.weekday() != 5:
+                holidays.add(_observed(new_year))
+
+            early_closes[thanksgiving + timedelta(days=1)] = early
+            for eve in (date(year, 7, 3), date(year, 12, 24)):
+                if eve.weekday() < 5:
+                    early_closes[eve] = early
+
+        early_closes = {day: t for day, t in early_closes.items() if day not in holidays}
+        super().__init__("NYSE", "America/New_York", holidays, early_closes=early_closes)
+
+
+CALENDARS: Dict[str, ExchangeCalendar] = {
+    "BR": B3Calendar(),
+    "US": NYSECalendar(),
+}
+
+
+def get_calendar(market: Optional[str]) -> Optional[ExchangeCalendar]:
+    """
+    Retorna o calendário de um mercado.
+
+    Args:
+        market: Código do mercado ("BR" ou "US")
+
+    Returns:
+        Calendário do mercado ou None se não houver
+    """
+    if not market:
+        return None
+    return CALENDARS.get(market.upper())
+
+
+def market_for_symbol(symbol: str) -> Optional[str]:
+    """
+    Identifica o mercado cujo calendário rege um símbolo.
+
+    Args:
+        symbol: Símbolo no formato do Yahoo Finance
+
+    Returns:
+        "BR", "US" ou None para ativos sem calendário (moedas, cripto,
+        futuros e bolsas de outros países)
+
+    Example:
+        >>> market_for_symbol("PETR4.SA")
+        'BR'
+        >>> market_for_symbol("USDBRL=X") is None
+        True
+    """
+    symbol = symbol.strip().upper()
+    if symbol.endswith(".SA") or symbol in _BR_SYMBOLS:
+        return "BR"
+    if symbol in _US_INDEXES:
+        return "US"
+    if symbol.startswith("^") or "=" in symbol or "." in symbol:
+        return None
+    if "-" in symbol and symbol.rsplit("-", 1)[1] in _CRYPTO_QUOTES:
+        return None
+    return "US"
@@ -15,6 +15,8 @@ import re
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 
+from utils.market_calendar import get_calendar
+
 
 def validate_ticker_symbol(symbol: str) -> bool:
     """
@@ -341,37 +343,31 @@ def calculate_percentage_change(
 
 def is_market_open(market: str = "BR") -> bool:
     """
-    Verifica se um mercado está aberto (aproximação simples).
+    Verifica se um mercado está aberto na sessão regular.
+    
+    B3 ("BR") e NYSE ("US") usam o calendário de pregões (feriados, horários
+    especiais e fuso da bolsa); os demais mercados usam uma aproximação por
+    dia útil e horário comercial local.
     
     Args:
         market: Código do mercado
         
     Returns:
-        True se o mercado provavelmente está aberto
-        
-    Note:
-        Esta é uma implementação simplificada. Em produção,
-        seria necessário considerar feriados e horários específicos.
+        True se o mercado está aberto
         
     Example:
         >>> is_market_open("BR")  # Depende do horário atual
         True
     """
+    calendar = get_calendar(market)
+    if calendar is not None:
+        return calendar.is_open()
+    
     now = datetime.now()
     
     # Verificar se é dia útil (segunda a sexta)
     if now.weekday() >= 5:  # 5 = sábado, 6 = domingo
         return False
     
-    current_hour = now.hour
-    
-    if market.upper() == "BR":
-        # B3: 10:00 às 17:00 (horário de Brasília)
-        return 10 <= current_hour <= 17
-    elif market.upper() == "US":
-        # NYSE/NASDAQ: 9:30 às 16:00 (EST, aproximação)
-        return 9 <= current_hour <= 16
-    else:
-        # Assumir horário comercial padrão
-        return 9 <= current_hour <= 17
-    
\ No newline at end of file
+    # Assumir horário comercial padrão
+    return 9 <= now.hour <= 17
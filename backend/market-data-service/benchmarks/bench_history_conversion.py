@@ -0,0 +1,117 @@
+"""
+Benchmark da conversão do DataFrame de histórico em HistoricalDataPoint.
+
+Compara o laço original com `iterrows()` (reproduzido abaixo como
+referência) com `YahooFinanceProvider._frame_to_historical_points`, sobre
+frames sintéticos de barras de 1 minuto com linhas NaN, e confere que as
+duas saídas são idênticas.
+
+Uso (a partir de backend/market-data-service):
+    python benchmarks/bench_history_conversion.py
+    python benchmarks/bench_history_conversion.py --rows 10000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from models.responses import HistoricalDataPoint  # noqa: E402
+from services.yahoo_finance_provider import YahooFinanceProvider  # noqa: E402
+
+SYMBOL = "PETR4.SA"
+INTERVAL = "1m"
+
+
+def synthetic_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Barras de 1 minuto no fuso de São Paulo, com ~1% de linhas sem preço."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(
+        "2024-01-02 10:00", periods=rows, freq="min", tz="America/Sao_Paulo", name="Datetime"
+    )
+    close = 30 + np.cumsum(rng.normal(0, 0.05, rows))
+    frame = pd.DataFrame(
+        {
+            "Open": close + rng.normal(0, 0.02, rows),
+            "High": close + 0.1,
+            "Low": close - 0.1,
+            "Close": close,
+            "Volume": rng.integers(0, 100_000, rows).astype(float),
+            "Dividends": 0.0,
+            "Stock Splits": 0.0,
+        },
+        index=index,
+    )
+    missing = rng.random(rows) < 0.01
+    frame.loc[missing, ["Open", "Close"]] = np.nan
+    return frame
+
+
+def iterrows_points(hist: pd.DataFrame, symbol: str, interval: str) -> List[HistoricalDataPoint]:
+    """Conversão original, linha a linha (baseline)."""
+    hist = hist.reset_index()
+    date_column = "Datetime" if "Datetime" in hist.columns else "Date"
+    points = []
+    for _, row in hist.iterrows():
+        if pd.isna(row["Open"]) or pd.isna(row["Close"]):
+            continue
+        date_value = row[date_column]
+        if interval in ["1m", "2m", "5m", "15m", "30m", "1h"]:
+            formatted_date = date_value.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            formatted_date = date_value.strftime("%Y-%m-%d")
+        points.append(HistoricalDataPoint(
+            date=formatted_date,
+            symbol=symbol,
+            open=round(float(row["Open"]), 2),
+            high=round(float(row["High"]), 2),
+            low=round(float(row["Low"]), 2),
+            close=round(float(row["Close"]), 2),
+            volume=int(row["Volume"]) if pd.notna(row["Volume"]) else 0,
+            adj_close=round(float(row.get("Adj Close", row["Close"])), 2),
+        ))
+    return points
+
+
+def best_of(fn: Callable[[], List[HistoricalDataPoint]], repeat: int) -> float:
+    """Menor tempo de `repeat` execuções, em segundos."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3, help="execuções da versão vetorizada")
+    args = parser.parse_args()
+
+    provider = YahooFinanceProvider()
+    print(f"{'rows':>8} {'iterrows':>10} {'vectorized':>11} {'speedup':>8}")
+    for rows in args.rows:
+        frame = synthetic_frame(rows)
+        # O baseline roda uma vez só: em 100k linhas ele leva segundos
+        start = time.perf_counter()
+        expected = iterrows_points(frame, SYMBOL, INTERVAL)
+        baseline = time.perf_counter() - start
+
+        actual = provider._frame_to_historical_points(frame, SYMBOL, INTERVAL)
+        if actual != expected:
+            raise SystemExit(f"Saídas diferentes com {rows} linhas")
+        vectorized = best_of(
+            lambda: provider._frame_to_historical_points(frame, SYMBOL, INTERVAL), args.repeat
+        )
+        print(f"{rows:>8} {baseline:>9.3f}s {vectorized:>10.3f}s {baseline / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
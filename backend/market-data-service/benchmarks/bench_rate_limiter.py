@@ -0,0 +1,110 @@
+"""
+Micro-benchmark do rate limiter em processo.
+
+Compara o SimpleRateLimiter original (janela deslizante com uma lista de
+instantes por cliente, reproduzido abaixo como referência) com o
+`TokenBucketRateLimiter`, em dois cenários:
+
+- muitos clientes: N verificações distribuídas em rodízio entre 10 mil
+  clientes, limite 100/60s; mede o tempo por verificação e a memória do
+  estado mantido (tracemalloc, em uma segunda execução);
+- cliente quente: um único cliente com limite 1000/60s, sempre com a lista
+  ou o balde cheio.
+
+Uso (a partir de backend/market-data-service):
+    python benchmarks/bench_rate_limiter.py
+    python benchmarks/bench_rate_limiter.py --checks 200000 --clients 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from services.rate_limiter import TokenBucketRateLimiter  # noqa: E402
+
+
+class SimpleRateLimiter:
+    """Rate limiter original por janela deslizante (baseline)."""
+
+    def __init__(self, max_requests: int, window_seconds: int):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._requests: Dict[str, List[float]] = {}
+
+    def is_allowed(self, identifier: str) -> bool:
+        now = time.time()
+        if identifier not in self._requests:
+            self._requests[identifier] = []
+        self._requests[identifier] = [
+            req_time for req_time in self._requests[identifier]
+            if now - req_time < self.window_seconds
+        ]
+        if len(self._requests[identifier]) >= self.max_requests:
+            return False
+        self._requests[identifier].append(now)
+        return True
+
+
+def simple(max_requests: int) -> SimpleRateLimiter:
+    return SimpleRateLimiter(max_requests, 60)
+
+
+def token_bucket(max_requests: int) -> TokenBucketRateLimiter:
+    # Sem a thread de limpeza: clientes ociosos não somem durante a medição
+    return TokenBucketRateLimiter(max_requests, 60, sweep_interval=0)
+
+
+def run_checks(limiter, identifiers: List[str]) -> None:
+    is_allowed = limiter.is_allowed
+    for identifier in identifiers:
+        is_allowed(identifier)
+
+
+def per_check_us(factory: Callable, max_requests: int, identifiers: List[str]) -> float:
+    limiter = factory(max_requests)
+    start = time.perf_counter()
+    run_checks(limiter, identifiers)
+    return (time.perf_counter() - start) / len(identifiers) * 1e6
+
+
+def state_mb(factory: Callable, max_requests: int, identifiers: List[str]) -> float:
+    """Memória alocada e ainda viva após as verificações (estado do limiter)."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    limiter = factory(max_requests)
+    run_checks(limiter, identifiers)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del limiter
+    return (current - baseline) / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checks", type=int, default=1_000_000)
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--hot-checks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    clients = [f"client-{n}" for n in range(args.clients)]
+    identifiers = [clients[n % args.clients] for n in range(args.checks)]
+    hot = ["hot-client"] * args.hot_checks
+
+    print(f"{args.checks} checks over {args.clients} clients, limit 100/60s")
+    for name, factory in (("SimpleRateLimiter", simple), ("TokenBucketRateLimiter", token_bucket)):
+        us = per_check_us(factory, 100, identifiers)
+        mb = state_mb(factory, 100, identifiers)
+        print(f"  {name:<24} {us:6.1f} us/check  {mb:6.1f} MB state")
+
+    print(f"{args.hot_checks} checks from one client, limit 1000/60s")
+    for name, factory in (("SimpleRateLimiter", simple), ("TokenBucketRateLimiter", token_bucket)):
+        print(f"  {name:<24} {per_check_us(factory, 1000, hot):6.1f} us/check")
+
+
+if __name__ == "__main__":
+    main()
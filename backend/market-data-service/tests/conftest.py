@@ -0,0 +1,71 @@
+"""
+Fixtures compartilhadas dos testes do market-data-service.
+
+Os testes não acessam a rede: o provedor assíncrono recebe um upstream
+local (`httpx.MockTransport`) e cada teste usa um gateway novo, para que
+backoff e circuito de um teste não vazem para o próximo.
+"""
+
+import httpx
+import pytest
+
+import services.async_yahoo_provider as async_yahoo_provider
+from core.upstream import UpstreamGateway
+from services.async_yahoo_provider import AsyncYahooFinanceProvider
+from services.cache_service import BoundedLRUCache
+from services.market_data_service import MarketDataService
+from services.rate_limiter import TokenBucketRateLimiter
+from services.yahoo_finance_provider import YahooFinanceProvider
+from stubs import FakeRedisServer, StubUpstream
+
+
+@pytest.fixture
+def gateway(monkeypatch) -> UpstreamGateway:
+    """Gateway isolado usado pelo provedor assíncrono durante o teste."""
+    gateway = UpstreamGateway(
+        "yahoo-test",
+        min_concurrency=1,
+        max_concurrency=8,
+        initial_concurrency=8,
+        acquire_timeout=1.0,
+        failure_threshold=100,
+        reset_timeout=30.0,
+        backoff_base=30.0,
+        backoff_max=60.0,
+    )
+    monkeypatch.setattr(async_yahoo_provider, "upstream_gateway", gateway)
+    return gateway
+
+
+@pytest.fixture
+def upstream() -> StubUpstream:
+    return StubUpstream()
+
+
+@pytest.fixture
+def redis_server() -> FakeRedisServer:
+    """Servidor RESP local, derrubado ao fim do teste."""
+    server = FakeRedisServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def provider(upstream, gateway) -> AsyncYahooFinanceProvider:
+    return AsyncYahooFinanceProvider(
+        base_url="http://yahoo.test",
+        timeout=1.0,
+        transport=httpx.MockTransport(upstream),
+    )
+
+
+@pytest.fixture
+def service(provider):
+    service = MarketDataService(
+        provider=YahooFinanceProvider(),
+        async_provider=provider,
+        cache_service=BoundedLRUCache(),
+        rate_limiter=TokenBucketRateLimiter(max_requests=10_000, window_seconds=60),
+    )
+    yield service
+    service.fanout.shutdown()
@@ -0,0 +1,229 @@
+"""
+Upstream local e utilitários usados pelos testes.
+
+Example:
+    server = FakeRedisServer()
+    cache = RedisCache(server.url)
+
+    upstream = StubUpstream()
+    upstream.handler = lambda request: httpx.Response(429)
+    provider = AsyncYahooFinanceProvider(transport=httpx.MockTransport(upstream))
+"""
+
+import fnmatch
+import hashlib
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from services.market_data_service import MarketDataService
+
+
+def chart_payload(
+    symbol: str = "AAPL",
+    closes: Optional[List[float]] = None,
+    adjclose: Optional[List[float]] = None,
+) -> Dict:
+    """Resposta da API de gráficos com barras diárias a partir de 2024-01-02."""
+    closes = closes or [100.0, 101.0, 102.0]
+    start = 1704205800  # 2024-01-02 14:30 UTC
+    result = {
+        "meta": {"symbol": symbol, "exchangeTimezoneName": "America/New_York"},
+        "timestamp": [start + day * 86400 for day in range(len(closes))],
+        "indicators": {
+            "quote": [{
+                "open": closes,
+                "high": [c + 1 for c in closes],
+                "low": [c - 1 for c in closes],
+                "close": closes,
+                "volume": [1000] * len(closes),
+            }],
+        },
+    }
+    if adjclose is not None:
+        result["indicators"]["adjclose"] = [{"adjclose": adjclose}]
+    return {"chart": {"result": [result], "error": None}}
+
+
+class StubUpstream:
+    """
+    Upstream local que responde pelo `handler` e conta as requisições.
+
+    Attributes:
+        handler: Função (request) -> httpx.Response ou corrotina equivalente
+        requests: Requisições recebidas
+    """
+
+    def __init__(self):
+        self.handler: Callable = lambda request: httpx.Response(200, json=chart_payload())
+        self.requests: List[httpx.Request] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.handler(request)
+        if hasattr(response, "__await__"):
+            response = await response
+        return response
+
+
+def expire(service: MarketDataService, cache_key: str) -> None:
+    """Vence a entrada além da janela de revalidação em segundo plano."""
+    entry = service.cache_service.get(cache_key)
+    service.cache_service.set(cache_key, {**entry, "fresh_until": time.time() - 3600}, ttl=3600)
+
+
+class FakeRedisServer:
+    """
+    Servidor RESP local com um subconjunto dos comandos do Redis.
+
+    Cada leitura do socket é processada como um lote: todos os comandos
+    completos recebidos são respondidos em um único write, e o tamanho do
+    lote é registrado em `batches` para verificar o pipelining do cliente.
+    Scripts são emulados por funções Python registradas em `scripts` pelo
+    SHA1 do código Lua, recebendo (servidor, chaves, argumentos).
+
+    Attributes:
+        data: Valores das chaves de texto
+        hashes: Campos das chaves de hash
+        commands: Comandos recebidos, como listas de bytes
+        batches: Número de comandos em cada lote recebido
+        connections: Número de conexões aceitas
+        clock: Função que retorna o horário do servidor (comando TIME)
+        password: Senha exigida pelo AUTH, se houver
+        scripts: Emulações de scripts Lua por SHA1
+    """
+
+    def __init__(self, password: Optional[str] = None):
+        self.data: Dict[bytes, bytes] = {}
+        self.hashes: Dict[bytes, Dict[bytes, bytes]] = {}
+        self.commands: List[List[bytes]] = []
+        self.batches: List[int] = []
+        self.connections = 0
+        self.clock: Callable[[], float] = time.time
+        self.password = password
+        self.scripts: Dict[str, Callable] = {}
+        self._loaded: set = set()
+        self._clients: List[socket.socket] = []
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self._listener.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.port}/0"
+
+    def register_script(self, source: str, handler: Callable) -> None:
+        """Associa uma emulação ao script Lua `source` (ainda não carregado)."""
+        self.scripts[hashlib.sha1(source.encode()).hexdigest()] = handler
+
+    def stop(self) -> None:
+        """Fecha o servidor e derruba as conexões abertas."""
+        for client in [self._listener, *self._clients]:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+                client.close()
+            except OSError:
+                pass
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            self._clients.append(client)
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client: socket.socket) -> None:
+        buffer = b""
+        while True:
+            try:
+                chunk = client.recv(65536)
+            except OSError:
+                return
+            if not chunk:
+                return
+            buffer += chunk
+            replies = []
+            while True:
+                parsed = _parse_command(buffer)
+                if parsed is None:
+                    break
+                command, buffer = parsed
+                self.commands.append(command)
+                replies.append(self._dispatch(command))
+            if replies:
+                self.batches.append(len(replies))
+                client.sendall(b"".join(replies))
+
+    def _dispatch(self, command: List[bytes]) -> bytes:
+        name, args = command[0].upper().decode(), command[1:]
+        if name == "AUTH":
+            if args[0].decode() != self.password:
+                return b"-WRONGPASS invalid password\r\n"
+            return b"+OK\r\n"
+        if name == "SELECT":
+            return b"+OK\r\n"
+        if name == "GET":
+            if args[0] in self.hashes:
+                return b"-WRONGTYPE Operation against a key holding the wrong kind of value\r\n"
+            return _bulk(self.data.get(args[0]))
+        if name == "MGET":
+            return b"*%d\r\n" % len(args) + b"".join(_bulk(self.data.get(key)) for key in args)
+        if name == "SET":
+            self.data[args[0]] = args[1]
+            return b"+OK\r\n"
+        if name == "DEL":
+            removed = sum(
+                (self.data.pop(key, None) is not None) + (self.hashes.pop(key, None) is not None)
+                for key in args
+            )
+            return b":%d\r\n" % removed
+        if name == "SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+            keys = [key for key in self.data if fnmatch.fnmatchcase(key.decode(), pattern)]
+            return b"*2\r\n" + _bulk(b"0") + b"*%d\r\n" % len(keys) + b"".join(map(_bulk, keys))
+        if name in ("EVAL", "EVALSHA"):
+            sha = hashlib.sha1(args[0]).hexdigest() if name == "EVAL" else args[0].decode()
+            if name == "EVALSHA" and sha not in self._loaded:
+                return b"-NOSCRIPT No matching script\r\n"
+            handler = self.scripts.get(sha)
+            if handler is None:
+                return b"-ERR script not emulated\r\n"
+            self._loaded.add(sha)
+            count = int(args[1])
+            reply = handler(self, args[2:2 + count], args[2 + count:])
+            return b"*%d\r\n" % len(reply) + b"".join(b":%d\r\n" % item for item in reply)
+        return b"-ERR unknown command '%s'\r\n" % command[0]
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _parse_command(buffer: bytes) -> Optional[tuple]:
+    """Extrai um comando RESP completo do início do buffer, se houver."""
+    if not buffer.startswith(b"*"):
+        return None
+    end = buffer.find(b"\r\n")
+    if end < 0:
+        return None
+    count, position, args = int(buffer[1:end]), end + 2, []
+    for _ in range(count):
+        end = buffer.find(b"\r\n", position)
+        if end < 0:
+            return None
+        length = int(buffer[position + 1:end])
+        start = end + 2
+        if len(buffer) < start + length + 2:
+            return None
+        args.append(buffer[start:start + length])
+        position = start + length + 2
+    return args, buffer[position:]
@@ -0,0 +1,174 @@
+"""
+Testes do provedor assíncrono e da rota assíncrona de histórico.
+
+O Yahoo é substituído por um upstream local (ver `conftest.StubUpstream`),
+que responde 200, 5xx, 429 ou estoura o timeout conforme o teste.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from stubs import chart_payload, expire
+from core.upstream import UpstreamUnavailableError
+from models.responses import ColumnarHistoryResponse
+from services.interfaces import ProviderException
+
+HISTORY_KEY = "stock_history:AAPL:1d:1m:records"
+
+
+def run(coro_fn, provider):
+    """Executa o cenário em um event loop novo e fecha o cliente HTTP no fim."""
+    async def scenario():
+        try:
+            return await coro_fn()
+        finally:
+            await provider.aclose()
+    return asyncio.run(scenario())
+
+
+def history(service, output_format="records"):
+    # 1d/1m não é servido pelo armazenamento OHLCV, então usa o provedor assíncrono
+    return service.get_stock_history_async("AAPL", "1d", "1m", output_format=output_format)
+
+
+def test_chart_200_returns_adjusted_points(provider, upstream):
+    upstream.handler = lambda request: httpx.Response(
+        200, json=chart_payload(closes=[100.0, 110.0], adjclose=[50.0, 55.0])
+    )
+
+    points = run(lambda: provider.get_historical_data("AAPL", "1mo", "1d"), provider)
+
+    assert [point.close for point in points] == [50.0, 55.0]
+    assert [point.open for point in points] == [50.0, 55.0]
+    assert points[0].symbol == "AAPL"
+    request = upstream.requests[0]
+    assert request.url.path == "/v8/finance/chart/AAPL"
+    assert request.url.params["range"] == "1mo"
+    assert request.url.params["interval"] == "1d"
+
+
+def test_chart_200_columnar(provider, upstream):
+    columnar = run(
+        lambda: provider.get_historical_data("AAPL", "1mo", "1d", output_format="columnar"),
+        provider,
+    )
+
+    assert isinstance(columnar, ColumnarHistoryResponse)
+    assert columnar.close == [100.0, 101.0, 102.0]
+    assert len(columnar.dates) == 3
+
+
+def test_chart_404_raises_provider_exception(provider, upstream):
+    upstream.handler = lambda request: httpx.Response(
+        404,
+        json={"chart": {"result": None, "error": {"description": "No data found"}}},
+    )
+
+    with pytest.raises(ProviderException):
+        run(lambda: provider.get_historical_data("XXXX", "1mo", "1d"), provider)
+
+
+def test_timeout_without_cache_returns_empty(service, provider, upstream, gateway):
+    def timeout(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+    upstream.handler = timeout
+
+    assert run(lambda: history(service), provider) == []
+    assert gateway.get_stats()["endpoints"]["chart"]["errors"] == 1
+
+
+def test_timeout_serves_stale_cache(service, provider, upstream):
+    async def scenario():
+        fresh = await history(service)
+        expire(service, HISTORY_KEY)
+
+        def timeout(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+        upstream.handler = timeout
+        return fresh, await history(service)
+
+    fresh, stale = run(scenario, provider)
+
+    assert stale == fresh
+    assert len(upstream.requests) == 2
+
+
+def test_5xx_serves_stale_cache(service, provider, upstream, gateway):
+    async def scenario():
+        fresh = await history(service)
+        expire(service, HISTORY_KEY)
+        upstream.handler = lambda request: httpx.Response(503)
+        return fresh, await history(service)
+
+    fresh, stale = run(scenario, provider)
+
+    assert stale == fresh
+    assert [point.close for point in stale] == [100.0, 101.0, 102.0]
+    assert gateway.get_stats()["consecutive_failures"] == 1
+
+
+def test_429_opens_backoff_and_serves_stale_cache(service, provider, upstream, gateway):
+    async def scenario():
+        fresh = await history(service)
+        expire(service, HISTORY_KEY)
+        upstream.handler = lambda request: httpx.Response(429)
+        throttled = await history(service)
+        # Durante o backoff a chamada falha sem chegar ao upstream
+        during_backoff = await history(service)
+        return fresh, throttled, during_backoff
+
+    fresh, throttled, during_backoff = run(scenario, provider)
+
+    assert throttled == fresh
+    assert during_backoff == fresh
+    assert len(upstream.requests) == 2
+    stats = gateway.get_stats()
+    assert stats["endpoints"]["chart"]["throttled"] == 1
+    assert stats["endpoints"]["chart"]["rejected"] == 1
+    assert stats["backoff_remaining"] > 0
+
+
+def test_429_without_cache_raises_unavailable(service, provider, upstream):
+    upstream.handler = lambda request: httpx.Response(429)
+
+    async def scenario():
+        assert await history(service) == []
+        # A chamada seguinte cai no backoff e vira 503 na rota
+        with pytest.raises(UpstreamUnavailableError):
+            await history(service)
+
+    run(scenario, provider)
+    assert len(upstream.requests) == 1
+
+
+def test_fresh_cache_hit_skips_upstream(service, provider, upstream):
+    async def scenario():
+        first = await history(service)
+        second = await history(service)
+        return first, second
+
+    first, second = run(scenario, provider)
+
+    assert first == second
+    assert len(upstream.requests) == 1
+
+
+def test_concurrent_misses_are_coalesced(service, provider, upstream):
+    async def slow(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=chart_payload())
+    upstream.handler = slow
+
+    async def scenario():
+        return await asyncio.gather(*(history(service) for _ in range(20)))
+
+    results = run(scenario, provider)
+
+    assert len(upstream.requests) == 1
+    assert all(result == results[0] for result in results)
+    stats = service.async_single_flight.get_stats()
+    assert stats["leader_calls"] == 1
+    assert stats["coalesced_calls"] == 19
+    assert stats["in_flight"] == 0
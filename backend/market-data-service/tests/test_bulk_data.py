@@ -0,0 +1,106 @@
+"""
+Testes do endpoint em lote: tickers sem valor fresco no cache seguem o
+mesmo caminho de get_stock_data (stale-while-revalidate e coalescência de
+buscas concorrentes), em vez de uma busca síncrona por requisição.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from core.cache_status import track_request
+from models.requests import BulkDataRequest, StockDataRequest
+from models.responses import StockDataResponse
+from services.interfaces import ProviderException
+from stubs import expire
+
+
+class CountingProvider:
+    """Provedor síncrono lento que conta as buscas por símbolo."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.price = 100.0
+        self.fail = False
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def get_stock_data(self, symbol: str, request: StockDataRequest) -> StockDataResponse:
+        with self._lock:
+            self.calls[symbol] = self.calls.get(symbol, 0) + 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ProviderException("falha", provider="stub", error_code="UPSTREAM_ERROR")
+        return StockDataResponse(
+            symbol=symbol, current_price=self.price, last_updated=datetime.now().isoformat()
+        )
+
+
+@pytest.fixture
+def counting(service, monkeypatch) -> CountingProvider:
+    counting = CountingProvider()
+    monkeypatch.setattr(service.provider, "get_stock_data", counting.get_stock_data)
+    return counting
+
+
+def cache_key(service, symbol: str) -> str:
+    return service._generate_cache_key(
+        "stock_data", symbol, StockDataRequest(symbol=symbol)
+    )
+
+
+def test_concurrent_bulk_misses_are_coalesced(service, counting):
+    request = BulkDataRequest(symbols=["AAPL", "MSFT"])
+    responses = []
+    threads = [
+        threading.Thread(target=lambda: responses.append(service.get_bulk_data(request)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counting.calls == {"AAPL": 1, "MSFT": 1}
+    assert all(response.successful_requests == 2 for response in responses)
+
+
+def test_stale_entry_within_grace_is_served_and_revalidated(service, counting):
+    service.get_bulk_data(BulkDataRequest(symbols=["AAPL"]))
+    key = cache_key(service, "AAPL")
+    entry = service.cache_service.get(key)
+    service.cache_service.set(key, {**entry, "fresh_until": time.time() - 1}, ttl=3600)
+    counting.price = 110.0
+
+    state = track_request()
+    started = time.monotonic()
+    response = service.get_bulk_data(BulkDataRequest(symbols=["AAPL"]))
+
+    # Servido do cache sem esperar o provedor; a atualização roda em segundo plano
+    assert time.monotonic() - started < counting.delay
+    assert response.data["AAPL"].current_price == 100.0
+    assert response.data["AAPL"].metadata == {"stale": True}
+    assert state["stale"]
+
+    deadline = time.monotonic() + 2
+    while service.cache_service.get(key)["value"]["current_price"] != 110.0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert counting.calls["AAPL"] == 2
+
+
+def test_provider_failure_serves_expired_entry(service, counting):
+    service.get_bulk_data(BulkDataRequest(symbols=["AAPL", "MSFT"]))
+    expire(service, cache_key(service, "AAPL"))
+    counting.fail = True
+
+    state = track_request()
+    response = service.get_bulk_data(BulkDataRequest(symbols=["AAPL", "MSFT"]))
+
+    assert response.successful_requests == 2
+    assert response.errors is None
+    assert response.data["AAPL"].current_price == 100.0
+    assert state["stale"]
+    assert counting.calls == {"AAPL": 2, "MSFT": 1}
@@ -0,0 +1,141 @@
+"""
+Testes do cache LRU em memória: ordem de despejo, orçamento de bytes,
+TTL, limpeza periódica e contadores.
+
+O relógio do módulo é substituído por um relógio manual (`FakeClock`),
+de modo que a expiração não depende de esperas reais.
+"""
+
+import sys
+import time
+
+import pytest
+
+import services.cache_service as cache_service
+from models.responses import HistoricalDataPoint
+from services.cache_service import BoundedLRUCache, estimate_size
+
+
+class FakeClock:
+    """Relógio manual no lugar do módulo `time` do cache."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(cache_service, "time", clock)
+    return clock
+
+
+def points(count: int):
+    return [
+        HistoricalDataPoint(
+            date="2024-01-02", symbol="AAPL", open=1.0, high=2.0, low=0.5,
+            close=1.5, volume=1000, adj_close=1.4,
+        )
+        for _ in range(count)
+    ]
+
+
+def test_lru_evicts_least_recently_used(clock):
+    cache = BoundedLRUCache(max_entries=2, sweep_interval=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" passa a ser o menos usado
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_and_rejects(clock):
+    value = "x" * 1000
+    entry_size = estimate_size(value) + sys.getsizeof("k0")
+    cache = BoundedLRUCache(max_entries=100, max_bytes=entry_size * 3, sweep_interval=0)
+    for i in range(5):
+        assert cache.set(f"k{i}", value)
+
+    stats = cache.get_stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert stats["evictions"] == 2
+    assert cache.get("k0") is None and cache.get("k4") == value
+
+    assert not cache.set("big", "x" * entry_size * 4)
+    assert cache.get_stats()["rejected"] == 1
+    assert cache.get("k4") == value
+
+
+def test_overwrite_replaces_size(clock):
+    cache = BoundedLRUCache(max_entries=10, sweep_interval=0)
+    cache.set("k", "x" * 10_000)
+    cache.set("k", "x")
+
+    assert cache.get_stats()["bytes"] == estimate_size("x") + sys.getsizeof("k")
+    cache.delete("k")
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_ttl_expiry_and_counters(clock):
+    cache = BoundedLRUCache(max_entries=10, sweep_interval=0)
+    cache.set("k", "v", ttl=10)
+    assert cache.get("k") == "v"
+    assert cache.get("missing") is None
+
+    clock.now += 11
+    assert cache.get("k") is None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 1)
+    assert stats["hit_ratio"] == round(1 / 3, 4)
+    assert stats["entries"] == 0 and stats["bytes"] == 0
+
+
+def test_sweep_removes_expired_only(clock):
+    cache = BoundedLRUCache(max_entries=10, sweep_interval=0)
+    cache.set("short", 1, ttl=5)
+    cache.set("long", 2, ttl=60)
+    clock.now += 10
+
+    assert cache.sweep() == 1
+    stats = cache.get_stats()
+    assert stats["entries"] == 1 and stats["expirations"] == 1
+    assert cache.get("long") == 2
+
+
+def test_sweeper_thread_removes_expired(clock):
+    cache = BoundedLRUCache(max_entries=10, sweep_interval=0.01)
+    try:
+        cache.set("k", 1, ttl=5)
+        clock.now += 10
+        deadline = time.monotonic() + 2.0
+        while cache.get_stats()["entries"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.get_stats()["entries"] == 0
+    finally:
+        cache.close()
+
+
+def test_estimate_size_scales_with_rows():
+    small, large = estimate_size(points(100)), estimate_size(points(5000))
+
+    # Amostrado: proporcional ao número de pontos, sem serializar o valor
+    assert 45 < large / small < 55
+    assert estimate_size({"value": points(5000)}) > large
+
+
+def test_estimate_size_is_cheap_for_large_histories():
+    value = {"value": {"data": points(5000)}, "fresh_until": 0.0}
+    started = time.perf_counter()
+    for _ in range(100):
+        estimate_size(value)
+    # Serializar com pickle levava ~15 ms por escrita
+    assert (time.perf_counter() - started) / 100 < 0.005
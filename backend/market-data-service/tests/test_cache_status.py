@@ -0,0 +1,106 @@
+"""
+Testes da marcação de dados vencidos (X-Cache-Status) em buscas
+coalescidas: quem aguarda a busca de outro chamador recebe a mesma
+marcação que o líder, no serviço síncrono, no assíncrono e no cache do
+módulo cadu.
+"""
+
+import asyncio
+import threading
+import time
+
+from cadu.caching import CacheManager
+from core.cache_status import capture_stale, mark_stale, track_request
+
+
+def run_concurrently(count: int, func):
+    """Executa `func` em `count` threads, cada uma com sua requisição rastreada."""
+    states = []
+
+    def request():
+        state = track_request()
+        func()
+        states.append(state)
+
+    threads = [threading.Thread(target=request) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return states
+
+
+def test_capture_stale_isolates_the_caller_state():
+    outer = track_request()
+
+    result, stale = capture_stale(lambda: mark_stale() or 42)
+
+    assert (result, stale) == (42, True)
+    assert not outer["stale"]
+
+
+def test_coalesced_waiters_receive_stale_flag(service):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        mark_stale()  # ex: um valor aninhado servido vencido
+        return {"price": 1.0}
+
+    results = []
+    states = run_concurrently(
+        4, lambda: results.append(service._cached_call("test:key", 60, loader))
+    )
+
+    assert len(calls) == 1
+    assert results == [({"price": 1.0}, True)] * 4
+    assert all(state["stale"] for state in states)
+
+
+def test_async_coalesced_waiters_receive_stale_flag(service):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        mark_stale()
+        return {"price": 1.0}
+
+    async def request():
+        state = track_request()
+        value = await service._cached_call_async("test:key", 60, loader)
+        return value, state["stale"]
+
+    async def main():
+        return await asyncio.gather(*(request() for _ in range(4)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert results == [(({"price": 1.0}, True), True)] * 4
+
+
+def test_cadu_cache_propagates_stale_flag_and_shuts_down():
+    manager = CacheManager(maxsize=8, default_ttl=60)
+    calls = []
+
+    @manager.cached()
+    def quote(symbol):
+        calls.append(symbol)
+        time.sleep(0.05)
+        mark_stale()
+        return {"symbol": symbol}
+
+    states = run_concurrently(4, lambda: quote("AAPL"))
+
+    assert calls == ["AAPL"]
+    assert all(state["stale"] for state in states)
+
+    # Após o desligamento, valores vencidos ainda são servidos sem agendar atualização
+    manager.shutdown()
+    partition = manager._partition(60)
+    ((key, (value, _)),) = partition.items()
+    partition[key] = (value, time.time() - 1)
+    assert quote("AAPL") == {"symbol": "AAPL"}
+    assert calls == ["AAPL"]
@@ -0,0 +1,56 @@
+"""
+Testes da memorização do motor de indicadores.
+
+A barra do pregão em andamento mantém a data enquanto o fechamento muda;
+a memória não pode devolver os indicadores calculados com o preço antigo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from services.indicators import IndicatorEngine, parse_indicator_specs
+
+
+def closes_frame(closes):
+    index = pd.date_range("2024-01-02", periods=len(closes), freq="B")
+    return pd.DataFrame({"Close": closes}, index=index)
+
+
+def test_repeated_request_is_memoized():
+    engine = IndicatorEngine(max_entries=8)
+    frame = closes_frame(np.linspace(80.0, 100.0, 40))
+    specs = parse_indicator_specs("sma:20")
+
+    first = engine.compute({"AAPL": frame}, "1d", specs)
+    second = engine.compute({"AAPL": frame.copy()}, "1d", specs)
+
+    assert second == first
+    assert engine.get_stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_last_close_update_recomputes():
+    engine = IndicatorEngine(max_entries=8)
+    closes = np.linspace(80.0, 100.0, 40)
+    specs = parse_indicator_specs("sma:20")
+    before = engine.compute({"AAPL": closes_frame(closes)}, "1d", specs)["AAPL"]["sma_20"][-1]
+
+    # Mesma última barra (data), fechamento atualizado durante o pregão
+    updated = closes.copy()
+    updated[-1] += 50.0
+    after = engine.compute({"AAPL": closes_frame(updated)}, "1d", specs)["AAPL"]["sma_20"][-1]
+
+    assert after == round(float(updated[-20:].mean()), 4)
+    assert after == round(before + 50.0 / 20, 4)
+    assert engine.get_stats()["misses"] == 2
+
+
+def test_back_adjustment_recomputes():
+    engine = IndicatorEngine(max_entries=8)
+    closes = np.linspace(80.0, 100.0, 40)
+    specs = parse_indicator_specs("sma:20")
+    engine.compute({"AAPL": closes_frame(closes)}, "1d", specs)
+
+    # Ajuste por proventos reescreve toda a série
+    adjusted = engine.compute({"AAPL": closes_frame(closes * 0.5)}, "1d", specs)
+
+    assert adjusted["AAPL"]["sma_20"][-1] == round(float((closes * 0.5)[-20:].mean()), 4)
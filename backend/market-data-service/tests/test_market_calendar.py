@@ -0,0 +1,125 @@
+"""
+Testes dos calendários de pregão da B3 e da NYSE: tabelas de feriados
+(Carnaval, Sexta-feira Santa), pregões com horário especial (Quarta-feira
+de Cinzas, dia seguinte a Ação de Graças), a semana da mudança do horário
+de verão americano e o tempo até a próxima abertura.
+"""
+
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+from utils.market_calendar import CALENDARS, easter_sunday, market_for_symbol
+
+B3 = CALENDARS["BR"]
+NYSE = CALENDARS["US"]
+
+
+def b3_at(*args) -> datetime:
+    return datetime(*args, tzinfo=B3.tz)
+
+
+def nyse_at(*args) -> datetime:
+    return datetime(*args, tzinfo=NYSE.tz)
+
+
+@pytest.mark.parametrize("year, expected", [
+    (2024, date(2024, 3, 31)),
+    (2025, date(2025, 4, 20)),
+    (2026, date(2026, 4, 5)),
+])
+def test_easter_sunday(year, expected):
+    assert easter_sunday(year) == expected
+
+
+def test_b3_carnival_and_ash_wednesday():
+    # Carnaval de 2025: segunda 3/3 e terça 4/3, sem pregão
+    assert B3.session(date(2025, 3, 3)) is None
+    assert B3.session(date(2025, 3, 4)) is None
+    assert not B3.is_open(b3_at(2025, 3, 4, 11, 0))
+
+    # Quarta-feira de Cinzas abre às 13h (pré-abertura às 12h45)
+    ash_wednesday = B3.session(date(2025, 3, 5))
+    assert ash_wednesday.open == b3_at(2025, 3, 5, 13, 0)
+    assert ash_wednesday.pre_open == b3_at(2025, 3, 5, 12, 45)
+    assert not B3.is_open(b3_at(2025, 3, 5, 11, 0))
+    assert B3.is_open(b3_at(2025, 3, 5, 13, 30))
+    assert B3.next_open(b3_at(2025, 2, 28, 19, 0)) == b3_at(2025, 3, 5, 13, 0)
+
+
+def test_holiday_tables():
+    good_friday = date(2025, 4, 18)
+    assert B3.session(good_friday) is None and NYSE.session(good_friday) is None
+    assert B3.session(date(2024, 11, 20)) is None  # Consciência Negra a partir de 2024
+    assert B3.session(date(2023, 11, 20)) is not None
+    assert NYSE.session(date(2025, 1, 9)) is None  # Luto nacional
+    assert NYSE.session(date(2027, 7, 5)) is None  # Independência observada (domingo)
+    # Ano-Novo no sábado (2022) não fecha a sexta anterior
+    assert NYSE.session(date(2021, 12, 31)) is not None
+
+
+def test_nyse_thanksgiving_early_close():
+    assert NYSE.session(date(2025, 11, 27)) is None
+    friday = NYSE.session(date(2025, 11, 28))
+    assert friday.open == nyse_at(2025, 11, 28, 9, 30)
+    assert friday.close == nyse_at(2025, 11, 28, 13, 0)
+    assert friday.post_close == nyse_at(2025, 11, 28, 17, 0)
+    assert NYSE.is_open(nyse_at(2025, 11, 28, 12, 59))
+    assert not NYSE.is_open(nyse_at(2025, 11, 28, 13, 0))
+    assert NYSE.is_open(nyse_at(2025, 11, 28, 13, 0), extended=True)
+    assert NYSE.next_close(nyse_at(2025, 11, 28, 10, 0)) == nyse_at(2025, 11, 28, 13, 0)
+
+
+def test_dst_transition_week():
+    # Horário de verão americano começa em 9/3/2025; o Brasil não o adota
+    assert B3.session(date(2025, 3, 7)).close.time() == time(18, 0)
+    assert B3.session(date(2025, 3, 10)).close.time() == time(17, 0)
+
+    # A abertura da NYSE é fixa no horário local e anda uma hora em UTC
+    friday = NYSE.session(date(2025, 3, 7)).open.astimezone(timezone.utc)
+    monday = NYSE.session(date(2025, 3, 10)).open.astimezone(timezone.utc)
+    assert (friday.hour, friday.minute) == (14, 30)
+    assert (monday.hour, monday.minute) == (13, 30)
+
+    # Instantes em outro fuso são convertidos para o da bolsa
+    assert NYSE.is_open(datetime(2025, 3, 10, 13, 45, tzinfo=timezone.utc))
+    assert not NYSE.is_open(datetime(2025, 3, 7, 14, 15, tzinfo=timezone.utc))
+
+    # No fim do horário de verão (2/11/2025) a B3 volta a fechar às 18h
+    assert B3.session(date(2025, 10, 31)).close.time() == time(17, 0)
+    assert B3.session(date(2025, 11, 3)).close.time() == time(18, 0)
+
+
+def test_seconds_until_open():
+    # Sexta após o call de fechamento -> pré-abertura de segunda (9h45)
+    assert B3.seconds_until_open(b3_at(2025, 3, 7, 20, 0)) == (2 * 24 + 13.75) * 3600
+    # Atravessando o Carnaval até a pré-abertura da Quarta-feira de Cinzas
+    assert B3.seconds_until_open(b3_at(2025, 2, 28, 19, 0)) == (4 * 24 + 17.75) * 3600
+    # O domingo da mudança de horário tem 23 horas: 40h no relógio, 39h reais
+    assert NYSE.seconds_until_open(nyse_at(2025, 3, 8, 12, 0)) == 39 * 3600
+    assert NYSE.seconds_until_open(datetime(2025, 3, 8, 17, 0, tzinfo=timezone.utc)) == 39 * 3600
+    # Durante a sessão, conta até a próxima pré-abertura
+    assert NYSE.seconds_until_open(nyse_at(2025, 3, 11, 10, 0)) == 18 * 3600
+
+
+def test_quiet_after_settle_window():
+    # Pós-fechamento da B3 até 18h10 (fora do horário de verão americano) + 15 min
+    assert not B3.is_quiet(b3_at(2025, 3, 7, 18, 5))
+    assert not B3.is_quiet(b3_at(2025, 3, 7, 18, 20))
+    assert B3.is_quiet(b3_at(2025, 3, 7, 18, 25))
+    assert B3.closed_since(b3_at(2025, 3, 7, 18, 30), b3_at(2025, 3, 10, 9, 0))
+    assert not B3.closed_since(b3_at(2025, 3, 7, 18, 30), b3_at(2025, 3, 10, 9, 50))
+
+
+@pytest.mark.parametrize("symbol, market", [
+    ("PETR4.SA", "BR"),
+    ("^BVSP", "BR"),
+    ("AAPL", "US"),
+    ("^GSPC", "US"),
+    ("BRK-B", "US"),
+    ("BTC-USD", None),
+    ("USDBRL=X", None),
+    ("VOD.L", None),
+])
+def test_market_for_symbol(symbol, market):
+    assert market_for_symbol(symbol) == market
@@ -0,0 +1,254 @@
+"""
+Testes do armazenamento OHLCV em disco.
+
+Um provedor falso (`FakeHistory`) serve uma série diária fixa, recorta-a
+como o `Ticker.history` (period, ou start e end) e registra as chamadas,
+de modo que cada teste confere o que foi buscado e o que foi servido.
+"""
+
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.ohlcv_store import STORE_PERIOD_OFFSETS, OHLCVStore
+
+# Sem calendário: a cauda é buscada sempre que o intervalo mínimo passa
+SYMBOL = "BTC-USD"
+TZ = "America/New_York"
+
+
+class FakeHistory:
+    """
+    Provedor falso com a assinatura de `Ticker.history`.
+
+    Attributes:
+        frame: Série completa disponível no provedor
+        calls: Argumentos de cada busca
+        fail: Predicado (kwargs) -> bool; buscas que o satisfazem falham
+        empty: Predicado (kwargs) -> bool; buscas que o satisfazem vêm vazias
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.calls: List[dict] = []
+        self.fail: Optional[Callable[[dict], bool]] = None
+        self.empty: Optional[Callable[[dict], bool]] = None
+
+    def __call__(self, **kwargs) -> pd.DataFrame:
+        self.calls.append(kwargs)
+        if self.fail is not None and self.fail(kwargs):
+            raise RuntimeError("upstream indisponível")
+        if self.empty is not None and self.empty(kwargs):
+            return pd.DataFrame()
+        frame = self.frame
+        if kwargs.get("start"):
+            frame = frame[frame.index >= pd.Timestamp(kwargs["start"]).tz_localize(TZ)]
+        elif kwargs.get("period") in STORE_PERIOD_OFFSETS:
+            now = pd.Timestamp.now(tz="UTC").normalize()
+            frame = frame[frame.index >= now - STORE_PERIOD_OFFSETS[kwargs["period"]]]
+        if kwargs.get("end"):
+            frame = frame[frame.index < pd.Timestamp(kwargs["end"]).tz_localize(TZ)]
+        return frame.copy()
+
+
+def daily_frame(end_offset_days: int = 0, years: int = 6) -> pd.DataFrame:
+    """Barras em dias úteis até hoje menos `end_offset_days`."""
+    today = pd.Timestamp.now(tz=TZ).normalize()
+    index = pd.bdate_range(
+        today - pd.DateOffset(years=years), today - pd.Timedelta(days=end_offset_days),
+        tz=TZ, name="Date",
+    ).as_unit("ns")
+    closes = 100.0 + np.arange(len(index), dtype=float) * 0.1
+    return pd.DataFrame({
+        "Open": closes - 0.5,
+        "High": closes + 1.0,
+        "Low": closes - 1.0,
+        "Close": closes,
+        "Volume": np.arange(len(index), dtype=np.int64) * 10 + 1000,
+    }, index=index)
+
+
+def assert_same_bars(result: pd.DataFrame, expected: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+
+@pytest.fixture
+def history() -> FakeHistory:
+    return FakeHistory(daily_frame(end_offset_days=7))
+
+
+def make_store(tmp_path, refresh_seconds: int = 3600) -> OHLCVStore:
+    return OHLCVStore(base_dir=str(tmp_path), enabled=True, refresh_seconds=refresh_seconds)
+
+
+def test_first_fetch_downloads_period_and_persists(tmp_path, history):
+    store = make_store(tmp_path)
+
+    result = store.get_history(SYMBOL, "1d", fetch=history, period="1y")
+
+    assert history.calls == [{"period": "1y", "interval": "1d"}]
+    assert_same_bars(result, history(period="1y"))
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+
+def test_covered_sub_period_served_from_disk(tmp_path, history):
+    store = make_store(tmp_path)
+    store.get_history(SYMBOL, "1d", fetch=history, period="2y")
+    history.calls.clear()
+
+    result = store.get_history(SYMBOL, "1d", fetch=history, period="6mo")
+
+    assert history.calls == []
+    assert_same_bars(result, history(period="6mo"))
+
+
+def test_longer_period_fetches_full_range(tmp_path, history):
+    store = make_store(tmp_path)
+    store.get_history(SYMBOL, "1d", fetch=history, period="6mo")
+    history.calls.clear()
+
+    result = store.get_history(SYMBOL, "1d", fetch=history, period="5y")
+
+    assert history.calls == [{"period": "5y", "interval": "1d"}]
+    assert_same_bars(result, history(period="5y"))
+
+
+def test_tail_append_fetches_from_second_to_last_bar(tmp_path, history):
+    store = make_store(tmp_path, refresh_seconds=0)
+    stored = store.get_history(SYMBOL, "1d", fetch=history, period="1y")
+    anchor = stored.index[-2].strftime("%Y-%m-%d")
+
+    # Novos pregões no provedor
+    history.frame = daily_frame(end_offset_days=0)
+    history.calls.clear()
+    result = store.get_history(SYMBOL, "1d", fetch=history, period="1y")
+
+    assert history.calls == [{"start": anchor, "interval": "1d"}]
+    assert result.index[-1] == history.frame.index[-1]
+    assert_same_bars(result, history(period="1y"))
+
+    # A cauda anexada fica no disco
+    reloaded = make_store(tmp_path).get_history(SYMBOL, "1d", fetch=history, period="1y")
+    assert_same_bars(reloaded, result)
+
+
+def test_live_bar_is_replaced_by_tail(tmp_path, history):
+    store = make_store(tmp_path, refresh_seconds=0)
+    store.get_history(SYMBOL, "1d", fetch=history, period="1y")
+
+    # Pregão em andamento: só a última barra muda
+    updated = history.frame.copy()
+    updated.iloc[-1, updated.columns.get_loc("Close")] += 5.0
+    history.frame = updated
+    result = store.get_history(SYMBOL, "1d", fetch=history, period="1y")
+
+    assert result["Close"].iloc[-1] == updated["Close"].iloc[-1]
+    assert len(history.calls) == 2  # nada de nova busca completa
+
+
+def test_adjustment_refetches_whole_series(tmp_path, history):
+    store = make_store(tmp_path, refresh_seconds=0)
+    stored = store.get_history(SYMBOL, "1d", fetch=history, period="1y")
+    anchor = stored.index[-2].strftime("%Y-%m-%d")
+    covered_from = (pd.Timestamp.now(tz="UTC").normalize() - pd.DateOffset(years=1))
+
+    # Desdobramento: toda a série ajustada para trás
+    adjusted = history.frame.copy()
+    adjusted[["Open", "High", "Low", "Close"]] *= 0.5
+    history.frame = adjusted
+    history.calls.clear()
+    result = store.get_history(SYMBOL, "1d", fetch=history, period="1y")
+
+    # Cauda a partir da penúltima barra e, com o ajuste, todo o início coberto
+    assert history.calls == [
+        {"start": anchor, "interval": "1d"},
+        {"start": covered_from.strftime("%Y-%m-%d"), "interval": "1d"},
+    ]
+    assert_same_bars(result, history(period="1y"))
+
+
+@pytest.mark.parametrize("failure", ["error", "empty"])
+def test_failed_adjustment_refetch_serves_stored(tmp_path, history, failure):
+    store = make_store(tmp_path, refresh_seconds=0)
+    stored = store.get_history(SYMBOL, "1d", fetch=history, period="1y")
+    anchor = stored.index[-2].strftime("%Y-%m-%d")
+
+    adjusted = history.frame.copy()
+    adjusted[["Open", "High", "Low", "Close"]] *= 0.5
+    history.frame = adjusted
+    def full_refetch(kwargs):
+        return kwargs.get("start") not in (None, anchor)
+
+    if failure == "error":
+        history.fail = full_refetch
+    else:
+        history.empty = full_refetch
+
+    result = store.get_history(SYMBOL, "1d", fetch=history, period="1y")
+
+    assert len(history.calls) == 3  # busca inicial, cauda e nova busca completa
+    assert_same_bars(result, stored)
+    # Nada gravado: a próxima leitura tenta de novo
+    assert_same_bars(
+        make_store(tmp_path).get_history(SYMBOL, "1d", fetch=history, period="1y"), stored
+    )
+
+
+def test_start_end_slicing_passes_end(tmp_path, history):
+    store = make_store(tmp_path)
+    start, end = history.frame.index[100], history.frame.index[200]
+
+    result = store.get_history(
+        SYMBOL, "1d", fetch=history,
+        start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"),
+    )
+
+    assert history.calls == [{
+        "start": start.strftime("%Y-%m-%d"), "end": end.strftime("%Y-%m-%d"), "interval": "1d",
+    }]
+    assert result.index[0] == start
+    assert result.index[-1] == history.frame.index[199]
+    assert_same_bars(result, history.frame.iloc[100:200])
+
+
+def test_bounded_fetch_refreshes_tail_on_next_read(tmp_path, history):
+    store = make_store(tmp_path)
+    start, end = history.frame.index[100], history.frame.index[200]
+    store.get_history(
+        SYMBOL, "1d", fetch=history,
+        start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"),
+    )
+    history.calls.clear()
+
+    result = store.get_history(SYMBOL, "1d", fetch=history, start=start.strftime("%Y-%m-%d"))
+
+    # A série gravada só ia até `end`: a cauda é buscada apesar do intervalo mínimo
+    assert len(history.calls) == 1 and "end" not in history.calls[0]
+    assert_same_bars(result, history.frame.iloc[100:])
+
+
+def test_reload_after_restart(tmp_path, history):
+    make_store(tmp_path).get_history(SYMBOL, "1d", fetch=history, period="2y")
+    history.calls.clear()
+
+    restarted = make_store(tmp_path)
+    result = restarted.get_history(SYMBOL, "1d", fetch=history, period="1y")
+
+    assert history.calls == []
+    assert_same_bars(result, history(period="1y"))
+    assert result.index.tz is not None and str(result.index.tz) == TZ
+    assert result["Volume"].dtype == np.int64
+
+
+def test_unsupported_requests():
+    store = OHLCVStore(base_dir="unused", enabled=True)
+
+    assert store.supports("1d", period="1y")
+    assert store.supports("1wk", start="2020-01-01")
+    assert not store.supports("5m", period="1mo")
+    assert not store.supports("1d", period="5d")
+    assert not store.supports("1d", period="1y", prepost=True)
+    assert not store.supports("1d", period="1y", auto_adjust=False)
+    assert not OHLCVStore(base_dir="unused", enabled=False).supports("1d", period="1y")
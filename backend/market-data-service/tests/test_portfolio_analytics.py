@@ -0,0 +1,237 @@
+"""
+Testes das estatísticas de carteira: alinhamento dos fechamentos
+(preenchimento limitado, exclusão por cobertura), covariância e correlação
+móvel contra as implementações de referência do NumPy/pandas, métricas de
+risco históricas e a reprodutibilidade do Monte Carlo com semente fixa
+para qualquer divisão das trajetórias em tarefas.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.compute_pool import ComputePool
+from core.config import settings
+from services.portfolio_analytics import (
+    MAX_FILL_DAYS,
+    SIMULATION_BLOCK_PATHS,
+    align_closes,
+    correlation_from_covariance,
+    covariance_factor,
+    covariance_matrix,
+    horizon_returns,
+    max_drawdown,
+    risk_metrics,
+    rolling_correlation,
+    simple_returns,
+    simulate_portfolio_returns,
+    simulation_blocks,
+    var_cvar,
+)
+
+
+def close_frame(dates, closes, tz=None) -> pd.DataFrame:
+    index = pd.DatetimeIndex(dates)
+    if tz:
+        index = index.tz_localize(tz)
+    return pd.DataFrame({"Close": closes}, index=index)
+
+
+def random_returns(rows: int = 300, columns: int = 4, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    mixing = rng.normal(size=(columns, columns))
+    return rng.normal(size=(rows, columns)) @ mixing * 0.01
+
+
+def test_align_closes_fills_short_gaps_only():
+    days = pd.bdate_range("2024-01-01", periods=40)
+    full = close_frame(days, np.arange(40.0) + 100)
+    # Lacuna curta (feriado local) e lacuna maior que MAX_FILL_DAYS
+    short_gap = list(range(10, 13))
+    long_gap = list(range(20, 20 + MAX_FILL_DAYS + 2))
+    keep = [i for i in range(40) if i not in short_gap + long_gap]
+    gappy = close_frame(days[keep], np.arange(40.0)[keep] + 200)
+
+    prices, excluded = align_closes({"A": full, "B": gappy})
+
+    assert excluded == []
+    assert list(prices.columns) == ["A", "B"]
+    # A lacuna curta repete o último fechamento
+    assert (prices.loc[days[10]:days[12], "B"] == 209.0).all()
+    # Além do limite não há preenchimento: só as datas não cobertas saem
+    dropped = set(days) - set(prices.index)
+    assert dropped == set(days[20 + MAX_FILL_DAYS:20 + MAX_FILL_DAYS + 2])
+    assert not prices.isna().any().any()
+
+
+def test_align_closes_excludes_late_and_empty_assets():
+    days = pd.bdate_range("2024-01-01", periods=100)
+    frames = {
+        "A": close_frame(days, np.linspace(10, 20, 100)),
+        "B": close_frame(days[10:], np.linspace(10, 20, 90)),
+        "LATE": close_frame(days[80:], np.linspace(10, 20, 20)),
+        "EMPTY": pd.DataFrame(),
+        "NAN": close_frame(days, [np.nan] * 100),
+    }
+
+    prices, excluded = align_closes(frames)
+
+    assert sorted(excluded) == ["EMPTY", "LATE", "NAN"]
+    # Um ativo listado tarde demais não encurta a matriz
+    assert list(prices.columns) == ["A", "B"]
+    assert prices.index[0] == days[10] and len(prices) == 90
+
+
+def test_align_closes_keeps_last_bar_of_each_day_across_time_zones():
+    sao_paulo = close_frame(
+        ["2024-03-04 10:00", "2024-03-04 17:00", "2024-03-05 17:00"],
+        [1.0, 2.0, 3.0],
+        tz="America/Sao_Paulo",
+    )
+    new_york = close_frame(["2024-03-04 16:00", "2024-03-05 16:00"], [10.0, 11.0], tz="America/New_York")
+
+    prices, _ = align_closes({"BR": sao_paulo, "US": new_york})
+
+    assert prices.to_dict("list") == {"BR": [2.0, 3.0], "US": [10.0, 11.0]}
+    assert list(prices.index.strftime("%Y-%m-%d")) == ["2024-03-04", "2024-03-05"]
+
+
+def test_covariance_and_correlation_match_numpy():
+    returns = random_returns()
+    covariance = covariance_matrix(returns)
+
+    np.testing.assert_allclose(covariance, np.cov(returns, rowvar=False), rtol=1e-12)
+    np.testing.assert_allclose(
+        correlation_from_covariance(covariance), np.corrcoef(returns, rowvar=False), atol=1e-12
+    )
+
+    # Ativo sem variação fica com correlação 0, inclusive na diagonal
+    with_constant = np.column_stack([returns, np.zeros(len(returns))])
+    correlation = correlation_from_covariance(covariance_matrix(with_constant))
+    assert np.all(correlation[-1] == 0) and np.all(correlation[:, -1] == 0)
+
+
+# Com 2 pregões a correlação é sempre ±1 e as somas acumuladas cancelam
+# quase tudo; nas janelas usuais o erro fica na ordem de 1e-13
+@pytest.mark.parametrize("window, tolerance", [(2, 1e-6), (5, 1e-9), (20, 1e-9), (60, 1e-9), (300, 1e-9)])
+def test_rolling_correlation_matches_pandas(window, tolerance):
+    returns = random_returns()
+    reference = returns.mean(axis=1)
+
+    result = rolling_correlation(returns, reference, window)
+    expected = pd.DataFrame(returns).rolling(window).corr(pd.Series(reference)).to_numpy()
+
+    assert np.array_equal(np.isnan(result), np.isnan(expected))
+    np.testing.assert_allclose(result, expected, rtol=0, atol=tolerance)
+
+
+def test_rolling_correlation_shorter_than_window_is_nan():
+    returns = random_returns(rows=10)
+    assert np.isnan(rolling_correlation(returns, returns[:, 0], 20)).all()
+
+
+def test_risk_metrics_match_direct_formulas():
+    returns = np.array([0.1, -0.05, 0.02, -0.1, 0.03, 0.01, -0.02, 0.04])
+    risk_free = 0.05
+
+    metrics = risk_metrics(returns, risk_free, confidence=0.8, horizon=1)
+
+    annual_return = returns.mean() * 252
+    volatility = returns.std(ddof=1) * np.sqrt(252)
+    downside = np.minimum(returns - risk_free / 252, 0)
+    assert metrics["total_return"] == pytest.approx(np.prod(1 + returns) - 1)
+    assert metrics["annualized_return"] == pytest.approx(annual_return)
+    assert metrics["annualized_volatility"] == pytest.approx(volatility)
+    assert metrics["sharpe_ratio"] == pytest.approx((annual_return - risk_free) / volatility)
+    assert metrics["sortino_ratio"] == pytest.approx(
+        (annual_return - risk_free) / np.sqrt(np.mean(downside ** 2) * 252)
+    )
+    # Pico de 1.1 após o primeiro dia; vale de 1.1 * 0.95 * 1.02 * 0.9
+    assert metrics["max_drawdown"] == pytest.approx(1 - 0.95 * 1.02 * 0.9)
+    threshold = np.quantile(returns, 0.2)
+    assert metrics["historical_var"] == pytest.approx(-threshold)
+    assert metrics["historical_cvar"] == pytest.approx(-returns[returns <= threshold].mean())
+
+    flat = risk_metrics(np.zeros(10), 0.0, confidence=0.95, horizon=1)
+    assert flat["sharpe_ratio"] is None and flat["sortino_ratio"] is None
+    assert flat["max_drawdown"] == 0.0
+
+
+def test_horizon_returns_compound_overlapping_windows():
+    returns = np.array([0.1, -0.05, 0.02, -0.1, 0.03])
+    expected = pd.Series(1 + returns).rolling(3).apply(np.prod).dropna().to_numpy() - 1
+    np.testing.assert_allclose(horizon_returns(returns, 3), expected)
+    assert horizon_returns(returns, 1) is returns
+    assert max_drawdown(np.array([])) == 0.0
+
+
+def test_var_cvar_are_positive_losses():
+    outcomes = np.linspace(-0.2, 0.2, 401)
+    var, cvar = var_cvar(outcomes, 0.95)
+    assert var == pytest.approx(0.18)
+    assert cvar == pytest.approx(0.19)
+
+
+def simulation_inputs():
+    log_returns = np.log1p(random_returns(rows=250, columns=3))
+    factor = covariance_factor(covariance_matrix(log_returns))
+    return log_returns.mean(axis=0), factor, np.array([0.5, 0.3, 0.2])
+
+
+def test_monte_carlo_is_independent_of_task_split_and_chunk_size():
+    mean, factor, weights = simulation_inputs()
+    paths = 3 * SIMULATION_BLOCK_PATHS + 1234
+    blocks = simulation_blocks(paths, seed=42)
+    assert [size for _, size in blocks] == [SIMULATION_BLOCK_PATHS] * 3 + [1234]
+
+    single = simulate_portfolio_returns(mean, factor, weights, 5, blocks, 1_000_000)
+    split = np.concatenate([
+        simulate_portfolio_returns(mean, factor, weights, 5, blocks[:1], 1_000_000),
+        simulate_portfolio_returns(mean, factor, weights, 5, blocks[1:3], 1_000_000),
+        simulate_portfolio_returns(mean, factor, weights, 5, blocks[3:], 1_000_000),
+    ])
+    small_chunks = simulate_portfolio_returns(mean, factor, weights, 5, blocks, 999)
+
+    assert len(single) == paths
+    np.testing.assert_allclose(split, single, rtol=0, atol=1e-14)
+    np.testing.assert_allclose(small_chunks, single, rtol=0, atol=1e-14)
+
+    other_seed = simulate_portfolio_returns(
+        mean, factor, weights, 5, simulation_blocks(paths, seed=43), 1_000_000
+    )
+    assert not np.allclose(other_seed, single)
+
+
+def test_monte_carlo_matches_the_analytic_distribution():
+    mean, factor, weights = simulation_inputs()
+    outcomes = simulate_portfolio_returns(
+        mean, factor, weights, 1, simulation_blocks(200_000, seed=1), 1_000_000
+    )
+    # E[exp(X)] de uma normal com média m e variância s² é exp(m + s²/2)
+    variances = np.sum(factor ** 2, axis=1)
+    expected = np.exp(mean + variances / 2) @ weights - 1
+    assert outcomes.mean() == pytest.approx(expected, abs=2e-4)
+
+
+def test_portfolio_risk_is_reproducible_across_task_sizes(service, monkeypatch):
+    days = pd.bdate_range("2023-01-02", periods=260)
+    rng = np.random.default_rng(5)
+    frames = {
+        symbol: close_frame(days, 100 * np.cumprod(1 + rng.normal(0.0005, 0.01, 260)))
+        for symbol in ("AAPL", "MSFT", "PETR4.SA")
+    }
+    monkeypatch.setattr(service, "_load_histories", lambda symbols, period, interval: frames)
+    monkeypatch.setattr(service, "compute", ComputePool(max_workers=0))
+    monkeypatch.setattr(settings, "MONTE_CARLO_SEED", 42)
+
+    results = []
+    for per_task in (SIMULATION_BLOCK_PATHS, 2 * SIMULATION_BLOCK_PATHS, 10 ** 6):
+        monkeypatch.setattr(settings, "MONTE_CARLO_PATHS_PER_TASK", per_task)
+        results.append(service._compute_portfolio_risk(
+            ["AAPL", "MSFT", "PETR4.SA"], np.array([0.4, 0.4, 0.2]),
+            "1y", 0.95, 5, 45_000, 0.1,
+        )["monte_carlo"])
+
+    assert results[0] == results[1] == results[2]
+    assert results[0]["paths"] == 45_000
+    assert results[0]["cvar"] >= results[0]["var"] > 0
@@ -0,0 +1,117 @@
+"""
+Testes da otimização média-variância.
+
+As carteiras são conferidas contra soluções fechadas de problemas
+pequenos e contra as restrições (soma 1 e limites por ativo).
+"""
+
+import numpy as np
+import pytest
+
+from services.portfolio_optimizer import (
+    OptimizationError,
+    check_bounds,
+    interpolated_start,
+    max_return_weights,
+    max_sharpe,
+    min_variance,
+    solve_frontier_segment,
+)
+
+COVARIANCE = np.array([
+    [0.04, 0.006, 0.002],
+    [0.006, 0.09, 0.01],
+    [0.002, 0.01, 0.16],
+])
+EXPECTED = np.array([0.08, 0.12, 0.18])
+
+
+def closed_form_min_variance(covariance):
+    """w = Σ⁻¹1 / (1ᵀΣ⁻¹1), a mínima variância sem limites por ativo."""
+    inverse = np.linalg.solve(covariance, np.ones(len(covariance)))
+    return inverse / inverse.sum()
+
+
+def closed_form_tangency(expected, covariance, risk_free_rate):
+    """w ∝ Σ⁻¹(μ - rf), a carteira de máximo Sharpe sem limites por ativo."""
+    direction = np.linalg.solve(covariance, expected - risk_free_rate)
+    return direction / direction.sum()
+
+
+def test_min_variance_two_assets_closed_form():
+    covariance = np.array([[0.04, 0.01], [0.01, 0.09]])
+    # w1 = (σ2² - σ12) / (σ1² + σ2² - 2σ12)
+    w1 = (0.09 - 0.01) / (0.04 + 0.09 - 0.02)
+
+    weights = min_variance(covariance, bounds=(0.0, 1.0))
+
+    np.testing.assert_allclose(weights, [w1, 1 - w1], atol=1e-6)
+
+
+def test_min_variance_three_assets_closed_form():
+    weights = min_variance(COVARIANCE, bounds=(-1.0, 1.0))
+
+    np.testing.assert_allclose(weights, closed_form_min_variance(COVARIANCE), atol=1e-6)
+
+
+def test_max_sharpe_closed_form():
+    weights = max_sharpe(EXPECTED, COVARIANCE, 0.02, bounds=(-1.0, 1.0))
+
+    np.testing.assert_allclose(
+        weights, closed_form_tangency(EXPECTED, COVARIANCE, 0.02), atol=1e-4
+    )
+
+
+@pytest.mark.parametrize("bounds", [(0.0, 0.4), (0.1, 0.5), (-0.2, 0.6)])
+def test_bounds_respected(bounds):
+    low, high = bounds
+    minimum = min_variance(COVARIANCE, bounds)
+    tangency = max_sharpe(EXPECTED, COVARIANCE, 0.02, bounds)
+
+    for weights in (minimum, tangency):
+        assert weights.sum() == pytest.approx(1.0, abs=1e-8)
+        assert weights.min() >= low - 1e-8
+        assert weights.max() <= high + 1e-8
+
+
+def test_frontier_points_hit_targets_within_bounds():
+    bounds = (0.0, 0.6)
+    minimum = min_variance(COVARIANCE, bounds)
+    maximum = max_return_weights(EXPECTED, bounds)
+    targets = np.linspace(minimum @ EXPECTED, maximum @ EXPECTED, 6)[1:].tolist()
+
+    solutions = solve_frontier_segment(
+        EXPECTED, COVARIANCE, bounds, targets,
+        interpolated_start(minimum, maximum, EXPECTED, targets[0]),
+    )
+
+    assert len(solutions) == len(targets)
+    variances = []
+    for weights, target in zip(solutions, targets):
+        assert weights @ EXPECTED == pytest.approx(target, abs=1e-6)
+        assert weights.max() <= 0.6 + 1e-8 and weights.min() >= -1e-8
+        variances.append(weights @ COVARIANCE @ weights)
+    assert variances == sorted(variances)
+
+
+def test_frontier_drops_points_that_do_not_converge():
+    bounds = (0.0, 1.0)
+    start = np.full(3, 1 / 3)
+
+    # Retorno acima do maior retorno possível: sem solução viável
+    solutions = solve_frontier_segment(EXPECTED, COVARIANCE, bounds, [0.10, 0.50], start)
+
+    assert solutions[0] is not None
+    assert solutions[1] is None
+
+
+@pytest.mark.parametrize("bounds", [(0.0, 0.3), (0.4, 1.0), (0.5, 0.2)])
+def test_infeasible_bounds_raise(bounds):
+    with pytest.raises(ValueError, match="inviáveis"):
+        check_bounds(3, bounds)
+    with pytest.raises(ValueError, match="inviáveis"):
+        min_variance(COVARIANCE, bounds)
+
+
+def test_optimization_error_is_value_error():
+    assert issubclass(OptimizationError, ValueError)
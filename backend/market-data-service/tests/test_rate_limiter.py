@@ -0,0 +1,294 @@
+"""
+Testes dos rate limiters.
+
+- TokenBucketRateLimiter: reabastecimento contínuo, custo e remoção de
+  clientes ociosos.
+- SharedMemoryRateLimiter: vários processos disputando o mesmo balde pela
+  tabela mapeada em memória, reabastecimento e despejo quando a sondagem
+  de uma faixa está cheia.
+- RedisRateLimiter: contra o servidor RESP local (`FakeRedisServer`), com o
+  script Lua do token bucket emulado em Python linha a linha, incluindo o
+  relógio do servidor, o carregamento via NOSCRIPT e o fallback local.
+"""
+
+import math
+import multiprocessing
+
+import pytest
+
+import services.rate_limiter as rate_limiter
+from services.rate_limiter import (
+    _REDIS_TOKEN_BUCKET_SCRIPT,
+    _SHM_PROBE_LIMIT,
+    _SHM_STRIPES,
+    RedisRateLimiter,
+    SharedMemoryRateLimiter,
+    TokenBucketRateLimiter,
+)
+
+
+class FakeClock:
+    """Relógio manual no lugar do módulo `time` dos rate limiters."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def test_token_bucket_refills_continuously(clock):
+    limiter = TokenBucketRateLimiter(max_requests=10, window_seconds=10, sweep_interval=0)
+    assert limiter.is_allowed("client", cost=10)
+    assert not limiter.is_allowed("client")
+
+    clock.now += 0.5
+    assert limiter.get_remaining_requests("client") == 0
+    clock.now += 2
+    assert limiter.get_remaining_requests("client") == 2
+    assert limiter.is_allowed("client", cost=2)
+    assert not limiter.is_allowed("client")
+    # Outros clientes têm baldes próprios
+    assert limiter.is_allowed("other", cost=50)
+
+    stats = limiter.get_stats()
+    assert (stats["allowed"], stats["rejected"]) == (3, 2)
+
+
+def test_token_bucket_sweep_removes_only_full_buckets(clock):
+    limiter = TokenBucketRateLimiter(max_requests=10, window_seconds=10, sweep_interval=0)
+    limiter.is_allowed("idle", cost=10)
+    clock.now += 5
+    limiter.is_allowed("active")
+
+    clock.now += 5  # "idle" está cheio de novo; "active" ainda não
+    assert limiter.sweep() == 1
+    assert limiter.get_stats()["tracked_clients"] == 1
+    assert limiter.get_remaining_requests("idle") == 10
+    assert limiter.is_allowed("idle", cost=10)
+
+
+def consume(path: str, attempts: int, barrier, results) -> None:
+    """Tenta `attempts` requisições em um processo separado e informa as aceitas."""
+    limiter = SharedMemoryRateLimiter(max_requests=50, window_seconds=3600, path=path, slots=1024)
+    try:
+        barrier.wait()
+        results.put(sum(limiter.is_allowed("client") for _ in range(attempts)))
+    finally:
+        limiter.close()
+
+
+def test_shared_memory_bucket_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "rate_limit.shm")
+    context = multiprocessing.get_context("spawn")
+    barrier, results = context.Barrier(4), context.Queue()
+    workers = [
+        context.Process(target=consume, args=(path, 30, barrier, results))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    allowed = [results.get(timeout=30) for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    # 120 tentativas simultâneas para um balde de 50 fichas sem reabastecimento
+    assert sum(allowed) == 50
+    limiter = SharedMemoryRateLimiter(max_requests=50, window_seconds=3600, path=path, slots=1024)
+    assert not limiter.is_allowed("client")
+    assert limiter.get_remaining_requests("client") == 0
+    limiter.close()
+
+
+def test_shared_memory_refill_and_cost(tmp_path, clock):
+    limiter = SharedMemoryRateLimiter(
+        max_requests=10, window_seconds=10, path=str(tmp_path / "rl.shm"), slots=1024
+    )
+    assert limiter.is_allowed("client", cost=8)
+    assert not limiter.is_allowed("client", cost=3)
+    assert limiter.is_allowed("client", cost=2)
+    assert not limiter.is_allowed("client")
+
+    clock.now += 3  # 1 ficha por segundo
+    assert limiter.get_remaining_requests("client") == 3
+    assert limiter.is_allowed("client", cost=3)
+    assert not limiter.is_allowed("client")
+
+    # Custo acima da capacidade é limitado a ela
+    clock.now += 100
+    assert limiter.get_remaining_requests("client") == 10
+    assert limiter.is_allowed("client", cost=500)
+    assert limiter.get_stats()["allowed"] == 4
+    limiter.close()
+
+
+def test_shared_memory_state_survives_reopen(tmp_path, clock):
+    path = str(tmp_path / "rl.shm")
+    first = SharedMemoryRateLimiter(max_requests=5, window_seconds=60, path=path, slots=1024)
+    assert first.is_allowed("client", cost=5)
+    first.close()
+
+    second = SharedMemoryRateLimiter(max_requests=5, window_seconds=60, path=path, slots=1024)
+    assert not second.is_allowed("client")
+    second.reset_limit("client")
+    assert second.is_allowed("client", cost=5)
+    second.close()
+
+    # Layout diferente recria a tabela
+    resized = SharedMemoryRateLimiter(max_requests=5, window_seconds=60, path=path, slots=2048)
+    assert resized.get_remaining_requests("client") == 5
+    resized.close()
+
+
+def test_shared_memory_evicts_oldest_when_probe_is_full(tmp_path, clock):
+    limiter = SharedMemoryRateLimiter(
+        max_requests=5, window_seconds=3600, path=str(tmp_path / "rl.shm"), slots=1024
+    )
+    # Identificadores da mesma faixa: a sondagem cobre apenas 16 slots dela
+    same_stripe = []
+    candidate = 0
+    while len(same_stripe) < _SHM_PROBE_LIMIT + 1:
+        identifier = f"client-{candidate}"
+        if limiter._hash(identifier) % _SHM_STRIPES == 0:
+            same_stripe.append(identifier)
+        candidate += 1
+
+    for identifier in same_stripe[:-1]:
+        assert limiter.is_allowed(identifier, cost=5)
+        clock.now += 1
+    assert limiter.get_stats()["tracked_clients"] == _SHM_PROBE_LIMIT
+
+    assert limiter.is_allowed(same_stripe[-1], cost=5)
+    assert limiter.get_stats()["evicted"] == 1
+    # O cliente mais antigo foi despejado e recomeça com o balde cheio
+    assert limiter.get_remaining_requests(same_stripe[0]) == 5
+    assert limiter.get_remaining_requests(same_stripe[1]) == 0
+    limiter.close()
+
+
+def token_bucket_script(expirations):
+    """Emulação do script Lua do token bucket sobre o estado do servidor local."""
+
+    def run(server, keys, argv):
+        capacity = float(argv[0])
+        rate = float(argv[1])
+        cost = float(argv[2])
+        seconds, micros = divmod(int(server.clock() * 1_000_000), 1_000_000)  # TIME
+        now = seconds + micros / 1_000_000
+        bucket = server.hashes.get(keys[0], {})
+        tokens = float(bucket[b"tokens"]) if b"tokens" in bucket else capacity
+        updated_at = float(bucket[b"updated_at"]) if b"updated_at" in bucket else now
+        tokens = min(capacity, tokens + max(0, now - updated_at) * rate)
+        allowed = 0
+        if tokens >= cost:
+            tokens = tokens - cost
+            allowed = 1
+        # tostring() de números do Lua usa "%.14g"
+        server.hashes[keys[0]] = {
+            b"tokens": b"%.14g" % tokens,
+            b"updated_at": b"%.14g" % now,
+        }
+        expirations[keys[0]] = int(argv[3])
+        return [allowed, math.floor(tokens)]
+
+    return run
+
+
+@pytest.fixture
+def expirations(redis_server):
+    expirations = {}
+    redis_server.register_script(_REDIS_TOKEN_BUCKET_SCRIPT, token_bucket_script(expirations))
+    return expirations
+
+
+@pytest.fixture
+def server_clock(redis_server) -> FakeClock:
+    server_clock = FakeClock()
+    redis_server.clock = server_clock.time
+    return server_clock
+
+
+def redis_limiter(redis_server, **kwargs) -> RedisRateLimiter:
+    return RedisRateLimiter(
+        max_requests=10,
+        window_seconds=10,
+        url=redis_server.url,
+        retry_cooldown=30,
+        fallback=TokenBucketRateLimiter(10, 10, sweep_interval=0),
+        **kwargs,
+    )
+
+
+def test_redis_script_is_loaded_once_then_called_by_sha(redis_server, expirations):
+    limiter = redis_limiter(redis_server)
+    assert limiter.is_allowed("client", cost=3)
+    assert limiter.is_allowed("client")
+
+    names = [command[0] for command in redis_server.commands]
+    assert names == [b"EVALSHA", b"EVAL", b"EVALSHA"]
+    evalsha = redis_server.commands[-1]
+    assert evalsha[2:] == [b"1", b"market_data:rate_limit:client", b"10", b"1.0", b"1", b"20"]
+    assert expirations == {b"market_data:rate_limit:client": 20}
+    limiter.close()
+
+
+def test_redis_bucket_refills_by_server_clock(redis_server, expirations, server_clock, clock):
+    limiter = redis_limiter(redis_server)
+    assert limiter.is_allowed("client", cost=10)
+    assert not limiter.is_allowed("client")
+
+    # O relógio do processo não importa: o reabastecimento usa o TIME do servidor
+    clock.now += 100
+    assert not limiter.is_allowed("client")
+    server_clock.now += 2.5
+    assert limiter.get_remaining_requests("client") == 2
+    assert limiter.is_allowed("client", cost=2)
+    assert not limiter.is_allowed("client")
+
+    stats = limiter.get_stats()
+    assert (stats["allowed"], stats["rejected"], stats["errors"]) == (2, 3, 0)
+    limiter.close()
+
+
+def test_redis_bucket_is_shared_between_hosts(redis_server, expirations):
+    first = redis_limiter(redis_server)
+    second = redis_limiter(redis_server)
+
+    assert first.is_allowed("client", cost=6)
+    assert not second.is_allowed("client", cost=5)
+    assert second.is_allowed("client", cost=4)
+    assert not first.is_allowed("client")
+
+    assert second.reset_limit("client")
+    assert first.get_remaining_requests("client") == 10
+    first.close()
+    second.close()
+
+
+def test_redis_failure_uses_local_fallback_during_cooldown(redis_server, expirations, clock):
+    limiter = redis_limiter(redis_server)
+    assert limiter.is_allowed("client", cost=9)
+    redis_server.stop()
+
+    # A falha desvia para o balde local, que começa cheio
+    assert limiter.is_allowed("client", cost=10)
+    assert not limiter.is_allowed("client")
+    stats = limiter.get_stats()
+    assert stats["errors"] == 1 and not stats["available"]
+    assert stats["fallback"]["allowed"] == 1
+
+    clock.now += 31
+    assert limiter.get_stats()["available"]
+    limiter.is_allowed("client")
+    assert limiter.get_stats()["errors"] == 2
+    limiter.close()
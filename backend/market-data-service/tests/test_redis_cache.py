@@ -0,0 +1,151 @@
+"""
+Testes do cache Redis contra um servidor RESP local (`FakeRedisServer`):
+pipelining de GET/SET/MGET, compressão acima do limiar, respostas de erro,
+preparação da conexão e o período de fallback após uma falha.
+"""
+
+import json
+import zlib
+
+import pytest
+
+import services.redis_cache as redis_cache
+from services.cache_service import BoundedLRUCache
+from services.redis_cache import (
+    RedisCache,
+    RedisConnectionPool,
+    RedisError,
+    RedisReplyError,
+)
+from stubs import FakeRedisServer
+
+
+class FakeClock:
+    """Relógio manual no lugar do módulo `time` do cache Redis."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def cache(redis_server) -> RedisCache:
+    cache = RedisCache(
+        redis_server.url,
+        pool_size=2,
+        timeout=1.0,
+        retry_cooldown=30,
+        fallback=BoundedLRUCache(sweep_interval=0),
+    )
+    yield cache
+    cache.close()
+
+
+def test_set_many_pipelines_all_sets_in_one_write(cache, redis_server):
+    assert cache.set_many({"a": 1, "b": [1, 2], "c": {"x": "y"}}, ttl=60)
+
+    assert redis_server.batches == [3]
+    assert [command[:2] for command in redis_server.commands] == [
+        [b"SET", b"market_data:a"],
+        [b"SET", b"market_data:b"],
+        [b"SET", b"market_data:c"],
+    ]
+    assert all(command[3:] == [b"EX", b"60"] for command in redis_server.commands)
+
+
+def test_get_many_uses_single_mget_and_counts_hits(cache, redis_server):
+    cache.set_many({"a": 1, "b": [1, 2]})
+    redis_server.commands.clear()
+
+    assert cache.get_many(["a", "b", "missing"]) == {"a": 1, "b": [1, 2]}
+    assert redis_server.commands == [
+        [b"MGET", b"market_data:a", b"market_data:b", b"market_data:missing"]
+    ]
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_values_above_threshold_are_compressed(cache, redis_server):
+    small = {"symbol": "AAPL"}
+    large = {"points": [{"close": 100.0 + i, "date": "2024-01-02"} for i in range(100)]}
+    cache.set_many({"small": small, "large": large})
+
+    raw_small = redis_server.data[b"market_data:small"]
+    raw_large = redis_server.data[b"market_data:large"]
+    encoded_large = json.dumps(large, separators=(",", ":")).encode()
+    assert raw_small[:1] == b"\x00"
+    assert raw_large[:1] == b"\x01"
+    assert zlib.decompress(raw_large[1:]) == encoded_large
+    assert len(raw_large) < len(encoded_large)
+    assert cache.get_many(["small", "large"]) == {"small": small, "large": large}
+
+
+def test_error_reply_is_raised_after_reading_pipeline(redis_server):
+    pool = RedisConnectionPool.from_url(redis_server.url, size=1, timeout=1.0)
+    redis_server.data[b"ok"] = b"1"
+    redis_server.hashes[b"bucket"] = {b"tokens": b"1"}
+
+    with pytest.raises(RedisReplyError, match="WRONGTYPE"):
+        pool.execute(("GET", "bucket"), ("GET", "ok"))
+
+    # A conexão continua sincronizada e é reaproveitada
+    assert pool.execute(("GET", "ok")) == [b"1"]
+    assert redis_server.connections == 1
+    pool.close()
+
+
+def test_connection_authenticates_and_selects_db():
+    server = FakeRedisServer(password="segredo")
+    try:
+        pool = RedisConnectionPool.from_url(
+            f"redis://:segredo@127.0.0.1:{server.port}/2", size=1, timeout=1.0
+        )
+        assert pool.execute(("GET", "x")) == [None]
+        assert server.commands[:2] == [[b"AUTH", b"segredo"], [b"SELECT", b"2"]]
+        assert server.batches[0] == 2
+        pool.close()
+
+        bad = RedisConnectionPool.from_url(
+            f"redis://:errada@127.0.0.1:{server.port}/0", size=1, timeout=1.0
+        )
+        with pytest.raises(RedisError, match="preparar"):
+            bad.execute(("GET", "x"))
+    finally:
+        server.stop()
+
+
+def test_clear_removes_only_prefixed_keys(cache, redis_server):
+    cache.set_many({"a": 1, "b": 2})
+    redis_server.data[b"other:key"] = b"x"
+
+    assert cache.clear()
+    assert list(redis_server.data) == [b"other:key"]
+
+
+def test_fallback_cooldown_after_server_failure(cache, redis_server, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(redis_cache, "time", clock)
+    cache.set("a", 1)
+    redis_server.stop()
+
+    # A falha desvia para o cache local e abre o período de fallback
+    assert cache.set("b", 2)
+    assert cache.fallback.get("b") == 2
+    stats = cache.get_stats()
+    assert stats["errors"] == 1 and not stats["available"]
+
+    commands = len(redis_server.commands)
+    assert cache.get("b") == 2
+    assert cache.get("a") is None
+    stats = cache.get_stats()
+    assert stats["errors"] == 1
+    assert stats["fallback_uses"] == 2
+    assert len(redis_server.commands) == commands
+
+    # Vencido o período, o servidor volta a ser tentado
+    clock.now += 31
+    assert cache.get_stats()["available"]
+    assert cache.get("b") == 2
+    assert cache.get_stats()["errors"] == 2
@@ -0,0 +1,275 @@
+"""
+Testes do agendador de atualização: cadência com o mercado aberto e
+fechado, limites do jitter, orçamento de chamadas e os conjuntos padrão.
+
+O relógio monotônico do módulo é substituído por um relógio manual e as
+atualizações rodam em linha (sem o executor de trabalho bloqueante).
+"""
+
+import asyncio
+
+import pytest
+
+import services.refresh_scheduler as refresh_scheduler
+from core.config import settings
+from services.market_data_service import MARKET_OVERVIEW_SYMBOLS
+from services.refresh_scheduler import RefreshJob, RefreshScheduler, UpstreamBudget
+
+
+class FakeClock:
+    """Relógio manual no lugar do módulo `time` do agendador."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class InlineBlocking:
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+class FakeService:
+    """Serviço mínimo: registra as chamadas das atualizações padrão."""
+
+    def __init__(self):
+        self.blocking = InlineBlocking()
+        self.overview_calls = []
+        self.screener_calls = []
+
+    def warm_market_overview(self, categories, refresh_ttl=None):
+        self.overview_calls.append((tuple(categories), refresh_ttl))
+        return len(categories)
+
+    def get_trending(self, categoria, setor, limit, offset, sort_field, sort_asc, refresh_ttl=None):
+        self.screener_calls.append((categoria, limit, sort_field, sort_asc))
+        return {"resultados": [{"symbol": "PETR4.SA"}]}
+
+    def get_trending_stocks(self, market, client_id, refresh_ttl=None):
+        return {}
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(refresh_scheduler, "time", clock)
+    monkeypatch.setattr(refresh_scheduler.upstream_gateway, "blocked_for", lambda: 0.0)
+    return clock
+
+
+def make_job(name="job", interval=60.0, cost=1, markets=("BR",), calls=None):
+    calls = calls if calls is not None else []
+    return RefreshJob(name=name, refresh=calls.append, interval=interval, cost=cost, markets=markets)
+
+
+def scheduler_for(jobs, open_markets=(), budget=1000, **kwargs):
+    return RefreshScheduler(
+        FakeService(),
+        jobs=jobs,
+        budget=UpstreamBudget(budget),
+        market_open=lambda market: market in open_markets,
+        **kwargs,
+    )
+
+
+def dispatch(scheduler):
+    """Dispara as atualizações vencidas e espera terminarem."""
+    async def scenario():
+        scheduler._dispatch_due()
+        await asyncio.gather(*list(scheduler._tasks))
+    asyncio.run(scenario())
+
+
+def test_cadence_open_vs_closed(clock, monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_JITTER", 0.0)
+    job = make_job(interval=45.0, markets=("BR",))
+
+    open_scheduler = scheduler_for([job], open_markets=("BR",))
+    open_scheduler._check_market_transitions()
+    assert open_scheduler._next_delay(job) == 45.0
+
+    closed_scheduler = scheduler_for([job], open_markets=())
+    closed_scheduler._check_market_transitions()
+    assert closed_scheduler._next_delay(job) == settings.REFRESH_CLOSED_INTERVAL
+
+
+def test_cadence_open_if_any_market_open(clock, monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_JITTER", 0.0)
+    job = make_job(interval=45.0, markets=("BR", "US"))
+    scheduler = scheduler_for([job], open_markets=("US",))
+    scheduler._check_market_transitions()
+
+    assert scheduler._next_delay(job) == 45.0
+
+
+def test_closed_cadence_sets_long_ttl(clock, monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_JITTER", 0.0)
+    ttls = []
+    job = make_job(interval=45.0, calls=ttls)
+    scheduler = scheduler_for([job], open_markets=())
+    job.next_run = clock.now
+
+    dispatch(scheduler)
+
+    assert ttls == [settings.REFRESH_CLOSED_INTERVAL + settings.REFRESH_TTL_MARGIN_SECONDS]
+    assert job.next_run == clock.now + settings.REFRESH_CLOSED_INTERVAL
+    assert job.runs == 1
+
+
+def test_jitter_bounds(clock):
+    job = make_job(interval=100.0)
+    scheduler = scheduler_for([job], open_markets=("BR",))
+    scheduler._check_market_transitions()
+    jitter = settings.REFRESH_JITTER
+
+    delays = [scheduler._next_delay(job) for _ in range(2000)]
+
+    assert min(delays) >= 100.0 * (1 - jitter)
+    assert max(delays) <= 100.0 * (1 + jitter)
+    # O jitter de fato espalha as rodadas
+    assert max(delays) - min(delays) > 100.0 * jitter
+
+
+def test_first_run_spread_within_interval(clock):
+    jobs = [make_job(name=f"job{i}", interval=5.0) for i in range(50)]
+    scheduler_for(jobs)
+
+    offsets = [job.next_run - clock.now for job in jobs]
+    assert all(0.0 <= offset <= 5.0 for offset in offsets)
+    assert len(set(offsets)) > 1
+
+
+def test_market_open_transition_pulls_jobs_forward(clock):
+    job = make_job(markets=("BR",))
+    is_open = {"BR": False}
+    scheduler = RefreshScheduler(
+        FakeService(), jobs=[job], budget=UpstreamBudget(1000),
+        market_open=lambda market: is_open[market],
+    )
+    scheduler._check_market_transitions()
+    job.next_run = clock.now + 3600
+
+    is_open["BR"] = True
+    scheduler._check_market_transitions()
+
+    assert job.next_run == clock.now
+
+
+def test_budget_refills_with_clock(clock):
+    budget = UpstreamBudget(60)
+    assert budget.try_spend(60)
+    assert not budget.try_spend(1)
+
+    clock.now += 10  # 60 por minuto: 10 chamadas em 10s
+    assert budget.try_spend(10)
+    assert not budget.try_spend(1)
+
+    clock.now += 3600  # a recarga para na capacidade
+    assert budget.try_spend(60)
+    assert not budget.try_spend(1)
+
+
+def test_budget_exhaustion_defers_in_order(clock, monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_MAX_CONCURRENCY", 10)
+    calls = []
+    jobs = [make_job(name=f"job{i}", cost=10, calls=calls) for i in range(3)]
+    scheduler = scheduler_for(jobs, open_markets=("BR",), budget=25)
+    for offset, job in enumerate(jobs):
+        job.next_run = clock.now - 10 + offset
+
+    dispatch(scheduler)
+
+    assert [job.runs for job in jobs] == [1, 1, 0]
+    assert scheduler.get_stats()["deferred_by_budget"] == 1
+
+    # Sem recarga suficiente o mais atrasado continua esperando
+    dispatch(scheduler)
+    assert jobs[2].runs == 0
+
+    clock.now += 6  # 25 por minuto: 2.5 chamadas em 6s, saldo 7.5
+    dispatch(scheduler)
+    assert jobs[2].runs == 0
+    clock.now += 6
+    dispatch(scheduler)
+    assert jobs[2].runs == 1
+
+
+def test_blocked_gateway_skips_dispatch(clock, monkeypatch):
+    monkeypatch.setattr(refresh_scheduler.upstream_gateway, "blocked_for", lambda: 5.0)
+    job = make_job()
+    scheduler = scheduler_for([job], open_markets=("BR",))
+    job.next_run = clock.now
+
+    dispatch(scheduler)
+
+    assert job.runs == 0 and scheduler.get_stats()["deferred_by_budget"] == 0
+
+
+def test_default_overview_job_fetches_symbol_union_once(clock):
+    service = FakeService()
+    scheduler = RefreshScheduler(service, budget=UpstreamBudget(1000), market_open=lambda m: True)
+    overview = [job for job in scheduler.jobs if job.name.startswith("market_overview")]
+
+    assert len(overview) == 1
+    categories = [c for c in settings.REFRESH_OVERVIEW_CATEGORIES if c in MARKET_OVERVIEW_SYMBOLS]
+    union = {s for c in categories for s in MARKET_OVERVIEW_SYMBOLS[c]}
+    assert overview[0].cost == len(union)
+
+    overview[0].refresh(60)
+    assert service.overview_calls == [(tuple(categories), 60)]
+
+
+def test_default_screener_jobs_match_dashboard_requests(clock):
+    service = FakeService()
+    scheduler = RefreshScheduler(service, budget=UpstreamBudget(1000), market_open=lambda m: True)
+    for job in scheduler.jobs:
+        if job.name.startswith("screener:"):
+            job.refresh(60)
+
+    refreshed = {(c, field, asc) for c, _, field, asc in service.screener_calls}
+    # Pedidos dos painéis (frontend/src/hooks/queries/usecategories.ts)
+    dashboard = [
+        ("percentchange", False), ("percentchange", True),
+        ("dayvolume", False), ("forward_dividend_yield", False),
+    ]
+    names = ["alta_do_dia", "baixa_do_dia", "mais_negociadas", "valor_dividendos"]
+    for name, (field, asc) in zip(names, dashboard):
+        assert (name, field, asc) in refreshed
+        assert ("mercado_todo", field, asc) in refreshed
+    assert {limit for _, limit, _, _ in service.screener_calls} == {settings.SCREENER_PAGE_SIZE}
+
+
+def test_refreshed_screener_page_serves_dashboard_limit(service, monkeypatch):
+    import services.market_data_service as market_data_service
+
+    calls = []
+
+    def screen(query, size, offset, sortField, sortAsc):
+        calls.append(size)
+        return {
+            "quotes": [{"symbol": f"T{i}.SA", "regularMarketPrice": i} for i in range(size)],
+            "total": 100,
+        }
+
+    monkeypatch.setattr(market_data_service.yf, "screen", screen)
+    monkeypatch.setattr(settings, "ENABLE_CACHE", True)
+
+    service.get_trending(
+        "alta_do_dia", None, settings.SCREENER_PAGE_SIZE, 0, "percentchange", False,
+        refresh_ttl=60,
+    )
+    dashboard = asyncio.run(
+        service.get_trending_async("alta_do_dia", None, 5, 0, "percentchange", False)
+    )
+    default_page = service.get_trending("alta_do_dia", None, 20, 0, "percentchange", False)
+
+    assert calls == [settings.SCREENER_PAGE_SIZE]
+    assert [r["symbol"] for r in dashboard["resultados"]] == [f"T{i}.SA" for i in range(5)]
+    assert dashboard["total"] == 5 and dashboard["limit"] == 5
+    assert default_page["total"] == 20 and default_page["limit"] == 20
+
+    # Páginas maiores que a padrão têm a sua própria entrada
+    larger = service.get_trending("alta_do_dia", None, 50, 0, "percentchange", False)
+    assert calls == [settings.SCREENER_PAGE_SIZE, 50] and larger["total"] == 50
@@ -0,0 +1,155 @@
+"""
+Testes do índice de busca de tickers: ordem de relevância (símbolo exato,
+prefixos, substring, aproximados), tolerância a erros de digitação e a
+equivalência entre o índice de remoções, limitado pela distância, e a
+distância de edição calculada sem limite sobre todo o universo.
+"""
+
+import random
+
+import pytest
+
+from services.ticker_index import (
+    SCORE_EXACT_SYMBOL,
+    SCORE_FUZZY,
+    SCORE_NAME_PREFIX,
+    SCORE_SUBSTRING,
+    SCORE_SYMBOL_PREFIX,
+    EditDistanceIndex,
+    TickerIndex,
+    osa_distance,
+)
+
+STOCKS = [
+    {"symbol": "PETR4.SA", "name": "Petróleo Brasileiro S.A. - Petrobras"},
+    {"symbol": "PETR3.SA", "name": "Petróleo Brasileiro S.A. - Petrobras"},
+    {"symbol": "PETZ3.SA", "name": "Pet Center Comércio e Participações S.A."},
+    {"symbol": "VALE3.SA", "name": "Vale S.A."},
+    {"symbol": "BBDC4.SA", "name": "Banco Bradesco S.A."},
+    {"symbol": "BBAS3.SA", "name": "Banco do Brasil S.A."},
+    {"symbol": "ITUB4.SA", "name": "Itaú Unibanco Holding S.A."},
+    {"symbol": "AAPL", "name": "Apple Inc."},
+    {"symbol": "BRK-B", "name": "Berkshire Hathaway Inc."},
+    {"symbol": "petr4.sa", "name": "Duplicado"},
+]
+
+
+@pytest.fixture(scope="module")
+def index() -> TickerIndex:
+    return TickerIndex(STOCKS)
+
+
+def ranked(results):
+    return [(stock["symbol"], score) for stock, score in results]
+
+
+def test_duplicates_are_ignored_and_symbols_resolve(index):
+    assert len(index) == 9
+    assert index.get("petr4")["name"].startswith("Petróleo")
+    assert index.get("PETR4.SA") is index.get("petr4.sa")
+    assert index.get("brk-b")["symbol"] == "BRK-B"
+    assert index.get("XPTO3") is None
+
+
+def test_exact_symbol_ranks_before_prefixes(index):
+    # Os aproximados completam a lista depois das correspondências diretas
+    assert ranked(index.search("PETR4")) == [
+        ("PETR4.SA", SCORE_EXACT_SYMBOL),
+        ("PETR3.SA", SCORE_FUZZY),
+    ]
+    assert ranked(index.search("pet")) == [
+        ("PETR3.SA", SCORE_SYMBOL_PREFIX),
+        ("PETR4.SA", SCORE_SYMBOL_PREFIX),
+        ("PETZ3.SA", SCORE_SYMBOL_PREFIX),
+    ]
+
+
+def test_name_prefix_accents_and_multiple_words(index):
+    assert ranked(index.search("itaú")) == [("ITUB4.SA", SCORE_NAME_PREFIX)]
+    assert ranked(index.search("banco bra")) == [
+        ("BBDC4.SA", SCORE_NAME_PREFIX),
+        ("BBAS3.SA", SCORE_NAME_PREFIX),
+    ]
+    # Prefixo do nome vem depois do prefixo do símbolo, sem repetir tickers
+    assert ranked(index.search("va")) == [("VALE3.SA", SCORE_SYMBOL_PREFIX)]
+
+
+def test_substring_and_limit(index):
+    assert ranked(index.search("nibanc")) == [("ITUB4.SA", SCORE_SUBSTRING)]
+    assert ranked(index.search("hathaway inc")) == [("BRK-B", SCORE_NAME_PREFIX)]
+    assert len(index.search("b", limit=2)) == 2
+    assert index.search("b", limit=0) == []
+    assert index.search("  ") == []
+
+
+def test_typos_fall_back_to_fuzzy_matches(index):
+    assert ranked(index.search("petrobas")) == [
+        ("PETR4.SA", SCORE_FUZZY),
+        ("PETR3.SA", SCORE_FUZZY),
+    ]
+    assert ranked(index.search("bradesko")) == [("BBDC4.SA", SCORE_FUZZY)]
+    # Consultas curtas não usam a busca aproximada
+    assert index.search("zz") == []
+
+
+def test_suggest_symbol_typos(index):
+    # Transposição conta como uma edição; PETR3 (2 edições) excede a tolerância
+    assert [(stock["symbol"], d) for stock, d in index.suggest("PERT4")] == [("PETR4.SA", 1)]
+    assert [(stock["symbol"], d) for stock, d in index.suggest("PETR5")] == [
+        ("PETR3.SA", 1),
+        ("PETR4.SA", 1),
+    ]
+    assert [(stock["symbol"], d) for stock, d in index.suggest("VAL3.SA")] == [("VALE3.SA", 1)]
+    assert [(stock["symbol"], d) for stock, d in index.suggest("APPL")] == [("AAPL", 1)]
+    # O próprio símbolo não é sugestão
+    assert all(stock["symbol"] != "VALE3.SA" for stock, _ in index.suggest("VALE3"))
+
+
+def reference_distance(a: str, b: str) -> int:
+    """Distância de edição com transposições pela recorrência completa (sem cortes)."""
+    table = {}
+    for i in range(-1, len(a)):
+        table[i, -1] = i + 1
+    for j in range(-1, len(b)):
+        table[-1, j] = j + 1
+    for i in range(len(a)):
+        for j in range(len(b)):
+            cost = 0 if a[i] == b[j] else 1
+            table[i, j] = min(
+                table[i - 1, j] + 1,
+                table[i, j - 1] + 1,
+                table[i - 1, j - 1] + cost,
+            )
+            if i and j and a[i] == b[j - 1] and a[i - 1] == b[j]:
+                table[i, j] = min(table[i, j], table[i - 2, j - 2] + 1)
+    return table[len(a) - 1, len(b) - 1]
+
+
+def test_osa_distance_matches_reference():
+    rng = random.Random(7)
+    for _ in range(500):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        assert osa_distance(a, b) == reference_distance(a, b), (a, b)
+    assert osa_distance("pert4", "petr4") == 1
+
+
+def test_bounded_index_matches_unbounded_distance():
+    # Alfabeto pequeno: muitos termos a 1-3 edições uns dos outros
+    rng = random.Random(11)
+    terms = sorted({
+        "".join(rng.choice("abcd") for _ in range(rng.randint(2, 8)))
+        for _ in range(400)
+    })
+    index = EditDistanceIndex(terms, max_distance=2)
+
+    for query in terms[::7] + ["ab", "dcba", "aaaaaaaaa", "bacd"]:
+        distances = [(reference_distance(query, term), term) for term in terms]
+        for max_distance in (0, 1, 2):
+            expected = sorted(
+                (distance, term) for distance, term in distances
+                if distance <= max_distance
+            )
+            found = index.search(query, max_distance)
+            assert sorted(found) == expected, (query, max_distance)
+            assert [d for d, _ in found] == sorted(d for d, _ in found)